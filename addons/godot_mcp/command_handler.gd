@@ -4,6 +4,13 @@ extends Node
 
 const LOG_FILENAME := "addons/godot_mcp/command_handler.gd"
 const LOG_SECTION := "command_handler"
+const BATCH_COMMAND := "batch"
+const LIST_COMMANDS_COMMAND := "list_commands"
+const SUBSCRIBE_COMMAND := "subscribe_events"
+const UNSUBSCRIBE_COMMAND := "unsubscribe_events"
+const MAX_BATCH_SIZE := 1000
+# Seconds a batched command may await its reply before the batch moves on.
+const BATCH_COMMAND_TIMEOUT_SEC := 15.0
 
 const _MCP_BASE_COMMAND_PROCESSOR_SCRIPT := preload("res://addons/godot_mcp/commands/base_command_processor.gd")
 
@@ -85,6 +92,19 @@ var MCPRenderingCommands
 
 var _websocket_server
 var _command_processors: Array[MCPBaseCommandProcessor] = []
+# Command type -> processor, built once from each processor's SUPPORTED_COMMANDS.
+var _command_routes := {}
+# Processors that declare no command list; offered anything not in the table.
+var _fallback_processors: Array[MCPBaseCommandProcessor] = []
+var _command_names := PackedStringArray()
+# Sub-command id -> batch state, for batches waiting on that sub-command.
+var _batches := {}
+# Sub-command id -> client id, for timed-out sub-commands whose late reply is dropped.
+var _expired_batch_commands := {}
+# Command id -> chunk size, for requests that asked for a chunked reply.
+var _streams := {}
+# Command ids of requests that accept a binary reply frame.
+var _binary_replies := {}
 
 func _ready():
         await get_tree().process_frame
@@ -145,13 +165,39 @@ func _initialize_processors() -> void:
                         }, true)
                         continue
 
-                processor._websocket_server = _websocket_server
+                # Responses come back through send_response() so batches can collect them.
+                processor._websocket_server = self
                 processor.name = processor.get_class()
                 add_child(processor)
                 processor.command_completed.connect(func(client_id, command_type, result, command_id):
                         _on_command_completed(client_id, command_type, result, command_id, processor)
                 )
                 _command_processors.append(processor)
+                _register_routes(processor)
+
+        _command_names = PackedStringArray(_command_routes.keys())
+        _command_names.append_array([BATCH_COMMAND, LIST_COMMANDS_COMMAND, SUBSCRIBE_COMMAND, UNSUBSCRIBE_COMMAND])
+        _command_names.sort()
+        _log("Built command routing table", "_initialize_processors", 107, {
+                "command_count": _command_routes.size(),
+                "fallback_processors": _fallback_processors.size()
+        })
+
+func _register_routes(processor: MCPBaseCommandProcessor) -> void:
+        var commands := processor.get_supported_commands()
+        if commands.is_empty():
+                _fallback_processors.append(processor)
+                return
+
+        for command_type in commands:
+                if _command_routes.has(command_type):
+                        _log("Duplicate command registration ignored", "_register_routes", 121, {
+                                "command_type": command_type,
+                                "processor": processor.name,
+                                "registered_processor": _command_routes[command_type].name
+                        }, true)
+                        continue
+                _command_routes[command_type] = processor
 
 func _handle_command(client_id: int, command: Dictionary) -> void:
         var command_type: String = command.get("type", "")
@@ -178,35 +224,244 @@ func _handle_command(client_id: int, command: Dictionary) -> void:
                 })
                 params = {}
 
+        # Opt-in: {"chunkSize": N} streams a successful reply in chunks of about
+        # N characters; see utils/response_stream.gd.
+        if command.has("chunkSize") and not command_id.is_empty():
+                _streams[command_id] = MCPResponseStream.clamp_chunk_size(command["chunkSize"])
+        # Opt-in: {"encoding": "binary"} sends a successful reply with numeric
+        # arrays as a binary frame; see utils/binary_codec.gd.
+        if str(command.get("encoding", "")) == "binary" and not command_id.is_empty():
+                _binary_replies[command_id] = true
+
+        if command_type == BATCH_COMMAND:
+                _handle_batch(client_id, params, command_id)
+                return
+        if command_type == LIST_COMMANDS_COMMAND:
+                _send_success(client_id, {"commands": Array(_command_names)}, command_id)
+                return
+        if command_type == SUBSCRIBE_COMMAND or command_type == UNSUBSCRIBE_COMMAND:
+                _handle_subscription(client_id, command_type, params, command_id)
+                return
+
+        _route_command(client_id, command_type, params, command_id)
+
+func _route_command(client_id: int, command_type: String, params: Dictionary, command_id: String) -> void:
         _log("Routing command", "_handle_command", 131, {
                 "client_id": client_id,
                 "command_type": command_type,
                 "command_id": command_id
         })
 
-        var handled := false
-        for processor in _command_processors:
-                if processor == null:
-                        continue
+        var processor = _command_routes.get(command_type)
+        if processor != null:
+                if processor.process_command(client_id, command_type, params, command_id):
+                        return
+                _log("Routed processor rejected command", "_handle_command", 143, {
+                        "command_type": command_type,
+                        "processor": processor.name
+                }, true)
+        else:
+                for fallback in _fallback_processors:
+                        if fallback.process_command(client_id, command_type, params, command_id):
+                                return
 
-                if not processor.has_method("process_command"):
-                        _log("Processor missing process_command", "_handle_command", 143, {
-                                "processor": processor.name
-                        }, true)
+        _log("No processor handled command", "_handle_command", 154, {
+                "client_id": client_id,
+                "command_type": command_type,
+                "command_id": command_id
+        }, true)
+        _send_error(client_id, "Unsupported command: %s" % command_type, command_id)
+
+# Subscriptions belong to the connection, so they are answered here rather
+# than by a processor; see utils/event_hub.gd for the event frames.
+func _handle_subscription(client_id: int, command_type: String, params: Dictionary, command_id: String) -> void:
+        var events = params.get("events", [])
+        if typeof(events) != TYPE_ARRAY:
+                events = [events]
+        var event_hub: MCPEventHub = _websocket_server.event_hub
+
+        var subscribed = []
+        if command_type == SUBSCRIBE_COMMAND:
+                subscribed = event_hub.subscribe(client_id, events)
+                if typeof(subscribed) == TYPE_STRING:
+                        _send_error(client_id, subscribed, command_id)
+                        return
+        else:
+                subscribed = event_hub.unsubscribe(client_id, events)
+
+        _log("Updated event subscription", "_handle_subscription", 288, {
+                "client_id": client_id,
+                "command_type": command_type,
+                "subscribed": subscribed
+        })
+        _send_success(client_id, {"subscribed": subscribed, "events": MCPEventHub.EVENTS}, command_id)
+
+# A batch runs its commands in order within the current poll and answers with
+# one frame: {"results": [...], "completed", "failed", "skipped", "stopped"}.
+# Each command is routed under an internal "<batch id>#<index>" id so that
+# send_response() can capture its reply; a processor that awaits simply
+# resumes the batch when its reply arrives, or the command times out after
+# BATCH_COMMAND_TIMEOUT_SEC with an error result.
+func _handle_batch(client_id: int, params: Dictionary, command_id: String) -> void:
+        var commands = params.get("commands", [])
+        if typeof(commands) != TYPE_ARRAY or commands.is_empty():
+                _send_error(client_id, "Batch requires a non-empty 'commands' array", command_id)
+                return
+        if commands.size() > MAX_BATCH_SIZE:
+                _send_error(client_id, "Batch exceeds %d commands" % MAX_BATCH_SIZE, command_id)
+                return
+
+        var on_error := str(params.get("on_error", "stop"))
+        if on_error != "stop" and on_error != "continue":
+                _send_error(client_id, "Batch 'on_error' must be 'stop' or 'continue'", command_id)
+                return
+
+        var batch := {
+                "client_id": client_id,
+                "command_id": command_id,
+                "key": command_id if not command_id.is_empty() else "batch_%d" % Time.get_ticks_usec(),
+                "commands": commands,
+                "stop_on_error": on_error == "stop",
+                "results": [],
+                "failed": 0,
+                "stopped": false,
+                "dispatching": false,
+        }
+        _log("Routing batch", "_handle_batch", 190, {
+                "client_id": client_id,
+                "command_id": command_id,
+                "size": commands.size(),
+                "on_error": on_error
+        })
+        _advance_batch(batch)
+
+func _advance_batch(batch: Dictionary) -> void:
+        batch["dispatching"] = true
+        var commands: Array = batch["commands"]
+        while batch["results"].size() < commands.size():
+                var index: int = batch["results"].size()
+                var entry = commands[index]
+                if batch["stopped"]:
+                        batch["results"].append(_batch_item(entry, {"status": "skipped"}))
                         continue
 
-                var result = processor.process_command(client_id, command_type, params, command_id)
-                if result:
-                        handled = true
-                        break
+                var command_type := ""
+                var params = {}
+                if typeof(entry) == TYPE_DICTIONARY:
+                        command_type = str(entry.get("type", ""))
+                        params = entry.get("params", {})
+                if typeof(params) != TYPE_DICTIONARY:
+                        params = {}
 
-        if not handled:
-                _log("No processor handled command", "_handle_command", 154, {
-                        "client_id": client_id,
-                        "command_type": command_type,
-                        "command_id": command_id
-                }, true)
-                _send_error(client_id, "Unsupported command: %s" % command_type, command_id)
+                var sub_id := "%s#%d" % [batch["key"], index]
+                _batches[sub_id] = batch
+                if command_type.is_empty():
+                        _send_error(batch["client_id"], "Command type is required", sub_id)
+                elif command_type == BATCH_COMMAND:
+                        _send_error(batch["client_id"], "Batches cannot be nested", sub_id)
+                else:
+                        _route_command(batch["client_id"], command_type, params, sub_id)
+
+                if _batches.has(sub_id):
+                        # The processor is awaiting; send_response() resumes the batch.
+                        batch["dispatching"] = false
+                        get_tree().create_timer(BATCH_COMMAND_TIMEOUT_SEC).timeout.connect(
+                                _on_batch_command_timeout.bind(sub_id, batch))
+                        return
+
+        batch["dispatching"] = false
+        var skipped := 0
+        for item in batch["results"]:
+                if item.get("status") == "skipped":
+                        skipped += 1
+        var summary := {
+                "results": batch["results"],
+                "completed": batch["results"].size() - batch["failed"] - skipped,
+                "failed": batch["failed"],
+                "skipped": skipped,
+                "stopped": batch["stopped"],
+        }
+        _send_success(batch["client_id"], summary, batch["command_id"])
+
+func _on_batch_command_timeout(sub_id: String, batch: Dictionary) -> void:
+        if not _batches.has(sub_id) or not is_same(_batches[sub_id], batch):
+                return
+        _log("Batch command timed out", "_on_batch_command_timeout", 380, {
+                "client_id": batch["client_id"],
+                "command_id": sub_id,
+                "timeout_sec": BATCH_COMMAND_TIMEOUT_SEC
+        }, true)
+        _send_error(batch["client_id"], "Command timed out after %d seconds" % int(BATCH_COMMAND_TIMEOUT_SEC), sub_id)
+        _expired_batch_commands[sub_id] = batch["client_id"]
+
+# Called by the server when a client goes away: its batches can no longer be
+# answered, so their pending sub-commands are dropped.
+func remove_client(client_id: int) -> void:
+        for sub_id in _batches.keys():
+                if _batches[sub_id]["client_id"] == client_id:
+                        _batches.erase(sub_id)
+        for sub_id in _expired_batch_commands.keys():
+                if _expired_batch_commands[sub_id] == client_id:
+                        _expired_batch_commands.erase(sub_id)
+
+func _batch_item(entry, response: Dictionary) -> Dictionary:
+        var item := response.duplicate()
+        item.erase("commandId")
+        if typeof(entry) == TYPE_DICTIONARY and entry.has("commandId"):
+                item["commandId"] = entry["commandId"]
+        return item
+
+# Every processor and this handler reply through here.  Replies to batched
+# sub-commands are collected, successful replies to streamed requests are sent
+# in chunks or as binary frames, and everything else goes straight to the
+# server.  A request that asks for both gets chunks.
+func send_response(client_id: int, response: Dictionary) -> int:
+        var command_id := str(response.get("commandId", ""))
+        var binary := _binary_replies.has(command_id)
+        _binary_replies.erase(command_id)
+        if _streams.has(command_id):
+                var chunk_size: int = _streams[command_id]
+                _streams.erase(command_id)
+                if response.get("status", "") == "success":
+                        _stream_response(client_id, command_id, response.get("result", {}), chunk_size)
+                        return OK
+        if binary and response.get("status", "") == "success":
+                var frame := MCPBinaryCodec.encode(response)
+                if not frame.is_empty():
+                        return _websocket_server.send_binary_response(client_id, frame)
+        if _expired_batch_commands.has(command_id):
+                # The batch already recorded a timeout for this command.
+                _expired_batch_commands.erase(command_id)
+                return OK
+        if not _batches.has(command_id):
+                return _websocket_server.send_response(client_id, response)
+
+        var batch: Dictionary = _batches[command_id]
+        _batches.erase(command_id)
+        var index: int = batch["results"].size()
+        batch["results"].append(_batch_item(batch["commands"][index], response))
+        if response.get("status", "") != "success":
+                batch["failed"] += 1
+                if batch["stop_on_error"]:
+                        batch["stopped"] = true
+        if not batch["dispatching"]:
+                _advance_batch(batch)
+        return OK
+
+# Runs across frames; send_response() returns as soon as the first chunk is out.
+func _stream_response(client_id: int, command_id: String, result, chunk_size: int) -> void:
+        var server = _websocket_server
+        var send := func(frame: Dictionary) -> int:
+                return server.send_response(client_id, frame)
+        var stream := MCPResponseStream.new(get_tree(), send, command_id, chunk_size)
+        var error: int = await stream.send(result)
+        _log("Streamed response", "_stream_response", 384, {
+                "client_id": client_id,
+                "command_id": command_id,
+                "chunks": stream.chunk_count(),
+                "chunk_size": chunk_size,
+                "error_code": error
+        }, error != OK)
 
 func _on_command_completed(client_id: int, command_type: String, result: Dictionary, command_id: String, processor: MCPBaseCommandProcessor) -> void:
         _log("Processor completed command", "_on_command_completed", 162, {
@@ -226,7 +481,7 @@ func _send_success(client_id: int, result: Dictionary, command_id: String) -> vo
                 response["commandId"] = command_id
 
         if _websocket_server:
-                _websocket_server.send_response(client_id, response)
+                send_response(client_id, response)
                 _log("Sent success response", "_send_success", 180, {
                         "client_id": client_id,
                         "command_id": command_id
@@ -242,32 +497,13 @@ func _send_error(client_id: int, message: String, command_id: String) -> void:
                 response["commandId"] = command_id
 
         if _websocket_server:
-                _websocket_server.send_response(client_id, response)
+                send_response(client_id, response)
         _log("Error response sent", "_send_error", 196, {
                 "client_id": client_id,
                 "command_id": command_id,
-                "message": message
+                "error_message": message
         }, true)
 
 func _log(message: String, function_name: String, line_number: int, extra: Dictionary = {}, is_error: bool = false) -> void:
-        var log_entry := {
-                "filename": LOG_FILENAME,
-                "timestamp": Time.get_datetime_string_from_system(),
-                "classname": "MCPCommandHandler",
-                "function": function_name,
-                "system_section": LOG_SECTION,
-                "line_num": line_number,
-                "error": is_error,
-                "db_phase": "none",
-                "method": "NONE",
-                "message": message
-        }
-
-        for key in extra.keys():
-                log_entry[key] = extra[key]
-
-        print(JSON.stringify(log_entry))
-        var derived_message := "[Continuous skepticism (Sherlock Protocol)] %s" % message
-        if extra.size() > 0:
-                derived_message += " | " + JSON.stringify(extra)
-        print(derived_message)
+        var log_level := MCPLogger.Level.ERROR if is_error else MCPLogger.Level.INFO
+        MCPLogger.record(log_level, LOG_SECTION, LOG_FILENAME, "MCPCommandHandler", function_name, message, extra, line_number)
@@ -6,6 +6,17 @@ const LOG_FILENAME := "addons/godot_mcp/commands/animation_commands.gd"
 const DEFAULT_SYSTEM_SECTION := "animation_commands"
 const SceneTransactionManager := MCPSceneTransactionManager
 
+const SUPPORTED_COMMANDS := [
+	"list_animation_players",
+	"describe_animation_tracks",
+	"describe_animation_state_machines",
+	"edit_animation",
+	"configure_animation_tree",
+	"bake_skeleton_pose",
+	"generate_tween_sequence",
+	"sync_particles_with_animation",
+]
+
 func process_command(client_id: int, command_type: String, params: Dictionary, command_id: String) -> bool:
 	match command_type:
 		"list_animation_players":
@@ -1685,22 +1696,5 @@ func _path_to_string(node: Node) -> String:
 	return str(node_path)
 
 func _log(message: String, function_name: String, extra: Dictionary = {}, is_error: bool = false) -> void:
-	var payload := {
-		"filename": LOG_FILENAME,
-		"timestamp": Time.get_datetime_string_from_system(true, true),
-		"classname": "MCPAnimationCommands",
-		"function": function_name,
-		"system_section": extra.get("system_section", DEFAULT_SYSTEM_SECTION),
-		"line_num": extra.get("line_num", 0),
-		"error": is_error ? message : "",
-		"db_phase": extra.get("db_phase", "none"),
-		"method": extra.get("method", "NONE"),
-		"message": message,
-	}
-
-	for key in extra.keys():
-		if not payload.has(key):
-			payload[key] = extra[key]
-
-	print(JSON.stringify(payload))
-	print("[Continuous skepticism (Sherlock Protocol)] %s" % message)
+	var log_level := MCPLogger.Level.ERROR if is_error else MCPLogger.Level.INFO
+	MCPLogger.record(log_level, extra.get("system_section", DEFAULT_SYSTEM_SECTION), LOG_FILENAME, "MCPAnimationCommands", function_name, message, extra)
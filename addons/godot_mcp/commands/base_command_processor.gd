@@ -9,6 +9,13 @@ signal command_completed(client_id, command_type, result, command_id)
 var _websocket_server = null
 
 
+# Command types this processor handles.  Subclasses declare them in a
+# SUPPORTED_COMMANDS constant so the command handler can route by lookup;
+# a processor without one is offered every command the table does not know.
+func get_supported_commands() -> PackedStringArray:
+	return PackedStringArray(get_script().get_script_constant_map().get("SUPPORTED_COMMANDS", []))
+
+
 # Must be implemented by subclasses
 func process_command(
 	client_id: int, command_type: String, params: Dictionary, command_id: String
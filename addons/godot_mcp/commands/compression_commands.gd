@@ -5,6 +5,13 @@ extends MCPBaseCommandProcessor
 const LOG_FILENAME := "addons/godot_mcp/commands/compression_commands.gd"
 const DEFAULT_SYSTEM_SECTION := "compression_commands"
 
+const SUPPORTED_COMMANDS := [
+	"configure_texture_compression",
+	"batch_reimport_textures",
+	"create_texture_import_preset",
+	"list_texture_compression_settings",
+]
+
 func process_command(client_id: int, command_type: String, params: Dictionary, command_id: String) -> bool:
 	match command_type:
 		"configure_texture_compression":
@@ -22,21 +29,7 @@ func process_command(client_id: int, command_type: String, params: Dictionary, c
 	return false
 
 func _log_event(action: String, message: String, context := {}):
-	var entry := {
-		"filename": LOG_FILENAME,
-		"timestamp": Time.get_datetime_string_from_system(),
-		"classname": "MCPCompressionCommands",
-		"function": action,
-		"system_section": DEFAULT_SYSTEM_SECTION,
-		"line_num": 0,
-		"error": false,
-		"db_phase": "none",
-		"method": "NONE",
-		"message": message,
-		"context": context,
-	}
-	print(JSON.stringify(entry))
-	print("[Continuous skepticism (Sherlock Protocol)]", message)
+	MCPLogger.record(MCPLogger.Level.INFO, DEFAULT_SYSTEM_SECTION, LOG_FILENAME, "MCPCompressionCommands", action, message, {"context": context})
 
 func _configure_texture_compression(client_id: int, params: Dictionary, command_id: String) -> void:
 	var platform := params.get("platform", "")
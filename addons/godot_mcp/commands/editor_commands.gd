@@ -8,6 +8,17 @@ const SNAPSHOT_MAX_DEPTH_LIMIT := 6
 const SNAPSHOT_PROPERTY_LIMIT_DEFAULT := 32
 const SNAPSHOT_USAGE_MASK := PROPERTY_USAGE_STORAGE | PROPERTY_USAGE_SCRIPT_VARIABLE
 
+const SUPPORTED_COMMANDS := [
+	"get_editor_state",
+	"get_selected_node",
+	"create_resource",
+	"get_ui_theme_summary",
+	"run_godot_headless",
+	"capture_editor_profile",
+	"manage_editor_plugins",
+	"snapshot_scene_state",
+]
+
 
 func process_command(client_id: int, command_type: String, params: Dictionary, command_id: String) -> bool:
 	match command_type:
@@ -604,17 +615,37 @@ func _snapshot_scene_state(client_id: int, params: Dictionary, command_id: Strin
 		_log("No edited scene available for snapshot", function_name, log_context, true)
 		return _send_error(client_id, "No edited scene available for snapshot", command_id)
 
-	var snapshot := _build_scene_snapshot(root, {
+	var options := {
 		"include_internal": include_internal,
 		"include_resources": include_resources,
 		"max_properties": max_properties,
 		"node_limit": node_limit,
 		"max_depth": max_depth,
-	})
+	}
+
+	# A known baseline taken with the same options answers with a delta;
+	# any other since falls back to a full snapshot that says why.
+	var baseline := {}
+	var baseline_miss := ""
+	if params.has("since"):
+		baseline = MCPSceneSnapshots.lookup(int(params["since"]))
+		baseline_miss = MCPSceneSnapshots.mismatch(baseline, root, options)
+
+	var nodes := {}
+	var snapshot: Dictionary
+	if params.has("since") and baseline_miss == "":
+		snapshot = _build_scene_delta(root, baseline, options, bool(params.get("verify", false)), nodes)
+	else:
+		snapshot = _build_scene_snapshot(root, options, nodes)
+		if baseline_miss != "":
+			snapshot["baseline_miss"] = baseline_miss
+	snapshot["snapshot_id"] = MCPSceneSnapshots.store(root, options, nodes)
 
 	log_context["line_num"] = __LINE__
 	log_context["node_count"] = snapshot.get("node_count", 0)
 	log_context["scene_path"] = snapshot.get("scene_path", "")
+	log_context["snapshot_id"] = snapshot["snapshot_id"]
+	log_context["since"] = snapshot.get("since", 0)
 	_log("Captured editor scene snapshot", function_name, log_context)
 
 	_send_success(client_id, snapshot, command_id)
@@ -687,10 +718,8 @@ func _build_plugin_entry(plugin_cfg_path: String, cfg: ConfigFile, is_enabled: b
 	return entry
 
 
-func _build_scene_snapshot(root: Node, options: Dictionary) -> Dictionary:
-	var include_internal: bool = options.get("include_internal", false)
-	var include_resources: bool = options.get("include_resources", true)
-	var max_properties: int = options.get("max_properties", SNAPSHOT_PROPERTY_LIMIT_DEFAULT)
+# Fills node_map with path -> entry for every captured node.
+func _build_scene_snapshot(root: Node, options: Dictionary, node_map: Dictionary) -> Dictionary:
 	var node_limit: int = options.get("node_limit", 0)
 	var max_depth: int = options.get("max_depth", 3)
 
@@ -703,49 +732,9 @@ func _build_scene_snapshot(root: Node, options: Dictionary) -> Dictionary:
 		var node: Node = current["node"]
 		var depth: int = current["depth"]
 
-		var node_entry := {
-			"path": str(node.get_path()),
-			"name": node.name,
-			"type": node.get_class(),
-			"child_count": node.get_child_count(),
-			"depth": depth,
-		}
-
-		if node.owner != null:
-			node_entry["owner_path"] = str(node.owner.get_path())
-		if node.scene_file_path != "":
-			node_entry["scene_file_path"] = node.scene_file_path
-
-		var groups := node.get_groups()
-		if groups.size() > 0:
-			node_entry["groups"] = groups
-
-		var script := node.get_script()
-		if script and include_resources:
-			node_entry["script"] = _serialize_resource(script)
-
-		var properties := {}
-		var captured := 0
-		for property in node.get_property_list():
-			var property_name := String(property.get("name", ""))
-			if property_name.is_empty():
-				continue
-			if not include_internal and property_name.begins_with("_"):
-				continue
-			var usage := int(property.get("usage", 0))
-			if usage & SNAPSHOT_USAGE_MASK == 0:
-				continue
-			if max_properties > 0 and captured >= max_properties:
-				break
-
-			var property_value = node.get(property_name)
-			properties[property_name] = _serialize_snapshot_value(property_value, include_resources, 0, max_depth)
-			captured += 1
-
-		if not properties.is_empty():
-			node_entry["properties"] = properties
-
+		var node_entry := _build_snapshot_entry(node, depth, options)
 		nodes.append(node_entry)
+		node_map[node_entry["path"]] = node_entry
 		processed += 1
 
 		if node_limit > 0 and processed >= node_limit:
@@ -765,6 +754,115 @@ func _build_scene_snapshot(root: Node, options: Dictionary) -> Dictionary:
 	}
 
 
+# Changes since baseline, filling node_map like _build_scene_snapshot.  Only
+# the nodes the baseline saw change are serialized again, unless its changes
+# were not tracked, verify asks for a full comparison, or node_limit makes
+# the captured set depend on the whole tree.
+func _build_scene_delta(root: Node, baseline: Dictionary, options: Dictionary, verify: bool, node_map: Dictionary) -> Dictionary:
+	var max_depth: int = options.get("max_depth", 3)
+	var updates := {}
+	var compared := "tracked"
+
+	if verify or baseline["untracked"] or int(options.get("node_limit", 0)) > 0:
+		compared = "all"
+		_build_scene_snapshot(root, options, updates)
+		for path in baseline["nodes"]:
+			if not updates.has(path):
+				updates[path] = null
+	else:
+		var targets := {}
+		for path in baseline["dirty"]:
+			var node := root.get_node_or_null(NodePath(path))
+			if node == null or not (node == root or root.is_ancestor_of(node)):
+				targets[path] = null
+			elif node is Control and node != root:
+				# Containers and anchors lay out siblings and children too.
+				var parent := node.get_parent()
+				_collect_snapshot_targets(parent, _snapshot_depth(root, parent), max_depth, targets)
+			else:
+				targets[path] = node
+		for path in targets:
+			var node = targets[path]
+			var depth := -1 if node == null else _snapshot_depth(root, node)
+			updates[path] = null if depth < 0 or depth > max_depth else _build_snapshot_entry(node, depth, options)
+
+	var changes := MCPSceneSnapshots.apply(baseline, updates)
+	node_map.merge(changes["nodes"])
+	return {
+		"scene_path": root.scene_file_path,
+		"captured_at": Time.get_datetime_string_from_system(true, true),
+		"since": baseline["id"],
+		"compared": compared,
+		"node_count": node_map.size(),
+		"added": changes["added"],
+		"removed": changes["removed"],
+		"changed": changes["changed"],
+	}
+
+
+func _collect_snapshot_targets(node: Node, depth: int, max_depth: int, targets: Dictionary) -> void:
+	if depth > max_depth:
+		return
+	targets[str(node.get_path())] = node
+	for child in node.get_children():
+		_collect_snapshot_targets(child, depth + 1, max_depth, targets)
+
+
+func _snapshot_depth(root: Node, node: Node) -> int:
+	return 0 if node == root else root.get_path_to(node).get_name_count()
+
+
+func _build_snapshot_entry(node: Node, depth: int, options: Dictionary) -> Dictionary:
+	var include_internal: bool = options.get("include_internal", false)
+	var include_resources: bool = options.get("include_resources", true)
+	var max_properties: int = options.get("max_properties", SNAPSHOT_PROPERTY_LIMIT_DEFAULT)
+	var max_depth: int = options.get("max_depth", 3)
+
+	var node_entry := {
+		"path": str(node.get_path()),
+		"name": node.name,
+		"type": node.get_class(),
+		"child_count": node.get_child_count(),
+		"depth": depth,
+	}
+
+	if node.owner != null:
+		node_entry["owner_path"] = str(node.owner.get_path())
+	if node.scene_file_path != "":
+		node_entry["scene_file_path"] = node.scene_file_path
+
+	var groups := node.get_groups()
+	if groups.size() > 0:
+		node_entry["groups"] = groups
+
+	var script := node.get_script()
+	if script and include_resources:
+		node_entry["script"] = _serialize_resource(script)
+
+	var properties := {}
+	var captured := 0
+	for property in node.get_property_list():
+		var property_name := String(property.get("name", ""))
+		if property_name.is_empty():
+			continue
+		if not include_internal and property_name.begins_with("_"):
+			continue
+		var usage := int(property.get("usage", 0))
+		if usage & SNAPSHOT_USAGE_MASK == 0:
+			continue
+		if max_properties > 0 and captured >= max_properties:
+			break
+
+		var property_value = node.get(property_name)
+		properties[property_name] = _serialize_snapshot_value(property_value, include_resources, 0, max_depth)
+		captured += 1
+
+	if not properties.is_empty():
+		node_entry["properties"] = properties
+
+	return node_entry
+
+
 func _serialize_snapshot_value(value, include_resources: bool, depth: int, max_depth: int):
 	if depth > max_depth:
 		return null
@@ -824,22 +922,5 @@ func _serialize_resource(resource) -> Dictionary:
 	}
 
 func _log(message: String, function_name: String, extra: Dictionary = {}, is_error: bool = false) -> void:
-	var payload := {
-		"filename": LOG_FILENAME,
-		"timestamp": Time.get_datetime_string_from_system(true, true),
-		"classname": "MCPEditorCommands",
-		"function": function_name,
-		"system_section": extra.get("system_section", DEFAULT_SYSTEM_SECTION),
-		"line_num": extra.get("line_num", 0),
-		"error": is_error ? message : "",
-		"db_phase": extra.get("db_phase", "none"),
-		"method": extra.get("method", "NONE"),
-		"message": message,
-	}
-
-	for key in extra.keys():
-		if not payload.has(key):
-			payload[key] = extra[key]
-
-	print(JSON.stringify(payload))
-	print("[Continuous skepticism (Sherlock Protocol)] %s" % message)
+	var log_level := MCPLogger.Level.ERROR if is_error else MCPLogger.Level.INFO
+	MCPLogger.record(log_level, extra.get("system_section", DEFAULT_SYSTEM_SECTION), LOG_FILENAME, "MCPEditorCommands", function_name, message, extra)
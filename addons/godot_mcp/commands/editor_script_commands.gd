@@ -2,6 +2,10 @@
 class_name MCPEditorScriptCommands
 extends MCPBaseCommandProcessor
 
+const SUPPORTED_COMMANDS := [
+	"execute_editor_script",
+]
+
 func process_command(client_id: int, command_type: String, params: Dictionary, command_id: String) -> bool:
 	match command_type:
 		"execute_editor_script":
@@ -140,6 +144,9 @@ func _on_script_execution_completed(script_node: Node, client_id: int, command_i
 	remove_child(script_node)
 	script_node.queue_free()
 	
+	# The script may have edited the scene without telling anyone
+	MCPSceneSnapshots.mark_untracked()
+	
 	# Build the response
 	var result_data = {
 		"success": error_message.is_empty(),
@@ -5,6 +5,13 @@ extends MCPBaseCommandProcessor
 const LOG_FILENAME := "addons/godot_mcp/commands/multiplayer_commands.gd"
 const DEFAULT_SYSTEM_SECTION := "multiplayer_commands"
 
+const SUPPORTED_COMMANDS := [
+	"get_multiplayer_state",
+	"create_multiplayer_peer",
+	"teardown_multiplayer_peer",
+	"spawn_multiplayer_scene",
+]
+
 func process_command(client_id: int, command_type: String, params: Dictionary, command_id: String) -> bool:
 	match command_type:
 		"get_multiplayer_state":
@@ -22,21 +29,7 @@ func process_command(client_id: int, command_type: String, params: Dictionary, c
 	return false
 
 func _log_event(action: String, message: String, context := {}):
-	var entry := {
-		"filename": LOG_FILENAME,
-		"timestamp": Time.get_datetime_string_from_system(),
-		"classname": "MCPMultiplayerCommands",
-		"function": action,
-		"system_section": DEFAULT_SYSTEM_SECTION,
-		"line_num": 0,
-		"error": false,
-		"db_phase": "none",
-		"method": "NONE",
-		"message": message,
-		"context": context,
-	}
-	print(JSON.stringify(entry))
-	print("[Continuous skepticism (Sherlock Protocol)]", message)
+	MCPLogger.record(MCPLogger.Level.INFO, DEFAULT_SYSTEM_SECTION, LOG_FILENAME, "MCPMultiplayerCommands", action, message, {"context": context})
 
 func _get_scene_multiplayer() -> MultiplayerAPI:
 	return get_tree().get_multiplayer()
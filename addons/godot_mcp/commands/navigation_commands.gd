@@ -6,6 +6,16 @@ const SceneTransactionManager := MCPSceneTransactionManager
 const LOG_FILENAME := "addons/godot_mcp/commands/navigation_commands.gd"
 const DEFAULT_SYSTEM_SECTION := "navigation_commands"
 
+const SUPPORTED_COMMANDS := [
+	"list_navigation_maps",
+	"list_navigation_agents",
+	"bake_navigation_region",
+	"update_navigation_region",
+	"update_navigation_resource",
+	"update_navigation_agent",
+	"synchronize_navmesh_with_tilemap",
+]
+
 func process_command(client_id: int, command_type: String, params: Dictionary, command_id: String) -> bool:
 	match command_type:
 		"list_navigation_maps":
@@ -650,22 +660,5 @@ func _has_property(target: Object, property_name: String) -> bool:
 	return false
 
 func _log(message: String, function_name: String, extra: Dictionary = {}, is_error: bool = false) -> void:
-	var payload := {
-		"filename": LOG_FILENAME,
-		"timestamp": Time.get_datetime_string_from_system(true, true),
-		"classname": "MCPNavigationCommands",
-		"function": function_name,
-		"system_section": extra.get("system_section", DEFAULT_SYSTEM_SECTION),
-		"line_num": extra.get("line_num", 0),
-		"error": is_error ? message : "",
-		"db_phase": extra.get("db_phase", "none"),
-		"method": extra.get("method", "NONE"),
-		"message": message,
-	}
-
-	for key in extra.keys():
-		if not payload.has(key):
-			payload[key] = extra[key]
-
-	print(JSON.stringify(payload))
-	print("[Continuous skepticism (Sherlock Protocol)] %s" % message)
+	var log_level := MCPLogger.Level.ERROR if is_error else MCPLogger.Level.INFO
+	MCPLogger.record(log_level, extra.get("system_section", DEFAULT_SYSTEM_SECTION), LOG_FILENAME, "MCPNavigationCommands", function_name, message, extra)
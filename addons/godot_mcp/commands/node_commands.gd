@@ -7,6 +7,24 @@ const ScriptUtils := preload("res://addons/godot_mcp/utils/script_utils.gd")
 const LOG_FILENAME := "addons/godot_mcp/commands/node_commands.gd"
 const DEFAULT_SYSTEM_SECTION := "node_commands"
 
+const SUPPORTED_COMMANDS := [
+	"create_node",
+	"delete_node",
+	"update_node_property",
+	"get_node_properties",
+	"list_nodes",
+	"rename_node",
+	"add_node_to_group",
+	"remove_node_from_group",
+	"configure_camera2d_limits",
+	"list_node_groups",
+	"list_nodes_in_group",
+	"create_theme_override",
+	"wire_signal_handler",
+	"layout_ui_grid",
+	"validate_accessibility",
+]
+
 func process_command(client_id: int, command_type: String, params: Dictionary, command_id: String) -> bool:
 	match command_type:
 		"create_node":
@@ -2450,22 +2468,5 @@ func _is_interactive_control(control: Control) -> bool:
 
 
 func _log(message: String, function_name: String, extra: Dictionary = {}, is_error: bool = false) -> void:
-	var payload := {
-		"filename": LOG_FILENAME,
-		"timestamp": Time.get_datetime_string_from_system(true, true),
-		"classname": "MCPNodeCommands",
-		"function": function_name,
-		"system_section": extra.get("system_section", DEFAULT_SYSTEM_SECTION),
-		"line_num": extra.get("line_num", 0),
-		"error": is_error ? message : "",
-		"db_phase": extra.get("db_phase", "none"),
-		"method": extra.get("method", "NONE"),
-		"message": message,
-	}
-
-	for key in extra.keys():
-		if not payload.has(key):
-			payload[key] = extra[key]
-
-	print(JSON.stringify(payload))
-	print("[Continuous skepticism (Sherlock Protocol)] %s" % message)
+	var log_level := MCPLogger.Level.ERROR if is_error else MCPLogger.Level.INFO
+	MCPLogger.record(log_level, extra.get("system_section", DEFAULT_SYSTEM_SECTION), LOG_FILENAME, "MCPNodeCommands", function_name, message, extra)
@@ -23,6 +23,33 @@ const PROJECT_SETTING_DENYLIST := [
 	"editor_plugins/",
 ]
 
+# list_project_resources groups files by extension into these categories.
+const RESOURCE_CATEGORIES := {
+	"scenes": ["tscn", "scn"],
+	"scripts": ["gd", "cs"],
+	"textures": ["png", "jpg", "jpeg"],
+	"audio": ["wav", "ogg", "mp3"],
+	"models": ["obj", "glb", "gltf"],
+	"resources": ["tres", "res"],
+}
+
+const SUPPORTED_COMMANDS := [
+	"get_project_info",
+	"list_project_files",
+	"get_project_structure",
+	"get_project_settings",
+	"list_project_resources",
+	"list_input_actions",
+	"add_input_action",
+	"remove_input_action",
+	"add_input_event_to_action",
+	"remove_input_event_from_action",
+	"list_audio_buses",
+	"configure_audio_bus",
+	"configure_input_action_context",
+	"configure_project_setting",
+]
+
 func process_command(client_id: int, command_type: String, params: Dictionary, command_id: String) -> bool:
 	match command_type:
 		"get_project_info":
@@ -184,85 +211,32 @@ func _get_project_info(client_id: int, _params: Dictionary, command_id: String)
 	}, command_id)
 
 func _list_project_files(client_id: int, params: Dictionary, command_id: String) -> void:
-	var extensions = params.get("extensions", [])
-	var files = []
-	
-	# Get all files with the specified extensions
-	var dir = DirAccess.open("res://")
-	if dir:
-		_scan_directory(dir, "", extensions, files)
-	else:
-		return _send_error(client_id, "Failed to open res:// directory", command_id)
-	
-	_send_success(client_id, {
-		"files": files
-	}, command_id)
-
-func _scan_directory(dir: DirAccess, path: String, extensions: Array, files: Array) -> void:
-	dir.list_dir_begin()
-	var file_name = dir.get_next()
-	
-	while file_name != "":
-		if dir.current_is_dir():
-			var subdir = DirAccess.open("res://" + path + file_name)
-			if subdir:
-				_scan_directory(subdir, path + file_name + "/", extensions, files)
-		else:
-			var file_path = path + file_name
-			var has_valid_extension = extensions.is_empty()
-			
-			for ext in extensions:
-				if file_name.ends_with(ext):
-					has_valid_extension = true
-					break
-			
-			if has_valid_extension:
-				files.append("res://" + file_path)
-		
-		file_name = dir.get_next()
+	if not MCPFileIndex.ensure_ready():
+		return _send_error(client_id, "Editor file system is not available", command_id)
 	
-	dir.list_dir_end()
+	var extensions = params.get("extensions", [])
+	if typeof(extensions) != TYPE_ARRAY:
+		extensions = [extensions]
+	var result := MCPFileIndex.query(
+		extensions,
+		str(params.get("directory", MCPFileIndex.ROOT)),
+		str(params.get("type", "")),
+		int(params.get("offset", 0)),
+		int(params.get("limit", 0))
+	)
+	_send_success(client_id, result, command_id)
 
 func _get_project_structure(client_id: int, params: Dictionary, command_id: String) -> void:
-	var structure = {
-		"directories": [],
-		"file_counts": {},
-		"total_files": 0
-	}
-	
-	var dir = DirAccess.open("res://")
-	if dir:
-		_analyze_project_structure(dir, "", structure)
-	else:
-		return _send_error(client_id, "Failed to open res:// directory", command_id)
+	if not MCPFileIndex.ensure_ready():
+		return _send_error(client_id, "Editor file system is not available", command_id)
 	
+	var structure := MCPFileIndex.structure(
+		str(params.get("directory", MCPFileIndex.ROOT)),
+		int(params.get("offset", 0)),
+		int(params.get("limit", 0))
+	)
 	_send_success(client_id, structure, command_id)
 
-func _analyze_project_structure(dir: DirAccess, path: String, structure: Dictionary) -> void:
-	dir.list_dir_begin()
-	var file_name = dir.get_next()
-	
-	while file_name != "":
-		if dir.current_is_dir():
-			var dir_path = path + file_name + "/"
-			structure["directories"].append("res://" + dir_path)
-			
-			var subdir = DirAccess.open("res://" + dir_path)
-			if subdir:
-				_analyze_project_structure(subdir, dir_path, structure)
-		else:
-			structure["total_files"] += 1
-			
-			var extension = file_name.get_extension()
-			if extension in structure["file_counts"]:
-				structure["file_counts"][extension] += 1
-			else:
-				structure["file_counts"][extension] = 1
-		
-		file_name = dir.get_next()
-	
-	dir.list_dir_end()
-
 func _get_project_settings(client_id: int, params: Dictionary, command_id: String) -> void:
 	# Get relevant project settings
 	var settings = {
@@ -298,21 +272,31 @@ func _get_project_settings(client_id: int, params: Dictionary, command_id: Strin
 	_send_success(client_id, settings, command_id)
 
 func _list_project_resources(client_id: int, params: Dictionary, command_id: String) -> void:
-	var resources = {
-		"scenes": [],
-		"scripts": [],
-		"textures": [],
-		"audio": [],
-		"models": [],
-		"resources": []
-	}
-
-	var dir = DirAccess.open("res://")
-	if dir:
-		_scan_resources(dir, "", resources)
-	else:
-		return _send_error(client_id, "Failed to open res:// directory", command_id)
-
+	if not MCPFileIndex.ensure_ready():
+		return _send_error(client_id, "Editor file system is not available", command_id)
+	
+	var categories = params.get("categories", RESOURCE_CATEGORIES.keys())
+	if typeof(categories) != TYPE_ARRAY:
+		categories = [categories]
+	var directory := str(params.get("directory", MCPFileIndex.ROOT))
+	var offset := int(params.get("offset", 0))
+	var limit := int(params.get("limit", 0))
+	
+	var resources := {}
+	var totals := {}
+	var next_offsets := {}
+	for category in categories:
+		if not RESOURCE_CATEGORIES.has(category):
+			return _send_error(client_id, "Unknown resource category: %s" % category, command_id)
+		var page := MCPFileIndex.query(RESOURCE_CATEGORIES[category], directory, "", offset, limit)
+		resources[category] = page["files"]
+		totals[category] = page["total"]
+		if page.has("next_offset"):
+			next_offsets[category] = page["next_offset"]
+	
+	resources["totals"] = totals
+	if not next_offsets.is_empty():
+		resources["next_offsets"] = next_offsets
 	_send_success(client_id, resources, command_id)
 
 func _list_audio_buses(client_id: int, _params: Dictionary, command_id: String) -> void:
@@ -663,36 +647,6 @@ func _remove_input_event_from_action(client_id: int, params: Dictionary, command
 		"persistent": persistent,
 	}, command_id)
 
-func _scan_resources(dir: DirAccess, path: String, resources: Dictionary) -> void:
-	dir.list_dir_begin()
-	var file_name = dir.get_next()
-
-	while file_name != "":
-		if dir.current_is_dir():
-			var subdir = DirAccess.open("res://" + path + file_name)
-			if subdir:
-				_scan_resources(subdir, path + file_name + "/", resources)
-		else:
-			var file_path = "res://" + path + file_name
-			
-			# Categorize by extension
-			if file_name.ends_with(".tscn") or file_name.ends_with(".scn"):
-				resources["scenes"].append(file_path)
-			elif file_name.ends_with(".gd") or file_name.ends_with(".cs"):
-				resources["scripts"].append(file_path)
-			elif file_name.ends_with(".png") or file_name.ends_with(".jpg") or file_name.ends_with(".jpeg"):
-				resources["textures"].append(file_path)
-			elif file_name.ends_with(".wav") or file_name.ends_with(".ogg") or file_name.ends_with(".mp3"):
-				resources["audio"].append(file_path)
-			elif file_name.ends_with(".obj") or file_name.ends_with(".glb") or file_name.ends_with(".gltf"):
-				resources["models"].append(file_path)
-			elif file_name.ends_with(".tres") or file_name.ends_with(".res"):
-				resources["resources"].append(file_path)
-		
-		file_name = dir.get_next()
-	
-dir.list_dir_end()
-
 func _serialize_input_event(event: InputEvent) -> Dictionary:
 	var data := {
 		"type": event.get_class(),
@@ -1051,22 +1005,5 @@ func _are_variants_equal(a, b) -> bool:
 
 
 func _log(message: String, function_name: String, extra: Dictionary = {}, is_error: bool = false) -> void:
-	var payload := {
-		"filename": LOG_FILENAME,
-		"timestamp": Time.get_datetime_string_from_system(true, true),
-		"classname": "MCPProjectCommands",
-		"function": function_name,
-		"system_section": extra.get("system_section", DEFAULT_SYSTEM_SECTION),
-		"line_num": extra.get("line_num", 0),
-		"error": is_error ? message : "",
-		"db_phase": extra.get("db_phase", "none"),
-		"method": extra.get("method", "NONE"),
-		"message": message,
-	}
-
-	for key in extra.keys():
-		if not payload.has(key):
-			payload[key] = extra[key]
-
-	print(JSON.stringify(payload))
-	print("[Continuous skepticism (Sherlock Protocol)] %s" % message)
+	var log_level := MCPLogger.Level.ERROR if is_error else MCPLogger.Level.INFO
+	MCPLogger.record(log_level, extra.get("system_section", DEFAULT_SYSTEM_SECTION), LOG_FILENAME, "MCPProjectCommands", function_name, message, extra)
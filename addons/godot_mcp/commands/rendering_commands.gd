@@ -7,6 +7,15 @@ const DEFAULT_SYSTEM_SECTION := "rendering_commands"
 
 const SceneTransactionManager := MCPSceneTransactionManager
 
+const SUPPORTED_COMMANDS := [
+	"generate_material_variant",
+	"compile_shader_preview",
+	"unwrap_lightmap_uv2",
+	"optimize_mesh_lods",
+	"configure_environment",
+	"preview_environment_sun_settings",
+]
+
 func process_command(client_id: int, command_type: String, params: Dictionary, command_id: String) -> bool:
 	match command_type:
 		"generate_material_variant":
@@ -30,28 +39,18 @@ func process_command(client_id: int, command_type: String, params: Dictionary, c
 	return false
 
 func _log(message: String, function_name: String, context: Dictionary = {}, is_error: bool = false) -> void:
-	var entry := {
-		"filename": LOG_FILENAME,
-		"timestamp": Time.get_datetime_string_from_system(),
-		"classname": "MCPRenderingCommands",
-		"function": function_name,
-		"system_section": context.get("system_section", DEFAULT_SYSTEM_SECTION),
-		"line_num": context.get("line_num", 0),
-		"error": is_error,
-		"db_phase": "none",
-		"method": "NONE",
-		"message": message,
-	}
+	var log_level := MCPLogger.Level.ERROR if is_error else MCPLogger.Level.INFO
+	if not MCPLogger.enabled(log_level):
+		return
 
-	if context.has("system_section"):
-		context.erase("system_section")
-	if context.has("line_num"):
-		context.erase("line_num")
+	var section: String = context.get("system_section", DEFAULT_SYSTEM_SECTION)
+	var line_number: int = context.get("line_num", 0)
+	context.erase("system_section")
+	context.erase("line_num")
+	var extra := {}
 	if not context.is_empty():
-		entry["context"] = context
-
-	print(JSON.stringify(entry))
-	print("[Continuous skepticism (Sherlock Protocol)]", message)
+		extra["context"] = context
+	MCPLogger.record(log_level, section, LOG_FILENAME, "MCPRenderingCommands", function_name, message, extra, line_number)
 
 func _generate_material_variant(client_id: int, params: Dictionary, command_id: String) -> void:
 	var source_path := params.get("source_material", "")
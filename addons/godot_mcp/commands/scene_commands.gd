@@ -69,11 +69,45 @@ const AUDIO_STREAM_PLAYER_TYPES := [
 	"AudioStreamPlayerMicrophone",
 ]
 
+const GRIDMAP_LISTED_CHANGES := 100
+const MAX_ENVELOPE_BINS := 65536
+const DEFAULT_SILENCE_THRESHOLD := 0.0005
+
+const SCENE_STATE_FIELDS := ["name", "type", "path", "parent", "depth", "index", "groups", "instance", "properties"]
+
+const SUPPORTED_COMMANDS := [
+	"save_scene",
+	"open_scene",
+	"get_current_scene",
+	"get_scene_structure",
+	"get_physics_world_snapshot",
+	"create_scene",
+	"begin_scene_transaction",
+	"commit_scene_transaction",
+	"rollback_scene_transaction",
+	"list_scene_transactions",
+	"configure_physics_body",
+	"configure_physics_area",
+	"configure_physics_joint",
+	"link_joint_bodies",
+	"rebuild_physics_shapes",
+	"profile_physics_step",
+	"author_audio_stream_player",
+	"author_interactive_music_graph",
+	"generate_dynamic_music_layer",
+	"analyze_waveform",
+	"batch_import_audio_assets",
+	"configure_csg_shape",
+	"configure_material_resource",
+	"paint_gridmap_cells",
+	"clear_gridmap_cells",
+]
+
 func process_command(client_id: int, command_type: String, params: Dictionary, command_id: String) -> bool:
-match command_type:
-"save_scene":
-_save_scene(client_id, params, command_id)
-return true
+	match command_type:
+		"save_scene":
+			_save_scene(client_id, params, command_id)
+			return true
 		"open_scene":
 			_open_scene(client_id, params, command_id)
 			return true
@@ -143,10 +177,10 @@ return true
 		"paint_gridmap_cells":
 			_paint_gridmap_cells(client_id, params, command_id)
 			return true
-"clear_gridmap_cells":
-_clear_gridmap_cells(client_id, params, command_id)
-return true
-return false  # Command not handled
+		"clear_gridmap_cells":
+			_clear_gridmap_cells(client_id, params, command_id)
+			return true
+	return false  # Command not handled
 
 func _save_scene(client_id: int, params: Dictionary, command_id: String) -> void:
 	var path = params.get("path", "")
@@ -266,11 +300,33 @@ func _get_scene_structure(client_id: int, params: Dictionary, command_id: String
 	if not FileAccess.file_exists(path):
 		return _send_error(client_id, "Scene file not found: " + path, command_id)
 	
-	# Load the scene to analyze its structure
-	var packed_scene = load(path)
+	var mode := str(params.get("mode", "instance"))
+	if mode != "instance" and mode != "state":
+		return _send_error(client_id, "mode must be 'instance' or 'state'", command_id)
+	
+	var stamp := MCPResultCache.file_stamp(path)
+	var cache_key := "get_scene_structure:%s:%s" % [path, JSON.stringify(params, "", true)]
+	var cached = MCPResultCache.lookup(cache_key, stamp)
+	if cached != null:
+		return _send_success(client_id, cached, command_id)
+	
+	# Load the scene to analyze its structure.  Loading still loads the
+	# scene's external resources (scripts, textures, instanced scenes), but
+	# reuses the ones the editor already holds.
+	var packed_scene = ResourceLoader.load(path, "", ResourceLoader.CACHE_MODE_REUSE)
 	if not packed_scene:
 		return _send_error(client_id, "Failed to load scene: " + path, command_id)
 	
+	if mode == "state":
+		if not packed_scene is PackedScene:
+			return _send_error(client_id, "Not a PackedScene: " + path, command_id)
+		var listing = _get_scene_state_structure(packed_scene.get_state(), params)
+		if typeof(listing) == TYPE_STRING:
+			return _send_error(client_id, listing, command_id)
+		listing["path"] = path
+		MCPResultCache.store(cache_key, path, stamp, listing)
+		return _send_success(client_id, listing, command_id)
+	
 	# Create a temporary instance to analyze
 	var scene_instance = packed_scene.instantiate()
 	if not scene_instance:
@@ -282,11 +338,13 @@ func _get_scene_structure(client_id: int, params: Dictionary, command_id: String
 	# Clean up the temporary instance
 	scene_instance.queue_free()
 	
-	# Return the structure
-	_send_success(client_id, {
+	# The tree includes instanced child scenes, so any saved resource may change it.
+	var result := {
 		"path": path,
 		"structure": structure
-	}, command_id)
+	}
+	MCPResultCache.store(cache_key, MCPResultCache.ANY_PATH, stamp, result)
+	_send_success(client_id, result, command_id)
 
 func _get_node_structure(node: Node) -> Dictionary:
 	var structure = {
@@ -331,6 +389,80 @@ func _get_node_structure(node: Node) -> Dictionary:
 
 	return structure
 
+# Lists a scene's nodes from its SceneState, in file order, without
+# instantiating anything.  Only the requested fields are read, nodes deeper
+# than max_depth are skipped, and offset/limit page through what is left.
+# Returns an error message instead of a Dictionary for bad parameters.
+func _get_scene_state_structure(state: SceneState, params: Dictionary):
+	var max_depth := int(params.get("max_depth", -1))
+	var offset := int(params.get("offset", 0))
+	var limit := int(params.get("limit", 0))
+	if offset < 0 or limit < 0:
+		return "offset and limit cannot be negative"
+
+	var fields = params.get("fields", SCENE_STATE_FIELDS)
+	if typeof(fields) != TYPE_ARRAY and typeof(fields) != TYPE_PACKED_STRING_ARRAY:
+		return "fields must be an array of field names"
+	var wanted := {}
+	for field in fields:
+		if not SCENE_STATE_FIELDS.has(field):
+			return "Unknown field '%s'; expected one of %s" % [field, ", ".join(SCENE_STATE_FIELDS)]
+		wanted[field] = true
+
+	var nodes := []
+	var matched := 0
+	for idx in range(state.get_node_count()):
+		var node_path := state.get_node_path(idx)
+		# Node 0 is the root.  Other paths start at the root's "." (as in
+		# "./Child"), which is not a level of its own.
+		var depth := 0
+		if idx > 0:
+			for name_idx in range(node_path.get_name_count()):
+				if node_path.get_name(name_idx) != ".":
+					depth += 1
+		if max_depth >= 0 and depth > max_depth:
+			continue
+		matched += 1
+		if matched <= offset or (limit > 0 and nodes.size() >= limit):
+			continue
+
+		var entry := {}
+		if wanted.has("name"):
+			entry["name"] = String(state.get_node_name(idx))
+		if wanted.has("type"):
+			# Instanced and inherited nodes have no type of their own.
+			entry["type"] = String(state.get_node_type(idx))
+		if wanted.has("path"):
+			entry["path"] = String(node_path)
+		if wanted.has("parent") and depth > 0:
+			entry["parent"] = String(state.get_node_path(idx, true))
+		if wanted.has("depth"):
+			entry["depth"] = depth
+		if wanted.has("index"):
+			entry["index"] = state.get_node_index(idx)
+		if wanted.has("groups"):
+			entry["groups"] = Array(state.get_node_groups(idx))
+		if wanted.has("instance"):
+			var instance: PackedScene = state.get_node_instance(idx)
+			if instance != null:
+				entry["instance"] = instance.resource_path
+		if wanted.has("properties"):
+			var properties := {}
+			for prop_idx in range(state.get_node_property_count(idx)):
+				properties[String(state.get_node_property_name(idx, prop_idx))] = _serialize_variant(state.get_node_property_value(idx, prop_idx))
+			entry["properties"] = properties
+		nodes.append(entry)
+
+	var result := {
+		"mode": "state",
+		"nodes": nodes,
+		"total": matched,
+		"offset": offset,
+	}
+	if limit > 0 and offset + nodes.size() < matched:
+		result["next_offset"] = offset + nodes.size()
+	return result
+
 func _get_physics_world_snapshot(client_id: int, _params: Dictionary, command_id: String) -> void:
 	var function_name := "_get_physics_world_snapshot"
 	var log_context := {
@@ -2800,20 +2932,20 @@ func _analyze_waveform(client_id: int, params: Dictionary, command_id: String) -
 		return _send_error(client_id, "Audio resource not found: %s" % normalized_path, command_id)
 
 	var audio_resource := ResourceLoader.load(normalized_path)
-		if audio_resource == null or not (audio_resource is AudioStream):
-				context["resource_type"] = audio_resource ? audio_resource.get_class() : "null"
+	if audio_resource == null or not (audio_resource is AudioStream):
+		context["resource_type"] = audio_resource.get_class() if audio_resource else "null"
 		_log("Resource is not an AudioStream", function_name, context, true)
 		return _send_error(client_id, "Resource is not an AudioStream: %s" % normalized_path, command_id)
 
-		var audio_stream: AudioStream = audio_resource
-		var mix_rate := audio_stream.has_method("get_mix_rate") ? float(audio_stream.get_mix_rate()) : 0.0
-		var channel_count := audio_stream.has_method("get_channel_count") ? audio_stream.get_channel_count() : 0
+	var audio_stream: AudioStream = audio_resource
+	var mix_rate := float(audio_stream.get_mix_rate()) if audio_stream.has_method("get_mix_rate") else 0.0
+	var channel_count: int = audio_stream.get_channel_count() if audio_stream.has_method("get_channel_count") else 0
 	if channel_count <= 0 and _has_property(audio_stream, "stereo"):
-		channel_count = bool(audio_stream.stereo) ? 2 : 1
+		channel_count = 2 if bool(audio_stream.stereo) else 1
 	if channel_count <= 0:
 		channel_count = 1
 
-		var duration_seconds := audio_stream.has_method("get_length") ? audio_stream.get_length() : 0.0
+	var duration_seconds := audio_stream.get_length()
 	var loop_enabled := _has_property(audio_stream, "loop") and bool(audio_stream.loop)
 
 	var metadata := {
@@ -2825,189 +2957,98 @@ func _analyze_waveform(client_id: int, params: Dictionary, command_id: String) -
 		"loop": loop_enabled,
 	}
 
-	var silence_threshold := clamp(float(params.get("silence_threshold", 0.0005)), 0.000001, 0.1)
-	var envelope_bins := int(params.get("envelope_bins", 256))
-	envelope_bins = clamp(envelope_bins, 16, 4096)
+	var silence_threshold := clampf(float(params.get("silence_threshold", DEFAULT_SILENCE_THRESHOLD)), 0.000001, 0.1)
+	var envelope_bins := clampi(int(params.get("envelope_bins", 256)), 1, MAX_ENVELOPE_BINS)
+	var refresh_cache := bool(params.get("refresh_cache", false))
 	var analysis_mode := "metadata_only"
 	var limited_reason := ""
 	var sample_frames := 0
 	var total_samples := 0
 	var channel_summaries: Array = []
 	var overall_summary := {}
+	var envelope_window := {}
+	var envelope_source := {}
+	var cache_status := ""
 	var analysis_started_ms := Time.get_ticks_msec()
 
-	if audio_stream is AudioStreamSample:
-		var sample_stream: AudioStreamSample = audio_stream
-		var format := sample_stream.format
-		var pcm_supported := format == AudioStreamSample.FORMAT_8_BITS or format == AudioStreamSample.FORMAT_16_BITS
-		if not pcm_supported:
+	if audio_stream is AudioStreamWAV:
+		var wav_stream: AudioStreamWAV = audio_stream
+		if not MCPWaveformPyramid.supports(wav_stream):
 			limited_reason = "Unsupported PCM format for inline analysis"
+		elif wav_stream.data.is_empty():
+			limited_reason = "Audio stream contains no PCM frames"
 		else:
-			var data: PackedByteArray = sample_stream.data
-			if data.is_empty():
-				limited_reason = "Audio stream contains no PCM frames"
-			else:
-				analysis_mode = "pcm_samples"
-				var bytes_per_sample := format == AudioStreamSample.FORMAT_16_BITS ? 2 : 1
-				var total_values := data.size() / bytes_per_sample
-				if channel_count <= 0:
-					channel_count = sample_stream.stereo ? 2 : 1
-					if channel_count <= 0:
-						channel_count = 1
-				sample_frames = int(total_values / max(channel_count, 1))
-				total_samples = sample_frames * channel_count
-
-				if mix_rate <= 0.0 and sample_stream.mix_rate > 0:
-					mix_rate = float(sample_stream.mix_rate)
-				if duration_seconds <= 0.0 and mix_rate > 0.0:
-					duration_seconds = float(sample_frames) / mix_rate
-					metadata["length_seconds"] = duration_seconds
-				metadata["mix_rate"] = mix_rate
-				metadata["channel_count"] = channel_count
-
-				var stats: Array = []
-				var envelopes: Array = []
-				for channel_index in channel_count:
-					stats.append({
-						"min": 1.0,
-						"max": -1.0,
-						"sum": 0.0,
-						"sum_sq": 0.0,
-						"peak": 0.0,
-						"samples": 0,
-						"silent": 0,
-						"zero_crossings": 0,
-						"previous_sign": 0,
-					})
-					var bins: Array = []
-					for bin_index in envelope_bins:
-						bins.append({"min": 1.0, "max": -1.0, "samples": 0})
-					envelopes.append(bins)
-
-				var buffer := StreamPeerBuffer.new()
-				buffer.big_endian = false
-				buffer.data_array = data
-
-				var overall_peak := 0.0
-				var overall_sum := 0.0
-				var overall_sum_sq := 0.0
-
-				for frame_index in sample_frames:
-					var envelope_bin := -1
-					if envelope_bins > 0 and sample_frames > 0:
-						envelope_bin = int(floor(float(frame_index) * envelope_bins / sample_frames))
-						if envelope_bin >= envelope_bins:
-							envelope_bin = envelope_bins - 1
-
-					for channel_index in channel_count:
-						if buffer.get_position() >= buffer.get_size():
-							break
-
-						var sample_value := 0.0
-						if format == AudioStreamSample.FORMAT_16_BITS:
-							sample_value = clamp(buffer.get_16() / 32768.0, -1.0, 1.0)
-						else:
-							sample_value = (buffer.get_u8() - 128.0) / 128.0
-
-						var channel_stats: Dictionary = stats[channel_index]
-						channel_stats["samples"] += 1
-						channel_stats["sum"] += sample_value
-						channel_stats["sum_sq"] += sample_value * sample_value
-						if sample_value < channel_stats["min"]:
-							channel_stats["min"] = sample_value
-						if sample_value > channel_stats["max"]:
-							channel_stats["max"] = sample_value
-						var abs_value := abs(sample_value)
-						if abs_value > channel_stats["peak"]:
-							channel_stats["peak"] = abs_value
-						if abs_value <= silence_threshold:
-							channel_stats["silent"] += 1
-
-						var previous_sign := int(channel_stats["previous_sign"])
-						var sign := 0
-						if sample_value > silence_threshold:
-							sign = 1
-						elif sample_value < -silence_threshold:
-							sign = -1
-						if previous_sign != 0 and sign != 0 and previous_sign != sign:
-							channel_stats["zero_crossings"] += 1
-						if sign != 0:
-							channel_stats["previous_sign"] = sign
-
-						if envelope_bin >= 0:
-							var bin_stats: Dictionary = envelopes[channel_index][envelope_bin]
-							bin_stats["samples"] += 1
-							if sample_value < bin_stats["min"]:
-								bin_stats["min"] = sample_value
-							if sample_value > bin_stats["max"]:
-								bin_stats["max"] = sample_value
-							envelopes[channel_index][envelope_bin] = bin_stats
-
-						stats[channel_index] = channel_stats
-
-						if abs_value > overall_peak:
-							overall_peak = abs_value
-						overall_sum += sample_value
-						overall_sum_sq += sample_value * sample_value
-
-				var total_sample_count := max(total_samples, 1)
-				var overall_rms := sqrt(overall_sum_sq / total_sample_count)
-				var overall_mean := overall_sum / total_sample_count
-				var overall_peak_db := _amplitude_to_decibels(overall_peak)
-				var overall_rms_db := _amplitude_to_decibels(overall_rms)
-				overall_summary = {
-					"peak_amplitude": overall_peak,
-					"peak_db": overall_peak_db,
-					"rms_amplitude": overall_rms,
-					"rms_db": overall_rms_db,
-					"mean_amplitude": overall_mean,
-					"dynamic_range_db": overall_peak_db - overall_rms_db,
-				}
-
-				channel_summaries = []
-				for channel_index in channel_count:
-					var channel_stats: Dictionary = stats[channel_index]
-					var sample_count := int(channel_stats["samples"])
-					var mean_amplitude := sample_count > 0 ? channel_stats["sum"] / sample_count : 0.0
-					var rms_amplitude := sample_count > 0 ? sqrt(channel_stats["sum_sq"] / sample_count) : 0.0
-					var peak_amplitude := channel_stats["peak"]
-					var peak_db := _amplitude_to_decibels(peak_amplitude)
-					var rms_db := _amplitude_to_decibels(rms_amplitude)
-					var crest_factor := peak_db - rms_db
-					var silence_ratio := sample_count > 0 ? float(channel_stats["silent"]) / sample_count : 0.0
-					var zero_crossing_rate := 0.0
-					if duration_seconds > 0.0:
-						zero_crossing_rate = float(channel_stats["zero_crossings"]) / duration_seconds
-
-					var envelope: Array = []
-					if envelope_bins > 0:
-						for bin_stats in envelopes[channel_index]:
-							var bin_samples := int(bin_stats["samples"])
-							if bin_samples == 0:
-								envelope.append({"min": 0.0, "max": 0.0, "samples": 0})
-							else:
-								envelope.append({
-									"min": bin_stats["min"],
-									"max": bin_stats["max"],
-									"samples": bin_samples,
-								})
-
-					channel_summaries.append({
-						"channel_index": channel_index,
-						"sample_count": sample_count,
-												"min_amplitude": sample_count > 0 ? channel_stats["min"] : 0.0,
-												"max_amplitude": sample_count > 0 ? channel_stats["max"] : 0.0,
-						"peak_amplitude": peak_amplitude,
-						"peak_db": peak_db,
-						"rms_amplitude": rms_amplitude,
-						"rms_db": rms_db,
-						"mean_amplitude": mean_amplitude,
-						"crest_factor_db": crest_factor,
-						"silence_ratio": silence_ratio,
-						"zero_crossings": channel_stats["zero_crossings"],
-						"zero_crossings_per_second": zero_crossing_rate,
-						"envelope": envelope,
-					})
+			analysis_mode = "pcm_samples"
+			channel_count = 2 if wav_stream.stereo else 1
+			var fetched := MCPWaveformPyramid.fetch(normalized_path, wav_stream, silence_threshold, refresh_cache)
+			var pyramid: Dictionary = fetched["pyramid"]
+			cache_status = fetched["cache"]
+			sample_frames = pyramid["frames"]
+			total_samples = sample_frames * channel_count
+
+			if mix_rate <= 0.0 and wav_stream.mix_rate > 0:
+				mix_rate = float(wav_stream.mix_rate)
+			if duration_seconds <= 0.0 and mix_rate > 0.0:
+				duration_seconds = float(sample_frames) / mix_rate
+				metadata["length_seconds"] = duration_seconds
+			metadata["mix_rate"] = mix_rate
+			metadata["channel_count"] = channel_count
+
+			var start_frame := 0
+			var end_frame := sample_frames
+			if mix_rate > 0.0:
+				start_frame = clampi(int(float(params.get("start_seconds", 0.0)) * mix_rate), 0, sample_frames)
+				if params.has("end_seconds"):
+					end_frame = clampi(int(float(params["end_seconds"]) * mix_rate), start_frame, sample_frames)
+			var envelope := MCPWaveformPyramid.envelope(pyramid, wav_stream, start_frame, end_frame, envelope_bins)
+			envelope_source = {"level": envelope["level"], "frames_per_bin": envelope["frames_per_bin"]}
+			if mix_rate > 0.0:
+				envelope_window = {"start_seconds": start_frame / mix_rate, "end_seconds": end_frame / mix_rate}
+
+			var overall_peak := 0.0
+			var overall_mean := 0.0
+			var overall_mean_square := 0.0
+			var channel_stats: Array = MCPWaveformPyramid.summarize(pyramid, silence_threshold)
+			for channel_index in channel_count:
+				var stats: Dictionary = channel_stats[channel_index]
+				var peak_amplitude: float = stats["peak"]
+				var rms_amplitude: float = stats["rms"]
+				var peak_db := _amplitude_to_decibels(peak_amplitude)
+				var rms_db := _amplitude_to_decibels(rms_amplitude)
+				var zero_crossing_rate := 0.0
+				if duration_seconds > 0.0:
+					zero_crossing_rate = float(stats["zero_crossings"]) / duration_seconds
+				channel_summaries.append({
+					"channel_index": channel_index,
+					"sample_count": sample_frames,
+					"min_amplitude": stats["min"],
+					"max_amplitude": stats["max"],
+					"peak_amplitude": peak_amplitude,
+					"peak_db": peak_db,
+					"rms_amplitude": rms_amplitude,
+					"rms_db": rms_db,
+					"mean_amplitude": stats["mean"],
+					"crest_factor_db": peak_db - rms_db,
+					"silence_ratio": float(stats["silent"]) / maxi(sample_frames, 1),
+					"zero_crossings": stats["zero_crossings"],
+					"zero_crossings_per_second": zero_crossing_rate,
+					"envelope": envelope["channels"][channel_index],
+				})
+				overall_peak = maxf(overall_peak, peak_amplitude)
+				overall_mean += float(stats["mean"]) / channel_count
+				overall_mean_square += rms_amplitude * rms_amplitude / channel_count
+
+			var overall_rms := sqrt(overall_mean_square)
+			var overall_peak_db := _amplitude_to_decibels(overall_peak)
+			var overall_rms_db := _amplitude_to_decibels(overall_rms)
+			overall_summary = {
+				"peak_amplitude": overall_peak,
+				"peak_db": overall_peak_db,
+				"rms_amplitude": overall_rms,
+				"rms_db": overall_rms_db,
+				"mean_amplitude": overall_mean,
+				"dynamic_range_db": overall_peak_db - overall_rms_db,
+			}
 
 	var analysis_elapsed_ms := Time.get_ticks_msec() - analysis_started_ms
 
@@ -3025,6 +3066,12 @@ func _analyze_waveform(client_id: int, params: Dictionary, command_id: String) -
 		response["channel_summaries"] = channel_summaries
 	if not overall_summary.is_empty():
 		response["overall"] = overall_summary
+	if not envelope_window.is_empty():
+		response["envelope_window"] = envelope_window
+	if not envelope_source.is_empty():
+		response["envelope_source"] = envelope_source
+	if not cache_status.is_empty():
+		response["cache"] = cache_status
 	if not limited_reason.is_empty():
 		response["limited"] = true
 		response["limited_reason"] = limited_reason
@@ -3035,6 +3082,7 @@ func _analyze_waveform(client_id: int, params: Dictionary, command_id: String) -
 	context["channel_count"] = channel_count
 	context["sample_frames"] = sample_frames
 	context["analysis_duration_ms"] = analysis_elapsed_ms
+	context["cache"] = cache_status
 	if not limited_reason.is_empty():
 		context["limited_reason"] = limited_reason
 
@@ -3163,8 +3211,22 @@ func _batch_import_audio_assets(client_id: int, params: Dictionary, command_id:
 
 	filesystem.reimport_files(normalized_paths)
 
+	# Build the analyze_waveform pyramids now so the first analysis is cheap.
+	var warmed := 0
+	if bool(params.get("warm_waveform_cache", false)):
+		var silence_threshold := clampf(float(params.get("silence_threshold", DEFAULT_SILENCE_THRESHOLD)), 0.000001, 0.1)
+		for asset_summary in asset_results:
+			var asset_path: String = asset_summary["resource_path"]
+			var stream = ResourceLoader.load(asset_path, "", ResourceLoader.CACHE_MODE_REPLACE)
+			if not MCPWaveformPyramid.supports(stream) or stream.data.is_empty():
+				asset_summary["waveform_cache"] = "unsupported"
+				continue
+			asset_summary["waveform_cache"] = MCPWaveformPyramid.fetch(asset_path, stream, silence_threshold)["cache"]
+			warmed += 1
+
 	context["reimported"] = normalized_paths.size()
 	context["config_updates"] = config_updates
+	context["waveforms_warmed"] = warmed
 	context["error_count"] = errors.size()
 	if not errors.is_empty():
 		context["errors"] = errors.duplicate(true)
@@ -3175,6 +3237,7 @@ func _batch_import_audio_assets(client_id: int, params: Dictionary, command_id:
 		"reimported": normalized_paths.size(),
 		"assets": asset_results,
 		"config_updates": config_updates,
+		"waveforms_warmed": warmed,
 	}
 	if not errors.is_empty():
 		response["errors"] = errors
@@ -4412,613 +4475,207 @@ func _configure_material_resource(client_id: int, params: Dictionary, command_id
 	}, command_id)
 
 func _paint_gridmap_cells(client_id: int, params: Dictionary, command_id: String) -> void:
+	_edit_gridmap_cells(client_id, params, command_id, false)
+
+func _clear_gridmap_cells(client_id: int, params: Dictionary, command_id: String) -> void:
+	_edit_gridmap_cells(client_id, params, command_id, true)
+
+# Cells can come from any mix of "cells" dictionaries, "packed_cells" and
+# "regions".  They are diffed against the map in MCPGridMapCells and applied
+# as one do call and one undo call, so the whole edit is a single undo step.
+func _edit_gridmap_cells(client_id: int, params: Dictionary, command_id: String, clearing: bool) -> void:
+	var command := "clear_gridmap_cells" if clearing else "paint_gridmap_cells"
+	var function_name := "_" + command
+	var action := "clearing" if clearing else "painting"
 	var node_path := String(params.get("node_path", ""))
-	var cells_param = params.get("cells", [])
 	var transaction_id := String(params.get("transaction_id", ""))
+	var log_context := {
+		"command": command,
+		"client_id": client_id,
+		"command_id": command_id,
+		"node_path": node_path,
+		"system_section": "gridmap",
+	}
 
 	if node_path.is_empty():
-		_log(
-			"GridMap painting requires a node path",
-			"_paint_gridmap_cells",
-			{"command": "paint_gridmap_cells", "client_id": client_id, "command_id": command_id, "system_section": "gridmap"},
-			true
-		)
+		_log("GridMap %s requires a node path" % action, function_name, log_context, true)
 		return _send_error(client_id, "Node path cannot be empty", command_id)
 
-	if typeof(cells_param) != TYPE_ARRAY:
-		_log(
-			"GridMap painting expects an array of cell dictionaries",
-			"_paint_gridmap_cells",
-			{
-				"command": "paint_gridmap_cells",
-				"client_id": client_id,
-				"command_id": command_id,
-				"node_path": node_path,
-				"system_section": "gridmap",
-			},
-			true
-		)
-		return _send_error(client_id, "GridMap updates require an array of cell definitions", command_id)
-
-	var cells: Array = cells_param.duplicate(true)
-	if cells.is_empty():
-		_log(
-			"GridMap painting received an empty cell list",
-			"_paint_gridmap_cells",
-			{
-				"command": "paint_gridmap_cells",
-				"client_id": client_id,
-				"command_id": command_id,
-				"node_path": node_path,
-				"system_section": "gridmap",
-			},
-			true
-		)
-		return _send_error(client_id, "No GridMap cells provided for update", command_id)
-
 	var node = _get_editor_node(node_path)
 	if not node:
-		_log(
-			"GridMap node not found",
-			"_paint_gridmap_cells",
-			{
-				"command": "paint_gridmap_cells",
-				"client_id": client_id,
-				"command_id": command_id,
-				"node_path": node_path,
-				"system_section": "gridmap",
-			},
-			true
-		)
+		_log("GridMap node not found", function_name, log_context, true)
 		return _send_error(client_id, "Node not found: %s" % node_path, command_id)
 
+	log_context["node_type"] = node.get_class()
 	if not (node is GridMap):
-		_log(
-			"Node is not a GridMap",
-			"_paint_gridmap_cells",
-			{
-				"command": "paint_gridmap_cells",
-				"client_id": client_id,
-				"command_id": command_id,
-				"node_path": node_path,
-				"node_type": node.get_class(),
-				"system_section": "gridmap",
-			},
-			true
-		)
+		_log("Node is not a GridMap", function_name, log_context, true)
 		return _send_error(client_id, "Node at path is not a GridMap", command_id)
 
-	if not node.has_method("set_cell_item"):
-		_log(
-			"GridMap is missing set_cell_item method",
-			"_paint_gridmap_cells",
-			{
-				"command": "paint_gridmap_cells",
-				"client_id": client_id,
-				"command_id": command_id,
-				"node_path": node_path,
-				"node_type": node.get_class(),
-				"system_section": "gridmap",
-			},
-			true
-		)
-		return _send_error(client_id, "GridMap does not support cell painting", command_id)
+	var gathered := _gather_gridmap_cells(node, params, clearing)
+	if not gathered["ok"]:
+		_log("GridMap %s request is invalid" % action, function_name, _merged(log_context, gathered), true)
+		return _send_error(client_id, gathered["error"], command_id)
+
+	var cells: PackedInt32Array = gathered["cells"]
+	if cells.is_empty():
+		_log("GridMap %s received an empty cell list" % action, function_name, log_context, true)
+		return _send_error(client_id, "No GridMap cells provided for clearing" if clearing else "No GridMap cells provided for update", command_id)
 
-	var mesh_library = null
-	if _has_property(node, "mesh_library"):
-		mesh_library = node.mesh_library
+	var plan := MCPGridMapCells.plan(node, cells)
+	if not plan["ok"]:
+		_log("GridMap %s rejected a cell" % action, function_name, _merged(log_context, plan), true)
+		return _send_error(client_id, plan["error"], command_id)
 
 	var resolved_node_path := _node_path_to_string(node, node_path)
+	var requested_cells := cells.size() / MCPGridMapCells.STRIDE
+	var action_name := "Clear GridMap Cells" if clearing else "Paint GridMap Cells"
 	var transaction_metadata := {
-		"command": "paint_gridmap_cells",
+		"command": command,
 		"node_path": resolved_node_path,
 		"requested_path": node_path,
 		"client_id": client_id,
 		"command_id": command_id,
-		"cell_count": cells.size(),
+		"cell_count": requested_cells,
 		"node_type": node.get_class(),
 	}
 
 	var transaction
 	if transaction_id.is_empty():
-		transaction = SceneTransactionManager.begin_inline("Paint GridMap Cells", transaction_metadata)
+		transaction = SceneTransactionManager.begin_inline(action_name, transaction_metadata)
 	else:
 		transaction = SceneTransactionManager.get_transaction(transaction_id)
 		if not transaction:
-			transaction = SceneTransactionManager.begin_registered(transaction_id, "Paint GridMap Cells", transaction_metadata)
+			transaction = SceneTransactionManager.begin_registered(transaction_id, action_name, transaction_metadata)
 
 	if not transaction:
-		_log(
-			"Failed to obtain scene transaction for GridMap painting",
-			"_paint_gridmap_cells",
-			{
-				"command": "paint_gridmap_cells",
-				"client_id": client_id,
-				"command_id": command_id,
-				"node_path": node_path,
-				"node_type": node.get_class(),
-				"system_section": "gridmap",
-			},
-			true
-		)
-		return _send_error(client_id, "Failed to obtain scene transaction for GridMap painting", command_id)
-
-	var change_entries: Array = []
-	for i in cells.size():
-		var cell_entry = cells[i]
-		if typeof(cell_entry) != TYPE_DICTIONARY:
-			if transaction_id.is_empty():
-				transaction.rollback()
-			_log(
-				"GridMap cell entry must be a dictionary",
-				"_paint_gridmap_cells",
-				{
-					"command": "paint_gridmap_cells",
-					"client_id": client_id,
-					"command_id": command_id,
-					"node_path": node_path,
-					"index": i,
-					"system_section": "gridmap",
-				},
-				true
-			)
-			return _send_error(client_id, "Each GridMap cell must be provided as a dictionary", command_id)
-
-		var parsed_position = _parse_gridmap_position(cell_entry)
-		if parsed_position.is_empty():
-			if transaction_id.is_empty():
-				transaction.rollback()
-			_log(
-				"GridMap cell definition is missing position coordinates",
-				"_paint_gridmap_cells",
-				{
-					"command": "paint_gridmap_cells",
-					"client_id": client_id,
-					"command_id": command_id,
-					"node_path": node_path,
-					"index": i,
-					"system_section": "gridmap",
-				},
-				true
-			)
-			return _send_error(client_id, "GridMap cell definition requires a position", command_id)
-
-		if not cell_entry.has("item"):
-			if transaction_id.is_empty():
-				transaction.rollback()
-			_log(
-				"GridMap cell definition is missing item identifier",
-				"_paint_gridmap_cells",
-				{
-					"command": "paint_gridmap_cells",
-					"client_id": client_id,
-					"command_id": command_id,
-					"node_path": node_path,
-					"index": i,
-					"system_section": "gridmap",
-				},
-				true
-			)
-			return _send_error(client_id, "GridMap cell definition must include an item id", command_id)
-
-		var item_value = _to_int(cell_entry.get("item"))
-		if item_value == null:
-			if transaction_id.is_empty():
-				transaction.rollback()
-			_log(
-				"GridMap cell item could not be converted to an integer",
-				"_paint_gridmap_cells",
-				{
-					"command": "paint_gridmap_cells",
-					"client_id": client_id,
-					"command_id": command_id,
-					"node_path": node_path,
-					"index": i,
-					"raw_item": cell_entry.get("item"),
-					"system_section": "gridmap",
-				},
-				true
-			)
-			return _send_error(client_id, "GridMap cell item must be an integer", command_id)
-
-		var orientation_value = _to_int(cell_entry.get("orientation", 0))
-		if orientation_value == null:
-			if transaction_id.is_empty():
-				transaction.rollback()
-			_log(
-				"GridMap cell orientation could not be converted to an integer",
-				"_paint_gridmap_cells",
-				{
-					"command": "paint_gridmap_cells",
-					"client_id": client_id,
-					"command_id": command_id,
-					"node_path": node_path,
-					"index": i,
-					"raw_orientation": cell_entry.get("orientation", 0),
-					"system_section": "gridmap",
-				},
-				true
-			)
-			return _send_error(client_id, "GridMap cell orientation must be an integer", command_id)
-
-		if item_value != GridMap.INVALID_CELL_ITEM:
-			if mesh_library == null:
-				if transaction_id.is_empty():
-					transaction.rollback()
-				_log(
-					"GridMap mesh library is required to paint items",
-					"_paint_gridmap_cells",
-					{
-						"command": "paint_gridmap_cells",
-						"client_id": client_id,
-						"command_id": command_id,
-						"node_path": node_path,
-						"index": i,
-						"system_section": "gridmap",
-					},
-					true
-				)
-				return _send_error(client_id, "GridMap has no MeshLibrary configured", command_id)
-			elif mesh_library.has_method("has_item") and not mesh_library.has_item(item_value):
-				if transaction_id.is_empty():
-					transaction.rollback()
-				_log(
-					"Requested GridMap item is not present in the mesh library",
-					"_paint_gridmap_cells",
-					{
-						"command": "paint_gridmap_cells",
-						"client_id": client_id,
-						"command_id": command_id,
-						"node_path": node_path,
-						"index": i,
-						"item": item_value,
-						"system_section": "gridmap",
-					},
-					true
-				)
-				return _send_error(client_id, "MeshLibrary does not contain the requested item", command_id)
-
-		var position_vector: Vector3i = parsed_position["vector"]
-		var position_dict: Dictionary = parsed_position["components"].duplicate(true)
-		var previous_item := node.has_method("get_cell_item") ? node.get_cell_item(position_vector) : GridMap.INVALID_CELL_ITEM
-		var previous_orientation := 0
-		if node.has_method("get_cell_item_orientation"):
-			previous_orientation = node.get_cell_item_orientation(position_vector)
-
-		if previous_item == item_value and previous_orientation == orientation_value:
-			continue
-
-		change_entries.append({
-			"position": position_vector,
-			"position_dict": position_dict,
-			"previous_item": previous_item,
-			"previous_orientation": previous_orientation,
-			"item": item_value,
-			"orientation": orientation_value,
-		})
-
-		transaction.add_do_method(node, "set_cell_item", [position_vector, item_value, orientation_value])
-		transaction.add_undo_method(node, "set_cell_item", [position_vector, previous_item, previous_orientation])
+		_log("Failed to obtain scene transaction for GridMap %s" % action, function_name, log_context, true)
+		return _send_error(client_id, "Failed to obtain scene transaction for GridMap %s" % action, command_id)
 
+	var do_cells: PackedInt32Array = plan["do"]
+	var undo_cells: PackedInt32Array = plan["undo"]
+	var described := MCPGridMapCells.describe_changes(do_cells, undo_cells, clearing, GRIDMAP_LISTED_CHANGES)
 	var log_payload := {
-		"command": "paint_gridmap_cells",
+		"command": command,
 		"node_path": resolved_node_path,
 		"requested_path": node_path,
 		"node_type": node.get_class(),
 		"system_section": "gridmap",
 		"client_id": client_id,
 		"command_id": command_id,
-		"requested_cells": cells.size(),
+		"requested_cells": requested_cells,
+		"change_count": described["change_count"],
+		"bounds": described.get("bounds", {}),
 		"transaction_id": transaction.transaction_id,
 	}
 
-	var serialized_changes: Array = []
-	for change in change_entries:
-		serialized_changes.append({
-			"position": change["position_dict"].duplicate(true),
-			"previous_item": change["previous_item"],
-			"previous_orientation": change["previous_orientation"],
-			"item": change["item"],
-			"orientation": change["orientation"],
-		})
+	var response := {
+		"node_path": resolved_node_path,
+		"requested_path": node_path,
+		"node_type": node.get_class(),
+		"changes": described["changes"],
+		"change_count": described["change_count"],
+		"transaction_id": transaction.transaction_id,
+	}
+	if described.has("bounds"):
+		response["bounds"] = described["bounds"]
 
-	log_payload["change_count"] = serialized_changes.size()
+	if do_cells.is_empty():
+		if transaction_id.is_empty():
+			transaction.rollback()
+		_log("No GridMap cells required clearing" if clearing else "No GridMap cell changes were required", function_name, log_payload)
+		response["status"] = "no_changes"
+		return _send_success(client_id, response, command_id)
 
-	var commit_changes := []
-	for change in serialized_changes:
-		commit_changes.append(change.duplicate(true))
+	# The writer is a RefCounted the undo history keeps alive; the context
+	# keeps the action in the GridMap's scene history.
+	var writer := MCPGridMapCells.new()
+	transaction.context = node
+	transaction.add_do_method(writer, "apply", [node, do_cells])
+	transaction.add_undo_method(writer, "apply", [node, undo_cells])
 
 	transaction.register_on_commit(func():
 		_mark_scene_modified()
-		var payload = log_payload.duplicate(true)
-		payload["changes"] = commit_changes.duplicate(true)
-		_log("Painted GridMap cells", "_paint_gridmap_cells", payload)
+		_log("Cleared GridMap cells" if clearing else "Painted GridMap cells", function_name, log_payload)
 	)
 
 	transaction.register_on_rollback(func():
-		var payload = log_payload.duplicate(true)
-		payload["changes"] = commit_changes.duplicate(true)
-		_log("Rolled back GridMap painting", "_paint_gridmap_cells", payload)
+		_log("Rolled back GridMap %s" % action, function_name, log_payload)
 	)
 
-	if change_entries.is_empty():
-		if transaction_id.is_empty():
-			transaction.rollback()
-		_log("No GridMap cell changes were required", "_paint_gridmap_cells", log_payload)
-		return _send_success(client_id, {
-			"node_path": resolved_node_path,
-			"requested_path": node_path,
-			"node_type": node.get_class(),
-			"changes": [],
-			"transaction_id": transaction.transaction_id,
-			"status": "no_changes",
-		}, command_id)
-
 	var status := "pending"
 	if transaction_id.is_empty():
 		if not transaction.commit():
 			transaction.rollback()
-			_log(
-				"Failed to commit GridMap painting",
-				"_paint_gridmap_cells",
-				log_payload,
-				true
-			)
-			return _send_error(client_id, "Failed to commit GridMap painting", command_id)
+			_log("Failed to commit GridMap %s" % action, function_name, log_payload, true)
+			return _send_error(client_id, "Failed to commit GridMap %s" % action, command_id)
 		status = "committed"
 
-	_send_success(client_id, {
-		"node_path": resolved_node_path,
-		"requested_path": node_path,
-		"node_type": node.get_class(),
-		"changes": serialized_changes,
-		"transaction_id": transaction.transaction_id,
-		"status": status,
-	}, command_id)
+	response["status"] = status
+	_send_success(client_id, response, command_id)
 
-func _clear_gridmap_cells(client_id: int, params: Dictionary, command_id: String) -> void:
-	var node_path := String(params.get("node_path", ""))
+# Collects the requested cells as (x, y, z, item, orientation) ints, in
+# request order: "cells" dictionaries, then "packed_cells", then "regions".
+func _gather_gridmap_cells(node: GridMap, params: Dictionary, clearing: bool) -> Dictionary:
+	var cells := PackedInt32Array()
 	var cells_param = params.get("cells", [])
-	var transaction_id := String(params.get("transaction_id", ""))
-
-	if node_path.is_empty():
-		_log(
-			"GridMap clearing requires a node path",
-			"_clear_gridmap_cells",
-			{"command": "clear_gridmap_cells", "client_id": client_id, "command_id": command_id, "system_section": "gridmap"},
-			true
-		)
-		return _send_error(client_id, "Node path cannot be empty", command_id)
-
 	if typeof(cells_param) != TYPE_ARRAY:
-		_log(
-			"GridMap clearing expects an array of positions",
-			"_clear_gridmap_cells",
-			{
-				"command": "clear_gridmap_cells",
-				"client_id": client_id,
-				"command_id": command_id,
-				"node_path": node_path,
-				"system_section": "gridmap",
-			},
-			true
-		)
-		return _send_error(client_id, "GridMap clearing requires an array of positions", command_id)
-
-	var cells: Array = cells_param.duplicate(true)
-	if cells.is_empty():
-		_log(
-			"GridMap clearing received an empty cell list",
-			"_clear_gridmap_cells",
-			{
-				"command": "clear_gridmap_cells",
-				"client_id": client_id,
-				"command_id": command_id,
-				"node_path": node_path,
-				"system_section": "gridmap",
-			},
-			true
-		)
-		return _send_error(client_id, "No GridMap cells provided for clearing", command_id)
-
-	var node = _get_editor_node(node_path)
-	if not node:
-		_log(
-			"GridMap node not found",
-			"_clear_gridmap_cells",
-			{
-				"command": "clear_gridmap_cells",
-				"client_id": client_id,
-				"command_id": command_id,
-				"node_path": node_path,
-				"system_section": "gridmap",
-			},
-			true
-		)
-		return _send_error(client_id, "Node not found: %s" % node_path, command_id)
-
-	if not (node is GridMap):
-		_log(
-			"Node is not a GridMap",
-			"_clear_gridmap_cells",
-			{
-				"command": "clear_gridmap_cells",
-				"client_id": client_id,
-				"command_id": command_id,
-				"node_path": node_path,
-				"node_type": node.get_class(),
-				"system_section": "gridmap",
-			},
-			true
-		)
-		return _send_error(client_id, "Node at path is not a GridMap", command_id)
-
-	if not node.has_method("set_cell_item"):
-		_log(
-			"GridMap is missing set_cell_item method",
-			"_clear_gridmap_cells",
-			{
-				"command": "clear_gridmap_cells",
-				"client_id": client_id,
-				"command_id": command_id,
-				"node_path": node_path,
-				"node_type": node.get_class(),
-				"system_section": "gridmap",
-			},
-			true
-		)
-		return _send_error(client_id, "GridMap does not support cell clearing", command_id)
-
-	var resolved_node_path := _node_path_to_string(node, node_path)
-	var transaction_metadata := {
-		"command": "clear_gridmap_cells",
-		"node_path": resolved_node_path,
-		"requested_path": node_path,
-		"client_id": client_id,
-		"command_id": command_id,
-		"cell_count": cells.size(),
-		"node_type": node.get_class(),
-	}
+		return {
+			"ok": false,
+			"error": "GridMap clearing requires an array of positions" if clearing else "GridMap updates require an array of cell definitions",
+		}
 
-	var transaction
-	if transaction_id.is_empty():
-		transaction = SceneTransactionManager.begin_inline("Clear GridMap Cells", transaction_metadata)
-	else:
-		transaction = SceneTransactionManager.get_transaction(transaction_id)
-		if not transaction:
-			transaction = SceneTransactionManager.begin_registered(transaction_id, "Clear GridMap Cells", transaction_metadata)
+	for index in cells_param.size():
+		var cell_entry = cells_param[index]
+		if not clearing and typeof(cell_entry) != TYPE_DICTIONARY:
+			return {"ok": false, "error": "Each GridMap cell must be provided as a dictionary", "index": index}
 
-	if not transaction:
-		_log(
-			"Failed to obtain scene transaction for GridMap clearing",
-			"_clear_gridmap_cells",
-			{
-				"command": "clear_gridmap_cells",
-				"client_id": client_id,
-				"command_id": command_id,
-				"node_path": node_path,
-				"node_type": node.get_class(),
-				"system_section": "gridmap",
-			},
-			true
-		)
-		return _send_error(client_id, "Failed to obtain scene transaction for GridMap clearing", command_id)
-
-	var change_entries: Array = []
-	for i in cells.size():
-		var cell_entry = cells[i]
 		var parsed_position = _parse_gridmap_position(cell_entry)
 		if parsed_position.is_empty():
-			if transaction_id.is_empty():
-				transaction.rollback()
-			_log(
-				"GridMap clearing entry is missing position coordinates",
-				"_clear_gridmap_cells",
-				{
-					"command": "clear_gridmap_cells",
-					"client_id": client_id,
-					"command_id": command_id,
-					"node_path": node_path,
-					"index": i,
-					"system_section": "gridmap",
-				},
-				true
-			)
-			return _send_error(client_id, "GridMap clearing requires explicit positions", command_id)
-
-		var position_vector: Vector3i = parsed_position["vector"]
-		var position_dict: Dictionary = parsed_position["components"].duplicate(true)
-		var previous_item := node.has_method("get_cell_item") ? node.get_cell_item(position_vector) : GridMap.INVALID_CELL_ITEM
-		if previous_item == GridMap.INVALID_CELL_ITEM:
-			continue
-
-		var previous_orientation := 0
-		if node.has_method("get_cell_item_orientation"):
-			previous_orientation = node.get_cell_item_orientation(position_vector)
-
-		change_entries.append({
-			"position": position_vector,
-			"position_dict": position_dict,
-			"previous_item": previous_item,
-			"previous_orientation": previous_orientation,
-		})
-
-		transaction.add_do_method(node, "set_cell_item", [position_vector, GridMap.INVALID_CELL_ITEM, 0])
-		transaction.add_undo_method(node, "set_cell_item", [position_vector, previous_item, previous_orientation])
-
-	var log_payload := {
-		"command": "clear_gridmap_cells",
-		"node_path": resolved_node_path,
-		"requested_path": node_path,
-		"node_type": node.get_class(),
-		"system_section": "gridmap",
-		"client_id": client_id,
-		"command_id": command_id,
-		"requested_cells": cells.size(),
-		"transaction_id": transaction.transaction_id,
-	}
-
-	var serialized_changes: Array = []
-	for change in change_entries:
-		serialized_changes.append({
-			"position": change["position_dict"].duplicate(true),
-			"cleared_item": change["previous_item"],
-			"previous_orientation": change["previous_orientation"],
-		})
-
-	log_payload["change_count"] = serialized_changes.size()
-
-	var commit_changes := []
-	for change in serialized_changes:
-		commit_changes.append(change.duplicate(true))
-
-	transaction.register_on_commit(func():
-		_mark_scene_modified()
-		var payload = log_payload.duplicate(true)
-		payload["changes"] = commit_changes.duplicate(true)
-		_log("Cleared GridMap cells", "_clear_gridmap_cells", payload)
-	)
-
-	transaction.register_on_rollback(func():
-		var payload = log_payload.duplicate(true)
-		payload["changes"] = commit_changes.duplicate(true)
-		_log("Rolled back GridMap clearing", "_clear_gridmap_cells", payload)
-	)
-
-	if change_entries.is_empty():
-		if transaction_id.is_empty():
-			transaction.rollback()
-		_log("No GridMap cells required clearing", "_clear_gridmap_cells", log_payload)
-		return _send_success(client_id, {
-			"node_path": resolved_node_path,
-			"requested_path": node_path,
-			"node_type": node.get_class(),
-			"changes": [],
-			"transaction_id": transaction.transaction_id,
-			"status": "no_changes",
-		}, command_id)
-
-	var status := "pending"
-	if transaction_id.is_empty():
-		if not transaction.commit():
-			transaction.rollback()
-			_log(
-				"Failed to commit GridMap clearing",
-				"_clear_gridmap_cells",
-				log_payload,
-				true
-			)
-			return _send_error(client_id, "Failed to commit GridMap clearing", command_id)
-		status = "committed"
+			return {
+				"ok": false,
+				"error": "GridMap clearing requires explicit positions" if clearing else "GridMap cell definition requires a position",
+				"index": index,
+			}
 
-	_send_success(client_id, {
-		"node_path": resolved_node_path,
-		"requested_path": node_path,
-		"node_type": node.get_class(),
-		"changes": serialized_changes,
-		"transaction_id": transaction.transaction_id,
-		"status": status,
-	}, command_id)
+		var item := GridMap.INVALID_CELL_ITEM
+		var orientation := 0
+		if not clearing:
+			if not cell_entry.has("item"):
+				return {"ok": false, "error": "GridMap cell definition must include an item id", "index": index}
+			var item_value = _to_int(cell_entry["item"])
+			if item_value == null:
+				return {"ok": false, "error": "GridMap cell item must be an integer", "index": index, "raw_item": cell_entry["item"]}
+			var orientation_value = _to_int(cell_entry.get("orientation", 0))
+			if orientation_value == null:
+				return {
+					"ok": false,
+					"error": "GridMap cell orientation must be an integer",
+					"index": index,
+					"raw_orientation": cell_entry.get("orientation", 0),
+				}
+			item = item_value
+			orientation = orientation_value
+		MCPGridMapCells.append_cell(cells, parsed_position["vector"], item, orientation)
+
+	if params.has("packed_cells"):
+		var stride := MCPGridMapCells.POSITION_STRIDE if clearing else MCPGridMapCells.STRIDE
+		var decoded := MCPGridMapCells.decode_packed(params["packed_cells"], stride)
+		if not decoded["ok"]:
+			return decoded
+		cells.append_array(decoded["cells"])
+
+	var regions = params.get("regions", [])
+	if typeof(regions) != TYPE_ARRAY:
+		return {"ok": false, "error": "GridMap regions must be an array"}
+	var expanded := MCPGridMapCells.expand_regions(node, regions, clearing, cells)
+	if not expanded["ok"]:
+		return expanded
+	return {"ok": true, "cells": cells}
+
+func _merged(base: Dictionary, extra: Dictionary) -> Dictionary:
+	var merged := base.duplicate()
+	merged.merge(extra, true)
+	return merged
 
 
 func _classify_physics_node(node: Node) -> Dictionary:
@@ -5201,22 +4858,5 @@ func _amplitude_to_decibels(amplitude: float) -> float:
 
 
 func _log(message: String, function_name: String, extra: Dictionary = {}, is_error: bool = false) -> void:
-	var payload := {
-		"filename": LOG_FILENAME,
-		"timestamp": Time.get_datetime_string_from_system(true, true),
-		"classname": "MCPSceneCommands",
-		"function": function_name,
-		"system_section": extra.get("system_section", DEFAULT_SYSTEM_SECTION),
-		"line_num": extra.get("line_num", 0),
-		"error": is_error ? message : "",
-		"db_phase": extra.get("db_phase", "none"),
-		"method": extra.get("method", "NONE"),
-		"message": message,
-	}
-
-	for key in extra.keys():
-		if not payload.has(key):
-			payload[key] = extra[key]
-
-	print(JSON.stringify(payload))
-	print("[Continuous skepticism (Sherlock Protocol)] %s" % message)
+	var log_level := MCPLogger.Level.ERROR if is_error else MCPLogger.Level.INFO
+	MCPLogger.record(log_level, extra.get("system_section", DEFAULT_SYSTEM_SECTION), LOG_FILENAME, "MCPSceneCommands", function_name, message, extra)
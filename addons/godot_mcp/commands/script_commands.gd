@@ -2,6 +2,15 @@
 class_name MCPScriptCommands
 extends MCPBaseCommandProcessor
 
+const SUPPORTED_COMMANDS := [
+	"create_script",
+	"edit_script",
+	"get_script",
+	"get_script_metadata",
+	"get_current_script",
+	"create_script_template",
+]
+
 func process_command(client_id: int, command_type: String, params: Dictionary, command_id: String) -> bool:
 	match command_type:
 		"create_script":
@@ -5,6 +5,13 @@ extends MCPBaseCommandProcessor
 const LOG_FILENAME := "addons/godot_mcp/commands/xr_commands.gd"
 const DEFAULT_SYSTEM_SECTION := "xr_commands"
 
+const SUPPORTED_COMMANDS := [
+	"list_xr_interfaces",
+	"initialize_xr_interface",
+	"shutdown_xr_interface",
+	"save_xr_project_settings",
+]
+
 func process_command(client_id: int, command_type: String, params: Dictionary, command_id: String) -> bool:
 	match command_type:
 		"list_xr_interfaces":
@@ -22,21 +29,7 @@ func process_command(client_id: int, command_type: String, params: Dictionary, c
 	return false
 
 func _log_event(action: String, message: String, context := {}):
-	var entry := {
-		"filename": LOG_FILENAME,
-		"timestamp": Time.get_datetime_string_from_system(),
-		"classname": "MCPXRCommands",
-		"function": action,
-		"system_section": DEFAULT_SYSTEM_SECTION,
-		"line_num": 0,
-		"error": false,
-		"db_phase": "none",
-		"method": "NONE",
-		"message": message,
-		"context": context,
-	}
-	print(JSON.stringify(entry))
-	print("[Continuous skepticism (Sherlock Protocol)]", message)
+	MCPLogger.record(MCPLogger.Level.INFO, DEFAULT_SYSTEM_SECTION, LOG_FILENAME, "MCPXRCommands", action, message, {"context": context})
 
 func _list_xr_interfaces(client_id: int, command_id: String) -> void:
 	var interfaces := []
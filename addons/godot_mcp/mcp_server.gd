@@ -1,11 +1,12 @@
 @tool
 extends EditorPlugin
 
+const LOG_FILENAME := "addons/godot_mcp/mcp_server.gd"
+const LOG_SECTION := "mcp_server"
+
 var tcp_server := TCPServer.new()
 var port := 9080
 var handshake_timeout := 3000 # ms
-var debug_mode := true
-var log_detailed := true  # Enable detailed logging
 var command_handler = null  # Command handler reference
 
 signal client_connected(id)
@@ -33,32 +34,44 @@ class WebSocketClient:
 var clients := {}
 var next_client_id := 1
 var _jsonrpc_requests := {}
+# Editor events for clients that called subscribe_events.
+var event_hub := MCPEventHub.new()
+var _was_playing := false
 
 func _enter_tree():
 	# Store plugin instance for EditorInterface access
 	Engine.set_meta("GodotMCPPlugin", self)
 	
-	print("\n=== MCP SERVER STARTING ===")
+	_log(MCPLogger.Level.INFO, "_enter_tree", "MCP server starting")
 	
 	# Initialize the command handler
-	print("Creating command handler...")
 	command_handler = preload("res://addons/godot_mcp/command_handler.gd").new()
 	command_handler.name = "CommandHandler"
 	add_child(command_handler)
 	
 	# Connect signals
-	print("Connecting command handler signals...")
 	self.connect("command_received", Callable(command_handler, "_handle_command"))
+	resource_saved.connect(_on_resource_saved)
+	var filesystem := get_editor_interface().get_resource_filesystem()
+	filesystem.filesystem_changed.connect(_on_filesystem_changed)
+	filesystem.resources_reimported.connect(_on_resources_reimported)
+	MCPFileIndex.attach(filesystem)
+	get_tree().node_added.connect(_on_scene_node_changed)
+	get_tree().node_removed.connect(_on_scene_node_changed)
+	get_tree().node_renamed.connect(_on_scene_node_renamed)
+	get_undo_redo().version_changed.connect(_on_undo_redo_version_changed)
+	get_editor_interface().get_selection().selection_changed.connect(_on_selection_changed)
+	get_editor_interface().get_script_editor().editor_script_changed.connect(_on_editor_script_changed)
+	scene_changed.connect(_on_scene_changed)
+	scene_saved.connect(_on_scene_saved)
 	
 	# Start WebSocket server
 	var err = tcp_server.listen(port)
 	if err == OK:
-		print("Listening on port", port)
+		_log(MCPLogger.Level.INFO, "_enter_tree", "Listening", {"port": port})
 		set_process(true)
 	else:
-		printerr("Failed to listen on port", port, "error:", err)
-	
-	print("=== MCP SERVER INITIALIZED ===\n")
+		_log(MCPLogger.Level.ERROR, "_enter_tree", "Failed to listen", {"port": port, "error_code": err})
 
 func _exit_tree():
 	# Remove plugin instance from Engine metadata
@@ -69,14 +82,67 @@ func _exit_tree():
 		tcp_server.stop()
 	
 	clients.clear()
+	MCPResultCache.clear()
+	MCPFileIndex.detach()
+	MCPSceneSnapshots.clear()
 	
-	print("=== MCP SERVER SHUTDOWN ===")
+	_log(MCPLogger.Level.INFO, "_exit_tree", "MCP server shut down")
+	MCPLogger.flush()
+
+# Raw frames are logged at DEBUG; MCPLogger truncates them when flushed.
+func _log(log_level: int, function_name: String, message: String, extra: Dictionary = {}) -> void:
+	MCPLogger.record(log_level, LOG_SECTION, LOG_FILENAME, "MCPServer", function_name, message, extra)
+
+# Cached scene structures and the file index are rebuilt after the files change.
+func _on_resource_saved(resource: Resource) -> void:
+	MCPResultCache.invalidate_path(resource.resource_path)
+	if resource is Script:
+		event_hub.publish("script_changed", {"script_path": resource.resource_path, "saved": true})
+
+func _on_filesystem_changed() -> void:
+	MCPFileIndex.mark_stale()
+	event_hub.publish("filesystem_changed")
+
+func _on_resources_reimported(resources: PackedStringArray) -> void:
+	MCPFileIndex.update_files(resources)
+
+# Snapshot baselines track which nodes changed since they were taken.
+func _on_scene_node_changed(node: Node) -> void:
+	MCPSceneSnapshots.note_node(node)
+
+func _on_scene_node_renamed(node: Node) -> void:
+	MCPSceneSnapshots.note_renamed(node)
+
+func _on_undo_redo_version_changed() -> void:
+	MCPSceneSnapshots.note_version_changed()
+	event_hub.publish("scene_edited")
+
+func _on_selection_changed() -> void:
+	if not event_hub.has_subscribers():
+		return
+	var paths := []
+	for node in get_editor_interface().get_selection().get_selected_nodes():
+		paths.append(str(node.get_path()))
+	event_hub.publish("selection_changed", {"selected_nodes": paths})
+
+func _on_scene_changed(scene_root: Node) -> void:
+	event_hub.publish("scene_changed", {"scene_path": scene_root.scene_file_path if scene_root else ""})
+
+func _on_scene_saved(filepath: String) -> void:
+	event_hub.publish("scene_saved", {"scene_path": filepath})
 
-func _log(client_id, message):
-	if log_detailed:
-		print("[Client ", client_id, "] ", message)
+func _on_editor_script_changed(script: Script) -> void:
+	event_hub.publish("script_changed", {"script_path": script.resource_path if script else ""})
+
+# The editor has no signal for starting or stopping the running scene.
+func _poll_play_state() -> void:
+	var is_playing := get_editor_interface().is_playing_scene()
+	if is_playing != _was_playing:
+		_was_playing = is_playing
+		event_hub.publish("play_state_changed", {"is_playing": is_playing})
 
 func _process(_delta):
+	MCPLogger.tick()
 	if not tcp_server.is_listening():
 		return
 	
@@ -89,13 +155,13 @@ func _process(_delta):
 		var client = WebSocketClient.new(tcp, id)
 		clients[id] = client
 		
-		print("[Client ", id, "] New TCP connection")
+		_log(MCPLogger.Level.INFO, "_process", "New TCP connection", {"client_id": id})
 		
 		# Try to upgrade immediately
 		if client.upgrade_to_websocket():
-			print("[Client ", id, "] WebSocket handshake started")
+			_log(MCPLogger.Level.DEBUG, "_process", "WebSocket handshake started", {"client_id": id})
 		else:
-			print("[Client ", id, "] Failed to start WebSocket handshake")
+			_log(MCPLogger.Level.WARN, "_process", "Failed to start WebSocket handshake", {"client_id": id})
 			clients.erase(id)
 	
 	# Update clients
@@ -114,11 +180,11 @@ func _process(_delta):
 				
 				# Check WebSocket state
 				var ws_state = client.ws.get_ready_state()
-				if debug_mode:
-					_log(id, "State: " + str(ws_state))
+				if MCPLogger.enabled(MCPLogger.Level.DEBUG):
+					_log(MCPLogger.Level.DEBUG, "_process", "Handshake state", {"client_id": id, "state": ws_state})
 					
 				if ws_state == WebSocketPeer.STATE_OPEN:
-					print("[Client ", id, "] WebSocket handshake completed")
+					_log(MCPLogger.Level.INFO, "_process", "WebSocket handshake completed", {"client_id": id})
 					client.state = 0
 					
 					# Emit connected signal
@@ -132,23 +198,23 @@ func _process(_delta):
 					client.ws.send_text(msg)
 					
 				elif ws_state != WebSocketPeer.STATE_CONNECTING:
-					print("[Client ", id, "] WebSocket handshake failed, state: ", ws_state)
+					_log(MCPLogger.Level.WARN, "_process", "WebSocket handshake failed", {"client_id": id, "state": ws_state})
 					ids_to_remove.append(id)
 				
 				# Check for handshake timeout
 				elif current_time - client.handshake_time > handshake_timeout:
-					print("[Client ", id, "] WebSocket handshake timed out")
+					_log(MCPLogger.Level.WARN, "_process", "WebSocket handshake timed out", {"client_id": id})
 					ids_to_remove.append(id)
 			else:
 				# If TCP is still connected, try upgrading
 				if client.tcp.get_status() == StreamPeerTCP.STATUS_CONNECTED:
 					if client.upgrade_to_websocket():
-						print("[Client ", id, "] WebSocket handshake started")
+						_log(MCPLogger.Level.DEBUG, "_process", "WebSocket handshake started", {"client_id": id})
 					else:
-						print("[Client ", id, "] Failed to start WebSocket handshake")
+						_log(MCPLogger.Level.WARN, "_process", "Failed to start WebSocket handshake", {"client_id": id})
 						ids_to_remove.append(id)
 				else:
-					print("[Client ", id, "] TCP disconnected during handshake")
+					_log(MCPLogger.Level.WARN, "_process", "TCP disconnected during handshake", {"client_id": id})
 					ids_to_remove.append(id)
 		
 		elif client.state == 0: # Connected
@@ -158,7 +224,7 @@ func _process(_delta):
 			# Check state
 			var ws_state = client.ws.get_ready_state()
 			if ws_state != WebSocketPeer.STATE_OPEN:
-				print("[Client ", id, "] WebSocket connection closed, state: ", ws_state)
+				_log(MCPLogger.Level.INFO, "_process", "WebSocket connection closed", {"client_id": id, "state": ws_state})
 				emit_signal("client_disconnected", id)
 				ids_to_remove.append(id)
 				continue
@@ -168,22 +234,20 @@ func _process(_delta):
 				var packet = client.ws.get_packet()
 				var text = packet.get_string_from_utf8()
 				
-				print("[Client ", id, "] RECEIVED RAW DATA: ", text)
+				_log(MCPLogger.Level.DEBUG, "_process", "Received frame", {"client_id": id, "data": text})
 				
 				# Parse as JSON
 				var json = JSON.new()
 				var parse_result = json.parse(text)
-				_log(id, "JSON parse result: " + str(parse_result))
 				
 				if parse_result == OK:
 					var data = json.get_data()
-					_log(id, "Parsed JSON: " + str(data))
 					
 					# Handle JSON-RPC protocol
 					if data.has("jsonrpc") and data.get("jsonrpc") == "2.0":
 						# Handle ping method
 						if data.has("method") and data.get("method") == "ping":
-							print("[Client ", id, "] Received PING with id: ", data.get("id"))
+							_log(MCPLogger.Level.DEBUG, "_process", "Received ping", {"client_id": id, "request_id": data.get("id")})
 							var response = {
 								"jsonrpc": "2.0",
 								"id": data.get("id"),
@@ -191,7 +255,7 @@ func _process(_delta):
 							}
 							var response_text = JSON.stringify(response)
 							var send_result = client.ws.send_text(response_text)
-							print("[Client ", id, "] SENDING PING RESPONSE: ", response_text, " (result: ", send_result, ")")
+							_log(MCPLogger.Level.DEBUG, "_process", "Sent ping response", {"client_id": id, "data": response_text, "result": send_result})
 						
 						# Handle other MCP commands via command handler
 						elif data.has("method"):
@@ -200,7 +264,7 @@ func _process(_delta):
 							var req_id = data.get("id")
 
 							if method_name == "":
-								print("[Client ", id, "] JSON-RPC method missing")
+								_log(MCPLogger.Level.WARN, "_process", "JSON-RPC method missing", {"client_id": id})
 								continue
 
 							var command_id: String = ""
@@ -213,7 +277,7 @@ func _process(_delta):
 								}
 
 							if typeof(params) != TYPE_DICTIONARY:
-								print("[Client ", id, "] JSON-RPC params not a dictionary, coercing to {}")
+								_log(MCPLogger.Level.WARN, "_process", "JSON-RPC params not a dictionary, coercing to {}", {"client_id": id})
 								params = {}
 
 							var command_payload := {
@@ -222,7 +286,7 @@ func _process(_delta):
 								"commandId": command_id
 							}
 
-							print("[Client ", id, "] Routing JSON-RPC method ", method_name, " with commandId ", command_id)
+							_log(MCPLogger.Level.DEBUG, "_process", "Routing JSON-RPC method", {"client_id": id, "method": method_name, "command_id": command_id})
 							emit_signal("command_received", id, command_payload)
 					
 					# Handle legacy command format - This is what Claude Code uses
@@ -231,22 +295,28 @@ func _process(_delta):
 						var params = data.get("params", {})
 						var cmd_id = data.get("commandId", "")
 						
-						print("[Client ", id, "] Processing command: ", cmd_type)
+						_log(MCPLogger.Level.DEBUG, "_process", "Processing command", {"client_id": id, "command_type": cmd_type})
 						
 						# Route command to command handler via signal
 						# The command handler will handle the response via send_response
 						emit_signal("command_received", id, data)
 				else:
-					print("[Client ", id, "] Failed to parse JSON: ", json.get_error_message())
+					_log(MCPLogger.Level.WARN, "_process", "Failed to parse JSON", {"client_id": id, "error_message": json.get_error_message(), "data": text})
 	
 	# Remove clients that need to be removed
 	for id in ids_to_remove:
 		clients.erase(id)
+		event_hub.remove_client(id)
+		command_handler.remove_client(id)
+	
+	if event_hub.has_subscribers():
+		_poll_play_state()
+		event_hub.flush(send_response)
 
 # Function for command handler to send responses back to clients
 func send_response(client_id: int, response: Dictionary) -> int:
 	if not clients.has(client_id):
-		print("Error: Client %d not found" % client_id)
+		_log(MCPLogger.Level.ERROR, "send_response", "Client not found", {"client_id": client_id})
 		return ERR_DOES_NOT_EXIST
 
 	var client = clients[client_id]
@@ -279,25 +349,43 @@ func send_response(client_id: int, response: Dictionary) -> int:
 
 		var envelope_text = JSON.stringify(envelope)
 		if client.ws.get_ready_state() != WebSocketPeer.STATE_OPEN:
-			print("Error: Client %d connection not open" % client_id)
+			_log(MCPLogger.Level.ERROR, "send_response", "Client connection not open", {"client_id": client_id})
 			return ERR_UNAVAILABLE
 
 		var envelope_result = client.ws.send_text(envelope_text)
 		if envelope_result != OK:
-			print("Error sending JSON-RPC response to client %d: %d" % [client_id, envelope_result])
+			_log(MCPLogger.Level.ERROR, "send_response", "Failed to send JSON-RPC response", {"client_id": client_id, "error_code": envelope_result})
 		return envelope_result
 
 	var json_text = JSON.stringify(response)
 
-	print("Sending response to client %d: %s" % [client_id, json_text])
+	_log(MCPLogger.Level.DEBUG, "send_response", "Sending response", {"client_id": client_id, "data": json_text})
 
 	if client.ws.get_ready_state() != WebSocketPeer.STATE_OPEN:
-		print("Error: Client %d connection not open" % client_id)
+		_log(MCPLogger.Level.ERROR, "send_response", "Client connection not open", {"client_id": client_id})
 		return ERR_UNAVAILABLE
 
 	var result = client.ws.send_text(json_text)
 	if result != OK:
-		print("Error sending response to client %d: %d" % [client_id, result])
+		_log(MCPLogger.Level.ERROR, "send_response", "Failed to send response", {"client_id": client_id, "error_code": result})
+
+	return result
+
+# Binary frames come from MCPBinaryCodec for requests with "encoding": "binary".
+func send_binary_response(client_id: int, frame: PackedByteArray) -> int:
+	if not clients.has(client_id):
+		_log(MCPLogger.Level.ERROR, "send_binary_response", "Client not found", {"client_id": client_id})
+		return ERR_DOES_NOT_EXIST
+
+	var client = clients[client_id]
+	if client.ws.get_ready_state() != WebSocketPeer.STATE_OPEN:
+		_log(MCPLogger.Level.ERROR, "send_binary_response", "Client connection not open", {"client_id": client_id})
+		return ERR_UNAVAILABLE
+
+	_log(MCPLogger.Level.DEBUG, "send_binary_response", "Sending binary response", {"client_id": client_id, "bytes": frame.size()})
+	var result = client.ws.send(frame, WebSocketPeer.WRITE_MODE_BINARY)
+	if result != OK:
+		_log(MCPLogger.Level.ERROR, "send_binary_response", "Failed to send binary response", {"client_id": client_id, "error_code": result})
 
 	return result
 
@@ -308,7 +396,7 @@ func stop_server() -> void:
 	if is_server_active():
 		tcp_server.stop()
 		clients.clear()
-		print("MCP WebSocket server stopped")
+		_log(MCPLogger.Level.INFO, "stop_server", "MCP WebSocket server stopped")
 		
 func get_port() -> int:
 	return port
@@ -0,0 +1,219 @@
+@tool
+class_name MCPBinaryCodec
+extends RefCounted
+
+# Binary reply frames for requests that carry "encoding": "binary".  Numeric
+# arrays travel as raw little-endian typed arrays behind a small JSON header
+# instead of as JSON text:
+#
+#   0  "GMB1"
+#   4  uint32  length H of the JSON header
+#   8  H bytes of UTF-8 JSON header, zero-padded to a multiple of 8
+#   D  typed arrays, each starting 8-byte aligned
+#
+# The header is the response with each packed array replaced by
+#   {"$typed": "u8"|"i16"|"i32"|"f32"|"f64", "offset": bytes from D, "length": n}
+# and each array of dictionaries that share their keys, at least one of them
+# numeric, replaced by
+#   {"$table": n, "columns": {key: placeholder, nested table or JSON array}}
+# Integers use the narrowest of u8/i16/i32 that holds them (f64 beyond
+# that).  Arrays with floats use f32 when every value survives the round
+# trip through it, as the components of Godot's vectors do, and f64
+# otherwise; arrays that not even f64 holds exactly (integers beyond 2^53)
+# stay JSON, so a binary reply decodes to the same values as the JSON one.
+# Packed vector and colour arrays become tables of x/y/z/w or r/g/b/a
+# columns.
+# godot_ws/binary.py decodes it and godot_ws/binary_bench.py measures it.
+
+const MAGIC := "GMB1"
+const ALIGNMENT := 8
+const MIN_PACKED_LENGTH := 8
+const INT32_MIN := -2147483648
+const INT32_MAX := 2147483647
+# Every integer up to this magnitude is exact in a float64.
+const F64_EXACT_INT := 9007199254740992
+const ELEMENT_SIZES := {"u8": 1, "i16": 2, "i32": 4, "f32": 4, "f64": 8}
+const VECTOR_COMPONENTS := {
+	TYPE_PACKED_VECTOR2_ARRAY: ["x", "y"],
+	TYPE_PACKED_VECTOR3_ARRAY: ["x", "y", "z"],
+	TYPE_PACKED_VECTOR4_ARRAY: ["x", "y", "z", "w"],
+	TYPE_PACKED_COLOR_ARRAY: ["r", "g", "b", "a"],
+}
+
+
+# Returns the frame, or an empty array when nothing in the response packs
+# and it should go out as text.
+static func encode(response: Dictionary) -> PackedByteArray:
+	var state := {"buffers": [], "size": 0}
+	var header = _pack(response, state)
+	if state["buffers"].is_empty():
+		return PackedByteArray()
+
+	var header_bytes := JSON.stringify(header).to_utf8_buffer()
+	var frame := MAGIC.to_ascii_buffer()
+	frame.resize(8)
+	frame.encode_u32(4, header_bytes.size())
+	frame.append_array(header_bytes)
+	frame.resize(_aligned(frame.size()))
+	for buffer in state["buffers"]:
+		frame.append_array(buffer)
+		frame.resize(_aligned(frame.size()))
+	return frame
+
+
+static func _aligned(size: int) -> int:
+	return (size + ALIGNMENT - 1) & ~(ALIGNMENT - 1)
+
+
+static func _pack(value, state: Dictionary):
+	var value_type := typeof(value)
+	if value_type == TYPE_DICTIONARY:
+		var packed := {}
+		for key in value:
+			packed[key] = _pack(value[key], state)
+		return packed
+	if value_type == TYPE_ARRAY:
+		if value.size() >= MIN_PACKED_LENGTH:
+			return _emit(_plan(value), state)
+		return _pack_elements(value, state)
+	# Every type from TYPE_PACKED_BYTE_ARRAY on is a packed array.
+	if value_type < TYPE_PACKED_BYTE_ARRAY or value.size() < MIN_PACKED_LENGTH:
+		return value
+	match value_type:
+		TYPE_PACKED_BYTE_ARRAY:
+			return _typed(_column("u8", value), state)
+		TYPE_PACKED_INT32_ARRAY:
+			return _typed(_column("i32", value.to_byte_array()), state)
+		TYPE_PACKED_FLOAT32_ARRAY:
+			return _typed(_column("f32", value.to_byte_array()), state)
+		TYPE_PACKED_FLOAT64_ARRAY:
+			return _typed(_column("f64", value.to_byte_array()), state)
+		TYPE_PACKED_INT64_ARRAY:
+			var column = _numeric_column(Array(value))
+			return value if column == null else _emit(column, state)
+	if VECTOR_COMPONENTS.has(value_type):
+		return _emit(_vector_table(value, VECTOR_COMPONENTS[value_type]), state)
+	return value
+
+
+static func _pack_elements(values: Array, state: Dictionary) -> Array:
+	var packed := []
+	packed.resize(values.size())
+	for index in values.size():
+		packed[index] = _pack(values[index], state)
+	return packed
+
+
+# Plans an array without writing anything, so a table that turns out not to
+# pack leaves no orphaned buffers.  Returns a column {"dtype", "bytes"}, a
+# table {"length", "columns"}, or the array unchanged.
+static func _plan(rows: Array):
+	var first = rows[0]
+	var first_type := typeof(first)
+	if first_type == TYPE_INT or first_type == TYPE_FLOAT:
+		var column = _numeric_column(rows)
+		return rows if column == null else column
+	if first_type != TYPE_DICTIONARY or first.is_empty():
+		return rows
+
+	var keys: Array = first.keys()
+	for row in rows:
+		if typeof(row) != TYPE_DICTIONARY or row.size() != keys.size():
+			return rows
+	var columns := {}
+	var packs := false
+	for key in keys:
+		var column := []
+		column.resize(rows.size())
+		for index in rows.size():
+			var row: Dictionary = rows[index]
+			if not row.has(key):
+				return rows
+			column[index] = row[key]
+		var plan = _plan(column)
+		packs = packs or typeof(plan) != TYPE_ARRAY
+		columns[key] = plan
+	if not packs:
+		return rows
+	return {"length": rows.size(), "columns": columns}
+
+
+static func _numeric_column(values: Array):
+	var all_ints := true
+	var low := 0
+	var high := 0
+	for value in values:
+		var value_type := typeof(value)
+		if value_type == TYPE_FLOAT:
+			all_ints = false
+		elif value_type != TYPE_INT:
+			return null
+		elif all_ints:
+			low = mini(low, value)
+			high = maxi(high, value)
+
+	if not all_ints:
+		return _float_column(values)
+	if low >= 0 and high <= 0xFF:
+		return _column("u8", PackedByteArray(values))
+	if low >= -0x8000 and high <= 0x7FFF:
+		var bytes := PackedByteArray()
+		bytes.resize(values.size() * 2)
+		for index in values.size():
+			bytes.encode_s16(index * 2, values[index])
+		return _column("i16", bytes)
+	if low >= INT32_MIN and high <= INT32_MAX:
+		return _column("i32", PackedInt32Array(values).to_byte_array())
+	return _float_column(values)
+
+
+# f32 when every value comes back unchanged from it, else f64, else null
+# for integers that a float64 would round.
+static func _float_column(values):
+	for value in values:
+		if typeof(value) == TYPE_INT and absi(value) > F64_EXACT_INT:
+			return null
+	var narrow := PackedFloat32Array(values)
+	for index in narrow.size():
+		if narrow[index] != values[index]:
+			return _column("f64", PackedFloat64Array(values).to_byte_array())
+	return _column("f32", narrow.to_byte_array())
+
+
+# Components are checked like any float column, for double-precision builds.
+static func _vector_table(vectors, components: Array) -> Dictionary:
+	var columns := {}
+	for component_index in components.size():
+		var column := PackedFloat64Array()
+		column.resize(vectors.size())
+		for index in vectors.size():
+			column[index] = vectors[index][component_index]
+		columns[components[component_index]] = _float_column(column)
+	return {"length": vectors.size(), "columns": columns}
+
+
+static func _column(dtype: String, bytes: PackedByteArray) -> Dictionary:
+	return {"dtype": dtype, "bytes": bytes}
+
+
+static func _emit(plan, state: Dictionary):
+	if typeof(plan) == TYPE_ARRAY:
+		return _pack_elements(plan, state)
+	if plan.has("dtype"):
+		return _typed(plan, state)
+	var columns := {}
+	for key in plan["columns"]:
+		columns[key] = _emit(plan["columns"][key], state)
+	return {"$table": plan["length"], "columns": columns}
+
+
+static func _typed(column: Dictionary, state: Dictionary) -> Dictionary:
+	var bytes: PackedByteArray = column["bytes"]
+	var placeholder := {
+		"$typed": column["dtype"],
+		"offset": state["size"],
+		"length": bytes.size() / ELEMENT_SIZES[column["dtype"]],
+	}
+	state["buffers"].append(bytes)
+	state["size"] += _aligned(bytes.size())
+	return placeholder
@@ -0,0 +1,113 @@
+@tool
+class_name MCPEventHub
+extends RefCounted
+
+# Editor events pushed to the clients that subscribed to them with
+# subscribe_events, as frames without a commandId:
+#
+#   {"type": "event", "event": "selection_changed", "seq": 12,
+#    "data": {...}, "coalesced": 3}
+#
+# mcp_server.gd publishes events from the editor's signals and flushes the
+# queues from _process at most every FLUSH_INTERVAL_MSEC.  A client's queue
+# holds one frame per event name: an event that fires again before the
+# flush replaces the queued data and counts in "coalesced", so a burst of
+# selection changes costs one frame.  "data" names what changed; clients
+# read the new state with the matching get_* command once per event rather
+# than polling for it.
+
+const FRAME_TYPE := "event"
+const FLUSH_INTERVAL_MSEC := 50
+const EVENTS := [
+	"selection_changed",
+	"scene_changed",
+	"scene_saved",
+	"scene_edited",
+	"script_changed",
+	"filesystem_changed",
+	"play_state_changed",
+]
+
+# Client id -> {event name: true}.
+var _subscriptions := {}
+# Client id -> {event name: {"data", "coalesced"}}; insertion order is the
+# order the events first fired in.
+var _queues := {}
+var _seq := 0
+var _last_flush := 0
+
+
+# Subscribes client_id to events (every event when empty) and returns the
+# events it is now subscribed to, or an error string for an unknown name.
+func subscribe(client_id: int, events: Array):
+	for event in events:
+		if not EVENTS.has(event):
+			return "Unknown event: %s (expected one of %s)" % [event, ", ".join(PackedStringArray(EVENTS))]
+	var subscribed: Dictionary = _subscriptions.get(client_id, {})
+	for event in (EVENTS if events.is_empty() else events):
+		subscribed[event] = true
+	_subscriptions[client_id] = subscribed
+	return subscribed.keys()
+
+
+# Unsubscribes client_id from events (every event when empty) and returns the
+# events it is still subscribed to.
+func unsubscribe(client_id: int, events: Array) -> Array:
+	if not _subscriptions.has(client_id):
+		return []
+	var subscribed: Dictionary = _subscriptions[client_id]
+	for event in (EVENTS if events.is_empty() else events):
+		subscribed.erase(event)
+		if _queues.has(client_id):
+			_queues[client_id].erase(event)
+	if subscribed.is_empty():
+		remove_client(client_id)
+		return []
+	return subscribed.keys()
+
+
+func remove_client(client_id: int) -> void:
+	_subscriptions.erase(client_id)
+	_queues.erase(client_id)
+
+
+func has_subscribers() -> bool:
+	return not _subscriptions.is_empty()
+
+
+func publish(event: String, data: Dictionary = {}) -> void:
+	for client_id in _subscriptions:
+		if not _subscriptions[client_id].has(event):
+			continue
+		if not _queues.has(client_id):
+			_queues[client_id] = {}
+		var queue: Dictionary = _queues[client_id]
+		if queue.has(event):
+			queue[event]["data"] = data
+			queue[event]["coalesced"] += 1
+		else:
+			queue[event] = {"data": data, "coalesced": 0}
+
+
+# Sends the queued frames through send(client_id, frame) once the flush
+# interval has passed.
+func flush(send: Callable) -> void:
+	if _queues.is_empty():
+		return
+	var now := Time.get_ticks_msec()
+	if now - _last_flush < FLUSH_INTERVAL_MSEC:
+		return
+	_last_flush = now
+	var queues := _queues
+	_queues = {}
+	for client_id in queues:
+		var queue: Dictionary = queues[client_id]
+		for event in queue:
+			_seq += 1
+			send.call(client_id, {
+				"type": FRAME_TYPE,
+				"event": event,
+				"seq": _seq,
+				"data": queue[event]["data"],
+				"coalesced": queue[event]["coalesced"],
+			})
@@ -0,0 +1,266 @@
+@tool
+class_name MCPFileIndex
+extends RefCounted
+
+# Index of the project's files for list_project_files, get_project_structure
+# and list_project_resources, read from EditorFileSystem's in-memory tree
+# instead of walking res:// with DirAccess.
+#
+# Paths are bucketed by lower-case extension and by resource type, and every
+# bucket is kept sorted, so the files under a directory form one contiguous
+# range found by binary search.  A page of a query therefore costs the page
+# size plus a few lookups, not the project size.
+#
+# mcp_server.gd attaches the editor's EditorFileSystem.  filesystem_changed
+# does not say what changed, so it only marks the index stale and the next
+# query rebuilds it from the editor's tree without touching the disk;
+# resources_reimported updates the types of the reimported files in place.
+# Like the file system dock, the index leaves out hidden files, .godot,
+# directories with a .gdignore and import sidecar files.
+
+const ROOT := "res://"
+# Sorts after every character that can follow a directory prefix.
+const RANGE_END := "\U10FFFF"
+
+static var _filesystem: EditorFileSystem = null
+static var _stale := true
+static var _all: Array = []
+static var _directories: Array = []
+static var _by_extension := {}
+static var _by_type := {}
+# Path -> resource type, to move a reimported file between type buckets.
+static var _types := {}
+static var _builds := 0
+
+
+static func attach(filesystem: EditorFileSystem) -> void:
+	_filesystem = filesystem
+	_stale = true
+
+
+static func detach() -> void:
+	_filesystem = null
+	_stale = true
+	_all = []
+	_directories = []
+	_by_extension = {}
+	_by_type = {}
+	_types = {}
+
+
+static func mark_stale() -> void:
+	_stale = true
+
+
+# Returns false when there is no editor file system to read from.
+static func ensure_ready() -> bool:
+	if not _stale:
+		return true
+	if _filesystem == null or _filesystem.get_filesystem() == null:
+		return false
+	_rebuild(_filesystem.get_filesystem())
+	return true
+
+
+static func update_files(paths) -> void:
+	if _stale or _filesystem == null:
+		return
+	for path in paths:
+		var type := String(_filesystem.get_file_type(path))
+		if not _types.has(path):
+			_insert(_all, path)
+			_insert(_bucket(_by_extension, _extension(path)), path)
+		elif _types[path] == type:
+			continue
+		else:
+			_erase(_by_type[_types[path]], path)
+		_types[path] = type
+		_insert(_bucket(_by_type, type), path)
+
+
+# Files under directory with one of extensions (any when empty) whose type is
+# type or inherits from it (any when empty), in path order.  limit 0 returns
+# every match from offset.  Returns {"files", "total", "offset"} plus
+# "next_offset" while more files remain.
+static func query(extensions: Array = [], directory: String = ROOT, type: String = "", offset: int = 0, limit: int = 0) -> Dictionary:
+	var prefix := normalize_directory(directory)
+	var sources: Array = []
+	if type != "":
+		var wanted := {}
+		for extension in extensions:
+			wanted[normalize_extension(extension)] = true
+		for bucket_type in _by_type:
+			if bucket_type == type or ClassDB.is_parent_class(bucket_type, type):
+				var bucket: Array = _by_type[bucket_type]
+				if not wanted.is_empty():
+					bucket = bucket.filter(func(path): return wanted.has(_extension(path)))
+				sources.append(bucket)
+	elif not extensions.is_empty():
+		var seen := {}
+		for extension in extensions:
+			var key := normalize_extension(extension)
+			if _by_extension.has(key) and not seen.has(key):
+				seen[key] = true
+				sources.append(_by_extension[key])
+	else:
+		sources.append(_all)
+
+	var ranges: Array = []
+	var total := 0
+	for source in sources:
+		var bounds := _range(source, prefix)
+		if bounds.y > bounds.x:
+			ranges.append([source, bounds.x, bounds.y])
+			total += bounds.y - bounds.x
+
+	offset = clampi(offset, 0, total)
+	var count := total - offset if limit <= 0 else mini(limit, total - offset)
+	var files: Array = []
+	if ranges.size() == 1:
+		var only: Array = ranges[0]
+		files = only[0].slice(only[1] + offset, only[1] + offset + count)
+	elif count > 0:
+		files = _merge(ranges, offset + count).slice(offset)
+
+	var result := {"files": files, "total": total, "offset": offset}
+	if offset + count < total:
+		result["next_offset"] = offset + count
+	return result
+
+
+# Directories under directory (excluding itself) in path order, paged like
+# query, with file counts by extension and by type for the whole subtree.
+static func structure(directory: String = ROOT, offset: int = 0, limit: int = 0) -> Dictionary:
+	var prefix := normalize_directory(directory)
+	var bounds := _range(_directories, prefix)
+	if prefix == ROOT or (bounds.y > bounds.x and _directories[bounds.x] == prefix):
+		bounds.x += 1
+	var total := maxi(bounds.y - bounds.x, 0)
+	offset = clampi(offset, 0, total)
+	var count := total - offset if limit <= 0 else mini(limit, total - offset)
+	var files := _range(_all, prefix)
+
+	var result := {
+		"directory": prefix,
+		"directories": _directories.slice(bounds.x + offset, bounds.x + offset + count),
+		"directory_total": total,
+		"offset": offset,
+		"file_counts": _counts(_by_extension, prefix),
+		"type_counts": _counts(_by_type, prefix),
+		"total_files": files.y - files.x,
+	}
+	if offset + count < total:
+		result["next_offset"] = offset + count
+	return result
+
+
+static func normalize_directory(directory: String) -> String:
+	var prefix := directory.strip_edges()
+	if prefix == "" or prefix == ROOT:
+		return ROOT
+	if not prefix.begins_with(ROOT):
+		prefix = ROOT + prefix.trim_prefix("/")
+	return prefix if prefix.ends_with("/") else prefix + "/"
+
+
+static func normalize_extension(extension) -> String:
+	return str(extension).strip_edges().trim_prefix("*").trim_prefix(".").to_lower()
+
+
+static func stats() -> Dictionary:
+	return {
+		"files": _all.size(),
+		"directories": _directories.size(),
+		"extensions": _by_extension.size(),
+		"types": _by_type.size(),
+		"stale": _stale,
+		"builds": _builds,
+	}
+
+
+static func _rebuild(root: EditorFileSystemDirectory) -> void:
+	_all = []
+	_directories = []
+	_by_extension = {}
+	_by_type = {}
+	_types = {}
+	_collect(root)
+	_all.sort()
+	_directories.sort()
+	for bucket in _by_extension.values():
+		bucket.sort()
+	for bucket in _by_type.values():
+		bucket.sort()
+	_stale = false
+	_builds += 1
+
+
+static func _collect(directory: EditorFileSystemDirectory) -> void:
+	var path := directory.get_path()
+	_directories.append(path if path.ends_with("/") else path + "/")
+	for index in directory.get_file_count():
+		var file_path := directory.get_file_path(index)
+		var type := String(directory.get_file_type(index))
+		_all.append(file_path)
+		_types[file_path] = type
+		_bucket(_by_extension, _extension(file_path)).append(file_path)
+		_bucket(_by_type, type).append(file_path)
+	for index in directory.get_subdir_count():
+		_collect(directory.get_subdir(index))
+
+
+static func _extension(path: String) -> String:
+	return path.get_extension().to_lower()
+
+
+static func _bucket(buckets: Dictionary, key: String) -> Array:
+	if not buckets.has(key):
+		buckets[key] = []
+	return buckets[key]
+
+
+static func _insert(sorted: Array, path: String) -> void:
+	var index := sorted.bsearch(path)
+	if index >= sorted.size() or sorted[index] != path:
+		sorted.insert(index, path)
+
+
+static func _erase(sorted: Array, path: String) -> void:
+	var index := sorted.bsearch(path)
+	if index < sorted.size() and sorted[index] == path:
+		sorted.remove_at(index)
+
+
+# Index range [x, y) of the paths in sorted that start with prefix.
+static func _range(sorted: Array, prefix: String) -> Vector2i:
+	if prefix == ROOT:
+		return Vector2i(0, sorted.size())
+	return Vector2i(sorted.bsearch(prefix), sorted.bsearch(prefix + RANGE_END))
+
+
+static func _counts(buckets: Dictionary, prefix: String) -> Dictionary:
+	var counts := {}
+	for key in buckets:
+		var bounds := _range(buckets[key], prefix)
+		if bounds.y > bounds.x:
+			counts[key] = bounds.y - bounds.x
+	return counts
+
+
+# The first count paths of several sorted ranges, merged in path order.
+static func _merge(ranges: Array, count: int) -> Array:
+	var merged: Array = []
+	var cursors: Array = []
+	for entry in ranges:
+		cursors.append(entry[1])
+	while merged.size() < count:
+		var best := -1
+		for index in ranges.size():
+			var entry: Array = ranges[index]
+			if cursors[index] < entry[2] and (best < 0 or entry[0][cursors[index]] < ranges[best][0][cursors[best]]):
+				best = index
+		if best < 0:
+			break
+		merged.append(ranges[best][0][cursors[best]])
+		cursors[best] += 1
+	return merged
@@ -0,0 +1,297 @@
+@tool
+class_name MCPGridMapCells
+extends RefCounted
+
+# Compact GridMap edits for paint_gridmap_cells and clear_gridmap_cells.
+#
+# Cells are handled as flat PackedInt32Arrays of STRIDE ints per cell
+# (x, y, z, item, orientation) rather than one Dictionary per cell.  Requests
+# can send them directly as "packed_cells" (a JSON number array or base64 of
+# little-endian int32s) or describe them as box, line and fill regions that
+# are expanded here.  plan() turns the requested cells into the do and undo
+# arrays of a single undo action, and an instance of this class is the
+# target of that action: apply() writes a whole array in one call.
+
+const STRIDE := 5
+const POSITION_STRIDE := 3
+const MAX_REGION_CELLS := 1 << 20
+const DEFAULT_FILL_LIMIT := 65536
+const FILL_STEPS := [Vector3i.LEFT, Vector3i.RIGHT, Vector3i.FORWARD, Vector3i.BACK]
+
+
+func apply(grid_map: GridMap, cells: PackedInt32Array) -> void:
+	if not is_instance_valid(grid_map):
+		return
+	for index in range(0, cells.size(), STRIDE):
+		grid_map.set_cell_item(
+			Vector3i(cells[index], cells[index + 1], cells[index + 2]),
+			cells[index + 3],
+			cells[index + 4]
+		)
+
+
+static func append_cell(cells: PackedInt32Array, position: Vector3i, item: int, orientation: int) -> void:
+	cells.append(position.x)
+	cells.append(position.y)
+	cells.append(position.z)
+	cells.append(item)
+	cells.append(orientation)
+
+
+# Reads "packed_cells": stride ints per cell, either as a JSON number array
+# or as a base64 string of little-endian int32s.  Positions-only input
+# (stride 3, for clearing) is widened to empty cells.
+static func decode_packed(value, stride: int) -> Dictionary:
+	var ints: PackedInt32Array
+	match typeof(value):
+		TYPE_PACKED_INT32_ARRAY:
+			ints = value
+		TYPE_ARRAY, TYPE_PACKED_INT64_ARRAY, TYPE_PACKED_FLOAT32_ARRAY, TYPE_PACKED_FLOAT64_ARRAY:
+			ints = PackedInt32Array(value)
+		TYPE_STRING:
+			var raw := Marshalls.base64_to_raw(value)
+			if raw.size() % 4 != 0:
+				return {"ok": false, "error": "packed_cells base64 must decode to whole int32 values"}
+			ints = raw.to_int32_array()
+		_:
+			return {"ok": false, "error": "packed_cells must be an array of integers or a base64 string"}
+
+	if ints.size() % stride != 0:
+		return {"ok": false, "error": "packed_cells must hold %d integers per cell" % stride}
+	if stride == STRIDE:
+		return {"ok": true, "cells": ints}
+
+	var cells := PackedInt32Array()
+	cells.resize(ints.size() / stride * STRIDE)
+	var out := 0
+	for index in range(0, ints.size(), stride):
+		cells[out] = ints[index]
+		cells[out + 1] = ints[index + 1]
+		cells[out + 2] = ints[index + 2]
+		cells[out + 3] = GridMap.INVALID_CELL_ITEM
+		cells[out + 4] = 0
+		out += STRIDE
+	return {"ok": true, "cells": cells}
+
+
+# Expands box, line and fill regions into cells.  When clearing, every cell
+# gets the empty item and "item"/"orientation" are ignored.
+static func expand_regions(grid_map: GridMap, regions: Array, clearing: bool, cells: PackedInt32Array) -> Dictionary:
+	for index in regions.size():
+		var region = regions[index]
+		if typeof(region) != TYPE_DICTIONARY:
+			return {"ok": false, "error": "Each GridMap region must be a dictionary", "index": index}
+
+		var item := GridMap.INVALID_CELL_ITEM
+		var orientation := 0
+		if not clearing:
+			if not _is_number(region.get("item")):
+				return {"ok": false, "error": "GridMap region must include an integer item id", "index": index}
+			item = int(region["item"])
+			var orientation_value = region.get("orientation", 0)
+			if not _is_number(orientation_value):
+				return {"ok": false, "error": "GridMap region orientation must be an integer", "index": index}
+			orientation = int(orientation_value)
+
+		var result: Dictionary
+		match String(region.get("shape", "")):
+			"box":
+				result = _expand_box(region, item, orientation, cells)
+			"line":
+				result = _expand_line(region, item, orientation, cells)
+			"fill":
+				result = _expand_fill(grid_map, region, item, orientation, cells)
+			_:
+				result = {"ok": false, "error": "GridMap region shape must be box, line or fill"}
+		if not result["ok"]:
+			result["index"] = index
+			return result
+		if cells.size() / STRIDE > MAX_REGION_CELLS:
+			return {"ok": false, "error": "GridMap regions expand to more than %d cells" % MAX_REGION_CELLS, "index": index}
+	return {"ok": true}
+
+
+# Compares the requested cells with the map and returns the do and undo
+# arrays of the cells that actually change.  A cell requested twice keeps
+# its last value.  Items other than the empty one must exist in the
+# GridMap's MeshLibrary.
+static func plan(grid_map: GridMap, cells: PackedInt32Array) -> Dictionary:
+	var mesh_library := grid_map.mesh_library
+	var do_cells := PackedInt32Array()
+	var undo_cells := PackedInt32Array()
+	var slots := {}
+	var checked_items := {}
+	for index in range(0, cells.size(), STRIDE):
+		var position := Vector3i(cells[index], cells[index + 1], cells[index + 2])
+		var item := cells[index + 3]
+		var orientation := cells[index + 4]
+		if item < 0:
+			item = GridMap.INVALID_CELL_ITEM
+			orientation = 0
+
+		if item != GridMap.INVALID_CELL_ITEM and not checked_items.has(item):
+			if mesh_library == null:
+				return {"ok": false, "error": "GridMap has no MeshLibrary configured", "index": index / STRIDE}
+			if not mesh_library.has_item(item):
+				return {"ok": false, "error": "MeshLibrary does not contain the requested item", "index": index / STRIDE, "item": item}
+			checked_items[item] = true
+
+		if slots.has(position):
+			var slot: int = slots[position]
+			do_cells[slot + 3] = item
+			do_cells[slot + 4] = orientation
+			continue
+
+		slots[position] = do_cells.size()
+		append_cell(do_cells, position, item, orientation)
+		var previous_item := grid_map.get_cell_item(position)
+		append_cell(undo_cells, position, previous_item, maxi(grid_map.get_cell_item_orientation(position), 0))
+
+	# Drop the cells that already hold what was asked for.
+	var kept := 0
+	for index in range(0, do_cells.size(), STRIDE):
+		var unchanged := do_cells[index + 3] == undo_cells[index + 3]
+		if unchanged and do_cells[index + 3] != GridMap.INVALID_CELL_ITEM:
+			unchanged = do_cells[index + 4] == undo_cells[index + 4]
+		if unchanged:
+			continue
+		if kept != index:
+			for offset in STRIDE:
+				do_cells[kept + offset] = do_cells[index + offset]
+				undo_cells[kept + offset] = undo_cells[index + offset]
+		kept += STRIDE
+	do_cells.resize(kept)
+	undo_cells.resize(kept)
+	return {"ok": true, "do": do_cells, "undo": undo_cells}
+
+
+# Describes up to limit changes the way the commands always have, plus the
+# bounding box of all of them.
+static func describe_changes(do_cells: PackedInt32Array, undo_cells: PackedInt32Array, clearing: bool, limit: int) -> Dictionary:
+	var changes := []
+	var low := Vector3i.ZERO
+	var high := Vector3i.ZERO
+	for index in range(0, do_cells.size(), STRIDE):
+		var position := Vector3i(do_cells[index], do_cells[index + 1], do_cells[index + 2])
+		if index == 0:
+			low = position
+			high = position
+		else:
+			low = low.min(position)
+			high = high.max(position)
+		if changes.size() >= limit:
+			continue
+		var change := {"position": _position_dictionary(position), "previous_orientation": undo_cells[index + 4]}
+		if clearing:
+			change["cleared_item"] = undo_cells[index + 3]
+		else:
+			change["previous_item"] = undo_cells[index + 3]
+			change["item"] = do_cells[index + 3]
+			change["orientation"] = do_cells[index + 4]
+		changes.append(change)
+
+	var description := {"changes": changes, "change_count": do_cells.size() / STRIDE}
+	if not do_cells.is_empty():
+		description["bounds"] = {"from": _position_dictionary(low), "to": _position_dictionary(high)}
+	return description
+
+
+static func _expand_box(region: Dictionary, item: int, orientation: int, cells: PackedInt32Array) -> Dictionary:
+	var from = _position(region.get("from"))
+	var to = _position(region.get("to"))
+	if from == null or to == null:
+		return {"ok": false, "error": "GridMap box region requires from and to positions"}
+	var low: Vector3i = from.min(to)
+	var high: Vector3i = from.max(to)
+	var size := high - low + Vector3i.ONE
+	if size.x * size.y * size.z > MAX_REGION_CELLS:
+		return {"ok": false, "error": "GridMap box region covers more than %d cells" % MAX_REGION_CELLS}
+	for y in range(low.y, high.y + 1):
+		for z in range(low.z, high.z + 1):
+			for x in range(low.x, high.x + 1):
+				append_cell(cells, Vector3i(x, y, z), item, orientation)
+	return {"ok": true}
+
+
+static func _expand_line(region: Dictionary, item: int, orientation: int, cells: PackedInt32Array) -> Dictionary:
+	var from = _position(region.get("from"))
+	var to = _position(region.get("to"))
+	if from == null or to == null:
+		return {"ok": false, "error": "GridMap line region requires from and to positions"}
+	var delta: Vector3i = to - from
+	var steps := maxi(absi(delta.x), maxi(absi(delta.y), absi(delta.z)))
+	if steps >= MAX_REGION_CELLS:
+		return {"ok": false, "error": "GridMap line region covers more than %d cells" % MAX_REGION_CELLS}
+	for step in steps + 1:
+		var weight := 0.0 if steps == 0 else float(step) / steps
+		append_cell(cells, Vector3i((Vector3(from) + Vector3(delta) * weight).round()), item, orientation)
+	return {"ok": true}
+
+
+# Flood fills the horizontal layer of "origin": every cell 4-connected to it
+# that holds the same item as the origin, inside the optional "bounds".
+static func _expand_fill(grid_map: GridMap, region: Dictionary, item: int, orientation: int, cells: PackedInt32Array) -> Dictionary:
+	var origin = _position(region.get("origin"))
+	if origin == null:
+		return {"ok": false, "error": "GridMap fill region requires an origin position"}
+	var low = null
+	var high = null
+	var bounds = region.get("bounds")
+	if bounds != null:
+		if typeof(bounds) != TYPE_DICTIONARY:
+			return {"ok": false, "error": "GridMap fill bounds must be a dictionary with from and to"}
+		var bounds_from = _position(bounds.get("from"))
+		var bounds_to = _position(bounds.get("to"))
+		if bounds_from == null or bounds_to == null:
+			return {"ok": false, "error": "GridMap fill bounds require from and to positions"}
+		low = bounds_from.min(bounds_to)
+		high = bounds_from.max(bounds_to)
+	var limit_value = region.get("max_cells", DEFAULT_FILL_LIMIT)
+	if not _is_number(limit_value):
+		return {"ok": false, "error": "GridMap fill max_cells must be an integer"}
+	var limit := clampi(int(limit_value), 1, MAX_REGION_CELLS)
+
+	var replaced := grid_map.get_cell_item(origin)
+	var visited := {origin: true}
+	var frontier: Array[Vector3i] = [origin]
+	var count := 0
+	while not frontier.is_empty():
+		var cell: Vector3i = frontier.pop_back()
+		count += 1
+		if count > limit:
+			return {"ok": false, "error": "GridMap fill region exceeded %d cells; give it bounds or a larger max_cells" % limit}
+		append_cell(cells, cell, item, orientation)
+		for step in FILL_STEPS:
+			var next: Vector3i = cell + step
+			if visited.has(next):
+				continue
+			if low != null and (next.x < low.x or next.z < low.z or next.x > high.x or next.z > high.z):
+				continue
+			if grid_map.get_cell_item(next) != replaced:
+				continue
+			visited[next] = true
+			frontier.append(next)
+	return {"ok": true}
+
+
+static func _position(value) -> Variant:
+	match typeof(value):
+		TYPE_VECTOR3I:
+			return value
+		TYPE_VECTOR3:
+			return Vector3i(value.round())
+		TYPE_DICTIONARY:
+			if _is_number(value.get("x")) and _is_number(value.get("y")) and _is_number(value.get("z")):
+				return Vector3i(roundi(value["x"]), roundi(value["y"]), roundi(value["z"]))
+		TYPE_ARRAY:
+			if value.size() == 3 and _is_number(value[0]) and _is_number(value[1]) and _is_number(value[2]):
+				return Vector3i(roundi(value[0]), roundi(value[1]), roundi(value[2]))
+	return null
+
+
+static func _is_number(value) -> bool:
+	return typeof(value) == TYPE_INT or typeof(value) == TYPE_FLOAT
+
+
+static func _position_dictionary(position: Vector3i) -> Dictionary:
+	return {"x": position.x, "y": position.y, "z": position.z}
@@ -0,0 +1,169 @@
+@tool
+class_name MCPLogger
+extends RefCounted
+
+# Leveled, sampled, buffered structured logging shared by the addon scripts.
+#
+# record() checks the level and the section's sample rate before doing any
+# work, so a dropped entry costs one comparison and is never stringified.
+# Kept entries wait in a fixed-size ring buffer and are serialised when it
+# is flushed: once flush_batch entries are waiting, on the next tick() after
+# flush_interval_msec, or at once for an error.  If the buffer fills before
+# a flush, the oldest entries are overwritten and counted as dropped.  Each
+# payload value is stringified once and cut to max_value_chars.
+#
+# The defaults come from the same environment variables as the TS server
+# (server/src/utils/logger.ts):
+#   GODOT_MCP_LOG_LEVEL      debug | info | warn | error | off   (warn)
+#   GODOT_MCP_LOG_SAMPLE     section=N,...  keep 1 in N non-error entries
+#   GODOT_MCP_LOG_MAX_CHARS  truncate longer values               (512)
+
+enum Level { DEBUG, INFO, WARN, ERROR, OFF }
+
+const LEVEL_NAMES := ["debug", "info", "warn", "error", "off"]
+const ECHO_PREFIX := "[Continuous skepticism (Sherlock Protocol)]"
+# Written as-is; every other field (the message and the extras) is truncated.
+const FIXED_FIELDS := [
+	"filename", "timestamp", "ticks_usec", "classname", "function", "system_section",
+	"line_num", "error", "level", "db_phase", "method",
+]
+
+static var level: int = Level.WARN
+static var sample_every := {}
+static var max_value_chars := 512
+static var buffer_capacity := 512
+static var flush_batch := 64
+static var flush_interval_msec := 250
+static var echo := true
+
+static var _configured := false
+static var _buffer: Array = []
+static var _head := 0
+static var _count := 0
+static var _dropped := 0
+static var _sample_counters := {}
+static var _last_flush_msec := 0
+
+
+static func configure(environment: Dictionary = {}) -> void:
+	var level_name := str(environment.get("GODOT_MCP_LOG_LEVEL", OS.get_environment("GODOT_MCP_LOG_LEVEL")))
+	var level_index := LEVEL_NAMES.find(level_name.strip_edges().to_lower())
+	if level_index >= 0:
+		level = level_index
+
+	var sample_spec := str(environment.get("GODOT_MCP_LOG_SAMPLE", OS.get_environment("GODOT_MCP_LOG_SAMPLE")))
+	for item in sample_spec.split(",", false):
+		var parts: PackedStringArray = item.split("=")
+		if parts.size() == 2 and parts[1].strip_edges().is_valid_int():
+			sample_every[parts[0].strip_edges()] = maxi(1, parts[1].strip_edges().to_int())
+
+	var max_chars := str(environment.get("GODOT_MCP_LOG_MAX_CHARS", OS.get_environment("GODOT_MCP_LOG_MAX_CHARS")))
+	if max_chars.is_valid_int():
+		max_value_chars = max_chars.to_int()
+
+	_buffer.resize(buffer_capacity)
+	_configured = true
+
+
+static func enabled(log_level: int) -> bool:
+	if not _configured:
+		configure()
+	return log_level >= level and level != Level.OFF
+
+
+static func record(log_level: int, section: String, filename: String, classname: String, function_name: String, message: String, extra: Dictionary = {}, line_number: int = 0) -> void:
+	if not enabled(log_level):
+		return
+	if log_level < Level.ERROR and sample_every.has(section):
+		var seen: int = _sample_counters.get(section, 0)
+		_sample_counters[section] = seen + 1
+		if seen % int(sample_every[section]) != 0:
+			return
+
+	var entry := {
+		"filename": filename,
+		"timestamp": Time.get_unix_time_from_system(),
+		"ticks_usec": Time.get_ticks_usec(),
+		"classname": classname,
+		"function": function_name,
+		"system_section": section,
+		"line_num": line_number,
+		"error": log_level >= Level.ERROR,
+		"level": LEVEL_NAMES[log_level],
+		"message": message,
+	}
+	for key in extra.keys():
+		if not entry.has(key) or (key == "line_num" and line_number == 0):
+			entry[key] = extra[key]
+	if not entry.has("db_phase"):
+		entry["db_phase"] = "none"
+	if not entry.has("method"):
+		entry["method"] = "NONE"
+
+	if _count == buffer_capacity:
+		_head = (_head + 1) % buffer_capacity
+		_count -= 1
+		_dropped += 1
+	_buffer[(_head + _count) % buffer_capacity] = entry
+	_count += 1
+
+	if _count >= flush_batch or log_level >= Level.ERROR:
+		flush()
+
+
+# Called every frame by the plugin; flushes entries older than the interval.
+static func tick() -> void:
+	if _count > 0 and Time.get_ticks_msec() - _last_flush_msec >= flush_interval_msec:
+		flush()
+
+
+static func flush() -> void:
+	_last_flush_msec = Time.get_ticks_msec()
+	if _count == 0 and _dropped == 0:
+		return
+
+	var lines := PackedStringArray()
+	if _dropped > 0:
+		lines.append(JSON.stringify({
+			"classname": "MCPLogger",
+			"system_section": "logging",
+			"level": "warn",
+			"error": false,
+			"message": "Log buffer overflowed",
+			"dropped": _dropped,
+		}))
+		_dropped = 0
+	while _count > 0:
+		var entry: Dictionary = _buffer[_head]
+		_buffer[_head] = null
+		_head = (_head + 1) % buffer_capacity
+		_count -= 1
+		entry["timestamp"] = Time.get_datetime_string_from_unix_time(int(entry["timestamp"]))
+		lines.append(_serialize(entry))
+		if echo:
+			lines.append("%s %s" % [ECHO_PREFIX, entry.get("message", "")])
+	print("\n".join(lines))
+
+
+static func truncate(text: String) -> String:
+	if max_value_chars <= 0 or text.length() <= max_value_chars:
+		return text
+	return "%s...(+%d chars)" % [text.left(max_value_chars), text.length() - max_value_chars]
+
+
+static func _serialize(entry: Dictionary) -> String:
+	var fields := PackedStringArray()
+	for key in entry.keys():
+		var value = entry[key]
+		var text := ""
+		if key in FIXED_FIELDS:
+			text = JSON.stringify(value)
+		elif typeof(value) in [TYPE_STRING, TYPE_STRING_NAME, TYPE_NODE_PATH]:
+			text = JSON.stringify(truncate(str(value)))
+		else:
+			# Containers are cut as text; the reader sees where the payload stopped.
+			text = JSON.stringify(value)
+			if max_value_chars > 0 and text.length() > max_value_chars:
+				text = JSON.stringify(truncate(text))
+		fields.append("%s:%s" % [JSON.stringify(str(key)), text])
+	return "{%s}" % ",".join(fields)
@@ -0,0 +1,129 @@
+@tool
+class_name MCPResponseStream
+extends RefCounted
+
+# Sends one command result as a sequence of text chunks instead of a single
+# frame, for requests that carry "chunkSize" in their envelope:
+#
+#   {"status": "chunk", "commandId": id, "seq": 0, "data": "<JSON text>"}
+#   ...
+#   {"status": "success", "commandId": id, "final": true, "chunks": n}
+#
+# Concatenating every "data" in seq order gives the JSON encoding of the
+# result.  The result is encoded while it is walked: dictionaries and arrays
+# down to MAX_SPLIT_DEPTH are written piece by piece and packed arrays in
+# slices, so only about one chunk of text is held at a time rather than the
+# whole encoded payload.  The stream waits for the next frame after every
+# chunk it sends, which keeps the editor responsive during large replies.
+
+const MIN_CHUNK_SIZE := 1024
+const MAX_CHUNK_SIZE := 1024 * 1024
+# Containers nested deeper than this are encoded in one piece.
+const MAX_SPLIT_DEPTH := 3
+const PACKED_SLICE := 4096
+const PACKED_TYPES := [
+	TYPE_PACKED_BYTE_ARRAY, TYPE_PACKED_INT32_ARRAY, TYPE_PACKED_INT64_ARRAY,
+	TYPE_PACKED_FLOAT32_ARRAY, TYPE_PACKED_FLOAT64_ARRAY, TYPE_PACKED_STRING_ARRAY,
+]
+
+var _tree: SceneTree
+# func(frame: Dictionary) -> int, usually the server's send_response.
+var _send: Callable
+var _command_id: String
+var _chunk_size: int
+var _parts := PackedStringArray()
+var _pending_chars := 0
+var _seq := 0
+var _error := OK
+
+
+static func clamp_chunk_size(value) -> int:
+	return clampi(int(value), MIN_CHUNK_SIZE, MAX_CHUNK_SIZE)
+
+
+func _init(tree: SceneTree, send: Callable, command_id: String, chunk_size: int) -> void:
+	_tree = tree
+	_send = send
+	_command_id = command_id
+	_chunk_size = clamp_chunk_size(chunk_size)
+
+
+# Coroutine; returns OK once the final frame is sent, or the first send error.
+func send(result) -> int:
+	await _write(result, 0)
+	if _error == OK:
+		await _flush(true)
+	if _error == OK:
+		_emit({"status": "success", "commandId": _command_id, "final": true, "chunks": _seq})
+	return _error
+
+
+func chunk_count() -> int:
+	return _seq
+
+
+func _write(value, depth: int) -> void:
+	if _error != OK:
+		return
+	var value_type := typeof(value)
+	if value_type == TYPE_DICTIONARY and depth < MAX_SPLIT_DEPTH:
+		_append("{")
+		var first := true
+		for key in value:
+			_append(("%s:" if first else ",%s:") % JSON.stringify(str(key)))
+			first = false
+			await _write(value[key], depth + 1)
+			await _flush(false)
+		_append("}")
+	elif value_type == TYPE_ARRAY and depth < MAX_SPLIT_DEPTH:
+		_append("[")
+		for index in value.size():
+			if index > 0:
+				_append(",")
+			await _write(value[index], depth + 1)
+			await _flush(false)
+		_append("]")
+	elif value_type in PACKED_TYPES and value.size() > PACKED_SLICE:
+		_append("[")
+		for start in range(0, value.size(), PACKED_SLICE):
+			if start > 0:
+				_append(",")
+			var text := JSON.stringify(value.slice(start, start + PACKED_SLICE))
+			_append(text.substr(1, text.length() - 2))
+			await _flush(false)
+		_append("]")
+	else:
+		_append(JSON.stringify(value))
+
+
+func _append(text: String) -> void:
+	_parts.append(text)
+	_pending_chars += text.length()
+
+
+# Sends every full chunk, or everything left when `final` is set, and waits a
+# frame after each one.
+func _flush(final: bool) -> void:
+	if _error != OK or _pending_chars < (1 if final else _chunk_size):
+		return
+	var text := "".join(_parts)
+	_parts.clear()
+	_pending_chars = 0
+	var offset := 0
+	while text.length() - offset >= _chunk_size or (final and offset < text.length()):
+		var data := text.substr(offset, _chunk_size)
+		offset += data.length()
+		_emit({"status": "chunk", "commandId": _command_id, "seq": _seq, "data": data})
+		_seq += 1
+		if _error != OK:
+			return
+		await _tree.process_frame
+	if offset < text.length():
+		_append(text.substr(offset))
+
+
+func _emit(frame: Dictionary) -> void:
+	if not _send.is_valid():
+		_error = ERR_UNAVAILABLE
+		return
+	_error = _send.call(frame)
@@ -0,0 +1,91 @@
+@tool
+class_name MCPResultCache
+extends RefCounted
+
+# LRU cache for command results that are expensive to rebuild but only change
+# when files do, such as scene structures.  Project listings come from
+# MCPFileIndex instead.
+#
+# Each entry is tagged with the file it was built from and a stamp (the
+# file's modification time, or 0).  mcp_server.gd drops a file's entries on
+# EditorPlugin.resource_saved; the stamp catches edits made outside the
+# editor.  Entries built by instantiating a scene also depend on the
+# scenes it instances, so they are dropped whenever any resource is saved.
+# The cache is bounded by entry count and by the encoded size of the values.
+
+const ANY_PATH := ""
+
+static var max_entries := 128
+static var max_bytes := 16 * 1024 * 1024
+
+# Key -> {"path", "stamp", "value", "bytes"}; insertion order is LRU order.
+static var _entries := {}
+static var _bytes := 0
+static var _hits := 0
+static var _misses := 0
+static var _evictions := 0
+
+
+static func file_stamp(path: String) -> int:
+	return FileAccess.get_modified_time(path) if FileAccess.file_exists(path) else 0
+
+
+# Returns the cached value, or null on a miss or a stale stamp.  Callers must
+# not modify the returned value.
+static func lookup(key: String, stamp: int = 0):
+	if not _entries.has(key):
+		_misses += 1
+		return null
+	var entry: Dictionary = _entries[key]
+	if entry["stamp"] != stamp:
+		_remove(key)
+		_misses += 1
+		return null
+	_entries.erase(key)
+	_entries[key] = entry
+	_hits += 1
+	return entry["value"]
+
+
+static func store(key: String, path: String, stamp: int, value) -> void:
+	var size := var_to_bytes(value).size()
+	if _entries.has(key):
+		_remove(key)
+	if size > max_bytes:
+		return
+	_entries[key] = {"path": path, "stamp": stamp, "value": value, "bytes": size}
+	_bytes += size
+	while _entries.size() > max_entries or _bytes > max_bytes:
+		for oldest in _entries:
+			_remove(oldest)
+			break
+		_evictions += 1
+
+
+static func invalidate_path(path: String) -> void:
+	for key in _entries.keys():
+		var entry_path: String = _entries[key]["path"]
+		if entry_path == path or entry_path == ANY_PATH:
+			_remove(key)
+
+
+static func clear() -> void:
+	_entries.clear()
+	_bytes = 0
+
+
+static func stats() -> Dictionary:
+	return {
+		"entries": _entries.size(),
+		"bytes": _bytes,
+		"hits": _hits,
+		"misses": _misses,
+		"evictions": _evictions,
+		"max_entries": max_entries,
+		"max_bytes": max_bytes,
+	}
+
+
+static func _remove(key: String) -> void:
+	_bytes -= int(_entries[key]["bytes"])
+	_entries.erase(key)
@@ -0,0 +1,191 @@
+@tool
+class_name MCPSceneSnapshots
+extends RefCounted
+
+# Baselines for snapshot_scene_state deltas.
+#
+# Every snapshot is kept as a baseline with an id, up to MAX_BASELINES of
+# them.  A baseline maps node paths to the entries that were sent for them.
+# A baseline taken from a delta shares the unchanged entries with the one
+# before it, so it costs about the size of the delta.
+#
+# Baselines also collect the paths of nodes that may have changed since they
+# were taken.  mcp_server.gd reports the scene tree's node_added and
+# node_removed signals, and MCPSceneTransactionManager reports the nodes its
+# transactions edit, so a delta serializes only those nodes.  Other changes
+# arrive without saying what they touched: renames, undo and redo, and
+# inspector or viewport edits (an EditorUndoRedoManager version change
+# outside a transaction), and editor scripts.  They mark the baseline
+# untracked, and its next delta compares every node instead.
+
+const MAX_BASELINES := 4
+
+# Id -> {"id", "root_id", "options", "nodes", "dirty", "untracked"}; insertion
+# order is age order.  Entries in "nodes" are shared and never modified.
+static var _baselines := {}
+static var _next_id := 1
+static var _tracked_depth := 0
+
+
+static func store(root: Node, options: Dictionary, nodes: Dictionary) -> int:
+	var id := _next_id
+	_next_id += 1
+	_baselines[id] = {
+		"id": id,
+		"root_id": root.get_instance_id(),
+		"options": options.duplicate(),
+		"nodes": nodes,
+		"dirty": {},
+		"untracked": false,
+	}
+	while _baselines.size() > MAX_BASELINES:
+		for oldest in _baselines:
+			_baselines.erase(oldest)
+			break
+	return id
+
+
+static func lookup(id: int) -> Dictionary:
+	return _baselines.get(id, {})
+
+
+# Why baseline cannot serve a delta for root with options, or "" if it can.
+static func mismatch(baseline: Dictionary, root: Node, options: Dictionary) -> String:
+	if baseline.is_empty():
+		return "unknown_baseline"
+	if baseline["root_id"] != root.get_instance_id():
+		return "scene_changed"
+	if baseline["options"] != options:
+		return "options_changed"
+	return ""
+
+
+# Applies updates (path -> new entry, or null for a node that is gone or out
+# of range) to baseline.  Returns the resulting "nodes" and the "added"
+# entries, "removed" paths and "changed" diffs.
+static func apply(baseline: Dictionary, updates: Dictionary) -> Dictionary:
+	var nodes: Dictionary = baseline["nodes"].duplicate()
+	var added: Array = []
+	var removed: Array = []
+	var changed: Array = []
+	for path in updates:
+		var entry = updates[path]
+		var previous = nodes.get(path)
+		if entry == null:
+			if previous != null:
+				removed.append(path)
+				nodes.erase(path)
+		elif previous == null:
+			added.append(entry)
+			nodes[path] = entry
+		else:
+			var diff := diff_entry(previous, entry)
+			if not diff.is_empty():
+				changed.append(diff)
+				nodes[path] = entry
+	removed.sort()
+	return {"nodes": nodes, "added": added, "removed": removed, "changed": changed}
+
+
+# The fields and properties of entry that differ from previous, as
+# {"path", <changed fields>, "properties"?, "removed_fields"?,
+# "removed_properties"?}, or {} when they are equal.
+static func diff_entry(previous: Dictionary, entry: Dictionary) -> Dictionary:
+	var diff := {}
+	var removed_fields: Array = []
+	for key in entry:
+		if key == "properties" or (previous.has(key) and previous[key] == entry[key]):
+			continue
+		diff[key] = entry[key]
+	for key in previous:
+		if key != "properties" and not entry.has(key):
+			removed_fields.append(key)
+
+	var old_properties: Dictionary = previous.get("properties", {})
+	var new_properties: Dictionary = entry.get("properties", {})
+	var properties := {}
+	var removed_properties: Array = []
+	for property in new_properties:
+		if not old_properties.has(property) or old_properties[property] != new_properties[property]:
+			properties[property] = new_properties[property]
+	for property in old_properties:
+		if not new_properties.has(property):
+			removed_properties.append(property)
+
+	if not properties.is_empty():
+		diff["properties"] = properties
+	if not removed_fields.is_empty():
+		diff["removed_fields"] = removed_fields
+	if not removed_properties.is_empty():
+		diff["removed_properties"] = removed_properties
+	if not diff.is_empty():
+		diff["path"] = entry["path"]
+	return diff
+
+
+# node_added / node_removed: the node and its parent's child count changed.
+static func note_node(node: Node) -> void:
+	if _baselines.is_empty():
+		return
+	for baseline in _matching(node):
+		if baseline["root_id"] == node.get_instance_id():
+			baseline["untracked"] = true
+			continue
+		baseline["dirty"][str(node.get_path())] = true
+		baseline["dirty"][str(node.get_parent().get_path())] = true
+
+
+# A rename moves the paths of a whole subtree.
+static func note_renamed(node: Node) -> void:
+	for baseline in _matching(node):
+		baseline["untracked"] = true
+
+
+# EditorUndoRedoManager.version_changed.  Transactions report their own nodes,
+# so a version change while one commits is already accounted for.
+static func note_version_changed() -> void:
+	if _tracked_depth == 0:
+		mark_untracked()
+
+
+static func mark_untracked() -> void:
+	for baseline in _baselines.values():
+		baseline["untracked"] = true
+
+
+# Called around a transaction's commit with the objects it edits.  Objects
+# that are not nodes are attributed to context when it is a node.  Nodes
+# outside the tree are reported by node_added once they enter it.
+static func begin_tracked(targets: Array, context: Object = null) -> void:
+	_tracked_depth += 1
+	if _baselines.is_empty():
+		return
+	for target in targets:
+		if target == null:
+			continue
+		var node = target if target is Node else context
+		if not (node is Node):
+			mark_untracked()
+			return
+		if node.is_inside_tree():
+			for baseline in _matching(node):
+				baseline["dirty"][str(node.get_path())] = true
+
+
+static func end_tracked() -> void:
+	_tracked_depth = maxi(_tracked_depth - 1, 0)
+
+
+static func clear() -> void:
+	_baselines.clear()
+	_tracked_depth = 0
+
+
+# Baselines whose scene contains node.
+static func _matching(node: Node) -> Array:
+	var matching: Array = []
+	for baseline in _baselines.values():
+		var root = instance_from_id(baseline["root_id"])
+		if root is Node and (root == node or root.is_ancestor_of(node)):
+			matching.append(baseline)
+	return matching
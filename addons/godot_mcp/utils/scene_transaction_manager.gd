@@ -12,6 +12,9 @@ class SceneTransaction extends RefCounted:
 	var transaction_id: String
 	var action_name: String
 	var metadata: Dictionary
+	# Decides the undo history of the action when its methods target helper
+	# objects rather than scene nodes.
+	var context: Object
 	var _undo_redo: EditorUndoRedoManager
 	var _do_methods: Array = []
 	var _undo_methods: Array = []
@@ -109,7 +112,7 @@ class SceneTransaction extends RefCounted:
 			_is_committed = false
 			return true
 
-		_undo_redo.create_action(action_name)
+		_undo_redo.create_action(action_name, UndoRedo.MERGE_DISABLE, context)
 		if metadata.size() > 0:
 			_undo_redo.set_action_metadata(metadata)
 
@@ -124,7 +127,14 @@ class SceneTransaction extends RefCounted:
 		for reference in _do_references:
 			_undo_redo.add_do_reference(reference)
 
+		var targets: Array = []
+		for entry in _do_methods:
+			targets.append(entry.target)
+		for entry in _do_properties:
+			targets.append(entry.target)
+		MCPSceneSnapshots.begin_tracked(targets, context)
 		_undo_redo.commit_action()
+		MCPSceneSnapshots.end_tracked()
 		_is_active = false
 		_is_committed = true
 
@@ -296,22 +306,5 @@ static func _get_undo_redo():
 	return null
 
 static func _log(message: String, function_name: String, extra: Dictionary = {}, is_error: bool = false) -> void:
-	var payload := {
-		"filename": LOG_FILENAME,
-		"timestamp": Time.get_datetime_string_from_system(true, true),
-		"classname": "MCPSceneTransactionManager",
-		"function": function_name,
-		"system_section": extra.get("system_section", DEFAULT_SYSTEM_SECTION),
-		"line_num": extra.get("line_num", 0),
-		"error": is_error ? message : "",
-		"db_phase": extra.get("db_phase", "none"),
-		"method": extra.get("method", "NONE"),
-		"message": message,
-	}
-
-	for key in extra.keys():
-		if not payload.has(key):
-			payload[key] = extra[key]
-
-	print(JSON.stringify(payload))
-	print("[Continuous skepticism (Sherlock Protocol)] %s" % message)
+	var log_level := MCPLogger.Level.ERROR if is_error else MCPLogger.Level.INFO
+	MCPLogger.record(log_level, extra.get("system_section", DEFAULT_SYSTEM_SECTION), LOG_FILENAME, "MCPSceneTransactionManager", function_name, message, extra)
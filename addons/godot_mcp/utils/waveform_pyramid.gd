@@ -0,0 +1,320 @@
+@tool
+class_name MCPWaveformPyramid
+extends RefCounted
+
+# Multi-resolution min/max/RMS envelopes of PCM AudioStreamWAV resources for
+# analyze_waveform.
+#
+# The PCM data is decoded once per asset into level 0, with one bin per
+# BASE_BIN_FRAMES frames, and each further level halves the bin count until
+# a single bin covers the whole stream.  Every level holds one
+# PackedFloat32Array per channel of (min, max, mean, rms) per bin.  Any bin
+# count over any window is then answered from the coarsest level that still
+# has LEVEL_BINS_PER_ENTRY bins per requested one, so an entry's min and max
+# reach at most an eighth of its width past its edges, and its RMS counts
+# only the frames of the edge bins that fall inside it.  Entries narrower
+# than LEVEL_BINS_PER_ENTRY level 0 bins are decoded directly.
+#
+# Pyramids persist in CACHE_DIR under the hash of the imported data, so they
+# survive editor restarts and are rebuilt when the source or its import
+# settings change, and are kept in MCPResultCache while in use.
+# Silence ratios and zero crossings depend on the threshold, so they are
+# stored per threshold and scanned again only for a new one.
+
+const BASE_BIN_FRAMES := 256
+const VALUES_PER_BIN := 4
+const LEVEL_BINS_PER_ENTRY := 8
+const CACHE_DIR := "res://.godot/mcp_waveforms"
+const CACHE_EXTENSION := ".wfp"
+const FORMAT_VERSION := 1
+const MEMORY_KEY_PREFIX := "waveform_pyramid:"
+
+
+static func supports(stream) -> bool:
+	if not (stream is AudioStreamWAV):
+		return false
+	var format: int = stream.format
+	return format == AudioStreamWAV.FORMAT_8_BITS or format == AudioStreamWAV.FORMAT_16_BITS
+
+
+# Returns {"pyramid": Dictionary, "cache": "memory" | "disk" | "built"} and
+# makes sure the pyramid holds statistics for silence_threshold.  refresh
+# ignores cached pyramids and rebuilds.
+static func fetch(path: String, stream: AudioStreamWAV, silence_threshold: float, refresh: bool = false) -> Dictionary:
+	var memory_key := MEMORY_KEY_PREFIX + path
+	# Reimporting with new settings rewrites the .import file, not the source.
+	var stamp := maxi(MCPResultCache.file_stamp(path), MCPResultCache.file_stamp(path + ".import"))
+	var source := "memory"
+	var pyramid = null if refresh else MCPResultCache.lookup(memory_key, stamp)
+	if pyramid == null:
+		var data_hash := import_hash(path)
+		source = "disk"
+		pyramid = null if refresh else _load(data_hash)
+		if pyramid == null or pyramid.get("version") != FORMAT_VERSION:
+			pyramid = build(stream, silence_threshold)
+			pyramid["hash"] = data_hash
+			source = "built"
+			_save(pyramid)
+		MCPResultCache.store(memory_key, path, stamp, pyramid)
+
+	var threshold_key := str(silence_threshold)
+	if not pyramid["thresholds"].has(threshold_key):
+		var scanned := _scan(stream, pyramid["channel_count"], silence_threshold, false)
+		pyramid = pyramid.duplicate()
+		pyramid["thresholds"] = pyramid["thresholds"].duplicate()
+		pyramid["thresholds"][threshold_key] = scanned["threshold_stats"]
+		_save(pyramid)
+		MCPResultCache.store(memory_key, path, stamp, pyramid)
+	return {"pyramid": pyramid, "cache": source}
+
+
+static func build(stream: AudioStreamWAV, silence_threshold: float) -> Dictionary:
+	var channel_count := 2 if stream.stereo else 1
+	var scanned := _scan(stream, channel_count, silence_threshold, true)
+	var frames: int = scanned["frames"]
+	var levels: Array = [scanned["bins"]]
+	var bin_frames := BASE_BIN_FRAMES
+	while bin_frames < frames:
+		levels.append(_halve(levels[-1], bin_frames, frames))
+		bin_frames *= 2
+	return {
+		"version": FORMAT_VERSION,
+		"hash": "",
+		"channel_count": channel_count,
+		"frames": frames,
+		"levels": levels,
+		"thresholds": {str(silence_threshold): scanned["threshold_stats"]},
+	}
+
+
+# Hash of the data the importer produced, read from the .md5 file next to
+# the imported resource, falling back to the source file's own MD5.
+static func import_hash(path: String) -> String:
+	var import_config := ConfigFile.new()
+	if import_config.load(path + ".import") == OK:
+		var imported_path := String(import_config.get_value("remap", "path", ""))
+		if not imported_path.is_empty():
+			var md5_config := ConfigFile.new()
+			if md5_config.load(imported_path.get_basename() + ".md5") == OK:
+				var data_hash := String(md5_config.get_value("", "dest_md5", md5_config.get_value("", "source_md5", "")))
+				if not data_hash.is_empty():
+					return data_hash
+	return FileAccess.get_md5(path)
+
+
+# Per-channel statistics of the whole stream for silence_threshold, which
+# fetch() has already scanned.
+static func summarize(pyramid: Dictionary, silence_threshold: float) -> Array:
+	var top: Array = pyramid["levels"][-1]
+	var threshold_stats: Array = pyramid["thresholds"][str(silence_threshold)]
+	var summaries := []
+	for channel_index in pyramid["channel_count"]:
+		var bin: PackedFloat32Array = top[channel_index]
+		var stats: Dictionary = threshold_stats[channel_index]
+		summaries.append({
+			"min": bin[0],
+			"max": bin[1],
+			"mean": bin[2],
+			"rms": bin[3],
+			"peak": maxf(absf(bin[0]), absf(bin[1])),
+			"silent": stats["silent"],
+			"zero_crossings": stats["zero_crossings"],
+		})
+	return summaries
+
+
+# bins envelope entries per channel for frames [start_frame, end_frame).
+# Returns {"channels": [[{"min", "max", "rms", "samples"}, ...], ...],
+# "level": index or -1 when decoded directly, "frames_per_bin"}.
+static func envelope(pyramid: Dictionary, stream: AudioStreamWAV, start_frame: int, end_frame: int, bins: int) -> Dictionary:
+	var span := end_frame - start_frame
+	var frames_per_bin := float(span) / bins
+	var level := -1
+	var level_frames := 1
+	if frames_per_bin >= BASE_BIN_FRAMES * LEVEL_BINS_PER_ENTRY:
+		level = 0
+		level_frames = BASE_BIN_FRAMES
+		while level + 1 < pyramid["levels"].size() and level_frames * 2 * LEVEL_BINS_PER_ENTRY <= frames_per_bin:
+			level += 1
+			level_frames *= 2
+
+	var channels := []
+	if level < 0:
+		channels = _decode_envelope(stream, pyramid["channel_count"], start_frame, end_frame, bins)
+	else:
+		var frames: int = pyramid["frames"]
+		for channel_bins in pyramid["levels"][level]:
+			var entries := []
+			for bin_index in bins:
+				var first := start_frame + span * bin_index / bins
+				var last := start_frame + span * (bin_index + 1) / bins
+				entries.append(_merge_range(channel_bins, first, last, level_frames, frames))
+			channels.append(entries)
+	return {
+		"channels": channels,
+		"level": level,
+		"frames_per_bin": level_frames,
+	}
+
+
+# Merges the bins covering frames [first, last).  Edge bins contribute their
+# whole min and max but only their frames inside the range to the RMS.
+static func _merge_range(channel_bins: PackedFloat32Array, first: int, last: int, bin_frames: int, frames: int) -> Dictionary:
+	if last <= first:
+		return {"min": 0.0, "max": 0.0, "rms": 0.0, "samples": 0}
+	var low := 1.0
+	var high := -1.0
+	var sum_sq := 0.0
+	for bin_index in range(first / bin_frames, (last - 1) / bin_frames + 1):
+		var offset := bin_index * VALUES_PER_BIN
+		var bin_start := bin_index * bin_frames
+		var count := mini(mini(bin_start + bin_frames, frames), last) - maxi(bin_start, first)
+		low = minf(low, channel_bins[offset])
+		high = maxf(high, channel_bins[offset + 1])
+		sum_sq += channel_bins[offset + 3] * channel_bins[offset + 3] * count
+	return {"min": low, "max": high, "rms": sqrt(sum_sq / (last - first)), "samples": last - first}
+
+
+static func _halve(level: Array, bin_frames: int, frames: int) -> Array:
+	var halved := []
+	for channel_bins in level:
+		var bin_count: int = channel_bins.size() / VALUES_PER_BIN
+		var merged := PackedFloat32Array()
+		merged.resize((bin_count + 1) / 2 * VALUES_PER_BIN)
+		for index in range(0, bin_count, 2):
+			var left := index * VALUES_PER_BIN
+			var out := index / 2 * VALUES_PER_BIN
+			if index + 1 == bin_count:
+				for value_index in VALUES_PER_BIN:
+					merged[out + value_index] = channel_bins[left + value_index]
+				continue
+			var right := left + VALUES_PER_BIN
+			var left_count := float(bin_frames)
+			var right_count := float(mini(bin_frames, frames - (index + 1) * bin_frames))
+			var total := left_count + right_count
+			merged[out] = minf(channel_bins[left], channel_bins[right])
+			merged[out + 1] = maxf(channel_bins[left + 1], channel_bins[right + 1])
+			merged[out + 2] = (channel_bins[left + 2] * left_count + channel_bins[right + 2] * right_count) / total
+			merged[out + 3] = sqrt(
+				(channel_bins[left + 3] * channel_bins[left + 3] * left_count
+				+ channel_bins[right + 3] * channel_bins[right + 3] * right_count) / total
+			)
+		halved.append(merged)
+	return halved
+
+
+# One pass over the PCM data per channel.  Always counts silent samples and
+# zero crossings for silence_threshold; with build_bins also fills level 0.
+static func _scan(stream: AudioStreamWAV, channel_count: int, silence_threshold: float, build_bins: bool) -> Dictionary:
+	var data := stream.data
+	var sixteen_bit := stream.format == AudioStreamWAV.FORMAT_16_BITS
+	var bytes_per_sample := 2 if sixteen_bit else 1
+	var stride := bytes_per_sample * channel_count
+	var frames := data.size() / stride
+	var bin_count := ceili(float(frames) / BASE_BIN_FRAMES)
+
+	var bins := []
+	var threshold_stats := []
+	for channel_index in channel_count:
+		var channel_bins := PackedFloat32Array()
+		if build_bins:
+			channel_bins.resize(bin_count * VALUES_PER_BIN)
+		var silent := 0
+		var zero_crossings := 0
+		var previous_sign := 0
+		var bin_min := 1.0
+		var bin_max := -1.0
+		var bin_sum := 0.0
+		var bin_sum_sq := 0.0
+		var offset := channel_index * bytes_per_sample
+		for frame_index in frames:
+			var value := data.decode_s16(offset) / 32768.0 if sixteen_bit else data.decode_s8(offset) / 128.0
+			offset += stride
+
+			if absf(value) <= silence_threshold:
+				silent += 1
+			var sign := 0
+			if value > silence_threshold:
+				sign = 1
+			elif value < -silence_threshold:
+				sign = -1
+			if sign != 0:
+				if previous_sign != 0 and sign != previous_sign:
+					zero_crossings += 1
+				previous_sign = sign
+
+			if not build_bins:
+				continue
+			bin_min = minf(bin_min, value)
+			bin_max = maxf(bin_max, value)
+			bin_sum += value
+			bin_sum_sq += value * value
+			if (frame_index + 1) % BASE_BIN_FRAMES == 0 or frame_index == frames - 1:
+				var count := frame_index % BASE_BIN_FRAMES + 1
+				var out := frame_index / BASE_BIN_FRAMES * VALUES_PER_BIN
+				channel_bins[out] = bin_min
+				channel_bins[out + 1] = bin_max
+				channel_bins[out + 2] = bin_sum / count
+				channel_bins[out + 3] = sqrt(bin_sum_sq / count)
+				bin_min = 1.0
+				bin_max = -1.0
+				bin_sum = 0.0
+				bin_sum_sq = 0.0
+		bins.append(channel_bins)
+		threshold_stats.append({"silent": silent, "zero_crossings": zero_crossings})
+	return {"frames": frames, "bins": bins, "threshold_stats": threshold_stats}
+
+
+# Envelope straight from the PCM data, for windows finer than level 0.
+static func _decode_envelope(stream: AudioStreamWAV, channel_count: int, start_frame: int, end_frame: int, bins: int) -> Array:
+	var data := stream.data
+	var sixteen_bit := stream.format == AudioStreamWAV.FORMAT_16_BITS
+	var bytes_per_sample := 2 if sixteen_bit else 1
+	var stride := bytes_per_sample * channel_count
+	var span := end_frame - start_frame
+	var channels := []
+	for channel_index in channel_count:
+		var entries := []
+		for bin_index in bins:
+			var first := start_frame + span * bin_index / bins
+			var last := start_frame + span * (bin_index + 1) / bins
+			if last <= first:
+				entries.append({"min": 0.0, "max": 0.0, "rms": 0.0, "samples": 0})
+				continue
+			var low := 1.0
+			var high := -1.0
+			var sum_sq := 0.0
+			var offset := first * stride + channel_index * bytes_per_sample
+			for frame_index in range(first, last):
+				var value := data.decode_s16(offset) / 32768.0 if sixteen_bit else data.decode_s8(offset) / 128.0
+				offset += stride
+				low = minf(low, value)
+				high = maxf(high, value)
+				sum_sq += value * value
+			entries.append({"min": low, "max": high, "rms": sqrt(sum_sq / (last - first)), "samples": last - first})
+		channels.append(entries)
+	return channels
+
+
+static func _cache_path(data_hash: String) -> String:
+	return CACHE_DIR.path_join(data_hash + CACHE_EXTENSION)
+
+
+static func _load(data_hash: String):
+	if data_hash.is_empty():
+		return null
+	var file := FileAccess.open(_cache_path(data_hash), FileAccess.READ)
+	if file == null:
+		return null
+	var pyramid = file.get_var()
+	return pyramid if typeof(pyramid) == TYPE_DICTIONARY else null
+
+
+static func _save(pyramid: Dictionary) -> void:
+	var data_hash := String(pyramid.get("hash", ""))
+	if data_hash.is_empty():
+		return
+	DirAccess.make_dir_recursive_absolute(ProjectSettings.globalize_path(CACHE_DIR))
+	var file := FileAccess.open(_cache_path(data_hash), FileAccess.WRITE)
+	if file != null:
+		file.store_var(pyramid)
@@ -108,7 +108,7 @@ func poll() -> void:
 			
 			if parse_result == OK:
 				var command = json.get_data()
-				print("Received command from client %d: %s" % [id, command])
+				MCPLogger.record(MCPLogger.Level.DEBUG, "websocket_server", "addons/godot_mcp/websocket_server.gd", "MCPWebSocketServer", "_process", "Received command", {"client_id": id, "data": text})
 				emit_signal("command_received", id, command)
 			else:
 				print("Error parsing JSON from client %d: %s at line %d" % 
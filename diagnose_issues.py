@@ -4,6 +4,9 @@
 import sys
 import re
 
+from gdtools.cli import ADDON_ROOT
+from gdtools.symbols import FUNC, extract_symbols
+
 def check_file(filepath):
     """Check for common GDScript syntax issues"""
     print(f"\n=== Checking {filepath} ===")
@@ -25,17 +28,16 @@ def check_file(filepath):
         if '?' in line and 'if' not in line:
             issues.append(f"Line {i}: Unexpected '?' - GDScript uses 'value if condition else other'")
             print(f"  Content: {line.rstrip()}")
-        
-        # Check for duplicate function definitions nearby
-        if line.strip().startswith('func '):
-            func_name = re.search(r'func\s+(\w+)', line)
-            if func_name:
-                func_name = func_name.group(1)
-                # Check if this function appears again soon after
-                for j in range(i, min(i + 100, len(lines))):
-                    if j != i - 1 and lines[j].strip().startswith(f'func {func_name}'):
-                        issues.append(f"Line {i} and {j+1}: Duplicate function definition '{func_name}'")
-                        break
+    
+    # Check for duplicate function definitions anywhere in the file
+    first_definition = {}
+    for symbol in extract_symbols("".join(lines), filepath):
+        if symbol.kind != FUNC:
+            continue
+        if symbol.name in first_definition:
+            issues.append(f"Line {first_definition[symbol.name]} and {symbol.line}: Duplicate function definition '{symbol.name}'")
+        else:
+            first_definition[symbol.name] = symbol.line
     
     # Check overall indentation consistency
     tab_lines = sum(1 for line in lines if line.startswith('\t'))
@@ -55,9 +57,9 @@ def check_file(filepath):
 
 if __name__ == "__main__":
     files = [
-        "/Users/raymondgonzalez/mcp/Godot-MCP/addons/godot_mcp/command_handler.gd",
-        "/Users/raymondgonzalez/mcp/Godot-MCP/addons/godot_mcp/commands/node_commands.gd",
-        "/Users/raymondgonzalez/mcp/Godot-MCP/addons/godot_mcp/mcp_server.gd"
+        str(ADDON_ROOT / "command_handler.gd"),
+        str(ADDON_ROOT / "commands" / "node_commands.gd"),
+        str(ADDON_ROOT / "mcp_server.gd")
     ]
     
     for filepath in files:
@@ -4,6 +4,10 @@ import os
 import re
 import json
 
+from gdtools.balance import scan_brackets
+from gdtools.cli import REPO_ROOT
+from gdtools.deps import DependencyGraph
+
 def check_file(filepath):
     """Check if a GDScript file has parse errors"""
     with open(filepath, 'r') as f:
@@ -35,7 +39,7 @@ def check_file(filepath):
         for preload_path in preloads:
             # Convert res:// path to actual path
             actual_path = preload_path.replace("res://", "")
-            full_path = os.path.join("/Users/raymondgonzalez/mcp/Godot-MCP", actual_path)
+            full_path = os.path.join(str(REPO_ROOT), actual_path)
             if os.path.exists(full_path):
                 print(f"    ✓ {preload_path}")
             else:
@@ -43,21 +47,9 @@ def check_file(filepath):
                 issues.append(f"Preload file not found: {preload_path}")
     
     # Check for potential syntax issues
-    # Check for unclosed brackets
-    open_parens = content.count('(')
-    close_parens = content.count(')')
-    if open_parens != close_parens:
-        issues.append(f"Mismatched parentheses: {open_parens} open, {close_parens} close")
-    
-    open_brackets = content.count('[')
-    close_brackets = content.count(']')
-    if open_brackets != close_brackets:
-        issues.append(f"Mismatched brackets: {open_brackets} open, {close_brackets} close")
-    
-    open_braces = content.count('{')
-    close_braces = content.count('}')
-    if open_braces != close_braces:
-        issues.append(f"Mismatched braces: {open_braces} open, {close_braces} close")
+    # Check for unclosed brackets and strings (ignores brackets in strings/comments)
+    for bracket_issue in scan_brackets(content):
+        issues.append(f"Line {bracket_issue.line}:{bracket_issue.col}: {bracket_issue.message}")
     
     # Check for const declarations before preload
     const_preload_pattern = r'const\s+(\w+)\s*=\s*preload\("([^"]+)"\)'
@@ -70,7 +62,7 @@ def check_file(filepath):
 def main():
     print("=== Diagnosing Godot-MCP Preload Issues ===\n")
     
-    base_dir = "/Users/raymondgonzalez/mcp/Godot-MCP"
+    base_dir = str(REPO_ROOT)
     
     # Files to check
     files_to_check = [
@@ -102,16 +94,15 @@ def main():
     # Check if command_handler.gd might have cyclic dependencies
     print("=== Checking for Cyclic Dependencies ===")
     
-    # Check if any of the command files preload command_handler
-    commands_dir = os.path.join(base_dir, "addons/godot_mcp/commands")
-    if os.path.exists(commands_dir):
-        for filename in os.listdir(commands_dir):
-            if filename.endswith('.gd'):
-                filepath = os.path.join(commands_dir, filename)
-                with open(filepath, 'r') as f:
-                    content = f.read()
-                if 'preload("res://addons/godot_mcp/command_handler.gd")' in content:
-                    print(f"  ⚠ {filename} preloads command_handler.gd - CYCLIC DEPENDENCY!")
+    # Build the full preload/extends/class_name graph of the addon
+    graph = DependencyGraph.build([os.path.join(base_dir, "addons/godot_mcp")])
+    cycles = graph.cycles()
+    for component in cycles:
+        print(f"  ⚠ CYCLIC DEPENDENCY: {' <-> '.join(component)}")
+    if not cycles:
+        print("  ✓ No cycles among preload/extends/class_name references")
+    for edge in graph.missing():
+        print(f"  ✗ {edge.source}:{edge.line} {edge.kind}s missing {edge.target}")
     
     print("\n=== Summary ===")
     if all_issues:
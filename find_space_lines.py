@@ -1,17 +1,9 @@
 #!/usr/bin/env python3
-"""Find lines starting with spaces instead of tabs"""
+"""List lines indented with spaces in a tab-indented file, or with tabs in a space-indented one."""
 
-def find_space_lines(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
-    for i, line in enumerate(lines, 1):
-        if line.startswith(' ') and not line.startswith('\t'):
-            # Count leading spaces
-            leading_spaces = len(line) - len(line.lstrip(' '))
-            print(f"Line {i}: {leading_spaces} leading spaces")
-            print(f"  Content: {repr(line[:80])}")
+import sys
+
+from gdtools.cli import run_legacy
 
 if __name__ == "__main__":
-    filepath = "/Users/raymondgonzalez/mcp/Godot-MCP/addons/godot_mcp/commands/node_commands.gd"
-    find_space_lines(filepath)
+    sys.exit(run_legacy(["mixed-indentation"], fix=False))
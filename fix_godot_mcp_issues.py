@@ -4,10 +4,12 @@ Fix script for Godot MCP plugin issues
 """
 
 import os
-import shutil
+
+from gdtools import runner
+from gdtools.cli import ADDON_ROOT
 
 # Define the base path
-base_path = "/Users/raymondgonzalez/mcp/Godot-MCP/addons/godot_mcp"
+base_path = str(ADDON_ROOT)
 
 def fix_base_command_processor():
     """Fix mixed tabs/spaces in base_command_processor.gd"""
@@ -15,31 +17,12 @@ def fix_base_command_processor():
     
     print(f"Fixing {file_path}...")
     
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
-    
-    # Fix lines 141 onwards - replace 8 spaces with tabs
-    fixed_lines = []
-    for i, line in enumerate(lines):
-        if i >= 140:  # Line 141 in 0-indexed is 140
-            # Replace leading spaces (8 spaces = 1 tab, 16 spaces = 2 tabs, etc.)
-            # Count leading spaces
-            stripped = line.lstrip(' ')
-            space_count = len(line) - len(stripped)
-            if space_count > 0 and space_count % 8 == 0:
-                # Replace with appropriate number of tabs
-                tab_count = space_count // 8
-                line = '\t' * tab_count + stripped
-        fixed_lines.append(line)
-    
-    # Backup original
-    shutil.copy2(file_path, file_path + ".backup")
-    
-    # Write fixed version
-    with open(file_path, 'w') as f:
-        f.writelines(fixed_lines)
+    # The mixed-indentation fix converts the space-indented lines to tabs in
+    # memory and replaces the file with a single temp-file-plus-rename write.
+    reports = runner.run([file_path], ["mixed-indentation"], fix=True, jobs=1)
+    fixed = sum(report.fixed for report in reports)
     
-    print(f"  ✓ Fixed indentation (replaced spaces with tabs)")
+    print(f"  ✓ Fixed indentation ({fixed} lines, replaced spaces with tabs)")
 
 def fix_command_handler_backup():
     """Fix ternary operator in command_handler_BACKUP.gd"""
@@ -51,23 +34,15 @@ def fix_command_handler_backup():
     
     print(f"Fixing {file_path}...")
     
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
-    # Fix the ternary operator on line 65
-    # Original: command_id = command_id_value != null ? str(command_id_value) : ""
-    # Fixed: command_id = str(command_id_value) if command_id_value != null else ""
-    
-    old_line = '\t\tcommand_id = command_id_value != null ? str(command_id_value) : ""'
-    new_line = '\t\tcommand_id = str(command_id_value) if command_id_value != null else ""'
-    
-    content = content.replace(old_line, new_line)
-    
-    # Write fixed version
-    with open(file_path, 'w') as f:
-        f.write(content)
+    # The ternary fix rewrites C-style ternaries such as
+    #   command_id = command_id_value != null ? str(command_id_value) : ""
+    # to GDScript's
+    #   command_id = str(command_id_value) if command_id_value != null else ""
+    # in memory and replaces the file with a single temp-file-plus-rename write.
+    reports = runner.run([file_path], ["ternary-operator"], fix=True, jobs=1)
+    fixed = sum(report.fixed for report in reports)
     
-    print(f"  ✓ Fixed ternary operator syntax")
+    print(f"  ✓ Fixed ternary operator syntax ({fixed} expressions)")
 
 def fix_case_mismatch():
     """Rename backup uid file to match the actual backup file name"""
@@ -0,0 +1,28 @@
+"""Token-stream based lint and repair tooling for the addon's GDScript sources."""
+
+from .balance import BracketIssue, scan_brackets
+from .engine import FileReport, apply_edits, iter_gd_files, lint_file, lint_paths, lint_source
+from .rules import RULES, Edit, Finding, Rule, RuleContext, get_rules, register_rule
+from .tokenizer import LogicalLine, Token, TokenStream, tokenize
+
+__all__ = [
+    "RULES",
+    "BracketIssue",
+    "Edit",
+    "FileReport",
+    "Finding",
+    "LogicalLine",
+    "Rule",
+    "RuleContext",
+    "Token",
+    "TokenStream",
+    "apply_edits",
+    "get_rules",
+    "iter_gd_files",
+    "lint_file",
+    "lint_paths",
+    "lint_source",
+    "register_rule",
+    "scan_brackets",
+    "tokenize",
+]
@@ -0,0 +1,302 @@
+"""Linear-time bracket balance scanner for GDScript sources.
+
+The scanner makes one left-to-right pass over the text with a single compiled
+regex.  Code, ``#`` comments and single, double and triple-quoted strings
+(including ``&"StringName"``, ``^"NodePath"`` and ``r"raw"`` forms, whose
+prefixes do not affect quoting) are consumed inside the regex engine,
+honouring backslash escapes, so the Python loop runs once per bracket.
+``()``, ``[]`` and ``{}`` share one stack, so interleaving errors such as
+``(]`` are reported against the site that opened them.
+
+Godot lets ``"..."`` and ``'...'`` strings contain literal newlines, so a
+string only ends at its unescaped closing quote.  A quote with no closer
+anywhere after it is reported as unterminated and scanning resumes on the
+next line.
+
+Strings and comments are first blanked out with spaces in one C-level
+substitution over the UTF-8 bytes, which keeps every offset.  What is left is
+checked by deleting everything but brackets and peeling matched pairs off
+level by level with ``bytes.replace``; a clean file reduces to nothing and is
+done.  Otherwise the file is bisected, preferably at a line that starts in
+column 0, which is almost always outside every bracket.  A piece that reduces
+to nothing is balanced on its own and leaves the bracket stack as it found
+it, so it is skipped; only the pieces around a problem are cut further, and
+only pieces of at most :data:`_LEAF_BYTES` are walked bracket by bracket.  A
+file with a quote left after blanking has an unterminated string, whose
+report resumes on the next line, and takes the regex-driven pass instead.
+Line and column numbers are only computed for the positions that end up in a
+report.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .rules import Rule, RuleContext, register_rule
+
+_NOISE = (
+    r"#[^\n]*"
+    r'|"""[^"\\]*(?:(?:\\[\s\S]|"(?!""))[^"\\]*)*"""'
+    r"|'''[^'\\]*(?:(?:\\[\s\S]|'(?!''))[^'\\]*)*'''"
+    r'|"(?!"")[^"\\]*(?:\\[\s\S][^"\\]*)*"'
+    r"|'(?!'')[^'\\]*(?:\\[\s\S][^'\\]*)*'"
+)
+_NOISE_BYTES = re.compile(_NOISE.encode("ascii"))
+_BRACKET_BYTES = re.compile(rb"[()\[\]{}]")
+# bytes.translate deletes everything except brackets and quotes.
+_NOT_BRACKET_OR_QUOTE = bytes(byte for byte in range(256) if byte not in b"()[]{}\"'")
+_CHARS = {byte: chr(byte) for byte in b"()[]{}"}
+# A line that starts in column 0 with code is almost always outside every
+# bracket, which makes it the place to cut a piece in two.
+_TOP_LEVEL_LINE = re.compile(rb"\n(?=[^\s)\]}])")
+# Each match swallows any run of code, strings and comments and stops on the
+# next bracket or unclosable quote, so there is one iteration per bracket.
+# The skipped run sits in a lookahead plus backreference, an atomic group in
+# any Python version, so a comment can never be backtracked into to expose a
+# bracket inside it.
+_NEXT_BRACKET = re.compile(
+    r"(?=(?P<skip>(?:[^()\[\]{}\"'#]+|" + _NOISE + r")*))(?P=skip)"
+    r"(?:(?P<open>[(\[{])|(?P<close>[)\]}])"
+    r'|(?P<unterminated>"""|' r"'''|[\"']))"
+)
+_PAIRS = {")": "(", "]": "[", "}": "{"}
+
+# How far down the stack a mismatched closer may reach to resynchronize.
+_RESYNC_DEPTH = 4
+# Nesting levels a reduction peels off before treating a piece as unbalanced.
+_QUICK_DEPTH = 32
+# Positions looked up by counting newlines before building a line table.
+_DIRECT_LOOKUPS = 8
+# Pieces this small are walked bracket by bracket instead of bisected further.
+_LEAF_BYTES = 4096
+
+UNCLOSED = "unclosed"
+UNEXPECTED = "unexpected"
+MISMATCHED = "mismatched"
+UNTERMINATED = "unterminated-string"
+
+
+@dataclass(frozen=True)
+class BracketIssue:
+    kind: str
+    line: int
+    col: int
+    char: str
+    open_line: Optional[int] = None
+    open_col: Optional[int] = None
+
+    @property
+    def message(self) -> str:
+        opened = f" opened at {self.open_line}:{self.open_col}" if self.open_line is not None else ""
+        if self.kind == UNCLOSED:
+            return f"Unclosed '{self.char}'"
+        if self.kind == UNEXPECTED:
+            return f"Unexpected closing '{self.char}' with no matching opener"
+        if self.kind == MISMATCHED:
+            return f"'{self.char}' does not close the bracket{opened}"
+        return f"Unterminated string starting with {self.char}"
+
+
+class _Positions:
+    """Offset -> (line, column) mapping.
+
+    The first few lookups count newlines in C; a table of line starts is only
+    built once a file turns out to have more issues than that.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.starts: Optional[List[int]] = None
+        self.lookups = 0
+
+    def __call__(self, offset: int):
+        self.lookups += 1
+        if self.starts is None and self.lookups <= _DIRECT_LOOKUPS:
+            line_start = self.source.rfind("\n", 0, offset) + 1
+            return self.source.count("\n", 0, offset) + 1, offset - line_start + 1
+        if self.starts is None:
+            self.starts = [0]
+            find = self.source.find
+            index = find("\n")
+            while index != -1:
+                self.starts.append(index + 1)
+                index = find("\n", index + 1)
+        line = bisect.bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+
+def _close_mismatched(stack: List[tuple], raw_issues: List[tuple], char: str, index: int) -> None:
+    if not stack:
+        raw_issues.append((UNEXPECTED, index, char, None))
+        return
+    opener = _PAIRS[char]
+    raw_issues.append((MISMATCHED, index, char, stack[-1][1]))
+    for depth in range(2, min(_RESYNC_DEPTH, len(stack)) + 1):
+        if stack[-depth][0] == opener:
+            # The closer belongs further down: everything above it is unclosed.
+            for _ in range(depth - 1):
+                unclosed_char, unclosed_index = stack.pop()
+                raw_issues.append((UNCLOSED, unclosed_index, unclosed_char, unclosed_index))
+            stack.pop()
+            return
+
+
+def _blank(match) -> bytes:
+    return b" " * (match.end() - match.start())
+
+
+def _reduces(skeleton: bytes) -> bool:
+    """Whether the brackets and quotes in ``skeleton`` cancel out.
+
+    Adjacent ``()``/``[]``/``{}`` pairs are peeled off one nesting level per
+    round.  A quote never reduces, and anything not empty within
+    ``_QUICK_DEPTH`` rounds counts as unbalanced, which only costs a closer
+    look.
+    """
+    skeleton = skeleton.translate(None, _NOT_BRACKET_OR_QUOTE)
+    for _ in range(_QUICK_DEPTH):
+        if not skeleton:
+            return True
+        reduced = skeleton.replace(b"()", b"").replace(b"[]", b"").replace(b"{}", b"")
+        if len(reduced) == len(skeleton):
+            return False
+        skeleton = reduced
+    return not skeleton
+
+
+def _scan_blanked(data: bytes, stack: List[tuple], raw_issues: List[tuple]) -> None:
+    """Feed the brackets of ``data`` to the stack, skipping balanced pieces.
+
+    Popping a pair that was pushed within the same piece leaves the stack as
+    it was, so a piece that reduces to nothing on its own can be skipped
+    without changing any report.
+    """
+    push = stack.append
+    pop = stack.pop
+    chars = _CHARS
+    pairs = _PAIRS
+    pieces = [(0, len(data))]
+    while pieces:
+        start, end = pieces.pop()
+        if _reduces(data[start:end]):
+            continue
+        if end - start > _LEAF_BYTES:
+            middle = (start + end) // 2
+            cut = _TOP_LEVEL_LINE.search(data, middle, end)
+            if cut is not None and cut.end() < end:
+                middle = cut.end()
+            # Last in, first out: the left half is scanned first.
+            pieces.append((middle, end))
+            pieces.append((start, middle))
+            continue
+        for match in _BRACKET_BYTES.finditer(data, start, end):
+            index = match.start()
+            char = chars[data[index]]
+            if char in "([{":
+                push((char, index))
+            elif stack and stack[-1][0] == pairs[char]:
+                pop()
+            else:
+                _close_mismatched(stack, raw_issues, char, index)
+
+
+def _scan_exact(source: str, stack: List[tuple], raw_issues: List[tuple]) -> None:
+    """The regex-driven pass, which also reports unterminated strings."""
+    push = stack.append
+    pop = stack.pop
+    match = _NEXT_BRACKET.match
+    find = source.find
+    pos = 0
+
+    # Anchored matches rather than finditer: when no bracket is left, a
+    # search would retry from inside the last string or comment.
+    while True:
+        m = match(source, pos)
+        if m is None:
+            break
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == "open":
+            push((source[pos - 1], pos - 1))
+        elif kind == "close":
+            char = source[pos - 1]
+            if stack and stack[-1][0] == _PAIRS[char]:
+                pop()
+            else:
+                _close_mismatched(stack, raw_issues, char, pos - 1)
+        else:
+            # Nothing closes this string: report it and resume on the next line.
+            raw_issues.append((UNTERMINATED, m.start(kind), m.group(kind), None))
+            newline = find("\n", pos)
+            if newline == -1:
+                break
+            pos = newline + 1
+
+
+def _char_offsets(encoded: bytes, byte_offsets) -> dict:
+    """Map UTF-8 byte offsets into ``encoded`` to character offsets."""
+    offsets = {}
+    previous = chars = 0
+    for offset in sorted(set(byte_offsets)):
+        chars += len(encoded[previous:offset].decode("utf-8"))
+        offsets[offset] = chars
+        previous = offset
+    return offsets
+
+
+def scan_brackets(source: str) -> List[BracketIssue]:
+    """Return every bracket and string-termination problem in ``source``."""
+    encoded = source.encode("utf-8")
+    data = _NOISE_BYTES.sub(_blank, encoded)
+    if _reduces(data):
+        return []
+    stack: List[tuple] = []
+    raw_issues: List[tuple] = []
+    if b'"' in data or b"'" in data:
+        _scan_exact(source, stack, raw_issues)
+    else:
+        _scan_blanked(data, stack, raw_issues)
+        if len(encoded) != len(source):
+            # Non-ASCII text: the offsets so far count bytes.
+            offsets = _char_offsets(
+                encoded,
+                [index for _, index, _, _ in raw_issues]
+                + [index for _, _, _, index in raw_issues if index is not None]
+                + [index for _, index in stack],
+            )
+            raw_issues = [
+                (kind, offsets[index], char, None if open_index is None else offsets[open_index])
+                for kind, index, char, open_index in raw_issues
+            ]
+            stack = [(char, offsets[index]) for char, index in stack]
+
+    for char, index in stack:
+        raw_issues.append((UNCLOSED, index, char, index))
+
+    if not raw_issues:
+        return []
+    position = _Positions(source)
+    issues = []
+    for kind, index, char, open_index in raw_issues:
+        line, col = position(index)
+        open_line = open_col = None
+        if open_index is not None:
+            open_line, open_col = position(open_index)
+        issues.append(BracketIssue(kind, line, col, char, open_line, open_col))
+    issues.sort(key=lambda issue: (issue.line, issue.col, issue.kind))
+    return issues
+
+
+@register_rule
+class UnbalancedBracketsRule(Rule):
+    """Report unbalanced ``()``, ``[]``, ``{}`` and unterminated strings."""
+
+    name = "unbalanced-brackets"
+    description = "Unbalanced brackets or unterminated strings (string/comment aware)"
+
+    def begin(self, ctx: RuleContext) -> None:
+        for issue in scan_brackets(ctx.source):
+            ctx.report(self, issue.line, issue.col, issue.message)
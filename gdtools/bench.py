@@ -0,0 +1,192 @@
+"""Benchmark: one pass per rule (the old script-per-fix workflow) vs one pass total.
+
+Usage::
+
+    python -m gdtools.bench [root] [--repeat N] [--json]
+    python -m gdtools.bench --brackets [--lines N] [--json]
+
+Both modes run with ``--fix`` semantics on a scratch copy of ``root`` so the
+working tree is never modified.  The sequential mode reads, tokenizes and
+rewrites every file once per rule, the way fix_ternary_v2.py,
+fix_var_declarations.py, fix_indentation_comprehensive.py and friends did when
+run one after another; the single-pass mode uses the shared engine.
+
+``--brackets`` instead times :func:`gdtools.balance.scan_brackets` on a
+synthetic file of ``--lines`` lines (one million by default) against the
+per-line regex stripping that find_unmatched_parens.py used to do.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import shutil
+import statistics
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from .balance import scan_brackets
+from .cli import ADDON_ROOT
+from .engine import lint_paths
+from .rules import get_rules
+
+
+def _run_sequential(root: Path) -> Counter:
+    stats = Counter()
+    for rule in get_rules():
+        lint_paths([root], [rule], fix=True, io_stats=stats)
+    return stats
+
+
+def _run_single_pass(root: Path) -> Counter:
+    stats = Counter()
+    lint_paths([root], get_rules(), fix=True, io_stats=stats)
+    return stats
+
+
+def _measure(source_root: Path, runner, repeat: int):
+    timings = []
+    stats = Counter()
+    with tempfile.TemporaryDirectory(prefix="gdtools-bench-") as scratch:
+        for _ in range(repeat):
+            target = Path(scratch) / "tree"
+            if target.exists():
+                shutil.rmtree(target)
+            shutil.copytree(source_root, target)
+            started = time.perf_counter()
+            stats = runner(target)
+            timings.append(time.perf_counter() - started)
+    return {
+        "best_s": min(timings),
+        "median_s": statistics.median(timings),
+        "reads": stats["reads"],
+        "writes": stats["writes"],
+    }
+
+
+_SYNTHETIC_BLOCK = [
+    "func handler_%d(params: Dictionary) -> Dictionary:",
+    '\tvar path := String(params.get("path", "res://(x)[y]{z}"))  # (unbalanced in a comment',
+    "\tvar names := [&\"StringName(\", ^\"Node/Path[\", 'single \\' quote )']",
+    '\tvar doc := """multi-line ( string',
+    '\t  with ] brackets and \\""" quotes } inside"""',
+    "\treturn {\"ok\": (path.length() > 0), \"names\": names.slice(0, [1, 2].size())}",
+    "",
+]
+
+
+def synthetic_source(lines: int) -> str:
+    """Build roughly ``lines`` lines of bracket-heavy, well-balanced GDScript."""
+    block = "\n".join(_SYNTHETIC_BLOCK) + "\n"
+    return "".join(block % index for index in range(max(1, lines // len(_SYNTHETIC_BLOCK))))
+
+
+def _legacy_line_scan(source: str) -> int:
+    """The find_unmatched_parens.py approach: strip strings per line with regexes."""
+    depth = 0
+    for line in source.split("\n"):
+        comment = line.find("#")
+        if comment >= 0:
+            line = line[:comment]
+        line = re.sub(r'"[^"]*"', "", line)
+        line = re.sub(r"'[^']*'", "", line)
+        for char in line:
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+    return depth
+
+
+def bench_brackets(lines: int) -> dict:
+    source = synthetic_source(lines)
+    line_count = source.count("\n")
+
+    started = time.perf_counter()
+    issues = scan_brackets(source)
+    scanner_s = time.perf_counter() - started
+
+    # A single stray closer at the very end defeats the clean-file fast path.
+    broken = source + ")\n"
+    started = time.perf_counter()
+    broken_issues = scan_brackets(broken)
+    full_scan_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    legacy_balance = _legacy_line_scan(source)
+    legacy_s = time.perf_counter() - started
+
+    return {
+        "lines": line_count,
+        "bytes": len(source.encode("utf-8")),
+        "scanner_s": scanner_s,
+        "scanner_issues": len(issues),
+        "scanner_mb_per_s": len(source) / scanner_s / 1e6,
+        "full_scan_s": full_scan_s,
+        "full_scan_issues": len(broken_issues),
+        "legacy_s": legacy_s,
+        "legacy_final_balance": legacy_balance,
+        "clean_speedup": legacy_s / max(scanner_s, 1e-9),
+        "full_scan_speedup": legacy_s / max(full_scan_s, 1e-9),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="gdtools.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("root", nargs="?", default=str(ADDON_ROOT))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--brackets", action="store_true", help="Benchmark the bracket scanner instead")
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    if args.brackets:
+        results = bench_brackets(args.lines)
+        if args.json:
+            print(json.dumps(results, indent=2))
+        else:
+            print(f"Bracket scan over {results['lines']:,} synthetic lines ({results['bytes'] / 1e6:.1f} MB)")
+            print(
+                f"  scanner      {results['scanner_s'] * 1000:8.1f} ms  {results['scanner_mb_per_s']:.1f} MB/s"
+                f"  issues {results['scanner_issues']}"
+            )
+            print(
+                f"  full scan    {results['full_scan_s'] * 1000:8.1f} ms"
+                f"  issues {results['full_scan_issues']} (one stray ')' appended)"
+            )
+            print(
+                f"  legacy       {results['legacy_s'] * 1000:8.1f} ms"
+                f"  final paren balance {results['legacy_final_balance']} (strings/comments misread)"
+            )
+            print(f"  speedup      {results['clean_speedup']:.2f}x clean, {results['full_scan_speedup']:.2f}x full scan")
+        return 0
+
+    root = Path(args.root)
+    results = {
+        "root": str(root),
+        "rules": len(get_rules()),
+        "sequential": _measure(root, _run_sequential, args.repeat),
+        "single_pass": _measure(root, _run_single_pass, args.repeat),
+    }
+    results["speedup"] = results["sequential"]["median_s"] / max(results["single_pass"]["median_s"], 1e-9)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"Benchmark over {root} ({results['rules']} rules, {args.repeat} runs each)")
+    for mode in ("sequential", "single_pass"):
+        data = results[mode]
+        print(
+            f"  {mode:12} median {data['median_s'] * 1000:8.1f} ms  best {data['best_s'] * 1000:8.1f} ms"
+            f"  reads {data['reads']:5}  writes {data['writes']:5}"
+        )
+    print(f"  speedup      {results['speedup']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,163 @@
+"""Persistent incremental cache of per-file, per-rule findings.
+
+The cache lives in ``<project>/.gdtools_cache/lint.json`` where ``<project>``
+is the nearest directory containing ``project.godot``.  Each entry is keyed
+by the file's project-relative path and records its size, ``st_mtime_ns``
+and a BLAKE2 content hash, plus the findings of every rule that ran on it
+together with that rule's version.
+
+A file whose size and mtime are unchanged is never opened.  A file whose
+stat changed but whose content hash did not (``touch``, checkout) is read
+but not re-analyzed.  Bumping a rule's ``version`` only re-runs that rule.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .engine import FileReport
+from .rules import Finding
+
+CACHE_DIRECTORY = ".gdtools_cache"
+CACHE_FILENAME = "lint.json"
+CACHE_FORMAT = 1
+
+
+def content_hash(source: str) -> str:
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def write_json_atomic(path: Path, payload) -> None:
+    """Write ``payload`` next to ``path`` and rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}-", suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, separators=(",", ":"), sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def find_project_root(paths: Iterable) -> Path:
+    """Return the closest ancestor holding project.godot, or the cwd."""
+    for entry in paths:
+        candidate = Path(entry).resolve()
+        for directory in (candidate, *candidate.parents):
+            if (directory / "project.godot").is_file():
+                return directory
+    return Path.cwd()
+
+
+class LintCache:
+    """Findings cache keyed by path, size, mtime and content hash."""
+
+    def __init__(self, project_root: Path):
+        self.project_root = Path(project_root).resolve()
+        self.path = self.project_root / CACHE_DIRECTORY / CACHE_FILENAME
+        self.entries: Dict[str, dict] = {}
+        self.dirty = False
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if data.get("format") == CACHE_FORMAT:
+            self.entries = data.get("files", {})
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        write_json_atomic(self.path, {"format": CACHE_FORMAT, "files": self.entries})
+        self.dirty = False
+
+    def key(self, path) -> str:
+        resolved = Path(path).resolve()
+        try:
+            return resolved.relative_to(self.project_root).as_posix()
+        except ValueError:
+            return resolved.as_posix()
+
+    def lookup(
+        self, path, versions: Mapping[str, int], fix: bool = False
+    ) -> Tuple[Optional[FileReport], List[str], Optional[str]]:
+        """Plan the work needed for ``path``.
+
+        Returns ``(report, stale_rules, expected_hash)``.  ``report`` is set
+        when every requested rule can be served from the cache.  Otherwise
+        ``stale_rules`` lists the rules to re-run if the content hash still
+        equals ``expected_hash``; any other content needs every rule.
+        """
+        entry = self.entries.get(self.key(path))
+        if entry is None:
+            return None, list(versions), None
+
+        cached_rules = entry.get("rules", {})
+        stale = [name for name, version in versions.items() if cached_rules.get(name, {}).get("version") != version]
+        if fix and any(
+            finding[3] for name in versions if name not in stale for finding in cached_rules[name]["findings"]
+        ):
+            # Fix mode needs edits, which are not cached; re-run everything.
+            stale = list(versions)
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None, list(versions), None
+        if stat.st_size != entry.get("size") or stat.st_mtime_ns != entry.get("mtime_ns"):
+            return None, stale, entry.get("hash")
+        if stale:
+            return None, stale, entry.get("hash")
+        return self.report_for(path, versions), [], entry.get("hash")
+
+    def report_for(self, path, names: Iterable[str]) -> FileReport:
+        cached_rules = self.entries[self.key(path)]["rules"]
+        findings = [
+            Finding(str(path), line, col, name, message, None, fixable)
+            for name in names
+            for line, col, message, fixable in cached_rules[name]["findings"]
+        ]
+        findings.sort(key=Finding.sort_key)
+        return FileReport(path=str(path), findings=findings)
+
+    def store(
+        self,
+        path,
+        size: int,
+        mtime_ns: int,
+        digest: str,
+        versions: Mapping[str, int],
+        findings: Iterable[Finding],
+    ) -> None:
+        """Record findings for the rules in ``versions`` that just ran."""
+        key = self.key(path)
+        entry = self.entries.get(key)
+        if entry is None or entry.get("hash") != digest:
+            entry = {"rules": {}}
+            self.entries[key] = entry
+        entry["size"] = size
+        entry["mtime_ns"] = mtime_ns
+        entry["hash"] = digest
+        by_rule = {name: [] for name in versions}
+        for finding in findings:
+            if finding.rule in by_rule:
+                by_rule[finding.rule].append([finding.line, finding.col, finding.message, finding.fixable])
+        for name, version in versions.items():
+            entry["rules"][name] = {"version": version, "findings": by_rule[name]}
+        self.dirty = True
+
+    def invalidate(self, path) -> None:
+        if self.entries.pop(self.key(path), None) is not None:
+            self.dirty = True
+
+    def prune(self) -> None:
+        """Drop entries whose files no longer exist."""
+        for key in list(self.entries):
+            if not (self.project_root / key).exists():
+                del self.entries[key]
+                self.dirty = True
@@ -0,0 +1,110 @@
+"""Command line front end: ``python -m gdtools [paths] [--fix] [--rules ...]``."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from . import runner
+from .cache import LintCache, find_project_root
+from .engine import FileReport
+from .pipeline import DEFAULT_MAX_ITERATIONS
+from .rules import RULES, get_rules
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ADDON_ROOT = REPO_ROOT / "addons" / "godot_mcp"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="gdtools",
+        description="Lint and repair GDScript files in a single pass per file.",
+    )
+    parser.add_argument("paths", nargs="*", help="Files or directories (default: addons/godot_mcp)")
+    parser.add_argument("--fix", action="store_true", help="Apply fixes and write each changed file once")
+    parser.add_argument("--diff", action="store_true", help="Print the fixes as a unified diff; write nothing")
+    parser.add_argument(
+        "--max-iterations", type=int, default=DEFAULT_MAX_ITERATIONS,
+        help="Fix passes per file before giving up on a fixed point",
+    )
+    parser.add_argument("--rules", help="Comma-separated rule names to run (default: all)")
+    parser.add_argument("--list-rules", action="store_true", help="List registered rules and exit")
+    parser.add_argument("--json", action="store_true", help="Emit findings as JSON")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update .gdtools_cache")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=0,
+        help="Worker processes (default: one per available CPU; 1 runs serially)",
+    )
+    return parser
+
+
+def format_reports(reports: Sequence[FileReport], as_json: bool = False, dry_run: bool = False) -> str:
+    findings = [finding for report in reports for finding in report.remaining]
+    if as_json:
+        payload = {
+            "files": len(reports),
+            "fixed": sum(report.fixed for report in reports),
+            "findings": [finding.to_dict() for finding in findings],
+        }
+        if dry_run:
+            payload["diffs"] = {report.path: report.diff for report in reports if report.diff}
+        return json.dumps(payload, indent=2)
+    lines = [f"{f.path}:{f.line}:{f.col}: {f.rule}: {f.message}" for f in findings]
+    fixed = sum(report.fixed for report in reports)
+    changed = sum(1 for report in reports if report.changed)
+    summary = f"{len(reports)} files checked, {len(findings)} findings"
+    if fixed:
+        verb = "would be applied" if dry_run else "applied"
+        summary += f", {fixed} fixes {verb} to {changed} files"
+    lines.append(summary)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.list_rules:
+        for name in sorted(RULES):
+            print(f"{name:20} v{RULES[name].version}  {RULES[name].description}")
+        return 0
+
+    rule_names = args.rules.split(",") if args.rules else None
+    try:
+        get_rules(rule_names)
+    except KeyError as error:
+        print(error.args[0], file=sys.stderr)
+        return 2
+
+    paths = args.paths or [ADDON_ROOT]
+    cache = None if args.no_cache else LintCache(find_project_root(paths))
+    reports = runner.run(
+        paths,
+        rule_names,
+        fix=args.fix or args.diff,
+        jobs=args.jobs or None,
+        cache=cache,
+        dry_run=args.diff,
+        max_iterations=args.max_iterations,
+    )
+    if args.diff and not args.json:
+        for report in reports:
+            if report.diff:
+                sys.stdout.write(report.diff)
+    print(format_reports(reports, args.json, dry_run=args.diff))
+    return 1 if any(report.remaining for report in reports) else 0
+
+
+def run_legacy(rule_names: Sequence[str], fix: bool, argv: Optional[List[str]] = None) -> int:
+    """Entry point for the historical fix_*/find_* scripts.
+
+    They used to carry their own regex pass and a hard-coded file path; now
+    they run the named rules through the shared engine over the paths given
+    on the command line, or over the whole addon by default.
+    """
+    paths = list(sys.argv[1:] if argv is None else argv)
+    arguments = paths + ["--rules", ",".join(rule_names)]
+    if fix:
+        arguments.append("--fix")
+    return main(arguments)
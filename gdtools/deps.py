@@ -0,0 +1,261 @@
+"""Script dependency graph: preload/load/extends/class_name references.
+
+Usage::
+
+    python -m gdtools.deps [paths] [--top N] [--json]
+
+Edges come from the symbol index (see :mod:`gdtools.symbols`), so a warm
+run re-reads nothing.  Four edge kinds are recorded:
+
+``preload``  ``preload("res://...")``, resolved when the script is parsed
+``extends``  ``extends "res://..."`` or ``extends SomeClassName``
+``class``    any use of another script's global ``class_name``
+``load``     ``load("res://...")`` with a literal path, resolved at run time
+
+The first three are *eager*: parsing a script pulls in everything they reach.
+The report lists eager cycles (strongly connected components), a
+dependencies-first load order, preload targets that do not exist, and for
+every ``preload`` site the transitive bytes and script count it drags in, which
+is what the editor pays at plugin startup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import posixpath
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from .cli import ADDON_ROOT
+from .symbols import CLASS_NAME, EXTENDS, LOAD, PRELOAD, REFERENCE, SymbolIndex
+
+RES_PREFIX = "res://"
+CLASS = "class"
+EAGER_KINDS = frozenset({PRELOAD, EXTENDS, CLASS})
+
+
+class Edge(NamedTuple):
+    source: str
+    target: str
+    kind: str
+    line: int
+
+
+class DependencyGraph:
+    """Directed graph of ``res://`` paths with per-node byte sizes."""
+
+    def __init__(self, project_root: Path):
+        self.project_root = Path(project_root)
+        self.sizes: Dict[str, int] = {}
+        self.edges: List[Edge] = []
+        self.eager: Dict[str, List[str]] = {}
+        self._components: Optional[List[List[str]]] = None
+        self._reach: Dict[str, frozenset] = {}
+
+    @classmethod
+    def build(cls, paths: Iterable, use_cache: bool = True) -> "DependencyGraph":
+        index = SymbolIndex.build(list(paths), use_cache=use_cache)
+        return cls.from_index(index)
+
+    @classmethod
+    def from_index(cls, index: SymbolIndex) -> "DependencyGraph":
+        graph = cls(index.project_root or Path.cwd())
+        class_names = {
+            symbol.name: RES_PREFIX + symbol.path
+            for symbols in index.files.values()
+            for symbol in symbols
+            if symbol.kind == CLASS_NAME
+        }
+        for key, symbols in sorted(index.files.items()):
+            source = RES_PREFIX + key
+            graph.add_node(source)
+            classes_used: Set[str] = set()
+            for symbol in symbols:
+                if symbol.kind in (PRELOAD, LOAD) or (symbol.kind == EXTENDS and symbol.target):
+                    graph.add_edge(source, graph.resolve(symbol.target, source), symbol.kind, symbol.line)
+                elif symbol.kind in (EXTENDS, REFERENCE):
+                    target = class_names.get(symbol.name)
+                    if target is None or target == source:
+                        continue
+                    kind = EXTENDS if symbol.kind == EXTENDS else CLASS
+                    if kind == CLASS:
+                        if target in classes_used:
+                            continue
+                        classes_used.add(target)
+                    graph.add_edge(source, target, kind, symbol.line)
+        return graph
+
+    def resolve(self, target: str, source: str) -> str:
+        """Turn a path literal into a ``res://`` path, relative to ``source``."""
+        if target.startswith(RES_PREFIX):
+            return RES_PREFIX + posixpath.normpath(target[len(RES_PREFIX):])
+        directory = posixpath.dirname(source[len(RES_PREFIX):])
+        return RES_PREFIX + posixpath.normpath(posixpath.join(directory, target))
+
+    def filesystem_path(self, node: str) -> Path:
+        return self.project_root / node[len(RES_PREFIX):]
+
+    def add_node(self, node: str) -> None:
+        if node not in self.sizes:
+            try:
+                self.sizes[node] = os.path.getsize(self.filesystem_path(node))
+            except OSError:
+                self.sizes[node] = -1
+            self.eager[node] = []
+            self._components = None
+
+    def add_edge(self, source: str, target: str, kind: str, line: int) -> None:
+        self.add_node(source)
+        self.add_node(target)
+        self.edges.append(Edge(source, target, kind, line))
+        if kind in EAGER_KINDS and target not in self.eager[source]:
+            self.eager[source].append(target)
+        self._components = None
+        self._reach.clear()
+
+    def missing(self) -> List[Edge]:
+        return [edge for edge in self.edges if self.sizes[edge.target] < 0]
+
+    def components(self) -> List[List[str]]:
+        """Strongly connected components of the eager graph, dependencies first.
+
+        Iterative Tarjan: a component is emitted only after every component
+        it can reach, which is exactly load order.
+        """
+        if self._components is not None:
+            return self._components
+        index_of: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        result: List[List[str]] = []
+        counter = 0
+
+        for root in sorted(self.eager):
+            if root in index_of:
+                continue
+            work = [(root, iter(self.eager[root]))]
+            index_of[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, successors = work[-1]
+                advanced = False
+                for successor in successors:
+                    if successor not in index_of:
+                        index_of[successor] = low[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append((successor, iter(self.eager[successor])))
+                        advanced = True
+                        break
+                    if successor in on_stack:
+                        low[node] = min(low[node], index_of[successor])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    result.append(sorted(component))
+        self._components = result
+        return result
+
+    def cycles(self) -> List[List[str]]:
+        return [
+            component
+            for component in self.components()
+            if len(component) > 1 or component[0] in self.eager[component[0]]
+        ]
+
+    def load_order(self) -> List[str]:
+        return [node for component in self.components() for node in component]
+
+    def reachable(self, node: str) -> frozenset:
+        """Every node ``node`` pulls in eagerly, itself included."""
+        if not self._reach:
+            for component in self.components():
+                members = set(component)
+                for member in component:
+                    for successor in self.eager[member]:
+                        if successor not in members:
+                            members |= self._reach[successor]
+                frozen = frozenset(members)
+                for member in component:
+                    self._reach[member] = frozen
+        return self._reach[node]
+
+    def cost(self, node: str) -> dict:
+        nodes = self.reachable(node)
+        return {
+            "bytes": sum(max(self.sizes[member], 0) for member in nodes),
+            "scripts": sum(1 for member in nodes if member.endswith(".gd")),
+        }
+
+    def preload_costs(self) -> List[dict]:
+        """Transitive cost of every preload site, most expensive first."""
+        rows = []
+        for edge in self.edges:
+            if edge.kind == PRELOAD:
+                rows.append(dict(source=edge.source, line=edge.line, target=edge.target, **self.cost(edge.target)))
+        rows.sort(key=lambda row: (-row["bytes"], row["source"], row["line"]))
+        return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="gdtools.deps", description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="Files or directories (default: addons/godot_mcp)")
+    parser.add_argument("--top", type=int, default=20, help="Preload sites to list (default: 20)")
+    parser.add_argument("--json", action="store_true", help="Emit the full report as JSON")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update .gdtools_cache")
+    args = parser.parse_args(argv)
+
+    graph = DependencyGraph.build(args.paths or [ADDON_ROOT], use_cache=not args.no_cache)
+    cycles = graph.cycles()
+    missing = graph.missing()
+    preloads = graph.preload_costs()
+
+    if args.json:
+        print(json.dumps(
+            {
+                "nodes": len(graph.sizes),
+                "edges": [edge._asdict() for edge in graph.edges],
+                "cycles": cycles,
+                "load_order": graph.load_order(),
+                "missing": [edge._asdict() for edge in missing],
+                "preloads": preloads,
+            },
+            indent=2,
+        ))
+    else:
+        print(f"{len(graph.sizes)} nodes, {len(graph.edges)} edges")
+        print(f"Eager cycles ({len(cycles)}):")
+        for component in cycles:
+            print("  " + " <-> ".join(component))
+        if missing:
+            print(f"Missing targets ({len(missing)}):")
+            for edge in missing:
+                print(f"  {edge.source}:{edge.line}: {edge.kind} {edge.target}")
+        print(f"Most expensive preloads (of {len(preloads)}):")
+        for row in preloads[:args.top]:
+            print(
+                f"  {row['bytes'] / 1024:8.1f} KiB {row['scripts']:4} scripts  "
+                f"{row['source']}:{row['line']} -> {row['target']}"
+            )
+    return 1 if cycles or missing else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
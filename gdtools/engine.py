@@ -0,0 +1,162 @@
+"""Single-pass lint/fix engine.
+
+Each file is read once, tokenized once, visited by every selected rule in one
+walk over its logical lines, and written back at most once.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Set, Tuple, Type
+
+from .rules import Edit, Finding, Rule, RuleContext, get_rules
+from .tokenizer import tokenize
+
+DEFAULT_ROOT = Path("addons/godot_mcp")
+SKIPPED_DIRECTORIES = {".git", ".godot", ".import", "node_modules", "__pycache__"}
+
+
+@dataclass
+class FileReport:
+    """Outcome of linting (and optionally fixing) one file."""
+
+    path: str
+    findings: List[Finding] = field(default_factory=list)
+    applied: Set[Edit] = field(default_factory=set)
+    changed: bool = False
+    source: str = ""
+    diff: str = ""
+
+    @property
+    def fixed(self) -> int:
+        return len(self.applied)
+
+    @property
+    def remaining(self) -> List[Finding]:
+        """Findings that were not resolved by an applied edit."""
+        if not self.applied:
+            return self.findings
+        return [finding for finding in self.findings if finding.edit not in self.applied]
+
+
+def lint_source(
+    source: str,
+    path: str = "<string>",
+    rules: Optional[Sequence[Type[Rule]]] = None,
+    fix: bool = False,
+) -> FileReport:
+    """Run ``rules`` over ``source`` in a single pass over its token stream."""
+    if rules is None:
+        rules = get_rules()
+    stream = tokenize(source)
+    ctx = RuleContext(path, stream)
+    instances = [rule_class() for rule_class in rules]
+    line_visitors = [rule for rule in instances if type(rule).visit_line is not Rule.visit_line]
+
+    for rule in instances:
+        rule.begin(ctx)
+    for line in stream.lines:
+        for rule in line_visitors:
+            rule.visit_line(line, ctx)
+    for rule in instances:
+        rule.finish(ctx)
+
+    findings = sorted(ctx.findings, key=Finding.sort_key)
+    report = FileReport(path=path, findings=findings, source=source)
+    if fix:
+        report.source, report.applied = apply_edits(source, [f.edit for f in findings if f.edit])
+        report.changed = report.source != source
+    return report
+
+
+def apply_edits(source: str, edits: Iterable[Edit]) -> Tuple[str, Set[Edit]]:
+    """Apply non-overlapping edits; later edits that overlap are dropped."""
+    pieces = []
+    cursor = 0
+    applied = set()
+    for edit in sorted(edits, key=lambda e: (e.start, e.end)):
+        if edit.start < cursor:
+            continue
+        pieces.append(source[cursor:edit.start])
+        pieces.append(edit.text)
+        cursor = edit.end
+        applied.add(edit)
+    pieces.append(source[cursor:])
+    return "".join(pieces), applied
+
+
+def read_source(path, io_stats: Optional[Counter] = None) -> str:
+    if io_stats is not None:
+        io_stats["reads"] += 1
+    with open(path, "r", encoding="utf-8", newline="") as handle:
+        return handle.read()
+
+
+def write_source(path, text: str, io_stats: Optional[Counter] = None) -> None:
+    """Replace ``path`` atomically: write a sibling temp file, then rename it.
+
+    A crash or a concurrent reader (the Godot editor, watch mode) never sees a
+    half-written script, and no ``.backup`` copy is needed.
+    """
+    if io_stats is not None:
+        io_stats["writes"] += 1
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".gdtools-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as handle:
+            handle.write(text)
+        try:
+            shutil.copymode(path, temp_path)
+        except OSError:
+            pass
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def lint_file(
+    path,
+    rules: Optional[Sequence[Type[Rule]]] = None,
+    fix: bool = False,
+    io_stats: Optional[Counter] = None,
+) -> FileReport:
+    """Lint one file with one read and, when fixing, at most one write."""
+    source = read_source(path, io_stats)
+    report = lint_source(source, str(path), rules, fix)
+    if report.changed:
+        write_source(path, report.source, io_stats)
+    report.source = ""
+    return report
+
+
+def iter_gd_files(paths: Iterable) -> List[Path]:
+    """Expand files and directories into a sorted, de-duplicated .gd list."""
+    found = set()
+    for entry in paths:
+        entry = Path(entry)
+        if entry.is_file():
+            found.add(entry)
+            continue
+        for root, dirs, files in os.walk(entry):
+            dirs[:] = sorted(d for d in dirs if d not in SKIPPED_DIRECTORIES)
+            for name in files:
+                if name.endswith(".gd"):
+                    found.add(Path(root) / name)
+    return sorted(found)
+
+
+def lint_paths(
+    paths: Iterable,
+    rules: Optional[Sequence[Type[Rule]]] = None,
+    fix: bool = False,
+    io_stats: Optional[Counter] = None,
+) -> List[FileReport]:
+    return [lint_file(path, rules, fix, io_stats) for path in iter_gd_files(paths)]
@@ -0,0 +1,119 @@
+"""Fix-point repair pipeline.
+
+A file is read once.  Every selected rule runs over the in-memory text, the
+non-overlapping edits are applied, and the result is re-tokenized and linted
+again until no fixable finding is left or ``max_iterations`` is reached.
+Fixes that only become visible after another fix (a ternary hidden behind a
+bad indent, a ``var`` moved out of a ternary) are therefore picked up in the
+same run instead of by a second script invocation.
+
+When two edits overlap, the one that starts first wins and the other is
+reported as a ``fix-conflict`` finding naming both rules.  If the losing
+rule still has something to fix after the winner's edit, it gets another
+chance in the next iteration against the updated text, so only the last
+pass's conflicts are kept; earlier ones were settled by the passes after them.
+
+The caller either writes the final text once (``engine.write_source`` writes
+a temp file and renames it into place) or renders a unified diff for a dry
+run.
+"""
+
+from __future__ import annotations
+
+import difflib
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Set, Tuple, Type
+
+from .engine import FileReport, apply_edits, lint_source
+from .rules import Edit, Finding, Rule
+
+CONFLICT_RULE = "fix-conflict"
+DEFAULT_MAX_ITERATIONS = 8
+
+
+@dataclass
+class RepairResult:
+    """Outcome of driving one file's fixes to a fixed point."""
+
+    path: str
+    original: str
+    source: str
+    iterations: int = 0
+    converged: bool = True
+    fixed: List[Finding] = field(default_factory=list)
+    conflicts: List[Finding] = field(default_factory=list)
+    remaining: List[Finding] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return self.source != self.original
+
+    def diff(self) -> str:
+        return "".join(
+            difflib.unified_diff(
+                self.original.splitlines(keepends=True),
+                self.source.splitlines(keepends=True),
+                fromfile=f"a/{self.path}",
+                tofile=f"b/{self.path}",
+            )
+        )
+
+    def to_report(self) -> FileReport:
+        """Fold the result into a :class:`FileReport` for the usual output."""
+        findings = sorted(self.fixed + self.conflicts + self.remaining, key=Finding.sort_key)
+        applied: Set[Edit] = {finding.edit for finding in self.fixed}
+        return FileReport(path=self.path, findings=findings, applied=applied, changed=self.changed, source=self.source)
+
+
+def select_edits(findings: Sequence[Finding]) -> Tuple[List[Finding], List[Finding]]:
+    """Split fixable findings into a non-overlapping set and conflict reports."""
+    chosen: List[Finding] = []
+    conflicts: List[Finding] = []
+    cursor = 0
+    holder: Optional[Finding] = None
+    for finding in sorted((f for f in findings if f.edit is not None), key=lambda f: (f.edit.start, f.edit.end)):
+        if holder is not None and finding.edit.start < cursor:
+            if finding.edit != holder.edit:
+                conflicts.append(
+                    Finding(
+                        finding.path,
+                        finding.line,
+                        finding.col,
+                        CONFLICT_RULE,
+                        f"{finding.rule} edit overlaps a {holder.rule} edit at line {holder.line}; skipped",
+                    )
+                )
+            continue
+        chosen.append(finding)
+        holder = finding
+        cursor = finding.edit.end
+    return chosen, conflicts
+
+
+def repair_source(
+    source: str,
+    path: str = "<string>",
+    rules: Optional[Sequence[Type[Rule]]] = None,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+) -> RepairResult:
+    """Apply ``rules``' fixes to ``source`` repeatedly until nothing changes."""
+    result = RepairResult(path=path, original=source, source=source)
+    current = source
+    for iteration in range(1, max_iterations + 1):
+        report = lint_source(current, path, rules)
+        chosen, conflicts = select_edits(report.findings)
+        result.conflicts = conflicts
+        if not chosen:
+            result.iterations = iteration - 1
+            result.remaining = report.findings
+            result.source = current
+            return result
+        current, _ = apply_edits(current, [finding.edit for finding in chosen])
+        result.fixed.extend(chosen)
+        result.iterations = iteration
+
+    report = lint_source(current, path, rules)
+    result.source = current
+    result.remaining = report.findings
+    result.converged = not any(finding.edit is not None for finding in report.findings)
+    return result
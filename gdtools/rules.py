@@ -0,0 +1,369 @@
+"""Lint and repair rules that run as visitors over a :class:`TokenStream`.
+
+Rules are registered with :func:`register_rule` and instantiated once per
+file.  The engine calls :meth:`Rule.begin`, then :meth:`Rule.visit_line` for
+every logical line, then :meth:`Rule.finish`, all during the same walk over
+the token stream.  Fixable rules attach an :class:`Edit` to the finding they
+report instead of rewriting the file themselves.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Type
+
+from .tokenizer import CLOSING_BRACKETS, NAME, OP, LogicalLine, TokenStream
+
+
+@dataclass(frozen=True)
+class Edit:
+    """Replace ``source[start:end]`` with ``text``."""
+
+    start: int
+    end: int
+    text: str
+
+
+@dataclass(frozen=True)
+class Finding:
+    """A single diagnostic produced by a rule."""
+
+    path: str
+    line: int
+    col: int
+    rule: str
+    message: str
+    edit: Optional[Edit] = None
+    fixable: bool = False
+
+    def sort_key(self):
+        return (self.path, self.line, self.col, self.rule, self.message)
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "line": self.line,
+            "col": self.col,
+            "rule": self.rule,
+            "message": self.message,
+            "fixable": self.fixable,
+        }
+
+
+class RuleContext:
+    """Per-file state handed to every rule visitor."""
+
+    def __init__(self, path: str, stream: TokenStream):
+        self.path = path
+        self.stream = stream
+        self.source = stream.source
+        self.findings: List[Finding] = []
+
+    def report(self, rule: "Rule", line: int, col: int, message: str, edit: Optional[Edit] = None) -> None:
+        self.findings.append(Finding(self.path, line, col, rule.name, message, edit, edit is not None))
+
+
+class Rule:
+    """Base class for token-stream rules.
+
+    Subclasses set ``name``, ``description`` and ``version`` and override any
+    of the visitor hooks.  Bump ``version`` whenever the rule's output for an
+    unchanged file can differ, so cached results are invalidated.
+    """
+
+    name = ""
+    description = ""
+    version = 1
+
+    def begin(self, ctx: RuleContext) -> None:
+        pass
+
+    def visit_line(self, line: LogicalLine, ctx: RuleContext) -> None:
+        pass
+
+    def finish(self, ctx: RuleContext) -> None:
+        pass
+
+
+RULES: Dict[str, Type[Rule]] = {}
+
+
+def register_rule(rule_class: Type[Rule]) -> Type[Rule]:
+    """Class decorator that adds a rule to the global registry."""
+    if not rule_class.name:
+        raise ValueError(f"{rule_class.__name__} must define a rule name")
+    if rule_class.name in RULES:
+        raise ValueError(f"Duplicate rule name: {rule_class.name}")
+    RULES[rule_class.name] = rule_class
+    return rule_class
+
+
+def get_rules(names: Optional[Iterable[str]] = None) -> List[Type[Rule]]:
+    """Return registered rule classes, optionally restricted to ``names``."""
+    if names is None:
+        return [RULES[name] for name in sorted(RULES)]
+    selected = []
+    for name in names:
+        if name not in RULES:
+            raise KeyError(f"Unknown rule: {name}")
+        selected.append(RULES[name])
+    return selected
+
+
+# Statement keywords that end a ternary condition when scanning backwards.
+_TERNARY_STOP_NAMES = {"return", "if", "elif", "else", "while", "match", "for", "in", "var", "const"}
+_TERNARY_STOP_OPS = {
+    "=", ":=", "+=", "-=", "*=", "/=", "%=", "&=", "|=", "^=", "**=", "<<=", ">>=",
+    ",", ":", ";", "->",
+}
+
+
+@register_rule
+class TernaryOperatorRule(Rule):
+    """Rewrite C-style ``cond ? a : b`` into ``a if cond else b``.
+
+    Operands are delimited by bracket depth rather than by regex, so calls,
+    dictionaries and strings containing ``?`` or ``:`` are left alone.
+    """
+
+    name = "ternary-operator"
+    description = "C-style ternary operator (GDScript uses 'a if cond else b')"
+
+    def visit_line(self, line: LogicalLine, ctx: RuleContext) -> None:
+        tokens = line.tokens
+        depth = line.depth
+        claimed_until = -1
+        for index, token in enumerate(tokens):
+            if token.kind != OP or token.text != "?":
+                continue
+            message = "C-style ternary operator; use 'a if cond else b'"
+            if index <= claimed_until:
+                ctx.report(self, token.line, token.col, message)
+                continue
+
+            level = depth[index]
+            cond_first = 0
+            for back in range(index - 1, -1, -1):
+                if depth[back] < level:
+                    cond_first = back + 1
+                    break
+                if depth[back] == level and _is_ternary_stop(tokens[back]):
+                    cond_first = back + 1
+                    break
+
+            colon = None
+            nested = 0
+            for forward in range(index + 1, len(tokens)):
+                if depth[forward] < level or (depth[forward] == level and tokens[forward].text in CLOSING_BRACKETS):
+                    break
+                if depth[forward] != level or tokens[forward].kind != OP:
+                    continue
+                if tokens[forward].text == "?":
+                    nested += 1
+                elif tokens[forward].text == ":":
+                    if nested == 0:
+                        colon = forward
+                        break
+                    nested -= 1
+
+            false_last = None
+            if colon is not None:
+                false_last = colon
+                nested = 0
+                for forward in range(colon + 1, len(tokens)):
+                    tok = tokens[forward]
+                    if depth[forward] == level and tok.kind == OP:
+                        if tok.text == "?":
+                            nested += 1
+                        elif tok.text == ":" and nested:
+                            nested -= 1
+                        elif tok.text in CLOSING_BRACKETS or tok.text in {",", ":", ";"}:
+                            break
+                    false_last = forward
+
+            if colon is None or cond_first >= index or colon == index + 1 or false_last == colon:
+                ctx.report(self, token.line, token.col, message)
+                continue
+
+            source = ctx.source
+            condition = line.text(source, cond_first, index - 1)
+            when_true = line.text(source, index + 1, colon - 1)
+            when_false = line.text(source, colon + 1, false_last)
+            edit = Edit(
+                tokens[cond_first].start,
+                tokens[false_last].end,
+                f"{when_true} if {condition} else {when_false}",
+            )
+            ctx.report(self, token.line, token.col, message, edit)
+            claimed_until = false_last
+
+
+def _is_ternary_stop(token) -> bool:
+    if token.kind == NAME:
+        return token.text in _TERNARY_STOP_NAMES
+    if token.kind == OP:
+        return token.text in _TERNARY_STOP_OPS
+    return False
+
+
+@register_rule
+class MisplacedVarRule(Rule):
+    """Repair ``a if var x := cond else b`` left behind by regex ternary fixes."""
+
+    name = "misplaced-var"
+    description = "Variable declaration trapped inside a conditional expression"
+
+    def visit_line(self, line: LogicalLine, ctx: RuleContext) -> None:
+        tokens = line.tokens
+        depth = line.depth
+        for index in range(1, len(tokens) - 2):
+            if not (
+                depth[index] == 0
+                and tokens[index].text == "if"
+                and tokens[index + 1].text == "var"
+                and tokens[index].kind == NAME
+                and tokens[index + 1].kind == NAME
+            ):
+                continue
+            declaration_end = None
+            else_index = None
+            for forward in range(index + 2, len(tokens)):
+                if depth[forward] != 0:
+                    continue
+                tok = tokens[forward]
+                if declaration_end is None and tok.kind == OP and tok.text in {"=", ":="}:
+                    declaration_end = forward
+                elif declaration_end is not None and tok.kind == NAME and tok.text == "else":
+                    else_index = forward
+                    break
+            marker = tokens[index + 1]
+            message = "'var' declaration inside a conditional expression"
+            if declaration_end is None or else_index is None or declaration_end + 1 >= else_index:
+                ctx.report(self, marker.line, marker.col, message)
+                return
+            source = ctx.source
+            value = line.text(source, 0, index - 1)
+            declaration = line.text(source, index + 1, declaration_end)
+            condition = line.text(source, declaration_end + 1, else_index - 1)
+            other = line.text(source, else_index + 1)
+            edit = Edit(
+                line.first.start,
+                line.last.end,
+                f"{declaration} {value} if {condition} else {other}",
+            )
+            ctx.report(self, marker.line, marker.col, message, edit)
+            return
+
+
+@register_rule
+class MixedIndentationRule(Rule):
+    """Flag indentation that mixes tabs and spaces or fights the file's style.
+
+    Only the indentation of logical lines matters to GDScript, so alignment
+    inside brackets is ignored.  The fix converts the indentation to the
+    file's dominant style, measuring space levels in the step between
+    neighbouring space-indented lines.  A line that opens a block keeps its
+    body: when the converted indent would not be deeper than the block line,
+    the finding is reported without a fix.
+    """
+
+    name = "mixed-indentation"
+    description = "Indentation mixes tabs and spaces or disagrees with the file style"
+    version = 2
+
+    def begin(self, ctx: RuleContext) -> None:
+        self.prefers_tabs = ctx.stream.prefers_tabs
+        self.unit = ctx.stream.space_unit
+        self.block_level: Optional[int] = None
+
+    def visit_line(self, line: LogicalLine, ctx: RuleContext) -> None:
+        indent = line.indent
+        tabs = indent.count("\t")
+        spaces = indent.count(" ")
+        if self.prefers_tabs:
+            replacement = "\t" * (tabs + (spaces + self.unit // 2) // self.unit)
+        else:
+            replacement = " " * (tabs * self.unit + spaces)
+        block_level = self.block_level
+        self.block_level = len(replacement) if line.last.text == ":" and line.last.kind == OP else None
+
+        has_tabs = "\t" in indent
+        has_spaces = " " in indent
+        if has_tabs and has_spaces:
+            message = "Mixed tabs and spaces in indentation"
+        elif self.prefers_tabs and has_spaces:
+            message = f"{len(indent)} leading spaces in a tab-indented file"
+        elif not self.prefers_tabs and has_tabs:
+            message = "Leading tabs in a space-indented file"
+        else:
+            return
+
+        if block_level is not None and len(replacement) <= block_level:
+            # Converting would move the line out of the block it belongs to.
+            ctx.report(self, line.start_line, 1, message)
+            return
+        edit = Edit(line.indent_start, line.indent_start + len(indent), replacement)
+        ctx.report(self, line.start_line, 1, message, edit)
+
+
+_BLOCK_TERMINATORS = {"return", "continue", "break", "pass"}
+
+
+@register_rule
+class UnexpectedIndentRule(Rule):
+    """Report GDScript's "Unexpected indent" and "Unindent" parse errors.
+
+    A logical line may only be deeper than the previous one when that line
+    opens a block with a trailing ``:``.  Over-indented lines are fixed by
+    aligning them with the previous statement unless that statement ends its
+    block, in which case the intended level cannot be inferred.  Only the
+    first line of an over-indented run is reported.
+    """
+
+    name = "unexpected-indent"
+    description = "Indentation that GDScript rejects as unexpected or inconsistent"
+    version = 2
+
+    def begin(self, ctx: RuleContext) -> None:
+        self.stack = [""]
+        self.previous: Optional[LogicalLine] = None
+
+    def visit_line(self, line: LogicalLine, ctx: RuleContext) -> None:
+        indent = line.indent
+        previous = self.previous
+        self.previous = line
+        if ("\t" in indent and " " in indent) or (previous is not None and not _same_style(indent, previous.indent)):
+            # Style problems are reported by mixed-indentation; levels are not comparable.
+            self.stack = [""]
+            return
+
+        opens_block = previous is not None and previous.last.kind == OP and previous.last.text == ":"
+        top = self.stack[-1]
+        if len(indent) > len(top):
+            if opens_block:
+                self.stack.append(indent)
+                return
+            if previous is not None and previous.indent == indent:
+                # Same run as the line already reported; fixing that one
+                # re-exposes this line on the next pass with a real target.
+                return
+            edit = None
+            if previous is None:
+                edit = Edit(line.indent_start, line.indent_start + len(indent), "")
+            elif previous.first.text not in _BLOCK_TERMINATORS:
+                # After return/continue/break the intended level is ambiguous.
+                edit = Edit(line.indent_start, line.indent_start + len(indent), previous.indent)
+            ctx.report(self, line.start_line, 1, "Unexpected indent", edit)
+            return
+
+        while len(self.stack) > 1 and len(self.stack[-1]) > len(indent):
+            self.stack.pop()
+        if self.stack[-1] != indent:
+            ctx.report(self, line.start_line, 1, "Unindent does not match any outer indentation level")
+            self.stack.append(indent)
+
+
+def _same_style(left: str, right: str) -> bool:
+    if not left or not right:
+        return True
+    return left[0] == right[0]
@@ -0,0 +1,176 @@
+"""Parallel runner that shards .gd files across a process pool.
+
+Files are grouped into size-balanced batches, largest first, so the slowest
+worker finishes close to the time it takes to process the single largest
+file.  Reports are merged back in path order, so the output is identical to
+a serial run regardless of worker scheduling.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from .cache import LintCache, content_hash
+from .engine import FileReport, iter_gd_files, lint_source, read_source, write_source
+from .pipeline import DEFAULT_MAX_ITERATIONS, repair_source
+from .rules import get_rules
+
+
+def default_jobs() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def shard(files: Sequence[Path], jobs: int) -> List[List[Path]]:
+    """Split ``files`` into batches of roughly equal byte size.
+
+    Each batch is at least as large as the biggest file, and there are about
+    four batches per worker so stragglers can be rebalanced by the pool.
+    """
+    sized = sorted(((_size(path), path) for path in files), key=lambda item: (-item[0], str(item[1])))
+    if not sized:
+        return []
+    total = sum(size for size, _ in sized)
+    target = max(sized[0][0], total // (jobs * 4) or 1)
+
+    batches: List[List[Path]] = []
+    current: List[Path] = []
+    current_size = 0
+    for size, path in sized:
+        if current and current_size + size > target:
+            batches.append(current)
+            current, current_size = [], 0
+        current.append(path)
+        current_size += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+class Job(NamedTuple):
+    """Work for one file: rules to run if unchanged, else every rule."""
+
+    path: Path
+    stale_rules: Optional[List[str]]
+    expected_hash: Optional[str]
+
+
+class JobResult(NamedTuple):
+    report: FileReport
+    ran_rules: List[str]
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+def _lint_batch(
+    jobs: List[Job],
+    rule_names: List[str],
+    fix: bool,
+    dry_run: bool = False,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+) -> List[JobResult]:
+    results = []
+    for job in jobs:
+        stat = os.stat(job.path)
+        source = read_source(job.path)
+        digest = content_hash(source)
+        names = rule_names
+        if job.expected_hash is not None and digest == job.expected_hash and job.stale_rules is not None:
+            names = job.stale_rules
+        if names and fix:
+            result = repair_source(source, str(job.path), get_rules(names), max_iterations)
+            report = result.to_report()
+            if report.changed:
+                if dry_run:
+                    report.diff = result.diff()
+                else:
+                    write_source(job.path, report.source)
+            report.source = ""
+        elif names:
+            report = lint_source(source, str(job.path), get_rules(names))
+            report.source = ""
+        else:
+            report = FileReport(path=str(job.path))
+        results.append(JobResult(report, names, stat.st_size, stat.st_mtime_ns, digest))
+    return results
+
+
+def run(
+    paths: Iterable,
+    rule_names: Optional[Sequence[str]] = None,
+    fix: bool = False,
+    jobs: Optional[int] = None,
+    cache: Optional[LintCache] = None,
+    dry_run: bool = False,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+) -> List[FileReport]:
+    """Lint every .gd file under ``paths`` using up to ``jobs`` processes.
+
+    With a ``cache``, files whose cached findings are still valid are served
+    without being opened and only stale rules run on the rest.  ``fix`` drives
+    each file through the fix-point pipeline and writes it at most once;
+    with ``dry_run`` nothing is written and each report carries a diff.
+    """
+    if dry_run:
+        # Findings describe the repaired text, not what is on disk.
+        cache = None
+    files = iter_gd_files(paths)
+    names = [rule.name for rule in get_rules(rule_names)]
+    versions = {rule.name: rule.version for rule in get_rules(names)}
+    jobs = jobs or default_jobs()
+
+    reports: List[FileReport] = []
+    pending: Dict[Path, Job] = {}
+    for path in files:
+        if cache is None:
+            pending[path] = Job(path, None, None)
+            continue
+        cached, stale, expected_hash = cache.lookup(path, versions, fix)
+        if cached is not None:
+            reports.append(cached)
+        else:
+            pending[path] = Job(path, stale, expected_hash)
+
+    batches = [[pending[path] for path in batch] for batch in shard(list(pending), jobs)]
+    if jobs == 1 or len(batches) <= 1:
+        results = [
+            result for batch in batches for result in _lint_batch(batch, names, fix, dry_run, max_iterations)
+        ]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        results = []
+        with ProcessPoolExecutor(max_workers=min(jobs, len(batches))) as pool:
+            futures = [
+                pool.submit(_lint_batch, batch, names, fix, dry_run, max_iterations) for batch in batches
+            ]
+            for future in futures:
+                results.extend(future.result())
+
+    for result in results:
+        report = result.report
+        if cache is not None:
+            if report.changed:
+                cache.invalidate(report.path)
+            else:
+                ran = {name: versions[name] for name in result.ran_rules}
+                cache.store(report.path, result.size, result.mtime_ns, result.digest, ran, report.findings)
+                if len(ran) < len(versions):
+                    report = cache.report_for(report.path, names)
+        reports.append(report)
+
+    if cache is not None:
+        cache.save()
+    reports.sort(key=lambda report: report.path)
+    return reports
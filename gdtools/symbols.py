@@ -0,0 +1,364 @@
+"""Project-wide symbol index with normalized function-body hashes.
+
+Usage::
+
+    python -m gdtools.symbols [paths] [--who NAME] [--duplicates] [--identical] [--json]
+
+Every ``class_name``, inner ``class``, ``func``, ``const``, ``signal``,
+``preload("...")``, ``load("...")`` and ``extends`` in the tree is recorded
+from the shared token stream, so keywords inside strings and comments are
+never mistaken for definitions.  The first use of each PascalCase
+identifier is kept as a ``reference`` so the dependency graph can resolve
+global ``class_name`` uses without re-tokenizing.  Each function carries a
+BLAKE2 hash of its body tokens, which ignores whitespace, comments and
+indentation style but not names or literals.
+
+After one build, "who defines X", "what is defined twice in one file" and
+"which bodies are identical across files" are dictionary lookups.  Per-file
+symbols are cached in ``.gdtools_cache/symbols.json`` next to
+``project.godot`` and reused while a file's size and mtime (or, failing that,
+its content hash) are unchanged.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .cache import CACHE_DIRECTORY, content_hash, find_project_root, write_json_atomic
+from .cli import ADDON_ROOT
+from .engine import iter_gd_files, read_source
+from .tokenizer import NAME, OP, STRING, tokenize
+
+SYMBOLS_FILENAME = "symbols.json"
+# Bump when extraction or hashing changes so cached entries are rebuilt.
+SYMBOLS_FORMAT = 2
+
+CLASS_NAME = "class_name"
+CLASS = "class"
+FUNC = "func"
+CONST = "const"
+SIGNAL = "signal"
+PRELOAD = "preload"
+LOAD = "load"
+EXTENDS = "extends"
+# First use of a PascalCase identifier; resolved against class_names later.
+REFERENCE = "reference"
+
+_DECLARATIONS = {CLASS_NAME, CLASS, FUNC, CONST, SIGNAL}
+DEFINITION_KINDS = frozenset(_DECLARATIONS)
+# Bodies shorter than this (``pass``, ``return null``) are too common to report.
+MIN_BODY_TOKENS = 8
+
+
+class Symbol(NamedTuple):
+    kind: str
+    name: str
+    path: str
+    line: int
+    body_hash: Optional[str] = None
+    body_tokens: int = 0
+    target: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        data = {"kind": self.kind, "name": self.name, "path": self.path, "line": self.line}
+        if self.body_hash is not None:
+            data["body_hash"] = self.body_hash
+            data["body_tokens"] = self.body_tokens
+        if self.target is not None:
+            data["target"] = self.target
+        return data
+
+
+def string_value(text: str) -> str:
+    """Strip the prefix and quotes from a string token's text."""
+    body = text.lstrip("&^r")
+    quote = 3 if body[:3] in ('"""', "'''") else 1
+    return body[quote:-quote]
+
+
+def _declaration(tokens) -> Optional[Tuple[str, int]]:
+    """Return ``(keyword, index of the declared name)`` for a declaration line."""
+    index = 0
+    count = len(tokens)
+    while index < count and tokens[index].text == "@":
+        # Skip ``@annotation`` and an optional ``(...)`` argument list.
+        index += 2
+        if index < count and tokens[index].text == "(":
+            depth = 0
+            while index < count:
+                if tokens[index].text == "(":
+                    depth += 1
+                elif tokens[index].text == ")":
+                    depth -= 1
+                    if depth == 0:
+                        index += 1
+                        break
+                index += 1
+    if index < count and tokens[index].text == "static":
+        index += 1
+    if index + 1 < count and tokens[index].kind == NAME and tokens[index].text in _DECLARATIONS:
+        if tokens[index + 1].kind == NAME:
+            return tokens[index].text, index + 1
+    return None
+
+
+def _body_hash(texts: List[str]) -> str:
+    return hashlib.blake2b("\x1f".join(texts).encode("utf-8"), digest_size=12).hexdigest()
+
+
+def extract_symbols(source: str, path: str) -> List[Symbol]:
+    """Collect the declarations, resource paths and references in one file."""
+    stream = tokenize(source)
+    symbols: List[Symbol] = []
+    # Open function: (name, line, indent width, body token texts)
+    open_func: Optional[Tuple[str, int, int, List[str]]] = None
+    referenced = set()
+
+    def close_func():
+        name, line, _, texts = open_func
+        symbols.append(Symbol(FUNC, name, path, line, _body_hash(texts), len(texts)))
+
+    for logical in stream.lines:
+        tokens = logical.tokens
+        width = len(logical.indent)
+        if open_func is not None:
+            if width > open_func[2]:
+                open_func[3].extend(token.text for token in tokens)
+            else:
+                close_func()
+                open_func = None
+
+        declared = _declaration(tokens)
+        if declared is not None:
+            keyword, name_index = declared
+            name = tokens[name_index].text
+            if keyword == FUNC:
+                # Anything after the signature's ``:`` is a one-line body.
+                body: List[str] = []
+                for position in range(name_index + 1, len(tokens)):
+                    if tokens[position].text == ":" and logical.depth[position] == 0:
+                        body = [token.text for token in tokens[position + 1:]]
+                        break
+                open_func = (name, tokens[0].line, width, body)
+            else:
+                symbols.append(Symbol(keyword, name, path, tokens[0].line))
+
+        for position, token in enumerate(tokens):
+            if token.kind != NAME:
+                continue
+            following = tokens[position + 1] if position + 1 < len(tokens) else None
+            if token.text in (PRELOAD, LOAD) and following is not None and following.text == "(":
+                argument = tokens[position + 2] if position + 2 < len(tokens) else None
+                if argument is not None and argument.kind == STRING:
+                    target = string_value(argument.text)
+                    symbols.append(Symbol(token.text, target.rsplit("/", 1)[-1], path, token.line, target=target))
+            elif token.text == EXTENDS and following is not None:
+                if following.kind == STRING:
+                    target = string_value(following.text)
+                    symbols.append(Symbol(EXTENDS, target.rsplit("/", 1)[-1], path, token.line, target=target))
+                elif following.kind == NAME:
+                    symbols.append(Symbol(EXTENDS, following.text, path, token.line))
+            elif token.text[0].isupper() and not token.text.isupper() and token.text not in referenced:
+                if position == 0 or tokens[position - 1].text != ".":
+                    referenced.add(token.text)
+                    symbols.append(Symbol(REFERENCE, token.text, path, token.line))
+
+    if open_func is not None:
+        close_func()
+    symbols.sort(key=lambda symbol: (symbol.line, symbol.kind))
+    return symbols
+
+
+class SymbolIndex:
+    """Symbols of every .gd file under a project, with O(1) lookups."""
+
+    def __init__(self, project_root: Optional[Path] = None, use_cache: bool = True):
+        self.project_root = Path(project_root).resolve() if project_root is not None else None
+        self.cache_path = self.project_root / CACHE_DIRECTORY / SYMBOLS_FILENAME if self.project_root else None
+        self.use_cache = use_cache and self.cache_path is not None
+        self.files: Dict[str, List[Symbol]] = {}
+        self.entries: Dict[str, dict] = {}
+        self.stats = {"reused": 0, "rehashed": 0, "parsed": 0}
+        self._by_name: Optional[Dict[str, List[Symbol]]] = None
+        self._by_hash: Optional[Dict[str, List[Symbol]]] = None
+        if self.use_cache:
+            self._load()
+
+    @classmethod
+    def build(cls, paths: Iterable, use_cache: bool = True) -> "SymbolIndex":
+        paths = list(paths)
+        index = cls(find_project_root(paths), use_cache)
+        index.update(iter_gd_files(paths))
+        return index
+
+    def _load(self) -> None:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if data.get("format") == SYMBOLS_FORMAT:
+            self.entries = data.get("files", {})
+
+    def save(self) -> None:
+        if self.use_cache:
+            write_json_atomic(self.cache_path, {"format": SYMBOLS_FORMAT, "files": self.entries})
+
+    def key(self, path) -> str:
+        resolved = Path(path).resolve()
+        if self.project_root is not None:
+            try:
+                return resolved.relative_to(self.project_root).as_posix()
+            except ValueError:
+                pass
+        return resolved.as_posix()
+
+    def update(self, files: Iterable[Path]) -> None:
+        """(Re)index ``files``; unchanged ones are served from the cache."""
+        seen = set()
+        for path in files:
+            key = self.key(path)
+            seen.add(key)
+            stat = os.stat(path)
+            entry = self.entries.get(key)
+            if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                self.stats["reused"] += 1
+            else:
+                source = read_source(path)
+                digest = content_hash(source)
+                if entry is not None and entry["hash"] == digest:
+                    self.stats["rehashed"] += 1
+                else:
+                    self.stats["parsed"] += 1
+                    entry = {
+                        "hash": digest,
+                        "symbols": [list(symbol[:2]) + list(symbol[3:]) for symbol in extract_symbols(source, key)],
+                    }
+                entry["size"] = stat.st_size
+                entry["mtime_ns"] = stat.st_mtime_ns
+                self.entries[key] = entry
+            self.files[key] = [
+                Symbol(kind, name, key, line, body_hash, body_tokens, target)
+                for kind, name, line, body_hash, body_tokens, target in entry["symbols"]
+            ]
+        self._by_name = self._by_hash = None
+        self.save()
+
+    def remove(self, path) -> None:
+        key = self.key(path)
+        self.files.pop(key, None)
+        self.entries.pop(key, None)
+        self._by_name = self._by_hash = None
+
+    @property
+    def by_name(self) -> Dict[str, List[Symbol]]:
+        if self._by_name is None:
+            self._by_name = defaultdict(list)
+            for symbols in self.files.values():
+                for symbol in symbols:
+                    self._by_name[symbol.name].append(symbol)
+        return self._by_name
+
+    @property
+    def by_hash(self) -> Dict[str, List[Symbol]]:
+        if self._by_hash is None:
+            self._by_hash = defaultdict(list)
+            for symbols in self.files.values():
+                for symbol in symbols:
+                    if symbol.body_hash is not None and symbol.body_tokens >= MIN_BODY_TOKENS:
+                        self._by_hash[symbol.body_hash].append(symbol)
+        return self._by_hash
+
+    def who_defines(self, name: str, kind: Optional[str] = None) -> List[Symbol]:
+        """Every declaration of ``name``, optionally of one kind."""
+        return [
+            symbol
+            for symbol in self.by_name.get(name, [])
+            if symbol.kind in DEFINITION_KINDS and (kind is None or symbol.kind == kind)
+        ]
+
+    def duplicate_definitions(self) -> List[List[Symbol]]:
+        """Names declared more than once in a file, and clashing class_names."""
+        groups = []
+        for symbols in self.by_name.values():
+            per_file = defaultdict(list)
+            class_names = []
+            for symbol in symbols:
+                if symbol.kind == CLASS_NAME:
+                    class_names.append(symbol)
+                elif symbol.kind in DEFINITION_KINDS:
+                    per_file[(symbol.path, symbol.kind)].append(symbol)
+            groups.extend(group for group in per_file.values() if len(group) > 1)
+            if len({symbol.path for symbol in class_names}) > 1:
+                groups.append(class_names)
+        return sorted(groups, key=lambda group: (group[0].path, group[0].line))
+
+    def identical_bodies(self, cross_file: bool = True) -> List[List[Symbol]]:
+        """Functions sharing a body hash, by default only across different files."""
+        groups = []
+        for symbols in self.by_hash.values():
+            if len(symbols) < 2:
+                continue
+            if cross_file and len({symbol.path for symbol in symbols}) < 2:
+                continue
+            groups.append(sorted(symbols, key=lambda symbol: (symbol.path, symbol.line)))
+        return sorted(groups, key=lambda group: (group[0].path, group[0].line))
+
+
+def _format_group(group: List[Symbol]) -> str:
+    head = group[0]
+    sites = ", ".join(f"{symbol.path}:{symbol.line}" for symbol in group)
+    return f"{head.kind} {head.name}: {sites}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="gdtools.symbols", description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="Files or directories (default: addons/godot_mcp)")
+    parser.add_argument("--who", metavar="NAME", help="List every definition of NAME")
+    parser.add_argument("--duplicates", action="store_true", help="Names defined twice in one file")
+    parser.add_argument("--identical", action="store_true", help="Identical function bodies across files")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update .gdtools_cache")
+    args = parser.parse_args(argv)
+
+    index = SymbolIndex.build(args.paths or [ADDON_ROOT], use_cache=not args.no_cache)
+    show_all = not (args.who or args.duplicates or args.identical)
+    results = {}
+    if args.who:
+        results["who"] = [symbol.to_dict() for symbol in index.who_defines(args.who)]
+    if args.duplicates or show_all:
+        results["duplicates"] = [[s.to_dict() for s in group] for group in index.duplicate_definitions()]
+    if args.identical or show_all:
+        results["identical_bodies"] = [[s.to_dict() for s in group] for group in index.identical_bodies()]
+
+    if args.json:
+        results["stats"] = dict(index.stats, files=len(index.files))
+        print(json.dumps(results, indent=2))
+    else:
+        if args.who:
+            for symbol in index.who_defines(args.who):
+                print(f"{symbol.path}:{symbol.line}: {symbol.kind} {symbol.name}")
+        if "duplicates" in results:
+            print(f"Duplicate definitions ({len(results['duplicates'])}):")
+            for group in index.duplicate_definitions():
+                print(f"  {_format_group(group)}")
+        if "identical_bodies" in results:
+            print(f"Identical bodies across files ({len(results['identical_bodies'])}):")
+            for group in index.identical_bodies():
+                print(f"  {_format_group(group)}")
+        stats = index.stats
+        print(
+            f"{len(index.files)} files indexed ({stats['parsed']} parsed, "
+            f"{stats['rehashed']} rehashed, {stats['reused']} from cache)"
+        )
+    return 1 if results.get("duplicates") else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,219 @@
+"""GDScript tokenizer shared by the lint and repair tooling.
+
+The tokenizer understands the parts of GDScript that line-based regex passes
+keep tripping over: single, double and triple-quoted strings (including
+``&"StringName"``, ``^"NodePath"`` and ``r"raw"`` prefixes), ``#`` comments,
+bracket nesting, backslash continuations and logical-line indentation.
+
+A file is tokenized exactly once into a :class:`TokenStream`; every rule then
+walks the same stream.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from math import gcd
+from typing import List, NamedTuple, Optional
+
+NAME = "name"
+NUMBER = "number"
+STRING = "string"
+OP = "op"
+COMMENT = "comment"
+ERROR = "error"
+
+OPENING_BRACKETS = {"(": ")", "[": "]", "{": "}"}
+CLOSING_BRACKETS = {")": "(", "]": "[", "}": "{"}
+
+_TOKEN_RE = re.compile(
+    r"""
+      (?P<ws>[ \t\f]+)
+    | (?P<nl>\r?\n)
+    | (?P<comment>\#[^\r\n]*)
+    | (?P<string>[&^]?r?(?:
+            \"\"\"(?:\\.|[^\\])*?\"\"\"
+          | '''(?:\\.|[^\\])*?'''
+          | "(?:\\.|[^"\\])*"
+          | '(?:\\.|[^'\\])*'
+      ))
+    | (?P<badstring>[&^]?r?(?:\"\"\"|'''|"|')[^\r\n]*)
+    | (?P<number>0[xX][0-9a-fA-F_]+|0[bB][01_]+
+          |(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE][+-]?\d[\d_]*)?)
+    | (?P<name>[^\W\d]\w*)
+    | (?P<continuation>\\\r?\n)
+    | (?P<op>\*\*=|<<=|>>=|\*\*|<<|>>|==|!=|<=|>=|&&|\|\||\+=|-=|\*=|/=|%=|&=|\|=|\^=
+          |->|:=|\.\.|[-+*/%<>=!&|^~.,:;()\[\]{}@$?])
+    | (?P<error>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+class Token(NamedTuple):
+    """A single significant token with its source span."""
+
+    kind: str
+    text: str
+    start: int
+    end: int
+    line: int
+    col: int
+
+
+@dataclass
+class LogicalLine:
+    """One GDScript statement line, possibly spanning several physical lines.
+
+    ``indent`` is the leading whitespace of the first physical line and
+    ``indent_start`` its offset in the source, so rules can emit edits that
+    replace the indentation without touching the code.
+    """
+
+    indent: str
+    indent_start: int
+    tokens: List[Token]
+    start_line: int
+    end_line: int
+    depth: List[int] = field(default_factory=list)
+
+    @property
+    def first(self) -> Token:
+        return self.tokens[0]
+
+    @property
+    def last(self) -> Token:
+        return self.tokens[-1]
+
+    def text(self, source: str, first: int = 0, last: Optional[int] = None) -> str:
+        """Return the source text spanned by ``tokens[first:last + 1]``."""
+        if last is None:
+            last = len(self.tokens) - 1
+        return source[self.tokens[first].start:self.tokens[last].end]
+
+
+@dataclass
+class TokenStream:
+    """Result of tokenizing one file."""
+
+    source: str
+    lines: List[LogicalLine]
+    comments: List[Token]
+    errors: List[Token]
+    tab_indented: int = 0
+    space_indented: int = 0
+    space_step: int = 0
+
+    @property
+    def tokens(self) -> List[Token]:
+        return [token for line in self.lines for token in line.tokens]
+
+    @property
+    def prefers_tabs(self) -> bool:
+        return self.tab_indented >= self.space_indented
+
+    @property
+    def space_unit(self) -> int:
+        return self.space_step or 4
+
+
+def tokenize(source: str) -> TokenStream:
+    """Tokenize ``source`` into logical lines in a single left-to-right scan."""
+    lines: List[LogicalLine] = []
+    comments: List[Token] = []
+    errors: List[Token] = []
+    tab_indented = 0
+    space_indented = 0
+    space_step = 0
+    previous_width: Optional[int] = None
+
+    line_no = 1
+    line_start = 0
+    bracket_depth = 0
+    at_line_start = True
+    pending_indent = ""
+    pending_indent_start = 0
+    current: Optional[LogicalLine] = None
+
+    pos = 0
+    length = len(source)
+    match = _TOKEN_RE.match
+    while pos < length:
+        m = match(source, pos)
+        kind = m.lastgroup
+        text = m.group()
+        start = pos
+        pos = m.end()
+
+        if kind == "ws":
+            if at_line_start:
+                pending_indent = text
+                pending_indent_start = start
+            continue
+
+        if kind == "nl" or kind == "continuation":
+            line_no += 1
+            line_start = pos
+            if kind == "nl" and bracket_depth == 0 and current is not None:
+                lines.append(current)
+                current = None
+            at_line_start = current is None
+            if at_line_start:
+                pending_indent = ""
+                pending_indent_start = pos
+            continue
+
+        col = start - line_start + 1
+        if kind == "comment":
+            comments.append(Token(COMMENT, text, start, pos, line_no, col))
+            continue
+
+        if kind == "badstring":
+            kind = ERROR
+        token = Token(kind, text, start, pos, line_no, col)
+        if kind == ERROR:
+            errors.append(token)
+
+        if current is None:
+            current = LogicalLine(pending_indent, pending_indent_start, [], line_no, line_no)
+            if "\t" in pending_indent:
+                if " " not in pending_indent:
+                    tab_indented += 1
+                previous_width = None
+            else:
+                # Space levels are measured in the steps between neighbouring
+                # lines, not the smallest indent: a file may only use spaces
+                # several levels deep.
+                width = len(pending_indent)
+                if width:
+                    space_indented += 1
+                if previous_width is not None:
+                    space_step = gcd(space_step, abs(width - previous_width))
+                previous_width = width
+            at_line_start = False
+
+        current.depth.append(bracket_depth)
+        current.tokens.append(token)
+        if kind == OP:
+            if text in OPENING_BRACKETS:
+                bracket_depth += 1
+            elif text in CLOSING_BRACKETS and bracket_depth > 0:
+                bracket_depth -= 1
+
+        if kind == STRING and "\n" in text:
+            line_no += text.count("\n")
+            line_start = start + text.rindex("\n") + 1
+        current.end_line = line_no
+
+    if current is not None:
+        lines.append(current)
+
+    return TokenStream(
+        source=source,
+        lines=lines,
+        comments=comments,
+        errors=errors,
+        tab_indented=tab_indented,
+        space_indented=space_indented,
+        space_step=space_step,
+    )
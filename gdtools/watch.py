@@ -0,0 +1,279 @@
+"""Watch mode: re-lint .gd files as soon as they change on disk.
+
+Usage::
+
+    python -m gdtools.watch [paths] [--rules ...] [--interval S] [--debounce S] [--port N]
+
+The tree is polled with ``os.scandir`` and each poll is diffed against the
+previous ``(size, st_mtime_ns)`` snapshot, so an idle poll costs one stat per
+file and never opens anything.  Changes are debounced: a batch of writes
+(edit_script, the patch tools, ``_ensure_signal_stub``) is linted once the
+tree has been quiet for ``--debounce`` seconds, and only the files in that
+batch are re-linted.
+
+Results live in an in-memory :class:`ResultTable`.  With ``--port`` it is
+served as JSON on localhost::
+
+    GET /status                          generation, file and finding counts
+    GET /findings?path=...&rule=...      current findings, optionally filtered
+    GET /findings?since=N                only files re-linted after generation N
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from . import runner
+from .cache import LintCache, find_project_root
+from .cli import ADDON_ROOT, format_reports
+from .engine import SKIPPED_DIRECTORIES, FileReport
+from .rules import get_rules
+
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+def scan_tree(paths: Iterable) -> Snapshot:
+    """Map every .gd file under ``paths`` to its ``(size, mtime_ns)``."""
+    snapshot: Snapshot = {}
+    pending = []
+    for entry in paths:
+        entry = str(entry)
+        if os.path.isfile(entry):
+            stat = os.stat(entry)
+            snapshot[entry] = (stat.st_size, stat.st_mtime_ns)
+        else:
+            pending.append(entry)
+    while pending:
+        directory = pending.pop()
+        try:
+            iterator = os.scandir(directory)
+        except OSError:
+            continue
+        with iterator:
+            for item in iterator:
+                try:
+                    if item.is_dir(follow_symlinks=False):
+                        if item.name not in SKIPPED_DIRECTORIES:
+                            pending.append(item.path)
+                    elif item.name.endswith(".gd"):
+                        stat = item.stat()
+                        snapshot[item.path] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    # Deleted between listing and stat; the next poll sees it gone.
+                    continue
+    return snapshot
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> Tuple[List[str], List[str]]:
+    """Return ``(changed_or_added, removed)`` paths between two snapshots."""
+    changed = [path for path, stamp in new.items() if old.get(path) != stamp]
+    removed = [path for path in old if path not in new]
+    return sorted(changed), sorted(removed)
+
+
+class ResultTable:
+    """Thread-safe table of the latest findings per file."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.entries: Dict[str, dict] = {}
+
+    def update(self, reports: Sequence[FileReport]) -> int:
+        with self.lock:
+            self.generation += 1
+            for report in reports:
+                self.entries[report.path] = {
+                    "generation": self.generation,
+                    "linted_at": time.time(),
+                    "findings": [finding.to_dict() for finding in report.remaining],
+                }
+            return self.generation
+
+    def remove(self, paths: Iterable[str]) -> None:
+        with self.lock:
+            for path in paths:
+                self.entries.pop(path, None)
+
+    def status(self) -> dict:
+        with self.lock:
+            return {
+                "generation": self.generation,
+                "files": len(self.entries),
+                "findings": sum(len(entry["findings"]) for entry in self.entries.values()),
+            }
+
+    def query(self, path: Optional[str] = None, rule: Optional[str] = None, since: int = 0) -> dict:
+        """Findings for files matching ``path`` (exact or path suffix, ``res://`` allowed)."""
+        suffix = path[len("res://"):] if path and path.startswith("res://") else path
+        with self.lock:
+            findings = []
+            files = 0
+            for file_path, entry in sorted(self.entries.items()):
+                if entry["generation"] <= since:
+                    continue
+                if suffix and not (file_path == suffix or file_path.replace(os.sep, "/").endswith("/" + suffix)):
+                    continue
+                files += 1
+                findings.extend(f for f in entry["findings"] if rule is None or f["rule"] == rule)
+            return {"generation": self.generation, "files": files, "findings": findings}
+
+
+class Watcher:
+    """Poll ``paths``, debounce bursts of writes and re-lint what changed."""
+
+    def __init__(
+        self,
+        paths: Sequence,
+        rule_names: Optional[Sequence[str]] = None,
+        interval: float = 0.2,
+        debounce: float = 0.3,
+        jobs: int = 1,
+        cache: Optional[LintCache] = None,
+        table: Optional[ResultTable] = None,
+        on_update: Optional[Callable[[List[FileReport], List[str]], None]] = None,
+    ):
+        self.paths = list(paths)
+        self.rule_names = rule_names
+        self.interval = interval
+        self.debounce = debounce
+        self.jobs = jobs
+        self.cache = cache
+        self.table = table or ResultTable()
+        self.on_update = on_update
+        self.snapshot: Snapshot = {}
+        self.pending_changed: set = set()
+        self.pending_removed: set = set()
+        self.last_change = 0.0
+
+    def poll(self, now: Optional[float] = None) -> bool:
+        """Take one snapshot; lint the pending batch once it has settled.
+
+        Returns ``True`` when a batch was linted.
+        """
+        now = time.monotonic() if now is None else now
+        current = scan_tree(self.paths)
+        changed, removed = diff_snapshots(self.snapshot, current)
+        self.snapshot = current
+        if changed or removed:
+            self.pending_changed.update(changed)
+            self.pending_changed.difference_update(removed)
+            self.pending_removed.update(removed)
+            self.pending_removed.difference_update(changed)
+            self.last_change = now
+            return False
+        if (self.pending_changed or self.pending_removed) and now - self.last_change >= self.debounce:
+            self.flush()
+            return True
+        return False
+
+    def flush(self) -> List[FileReport]:
+        changed = sorted(self.pending_changed)
+        removed = sorted(self.pending_removed)
+        self.pending_changed.clear()
+        self.pending_removed.clear()
+
+        reports = runner.run(changed, self.rule_names, jobs=self.jobs, cache=self.cache) if changed else []
+        if removed:
+            self.table.remove(removed)
+            if self.cache is not None:
+                for path in removed:
+                    self.cache.invalidate(path)
+                self.cache.save()
+        self.table.update(reports)
+        if self.on_update is not None:
+            self.on_update(reports, removed)
+        return reports
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        # The first poll sees every file as new; lint them without waiting.
+        self.poll()
+        self.flush()
+        while not stop.wait(self.interval):
+            self.poll()
+
+
+def serve(table: ResultTable, port: int, host: str = "127.0.0.1"):
+    """Serve ``table`` as JSON from a daemon thread; returns the server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            if url.path == "/status":
+                payload = table.status()
+            elif url.path == "/findings":
+                try:
+                    since = int(query.get("since", 0))
+                except ValueError:
+                    self.send_error(400, "since must be an integer")
+                    return
+                payload = table.query(query.get("path"), query.get("rule"), since)
+            else:
+                self.send_error(404)
+                return
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="gdtools-watch-http", daemon=True).start()
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="gdtools.watch", description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="Files or directories (default: addons/godot_mcp)")
+    parser.add_argument("--rules", help="Comma-separated rule names to run (default: all)")
+    parser.add_argument("--interval", type=float, default=0.2, help="Seconds between polls")
+    parser.add_argument("--debounce", type=float, default=0.3, help="Quiet period before re-linting")
+    parser.add_argument("--port", type=int, help="Serve the result table on localhost:PORT")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update .gdtools_cache")
+    parser.add_argument("--json", action="store_true", help="Print each batch as JSON")
+    args = parser.parse_args(argv)
+
+    rule_names = args.rules.split(",") if args.rules else None
+    try:
+        get_rules(rule_names)
+    except KeyError as error:
+        print(error.args[0], file=sys.stderr)
+        return 2
+
+    paths = [Path(path) for path in args.paths] or [ADDON_ROOT]
+    cache = None if args.no_cache else LintCache(find_project_root(paths))
+
+    def report(reports: List[FileReport], removed: List[str]) -> None:
+        for path in removed:
+            print(f"{path}: removed")
+        if reports:
+            print(format_reports(reports, args.json), flush=True)
+
+    watcher = Watcher(paths, rule_names, args.interval, args.debounce, cache=cache, on_update=report)
+    if args.port is not None:
+        server = serve(watcher.table, args.port)
+        print(f"Serving results on http://{server.server_address[0]}:{server.server_address[1]}", flush=True)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
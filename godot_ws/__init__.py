@@ -0,0 +1,19 @@
+"""Python tooling for the editor's WebSocket command channel (port 9080)."""
+
+from .client import ClientPool, CommandError, CommandTimeout, Connection, ConnectionLost
+from .protocol import DEFAULT_URI, WELCOME
+from .server import CommandProfile, StandInServer
+from .stats import LatencyHistogram
+
+__all__ = [
+    "DEFAULT_URI",
+    "WELCOME",
+    "ClientPool",
+    "CommandError",
+    "CommandProfile",
+    "CommandTimeout",
+    "Connection",
+    "ConnectionLost",
+    "LatencyHistogram",
+    "StandInServer",
+]
@@ -0,0 +1,263 @@
+"""Load generator and latency benchmark for the editor command channel.
+
+Usage::
+
+    python -m godot_ws.bench [--uri URI] [-c N] [-m M] [-n REQUESTS | -d SECONDS]
+                             [--mix TYPE[=WEIGHT],...] [--params TYPE=JSON]
+                             [--json] [--output FILE]
+
+``N`` connections are opened and each keeps ``M`` commands in flight over a
+multiplexed :class:`~godot_ws.client.Connection`, which matches replies to
+requests by ``commandId``, so replies may arrive in any order.
+Commands are drawn from a weighted mix (``--mix get_editor_state=3,list_nodes``);
+``--seed`` makes the sequence repeatable.
+
+The report gives throughput plus p50/p90/p99/max latency and a coarse
+histogram, overall and per command type.  ``--output`` writes it as JSON so
+runs can be diffed over time; error replies count towards latency (the
+editor did the round trip) while timeouts do not.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+import websockets
+
+from .client import CommandTimeout, Connection, ConnectionLost
+from .protocol import DEFAULT_URI, STATUS_SUCCESS
+from .stats import LatencyHistogram, merged
+
+DEFAULT_MIX = "get_editor_state,list_nodes,get_scene_structure"
+DEFAULT_PARAMS = {
+    "list_nodes": {"parent_path": "/root"},
+    "get_scene_structure": {"path": "res://TestScene.tscn", "mode": "state"},
+}
+
+
+@dataclass
+class CommandSpec:
+    type: str
+    weight: float = 1.0
+    params: dict = field(default_factory=dict)
+
+
+def parse_mix(text: str, params: Optional[Dict[str, dict]] = None) -> List[CommandSpec]:
+    """Parse ``type[=weight],...`` into command specs with their params."""
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    specs = []
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, _, weight = item.partition("=")
+        try:
+            value = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Bad weight for {name!r}: {weight!r}") from None
+        if value <= 0:
+            raise ValueError(f"Weight for {name!r} must be positive")
+        specs.append(CommandSpec(name, value, dict(params.get(name, {}))))
+    if not specs:
+        raise ValueError("The command mix is empty")
+    return specs
+
+
+class _CommandStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.timeouts = 0
+
+    def summary(self, elapsed: float) -> dict:
+        result = self.latency.summary()
+        result["errors"] = self.errors
+        result["timeouts"] = self.timeouts
+        result["throughput_rps"] = round(self.latency.count / elapsed, 2) if elapsed > 0 else None
+        return result
+
+
+class _Budget:
+    """Shared stop condition: a request count, a deadline, or both."""
+
+    def __init__(self, requests: Optional[int], duration: Optional[float], warmup: int):
+        self.remaining = None if requests is None else requests + warmup
+        self.deadline = None if duration is None else time.monotonic() + duration
+        self.warmup = warmup
+        self.issued = 0
+
+    def take(self) -> Optional[bool]:
+        """``None`` when done, else whether the next request is measured."""
+        if self.remaining is not None:
+            if self.remaining <= 0:
+                return None
+            self.remaining -= 1
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return None
+        self.issued += 1
+        return self.issued > self.warmup
+
+
+async def run_benchmark(
+    uri: str = DEFAULT_URI,
+    connections: int = 1,
+    in_flight: int = 1,
+    mix: Optional[Sequence[CommandSpec]] = None,
+    requests: Optional[int] = None,
+    duration: Optional[float] = None,
+    timeout: float = 10.0,
+    warmup: int = 0,
+    seed: Optional[int] = None,
+) -> dict:
+    """Drive the server at ``uri`` and return the JSON-ready report."""
+    mix = list(mix or parse_mix(DEFAULT_MIX))
+    if requests is None and duration is None:
+        requests = 1000
+    rng = random.Random(seed)
+    weights = [spec.weight for spec in mix]
+    stats = {spec.type: _CommandStats() for spec in mix}
+    budget = _Budget(requests, duration, warmup)
+    failures: List[str] = []
+
+    pool = [Connection(uri, in_flight, id_prefix=f"bench_{index}") for index in range(connections)]
+    try:
+        await asyncio.gather(*(connection.open() for connection in pool))
+    except BaseException:
+        await asyncio.gather(*(connection.close() for connection in pool), return_exceptions=True)
+        raise
+
+    async def worker(index: int, connection: Connection) -> None:
+        while True:
+            measured = budget.take()
+            if measured is None:
+                return
+            spec = rng.choices(mix, weights)[0]
+            started = time.perf_counter()
+            try:
+                reply = await connection.request(spec.type, spec.params, timeout)
+            except CommandTimeout:
+                if measured:
+                    stats[spec.type].timeouts += 1
+                continue
+            except ConnectionLost as exc:
+                failures.append(f"connection {index}: {exc}")
+                return
+            if measured:
+                entry = stats[spec.type]
+                entry.latency.record((time.perf_counter() - started) * 1000.0)
+                if reply.get("status") != STATUS_SUCCESS:
+                    entry.errors += 1
+
+    started_at = datetime.now(timezone.utc)
+    clock = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(index, connection) for index, connection in enumerate(pool) for _ in range(in_flight)))
+    finally:
+        elapsed = time.perf_counter() - clock
+        await asyncio.gather(*(connection.close() for connection in pool), return_exceptions=True)
+
+    overall = merged(entry.latency for entry in stats.values())
+    latency = overall.summary()
+    return {
+        "uri": uri,
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "config": {
+            "connections": connections,
+            "in_flight": in_flight,
+            "requests": requests,
+            "duration_s": duration,
+            "timeout_s": timeout,
+            "warmup": warmup,
+            "seed": seed,
+            "mix": {spec.type: spec.weight for spec in mix},
+        },
+        "elapsed_s": round(elapsed, 3),
+        "completed": overall.count,
+        "errors": sum(entry.errors for entry in stats.values()),
+        "timeouts": sum(entry.timeouts for entry in stats.values()),
+        "connection_failures": failures,
+        "throughput_rps": round(overall.count / elapsed, 2) if elapsed > 0 else None,
+        "latency": latency,
+        "commands": {name: entry.summary(elapsed) for name, entry in stats.items()},
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{report['completed']} replies in {report['elapsed_s']}s over "
+        f"{report['config']['connections']}x{report['config']['in_flight']} in flight: "
+        f"{report['throughput_rps']} req/s, {report['errors']} errors, {report['timeouts']} timeouts",
+        f"{'command':<28}{'count':>8}{'err':>6}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}  (ms)",
+    ]
+    rows = list(report["commands"].items()) + [("all", report["latency"])]
+    for name, row in rows:
+        values = "".join(
+            f"{row[key]:>10.2f}" if row.get(key) is not None else f"{'-':>10}"
+            for key in ("p50_ms", "p90_ms", "p99_ms", "max_ms")
+        )
+        lines.append(f"{name:<28}{row['count']:>8}{row.get('errors', report['errors']):>6}{values}")
+    for failure in report["connection_failures"]:
+        lines.append(f"connection failure: {failure}")
+    return "\n".join(lines)
+
+
+def _parse_params(items: Sequence[str]) -> Dict[str, dict]:
+    params = {}
+    for item in items:
+        name, _, text = item.partition("=")
+        value = json.loads(text)
+        if not isinstance(value, dict):
+            raise ValueError(f"--params {name}: expected a JSON object")
+        params[name] = value
+    return params
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="godot_ws.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--uri", default=DEFAULT_URI, help=f"Server to drive (default: {DEFAULT_URI})")
+    parser.add_argument("-c", "--connections", type=int, default=1, help="Concurrent connections")
+    parser.add_argument("-m", "--in-flight", type=int, default=1, help="In-flight requests per connection")
+    parser.add_argument("-n", "--requests", type=int, help="Measured requests to send (default: 1000)")
+    parser.add_argument("-d", "--duration", type=float, help="Stop after this many seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Comma-separated TYPE[=WEIGHT] list")
+    parser.add_argument("--params", action="append", default=[], metavar="TYPE=JSON", help="Params for a command type")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument("--warmup", type=int, default=0, help="Unmeasured requests sent first")
+    parser.add_argument("--seed", type=int, help="Seed for the command sequence")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    if args.connections < 1 or args.in_flight < 1:
+        parser.error("--connections and --in-flight must be at least 1")
+    try:
+        mix = parse_mix(args.mix, _parse_params(args.params))
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    try:
+        report = asyncio.run(
+            run_benchmark(
+                args.uri, args.connections, args.in_flight, mix,
+                args.requests, args.duration, args.timeout, args.warmup, args.seed,
+            )
+        )
+    except (OSError, websockets.InvalidHandshake) as exc:
+        print(f"Could not connect to {args.uri}: {exc}", file=sys.stderr)
+        return 1
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    print(text if args.json else format_report(report))
+    return 1 if report["connection_failures"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
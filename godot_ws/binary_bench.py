@@ -0,0 +1,163 @@
+"""Compare JSON and binary reply frames on numeric-heavy payloads.
+
+Usage::
+
+    python -m godot_ws.binary_bench [--scale N] [--repeat R] [--json]
+
+The payloads are synthetic but shaped like the addon's results: GridMap
+cells, animation keys, waveform envelopes and a physics snapshot.  For each
+one the report gives the encoded size and the best-of-R encode and decode
+times of :mod:`json` and :mod:`godot_ws.binary`, decoding both into rows
+(the same objects as the JSON reply) and into columns.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import struct
+import sys
+import time
+from typing import Dict, List, Optional
+
+from .binary import decode_frame, encode_frame
+from .protocol import encode
+
+
+# Synthetic payloads shaped like the addon's results.  Floats are rounded to
+# float32 so that both encodings carry the same values.
+def _f32(value: float) -> float:
+    return struct.unpack("<f", struct.pack("<f", value))[0]
+
+
+def _vector(rng: random.Random, scale: float = 100.0) -> dict:
+    return {axis: _f32(rng.uniform(-scale, scale)) for axis in ("x", "y", "z")}
+
+
+def sample_payloads(scale: int = 1, seed: int = 1) -> Dict[str, dict]:
+    rng = random.Random(seed)
+    side = 40 * scale
+    gridmap = {
+        "node_path": "/root/Level/GridMap",
+        "cells": [
+            {"position": {"x": x, "y": 0, "z": z}, "item": rng.randrange(16), "orientation": rng.choice((0, 10, 16, 22))}
+            for x in range(side)
+            for z in range(side)
+        ],
+    }
+    animation = {
+        "players": [
+            {
+                "path": f"/root/Character{player}/AnimationPlayer",
+                "tracks": [
+                    {
+                        "path": f"Skeleton3D:bone_{track}",
+                        "type": "position_3d",
+                        "keys": [
+                            {"time": _f32(key / 30.0), "transition": 1.0, "value": _vector(rng, 2.0)}
+                            for key in range(300 * scale)
+                        ],
+                    }
+                    for track in range(24)
+                ],
+            }
+            for player in range(2)
+        ]
+    }
+    waveform = {
+        "resource_path": "res://audio/theme.ogg",
+        "channels": [
+            {
+                "channel": channel,
+                "peak": 0.98,
+                "envelope": [
+                    {"min": _f32(-abs(math.sin(index / 50.0))), "max": _f32(abs(math.sin(index / 50.0))), "samples": 512}
+                    for index in range(4096 * scale)
+                ],
+            }
+            for channel in range(2)
+        ],
+    }
+    physics = {
+        "spaces": {
+            "3d": [
+                {
+                    "space_id": 0,
+                    "bodies": [
+                        {
+                            "name": f"Crate{index}",
+                            "type": "RigidBody3D",
+                            "position": _vector(rng),
+                            "linear_velocity": _vector(rng, 5.0),
+                            "mass": _f32(rng.uniform(0.5, 50.0)),
+                            "collision_layer": 1,
+                            "collision_mask": 3,
+                            "sleeping": rng.random() < 0.5,
+                        }
+                        for index in range(2000 * scale)
+                    ],
+                }
+            ]
+        }
+    }
+    return {"gridmap": gridmap, "animation_keys": animation, "waveform": waveform, "physics": physics}
+
+
+def _best_time(function, repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0
+
+
+def benchmark(scale: int = 1, repeat: int = 5) -> Dict[str, dict]:
+    report = {}
+    for name, result in sample_payloads(scale).items():
+        response = {"status": "success", "result": result, "commandId": "cmd_1"}
+        text = encode(response)
+        frame = encode_frame(response)
+        assert frame is not None and decode_frame(frame) == json.loads(text), name
+        report[name] = {
+            "json_bytes": len(text.encode("utf-8")),
+            "binary_bytes": len(frame),
+            "json_encode_ms": round(_best_time(lambda: encode(response), repeat), 3),
+            "binary_encode_ms": round(_best_time(lambda: encode_frame(response), repeat), 3),
+            "json_decode_ms": round(_best_time(lambda: json.loads(text), repeat), 3),
+            "binary_decode_ms": round(_best_time(lambda: decode_frame(frame), repeat), 3),
+            "columns_decode_ms": round(_best_time(lambda: decode_frame(frame, rows=False), repeat), 3),
+        }
+    return report
+
+
+def format_benchmark(report: Dict[str, dict]) -> str:
+    lines = [
+        f"{'payload':<16}{'json B':>11}{'binary B':>11}{'ratio':>7}"
+        f"{'enc json':>10}{'enc bin':>9}{'dec json':>10}{'dec bin':>9}{'dec cols':>10}  (ms)"
+    ]
+    for name, row in report.items():
+        lines.append(
+            f"{name:<16}{row['json_bytes']:>11}{row['binary_bytes']:>11}"
+            f"{row['json_bytes'] / row['binary_bytes']:>7.1f}"
+            f"{row['json_encode_ms']:>10.2f}{row['binary_encode_ms']:>9.2f}"
+            f"{row['json_decode_ms']:>10.2f}{row['binary_decode_ms']:>9.2f}{row['columns_decode_ms']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="godot_ws.binary_bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1, help="multiply the payload sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="best of R timings")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+    report = benchmark(args.scale, args.repeat)
+    print(json.dumps(report, indent=2) if args.json else format_benchmark(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""Pooled, multiplexed async client for the editor command channel.
+
+Example::
+
+    async with ClientPool(size=2, max_in_flight=32) as pool:
+        state = await pool.send_command("get_editor_state")
+        results = await pool.run_batch(
+            ("update_node_property", {"node_path": path, "property": "visible", "value": False})
+            for path in paths
+        )
+
+Each :class:`Connection` is one socket whose reader task resolves replies by
+``commandId``, so any number of commands can be in flight on it at once.  A
+per-connection semaphore bounds that number; a caller that would exceed it
+waits, which is the backpressure that keeps a batch job from flooding the
+editor.  The pool spreads commands over its least-loaded open connection,
+counting the callers waiting for a slot as well as those in flight.
+
+When a socket drops, every request pending on it fails with
+:class:`ConnectionLost` and a supervisor task reconnects that slot with
+exponential backoff.  A request is only re-sent when ``retries`` allows it,
+because the editor may already have executed it; timeouts are never retried.
+
+``chunk_size`` asks the editor to stream a large result in chunks; the
+reader collects them and the caller gets the reassembled response.
+``binary=True`` lets it send numeric arrays as a binary frame, which the
+reader decodes back into the same response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import websockets
+
+from .binary import decode_frame, is_binary_frame
+from .protocol import (
+    BATCH_COMMAND,
+    DEFAULT_URI,
+    STATUS_CHUNK,
+    STATUS_SUCCESS,
+    assemble,
+    command,
+    decode,
+    encode,
+    is_welcome,
+)
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_IN_FLIGHT = 32
+
+
+class ConnectionLost(ConnectionError):
+    """The socket closed before the reply arrived, or no socket is open."""
+
+
+class CommandTimeout(asyncio.TimeoutError):
+    """No reply with the request's ``commandId`` arrived in time."""
+
+
+class CommandError(Exception):
+    """The editor answered ``{"status": "error"}``."""
+
+    def __init__(self, command_type: str, message: str, response: Optional[dict] = None):
+        super().__init__(f"{command_type}: {message}")
+        self.command_type = command_type
+        self.message = message
+        self.response = response or {}
+
+
+class Connection:
+    """One WebSocket carrying many in-flight commands, matched by ``commandId``."""
+
+    def __init__(
+        self,
+        uri: str = DEFAULT_URI,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        open_timeout: float = 5.0,
+        id_prefix: str = "py",
+    ):
+        self.uri = uri
+        self.open_timeout = open_timeout
+        self.id_prefix = id_prefix
+        self.window = asyncio.Semaphore(max_in_flight)
+        self.pending: Dict[str, asyncio.Future] = {}
+        # Requests in flight plus callers waiting for a slot in the window.
+        self.load = 0
+        # commandId -> chunk data received so far for a chunked reply.
+        self.chunks: Dict[str, List[str]] = {}
+        self.sequence = itertools.count(1)
+        self.websocket = None
+        self.welcome: Optional[dict] = None
+        self.reader: Optional[asyncio.Task] = None
+        self.closed = asyncio.Event()
+
+    async def open(self) -> "Connection":
+        self.websocket = await websockets.connect(self.uri, open_timeout=self.open_timeout, max_size=None)
+        self.reader = asyncio.create_task(self._read())
+        return self
+
+    @property
+    def is_open(self) -> bool:
+        return self.websocket is not None and not self.closed.is_set()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.pending)
+
+    async def _read(self) -> None:
+        try:
+            async for frame in self.websocket:
+                message = decode_frame(frame) if is_binary_frame(frame) else decode(frame)
+                if message is None:
+                    continue
+                command_id = message.get("commandId")
+                if command_id is None:
+                    if is_welcome(message):
+                        self.welcome = message
+                    continue
+                key = str(command_id)
+                if message.get("status") == STATUS_CHUNK:
+                    if key in self.pending:
+                        self.chunks.setdefault(key, []).append(str(message.get("data", "")))
+                    continue
+                if message.get("final"):
+                    message = assemble(message, self.chunks.pop(key, []))
+                future = self.pending.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.closed.set()
+            pending, self.pending = self.pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionLost(f"connection to {self.uri} closed"))
+
+    async def request(
+        self,
+        command_type: str,
+        params: Optional[dict] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        chunk_size: int = 0,
+        binary: bool = False,
+    ) -> dict:
+        """Send one command and return the raw response envelope.
+
+        ``timeout`` starts once the command is on the wire; time spent
+        waiting for a free slot in the window is not counted.  It covers
+        every chunk of a chunked reply.
+        """
+        self.load += 1
+        try:
+            async with self.window:
+                if not self.is_open:
+                    raise ConnectionLost(f"connection to {self.uri} is closed")
+                command_id = f"{self.id_prefix}_{next(self.sequence)}"
+                future = asyncio.get_running_loop().create_future()
+                self.pending[command_id] = future
+                try:
+                    await self.websocket.send(encode(command(command_type, params, command_id, chunk_size, binary)))
+                    return await asyncio.wait_for(future, timeout)
+                except websockets.ConnectionClosed as exc:
+                    raise ConnectionLost(str(exc)) from None
+                except asyncio.TimeoutError:
+                    raise CommandTimeout(f"{command_type} ({command_id}) timed out after {timeout}s") from None
+                finally:
+                    self.pending.pop(command_id, None)
+                    self.chunks.pop(command_id, None)
+        finally:
+            self.load -= 1
+
+    async def send_command(
+        self,
+        command_type: str,
+        params: Optional[dict] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        chunk_size: int = 0,
+        binary: bool = False,
+    ) -> Any:
+        """Send one command and return its ``result``; raise :class:`CommandError` on failure."""
+        return _result(command_type, await self.request(command_type, params, timeout, chunk_size, binary))
+
+    async def close(self) -> None:
+        if self.websocket is not None:
+            await self.websocket.close()
+        if self.reader is not None:
+            await self.reader
+
+
+def _result(command_type: str, response: dict) -> Any:
+    if response.get("status") != STATUS_SUCCESS:
+        raise CommandError(command_type, str(response.get("message", "Unknown error")), response)
+    return response.get("result")
+
+
+class ClientPool:
+    """A fixed number of reconnecting :class:`Connection` slots."""
+
+    def __init__(
+        self,
+        uri: str = DEFAULT_URI,
+        size: int = 2,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = 0,
+        open_timeout: float = 5.0,
+        reconnect_delay: float = 0.2,
+        max_reconnect_delay: float = 5.0,
+    ):
+        if size < 1 or max_in_flight < 1:
+            raise ValueError("size and max_in_flight must be at least 1")
+        self.uri = uri
+        self.size = size
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.retries = retries
+        self.open_timeout = open_timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.prefix = f"py{os.getpid()}x{id(self) & 0xFFFF:x}"
+        self.slots: List[Connection] = []
+        self.supervisors: List[asyncio.Task] = []
+        self.reconnects = 0
+        self._changed = asyncio.Event()
+        self._closing = False
+
+    async def __aenter__(self) -> "ClientPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _new_connection(self, index: int) -> Connection:
+        return Connection(self.uri, self.max_in_flight, self.open_timeout, f"{self.prefix}_{index}")
+
+    async def start(self) -> None:
+        """Open every slot; a failure here propagates instead of being retried."""
+        self.slots = [self._new_connection(index) for index in range(self.size)]
+        try:
+            await asyncio.gather(*(connection.open() for connection in self.slots))
+        except BaseException:
+            await asyncio.gather(*(connection.close() for connection in self.slots), return_exceptions=True)
+            raise
+        self.supervisors = [asyncio.create_task(self._supervise(index)) for index in range(self.size)]
+
+    def _notify(self) -> None:
+        event, self._changed = self._changed, asyncio.Event()
+        event.set()
+
+    async def _supervise(self, index: int) -> None:
+        while True:
+            await self.slots[index].closed.wait()
+            if self._closing:
+                return
+            delay = self.reconnect_delay
+            while not self._closing:
+                connection = self._new_connection(index)
+                try:
+                    await connection.open()
+                except (OSError, asyncio.TimeoutError, websockets.InvalidHandshake):
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self.max_reconnect_delay)
+                    continue
+                self.slots[index] = connection
+                self.reconnects += 1
+                self._notify()
+                break
+
+    async def _connection(self, timeout: float) -> Connection:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            if self._closing:
+                raise ConnectionLost("pool is closed")
+            live = [connection for connection in self.slots if connection.is_open]
+            if live:
+                return min(live, key=lambda connection: connection.load)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise ConnectionLost(f"no open connection to {self.uri}")
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def request(
+        self,
+        command_type: str,
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        chunk_size: int = 0,
+        binary: bool = False,
+    ) -> dict:
+        """Raw response envelope, re-sent up to ``retries`` times on ConnectionLost."""
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.retries if retries is None else retries
+        for attempt in itertools.count():
+            connection = await self._connection(timeout)
+            try:
+                return await connection.request(command_type, params, timeout, chunk_size, binary)
+            except ConnectionLost:
+                if attempt >= retries:
+                    raise
+
+    async def send_command(
+        self,
+        command_type: str,
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        chunk_size: int = 0,
+        binary: bool = False,
+    ) -> Any:
+        return _result(command_type, await self.request(command_type, params, timeout, retries, chunk_size, binary))
+
+    async def send_batch(
+        self,
+        commands: Iterable[Tuple[str, Optional[dict]]],
+        on_error: str = "stop",
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """Send ``(type, params)`` pairs as one ``batch`` envelope, answered in one frame.
+
+        Unlike :meth:`run_batch` the editor runs them in order within a single
+        poll; per-command outcomes are in the returned ``results`` list.
+        """
+        payload = [{"type": command_type, "params": params or {}} for command_type, params in commands]
+        return await self.send_command(BATCH_COMMAND, {"commands": payload, "on_error": on_error}, timeout)
+
+    async def run_batch(
+        self,
+        commands: Iterable[Tuple[str, Optional[dict]]],
+        timeout: Optional[float] = None,
+        return_exceptions: bool = True,
+    ) -> List[Any]:
+        """Pipeline ``(type, params)`` pairs; results come back in input order.
+
+        Every command is submitted at once and the in-flight windows meter
+        them onto the sockets.
+        """
+        return await asyncio.gather(
+            *(self.send_command(command_type, params, timeout) for command_type, params in commands),
+            return_exceptions=return_exceptions,
+        )
+
+    async def close(self) -> None:
+        self._closing = True
+        self._notify()
+        for task in self.supervisors:
+            task.cancel()
+        await asyncio.gather(*self.supervisors, return_exceptions=True)
+        await asyncio.gather(*(connection.close() for connection in self.slots), return_exceptions=True)
@@ -0,0 +1,272 @@
+"""Per-command latency and error rates from the addon's structured logs.
+
+Usage::
+
+    python -m godot_ws.logs godot.log [server.log.gz ...] [--top N] [--json]
+    godot --editor 2>&1 | python -m godot_ws.logs -
+
+Every ``_log`` in the addon prints one JSON object per line and then a
+``[Continuous skepticism (Sherlock Protocol)] ...`` echo of the same message;
+the TS utils (CommandGuard, ProjectIndexer, PatchManager, EscalationManager)
+do the same on stderr.  The echo lines and any non-JSON output are dropped.
+
+The input is processed as a chain of generators, so memory does not grow
+with the size of the log:
+
+``read_lines``    lines from files (``.gz`` allowed) or ``-`` for stdin
+``parse_entries`` JSON log entries
+``join_commands`` one :class:`CommandSpan` per ``command_id``, from the
+                  ``Routing command`` entry to the first completion entry
+                  (logged by ``_on_command_completed``, ``_send_success``
+                  or ``_send_error``)
+
+Only commands that are still open are held, capped by ``--max-open``
+(oldest evicted first).  Latencies are aggregated in constant-size
+histograms, and the slowest ``--top`` commands are kept in a heap.
+Addon entries carry ``ticks_usec`` taken when they were recorded (MCPLogger
+buffers them), which gives microsecond latencies; entries without it fall
+back to their ``timestamp``.  Run the editor with GODOT_MCP_LOG_LEVEL=info so
+the routing entries are logged at all.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import heapq
+import io
+import json
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from .stats import LatencyHistogram, merged
+
+ECHO_PREFIX = "[Continuous skepticism (Sherlock Protocol)]"
+START_MESSAGE = "Routing command"
+# Completion entries are recognised by the logging function; older logs put
+# the error text in the "Error response sent" entry's message.
+SUCCESS_FUNCTION = "_send_success"
+ERROR_FUNCTION = "_send_error"
+# Processors report completion through a signal whose second argument is the
+# outcome, so command_handler logs it under "command_type".
+COMPLETED_FUNCTION = "_on_command_completed"
+DEFAULT_MAX_OPEN = 100_000
+
+
+class CommandSpan(NamedTuple):
+    command_id: str
+    command_type: str
+    latency_ms: float
+    ok: bool
+    started: str
+
+
+def read_lines(paths: Iterable[str]) -> Iterator[str]:
+    for path in paths:
+        if path == "-":
+            yield from io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors="replace")
+            continue
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8", errors="replace") as handle:
+            yield from handle
+
+
+def parse_entries(lines: Iterable[str]) -> Iterator[dict]:
+    """JSON objects from log lines; echoes and free-form output are skipped."""
+    for line in lines:
+        if line.startswith(ECHO_PREFIX):
+            continue
+        start = line.find("{")
+        if start < 0 or ECHO_PREFIX in line[:start]:
+            continue
+        try:
+            entry = json.loads(line[start:])
+        except ValueError:
+            continue
+        if isinstance(entry, dict) and "message" in entry:
+            yield entry
+
+
+def entry_time(entry: dict) -> Optional[float]:
+    """Seconds on the entry's own clock: ``ticks_usec`` if logged, else the timestamp."""
+    ticks = entry.get("ticks_usec")
+    if isinstance(ticks, (int, float)):
+        return ticks / 1_000_000.0
+    stamp = entry.get("timestamp")
+    if not isinstance(stamp, str) or not stamp:
+        return None
+    try:
+        return datetime.fromisoformat(stamp.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _outcome(entry: dict) -> Optional[bool]:
+    """``True``/``False`` for completion entries, ``None`` for anything else."""
+    function = entry.get("function")
+    if function == SUCCESS_FUNCTION:
+        return True
+    if function == ERROR_FUNCTION:
+        return False
+    if function == COMPLETED_FUNCTION:
+        return entry.get("command_type") != "error"
+    return None
+
+
+class JoinStats:
+    def __init__(self):
+        self.entries = 0
+        self.unmatched = 0
+        self.evicted = 0
+        self.by_class: Dict[str, List[int]] = {}
+
+
+def join_commands(
+    entries: Iterable[dict],
+    stats: Optional[JoinStats] = None,
+    max_open: int = DEFAULT_MAX_OPEN,
+) -> Iterator[CommandSpan]:
+    """Pair each ``Routing command`` entry with its completion by ``command_id``."""
+    stats = stats or JoinStats()
+    open_commands: "OrderedDict[str, tuple]" = OrderedDict()
+    for entry in entries:
+        stats.entries += 1
+        counts = stats.by_class.setdefault(str(entry.get("classname", "?")), [0, 0])
+        counts[0] += 1
+        if entry.get("error"):
+            counts[1] += 1
+
+        command_id = entry.get("command_id")
+        if not command_id:
+            continue
+        if entry["message"] == START_MESSAGE:
+            open_commands.pop(command_id, None)
+            open_commands[command_id] = (str(entry.get("command_type") or "?"), entry_time(entry), entry.get("timestamp", ""))
+            if len(open_commands) > max_open:
+                open_commands.popitem(last=False)
+                stats.evicted += 1
+            continue
+        ok = _outcome(entry)
+        if ok is None:
+            continue
+        opened = open_commands.pop(command_id, None)
+        if opened is None:
+            stats.unmatched += 1
+            continue
+        command_type, started, stamp = opened
+        ended = entry_time(entry)
+        if started is None or ended is None:
+            continue
+        yield CommandSpan(command_id, command_type, max(0.0, (ended - started) * 1000.0), ok, stamp)
+    stats.unmatched += len(open_commands)
+
+
+class CommandReport:
+    """Aggregate spans into per-type histograms and a slowest-N heap."""
+
+    def __init__(self, top: int = 10):
+        self.top = top
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[str, int] = {}
+        self.slowest: List[tuple] = []
+        self.sequence = 0
+
+    def add(self, span: CommandSpan) -> None:
+        self.latency.setdefault(span.command_type, LatencyHistogram()).record(span.latency_ms)
+        if not span.ok:
+            self.errors[span.command_type] = self.errors.get(span.command_type, 0) + 1
+        if self.top > 0:
+            # The sequence number keeps heap comparisons off the span itself.
+            self.sequence += 1
+            item = (span.latency_ms, self.sequence, span)
+            if len(self.slowest) < self.top:
+                heapq.heappush(self.slowest, item)
+            elif item > self.slowest[0]:
+                heapq.heapreplace(self.slowest, item)
+
+    def to_dict(self, stats: Optional[JoinStats] = None) -> dict:
+        commands = {}
+        ranked = sorted(self.latency.items(), key=lambda item: -item[1].total)
+        for command_type, histogram in ranked:
+            row = histogram.summary()
+            errors = self.errors.get(command_type, 0)
+            row["errors"] = errors
+            row["error_rate"] = round(errors / histogram.count, 4) if histogram.count else None
+            row["total_ms"] = round(histogram.total, 3)
+            commands[command_type] = row
+        report = {
+            "commands": commands,
+            "latency": merged(self.latency.values()).summary(),
+            "slowest": [
+                {**span._asdict(), "latency_ms": round(span.latency_ms, 3)}
+                for _, _, span in sorted(self.slowest, reverse=True)
+            ],
+        }
+        if stats is not None:
+            report["entries"] = stats.entries
+            report["unmatched"] = stats.unmatched
+            report["evicted"] = stats.evicted
+            report["by_class"] = {
+                name: {"entries": counts[0], "errors": counts[1]}
+                for name, counts in sorted(stats.by_class.items(), key=lambda item: -item[1][0])
+            }
+        return report
+
+
+def analyze(paths: Iterable[str], top: int = 10, max_open: int = DEFAULT_MAX_OPEN) -> dict:
+    stats = JoinStats()
+    report = CommandReport(top)
+    for span in join_commands(parse_entries(read_lines(paths)), stats, max_open):
+        report.add(span)
+    return report.to_dict(stats)
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{report['entries']} log entries, {report['latency']['count']} commands joined, "
+        f"{report['unmatched']} unmatched, {report['evicted']} evicted",
+        f"{'command':<32}{'count':>8}{'err%':>7}{'total':>11}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  (ms)",
+    ]
+    for command_type, row in report["commands"].items():
+        values = "".join(
+            f"{row[key]:>9.2f}" if row.get(key) is not None else f"{'-':>9}"
+            for key in ("p50_ms", "p90_ms", "p99_ms", "max_ms")
+        )
+        rate = row["error_rate"] * 100 if row["error_rate"] is not None else 0.0
+        lines.append(f"{command_type:<32}{row['count']:>8}{rate:>7.1f}{row['total_ms']:>11.1f}{values}")
+    if report["slowest"]:
+        lines.append(f"Slowest {len(report['slowest'])}:")
+        for span in report["slowest"]:
+            status = "ok" if span["ok"] else "error"
+            lines.append(
+                f"  {span['latency_ms']:>10.2f} ms  {span['command_type']} {span['command_id']} "
+                f"({status}, {span['started']})"
+            )
+    if report["by_class"]:
+        lines.append("Entries by class:")
+        for name, counts in report["by_class"].items():
+            lines.append(f"  {name:<30}{counts['entries']:>10}{counts['errors']:>8} errors")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="godot_ws.logs", description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="Log files (.gz allowed) or - for stdin")
+    parser.add_argument("--top", type=int, default=10, help="Slowest commands to list (default: 10)")
+    parser.add_argument("--max-open", type=int, default=DEFAULT_MAX_OPEN, help="Open commands to track at once")
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        report = analyze(args.paths, args.top, args.max_open)
+    except OSError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
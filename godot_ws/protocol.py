@@ -0,0 +1,140 @@
+"""Wire format of the editor's WebSocket command channel.
+
+The plugin listens on ``ws://localhost:9080`` (``mcp_server.gd``).  After
+the handshake it sends a welcome message, then accepts two request shapes:
+
+* Commands routed by ``command_handler.gd``::
+
+      {"type": "list_nodes", "params": {...}, "commandId": "cmd_1"}
+
+  answered with ``{"status": "success", "result": {...}, "commandId": ...}``
+  or ``{"status": "error", "message": "...", "commandId": ...}``.  The
+  ``commandId`` key is omitted from the reply when the request had none.
+  A command that also carries ``"chunkSize": N`` has a successful reply
+  streamed as ``{"status": "chunk", "seq": i, "data": "..."}`` frames,
+  whose ``data`` joined in order is the result's JSON text, followed by
+  ``{"status": "success", "final": true, "chunks": n}``.  One that carries
+  ``"encoding": "binary"`` may get a successful reply with numeric arrays
+  as a binary frame instead (see :mod:`godot_ws.binary`).
+
+* JSON-RPC 2.0.  ``ping`` is answered directly with a ``null`` result; any
+  other method is routed as a command with ``commandId`` ``jsonrpc_<id>`` and
+  the reply is wrapped back into a JSON-RPC result or a ``-32000`` error.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional
+
+DEFAULT_HOST = "localhost"
+DEFAULT_PORT = 9080
+DEFAULT_URI = f"ws://{DEFAULT_HOST}:{DEFAULT_PORT}"
+
+WELCOME = {"type": "welcome", "message": "Welcome to Godot MCP WebSocket Server"}
+SUBPROTOCOL = "json"
+JSONRPC_VERSION = "2.0"
+JSONRPC_ID_PREFIX = "jsonrpc_"
+JSONRPC_SERVER_ERROR = -32000
+
+STATUS_SUCCESS = "success"
+STATUS_ERROR = "error"
+STATUS_SKIPPED = "skipped"
+STATUS_CHUNK = "chunk"
+
+# Chunked replies; the addon clamps the requested size to this range.
+CHUNK_SIZE_KEY = "chunkSize"
+MIN_CHUNK_SIZE = 1024
+MAX_CHUNK_SIZE = 1024 * 1024
+
+ENCODING_KEY = "encoding"
+BINARY_ENCODING = "binary"
+
+# {"type": "batch", "params": {"commands": [...], "on_error": "stop"|"continue"}}
+BATCH_COMMAND = "batch"
+MAX_BATCH_SIZE = 1000
+# Answered by the handler itself with {"commands": [sorted command types]}.
+LIST_COMMANDS_COMMAND = "list_commands"
+# Editor event subscriptions; events arrive as {"type": "event", ...} frames
+# without a commandId.
+SUBSCRIBE_EVENTS_COMMAND = "subscribe_events"
+UNSUBSCRIBE_EVENTS_COMMAND = "unsubscribe_events"
+
+
+def command(
+    command_type: str,
+    params: Optional[Dict[str, Any]] = None,
+    command_id: str = "",
+    chunk_size: int = 0,
+    binary: bool = False,
+) -> dict:
+    message = {"type": command_type, "params": params or {}}
+    if command_id:
+        message["commandId"] = command_id
+    if chunk_size:
+        message[CHUNK_SIZE_KEY] = chunk_size
+    if binary:
+        message[ENCODING_KEY] = BINARY_ENCODING
+    return message
+
+
+def success(result: Any, command_id: str = "") -> dict:
+    response = {"status": STATUS_SUCCESS, "result": result}
+    if command_id:
+        response["commandId"] = command_id
+    return response
+
+
+def error(message: str, command_id: str = "") -> dict:
+    response = {"status": STATUS_ERROR, "message": message}
+    if command_id:
+        response["commandId"] = command_id
+    return response
+
+
+def chunked(response: dict, chunk_size: int) -> List[dict]:
+    """Split a success response into the frames the addon streams for it."""
+    chunk_size = min(max(int(chunk_size), MIN_CHUNK_SIZE), MAX_CHUNK_SIZE)
+    text = encode(response.get("result"))
+    command_id = response.get("commandId", "")
+    frames = []
+    for seq, start in enumerate(range(0, max(len(text), 1), chunk_size)):
+        frame = {"status": STATUS_CHUNK, "seq": seq, "data": text[start:start + chunk_size]}
+        if command_id:
+            frame["commandId"] = command_id
+        frames.append(frame)
+    final = {"status": STATUS_SUCCESS, "final": True, "chunks": len(frames)}
+    if command_id:
+        final["commandId"] = command_id
+    frames.append(final)
+    return frames
+
+
+def assemble(final: dict, parts: List[str]) -> dict:
+    """Rebuild the plain response from a final frame and the chunk data before it."""
+    command_id = final.get("commandId", "")
+    if final.get("chunks") != len(parts):
+        return error(f"Chunked reply ended after {len(parts)} of {final.get('chunks')} chunks", command_id)
+    return success(json.loads("".join(parts)), command_id)
+
+
+def is_welcome(message: dict) -> bool:
+    return message.get("type") == WELCOME["type"]
+
+
+def select_subprotocol(connection, offered) -> Optional[str]:
+    """Accept the ``json`` subprotocol the TS client asks for, or none at all."""
+    return SUBPROTOCOL if SUBPROTOCOL in offered else None
+
+
+def encode(message: Any) -> str:
+    return json.dumps(message, separators=(",", ":"))
+
+
+def decode(text) -> Optional[dict]:
+    """Parse one frame; ``None`` for anything that is not a JSON object."""
+    try:
+        message = json.loads(text)
+    except ValueError:
+        return None
+    return message if isinstance(message, dict) else None
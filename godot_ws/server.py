@@ -0,0 +1,365 @@
+"""Stand-in for the editor's WebSocket server, for offline tests and benchmarks.
+
+Usage::
+
+    python -m godot_ws.server [--port 9080] [--config FILE] [--results FILE]
+                              [--latency MS] [--jitter MS] [--payload BYTES]
+                              [--error-rate P] [--strict] [--serial]
+
+It speaks exactly what ``mcp_server.gd`` and ``command_handler.gd`` speak:
+the welcome message on connect, ``{type, params, commandId}`` commands
+answered with ``{status, result|message, commandId}``, the JSON-RPC ``ping``
+answered with a ``null`` result, and other JSON-RPC methods routed as
+commands with ``commandId`` ``jsonrpc_<id>`` and wrapped back into JSON-RPC
+results or ``-32000`` errors.
+
+What each command costs is configured per type with a JSON file::
+
+    {
+      "default": {"latency_ms": 1},
+      "commands": {
+        "get_scene_structure": {"latency_ms": 20, "jitter_ms": 5,
+                                "payload_bytes": 50000, "error_rate": 0.01}
+      }
+    }
+
+``--results`` replays canned results: a JSON object mapping a command type
+to one result or to a list of results served round-robin.  ``--strict``
+answers types with neither a profile nor a canned result with
+``Unsupported command: <type>``, as the real handler does; otherwise they
+succeed with an empty result.  ``--serial`` handles one command at a time
+like the editor's main thread instead of overlapping their latencies.
+``batch`` envelopes are executed in order and answered in one frame, as
+command_handler.gd does, and ``list_commands`` lists the configured types.
+The stand-in never pushes editor events, so unless they are configured
+``subscribe_events`` and ``unsubscribe_events`` are unsupported and clients
+that mirror editor state keep polling it.
+Requests with ``chunkSize`` get successful replies as chunk frames, and
+requests with ``"encoding": "binary"`` get binary frames when the result
+has numeric arrays.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import random
+import sys
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterator, List, Optional
+
+import websockets
+
+from .binary import encode_frame
+from .protocol import (
+    BATCH_COMMAND,
+    BINARY_ENCODING,
+    CHUNK_SIZE_KEY,
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    ENCODING_KEY,
+    JSONRPC_ID_PREFIX,
+    JSONRPC_SERVER_ERROR,
+    JSONRPC_VERSION,
+    LIST_COMMANDS_COMMAND,
+    MAX_BATCH_SIZE,
+    STATUS_SKIPPED,
+    STATUS_SUCCESS,
+    SUBSCRIBE_EVENTS_COMMAND,
+    UNSUBSCRIBE_EVENTS_COMMAND,
+    WELCOME,
+    chunked,
+    decode,
+    encode,
+    error,
+    select_subprotocol,
+    success,
+)
+
+PADDING_KEY = "_padding"
+
+
+@dataclass
+class CommandProfile:
+    """Simulated cost and failure behaviour of one command type."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    payload_bytes: int = 0
+    error_rate: float = 0.0
+    error_message: str = "Simulated failure"
+
+    @classmethod
+    def from_dict(cls, data: dict, base: Optional["CommandProfile"] = None) -> "CommandProfile":
+        known = {item.name for item in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown profile keys: {', '.join(sorted(unknown))}")
+        values = {item.name: getattr(base, item.name) for item in fields(cls)} if base else {}
+        values.update(data)
+        return cls(**values)
+
+    def delay(self, rng: random.Random) -> float:
+        jitter = rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000.0
+
+
+def jsonrpc_command_id(request_id: Any) -> str:
+    """``jsonrpc_<id>`` as mcp_server.gd builds it (Godot prints ``1.0`` as ``1``)."""
+    if isinstance(request_id, float) and request_id.is_integer():
+        request_id = int(request_id)
+    return f"{JSONRPC_ID_PREFIX}{request_id}"
+
+
+class StandInServer:
+    """Answer editor commands from profiles and canned results."""
+
+    def __init__(
+        self,
+        default: Optional[CommandProfile] = None,
+        profiles: Optional[Dict[str, CommandProfile]] = None,
+        results: Optional[Dict[str, Any]] = None,
+        strict: bool = False,
+        serial: bool = False,
+        seed: Optional[int] = None,
+    ):
+        self.default = default or CommandProfile()
+        self.profiles = dict(profiles or {})
+        self.strict = strict
+        self.rng = random.Random(seed)
+        self.lock = asyncio.Lock() if serial else None
+        self.results: Dict[str, Iterator] = {}
+        for command_type, canned in (results or {}).items():
+            canned = canned if isinstance(canned, list) else [canned]
+            if not canned or not all(isinstance(result, dict) for result in canned):
+                raise ValueError(f"Canned results for {command_type!r} must be an object or a list of objects")
+            self.results[command_type] = itertools.cycle(canned)
+        self.served: Dict[str, int] = {}
+        self.connections = 0
+
+    @classmethod
+    def from_config(cls, config: dict, results: Optional[Dict[str, Any]] = None, **options) -> "StandInServer":
+        default = CommandProfile.from_dict(config.get("default", {}))
+        profiles = {
+            command_type: CommandProfile.from_dict(profile, default)
+            for command_type, profile in config.get("commands", {}).items()
+        }
+        return cls(default, profiles, {**config.get("results", {}), **(results or {})}, **options)
+
+    def profile(self, command_type: str) -> CommandProfile:
+        return self.profiles.get(command_type, self.default)
+
+    def knows(self, command_type: str) -> bool:
+        return command_type in self.profiles or command_type in self.results
+
+    async def execute(self, command_type: str, params: dict, command_id: str) -> dict:
+        """Produce the ``command_handler.gd`` response for one command."""
+        if not command_type:
+            return error("Command type is required", command_id)
+        if command_type == BATCH_COMMAND:
+            return await self.execute_batch(params, command_id)
+        if command_type == LIST_COMMANDS_COMMAND:
+            known = {*self.profiles, *self.results, BATCH_COMMAND, LIST_COMMANDS_COMMAND}
+            return success({"commands": sorted(known)}, command_id)
+        if (self.strict or command_type in (SUBSCRIBE_EVENTS_COMMAND, UNSUBSCRIBE_EVENTS_COMMAND)) and not self.knows(command_type):
+            return error(f"Unsupported command: {command_type}", command_id)
+
+        profile = self.profile(command_type)
+        delay = profile.delay(self.rng)
+        if self.lock is not None:
+            async with self.lock:
+                await asyncio.sleep(delay)
+        elif delay:
+            await asyncio.sleep(delay)
+        self.served[command_type] = self.served.get(command_type, 0) + 1
+
+        if profile.error_rate and self.rng.random() < profile.error_rate:
+            return error(profile.error_message, command_id)
+        canned = self.results.get(command_type)
+        result = dict(next(canned)) if canned is not None else {}
+        if profile.payload_bytes:
+            result[PADDING_KEY] = "x" * profile.payload_bytes
+        return success(result, command_id)
+
+    async def execute_batch(self, params: dict, command_id: str) -> dict:
+        """Run a ``batch`` envelope in order and answer with one response."""
+        commands = params.get("commands")
+        if not isinstance(commands, list) or not commands:
+            return error("Batch requires a non-empty 'commands' array", command_id)
+        if len(commands) > MAX_BATCH_SIZE:
+            return error(f"Batch exceeds {MAX_BATCH_SIZE} commands", command_id)
+        on_error = str(params.get("on_error", "stop"))
+        if on_error not in ("stop", "continue"):
+            return error("Batch 'on_error' must be 'stop' or 'continue'", command_id)
+
+        results = []
+        failed = skipped = 0
+        stopped = False
+        for entry in commands:
+            entry = entry if isinstance(entry, dict) else {}
+            if stopped:
+                item = {"status": STATUS_SKIPPED}
+                skipped += 1
+            else:
+                command_type = str(entry.get("type") or "")
+                sub_params = entry.get("params", {})
+                if command_type == BATCH_COMMAND:
+                    item = error("Batches cannot be nested")
+                else:
+                    item = await self.execute(command_type, sub_params if isinstance(sub_params, dict) else {}, "")
+                if item["status"] != STATUS_SUCCESS:
+                    failed += 1
+                    stopped = on_error == "stop"
+            if "commandId" in entry:
+                item["commandId"] = entry["commandId"]
+            results.append(item)
+        return success(
+            {
+                "results": results,
+                "completed": len(results) - failed - skipped,
+                "failed": failed,
+                "skipped": skipped,
+                "stopped": stopped,
+            },
+            command_id,
+        )
+
+    async def _answer_command(self, websocket, message: dict) -> None:
+        params = message.get("params", {})
+        command_id = message.get("commandId", "")
+        command_id = "" if command_id is None else str(command_id)
+        response = await self.execute(str(message.get("type") or ""), params if isinstance(params, dict) else {}, command_id)
+        chunk_size = message.get(CHUNK_SIZE_KEY)
+        if chunk_size and command_id and response["status"] == STATUS_SUCCESS:
+            for frame in chunked(response, chunk_size):
+                await websocket.send(encode(frame))
+                # The addon yields a frame between chunks.
+                await asyncio.sleep(0)
+            return
+        if message.get(ENCODING_KEY) == BINARY_ENCODING and response["status"] == STATUS_SUCCESS:
+            frame = encode_frame(response)
+            if frame is not None:
+                await websocket.send(frame)
+                return
+        await websocket.send(encode(response))
+
+    async def _answer_jsonrpc(self, websocket, message: dict) -> None:
+        method = message.get("method")
+        if not method:
+            return
+        request_id = message.get("id")
+        if method == "ping":
+            await websocket.send(encode({"jsonrpc": JSONRPC_VERSION, "id": request_id, "result": None}))
+            return
+        params = message.get("params", {})
+        command_id = jsonrpc_command_id(request_id) if request_id is not None else ""
+        response = await self.execute(method, params if isinstance(params, dict) else {}, command_id)
+        if not command_id:
+            await websocket.send(encode(response))
+            return
+        envelope = {"jsonrpc": JSONRPC_VERSION, "id": request_id}
+        if response["status"] == STATUS_SUCCESS:
+            envelope["result"] = response.get("result")
+        else:
+            envelope["error"] = {"code": JSONRPC_SERVER_ERROR, "message": response["message"], "data": response.get("result")}
+        await websocket.send(encode(envelope))
+
+    async def handler(self, websocket) -> None:
+        self.connections += 1
+        tasks = set()
+        try:
+            await websocket.send(encode(WELCOME))
+            async for frame in websocket:
+                message = decode(frame)
+                if message is None:
+                    continue
+                if message.get("jsonrpc") == JSONRPC_VERSION:
+                    answer = self._answer_jsonrpc(websocket, message)
+                elif "type" in message:
+                    answer = self._answer_command(websocket, message)
+                else:
+                    continue
+                task = asyncio.create_task(answer)
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @contextlib.asynccontextmanager
+    async def running(self, host: str = DEFAULT_HOST, port: int = 0):
+        """Serve inside an ``async with`` block and yield the ``ws://`` URI.
+
+        ``port=0`` picks a free port, which is what tests and benchmarks want.
+        """
+        async with websockets.serve(
+            self.handler, host, port, select_subprotocol=select_subprotocol, max_size=None
+        ) as server:
+            bound = next(iter(server.sockets)).getsockname()
+            yield f"ws://{host}:{bound[1]}"
+
+
+def _load_json(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+async def _serve(stand_in: StandInServer, host: str, port: int) -> None:
+    async with stand_in.running(host, port) as uri:
+        print(f"Stand-in Godot MCP server listening on {uri}", flush=True)
+        await asyncio.Future()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="godot_ws.server", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Interface to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to bind (default: {DEFAULT_PORT})")
+    parser.add_argument("--config", help="JSON file with default and per-command profiles")
+    parser.add_argument("--results", help="JSON file mapping command types to canned results")
+    parser.add_argument("--latency", type=float, help="Default latency in ms")
+    parser.add_argument("--jitter", type=float, help="Default +/- jitter in ms")
+    parser.add_argument("--payload", type=int, help="Default padding added to results, in bytes")
+    parser.add_argument("--error-rate", type=float, help="Default probability of an error reply")
+    parser.add_argument("--strict", action="store_true", help="Reject command types with no profile or result")
+    parser.add_argument("--serial", action="store_true", help="Handle one command at a time")
+    parser.add_argument("--seed", type=int, help="Seed for jitter and injected errors")
+    args = parser.parse_args(argv)
+
+    try:
+        config = _load_json(args.config) if args.config else {}
+        results = _load_json(args.results) if args.results else None
+        overrides = {
+            key: value
+            for key, value in (
+                ("latency_ms", args.latency),
+                ("jitter_ms", args.jitter),
+                ("payload_bytes", args.payload),
+                ("error_rate", args.error_rate),
+            )
+            if value is not None
+        }
+        config["default"] = {**config.get("default", {}), **overrides}
+        stand_in = StandInServer.from_config(config, results, strict=args.strict, serial=args.serial, seed=args.seed)
+    except (OSError, ValueError, TypeError) as exc:
+        print(exc, file=sys.stderr)
+        return 2
+
+    try:
+        asyncio.run(_serve(stand_in, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    except OSError as exc:
+        print(f"Could not listen on {args.host}:{args.port}: {exc}", file=sys.stderr)
+        return 1
+    for command_type, count in sorted(stand_in.served.items()):
+        print(f"{command_type}: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
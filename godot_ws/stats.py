@@ -0,0 +1,103 @@
+"""Constant-memory latency histograms.
+
+Samples are counted in logarithmic buckets that each span ``PRECISION``
+(1%) of their lower bound, so a percentile read back from the histogram is
+within 1% of the true sample while memory stays proportional to the number
+of distinct buckets touched (a few hundred for anything between 10us and an
+hour), not to the number of samples.  Count, sum, min and max are exact.
+
+A coarse 1-2-5 histogram is kept alongside for human-readable output, and
+two histograms can be merged, so per-connection or per-file results fold
+into one summary.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+from typing import Dict, Iterable, List, Optional
+
+PRECISION = 0.01
+_LOG_BASE = math.log1p(PRECISION)
+# Smallest distinguishable latency; anything below lands in bucket zero.
+_FLOOR_MS = 0.001
+COARSE_EDGES_MS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+PERCENTILES = (50, 90, 99)
+
+
+def _bucket(value_ms: float) -> int:
+    if value_ms <= _FLOOR_MS:
+        return 0
+    return int(math.log(value_ms / _FLOOR_MS) / _LOG_BASE) + 1
+
+
+def _bucket_upper(index: int) -> float:
+    return _FLOOR_MS * math.exp(index * _LOG_BASE)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency counts in milliseconds."""
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.coarse: List[int] = [0] * (len(COARSE_EDGES_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, value_ms: float) -> None:
+        index = _bucket(value_ms)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.coarse[bisect.bisect_left(COARSE_EDGES_MS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        if self.min is None or value_ms < self.min:
+            self.min = value_ms
+        if self.max is None or value_ms > self.max:
+            self.max = value_ms
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        for index, count in enumerate(other.coarse):
+            self.coarse[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``percent``-th sample."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * percent / 100.0))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(_bucket_upper(index), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value, 3)
+
+        result = {"count": self.count}
+        result["mean_ms"] = rounded(self.total / self.count if self.count else None)
+        result["min_ms"] = rounded(self.min)
+        for percent in PERCENTILES:
+            result[f"p{percent}_ms"] = rounded(self.percentile(percent))
+        result["max_ms"] = rounded(self.max)
+        labels = [f"<={edge}" for edge in COARSE_EDGES_MS] + [f">{COARSE_EDGES_MS[-1]}"]
+        result["histogram_ms"] = {label: count for label, count in zip(labels, self.coarse) if count}
+        return result
+
+
+def merged(histograms: Iterable[LatencyHistogram]) -> LatencyHistogram:
+    total = LatencyHistogram()
+    for histogram in histograms:
+        total.merge(histogram)
+    return total
@@ -0,0 +1,416 @@
+"""Record command traffic as JSONL and replay it with time-scaled playback.
+
+Usage::
+
+    python -m godot_ws.trace record [--listen PORT] [--upstream URI] [--output FILE] [--bodies]
+    python -m godot_ws.trace replay TRACE [--uri URI] [--speed 1|N|max] [--output FILE]
+    python -m godot_ws.trace summary TRACE_OR_REPORT [--json]
+    python -m godot_ws.trace compare BASELINE CANDIDATE [--json]
+
+``record`` is a WebSocket proxy: point the TS server at it
+(``GODOT_WS_URL=ws://localhost:9081``) and it forwards every frame to the
+editor on ``--upstream`` while appending one line per frame to the trace::
+
+    {"t": 1.204311, "conn": 0, "dir": "send", "id": "cmd_7", "type": "list_nodes", "bytes": 64, "msg": {...}}
+    {"t": 1.219876, "conn": 0, "dir": "recv", "id": "cmd_7", "status": "success", "bytes": 5120}
+
+``t`` is seconds since the proxy started on the monotonic clock and
+``bytes`` is the UTF-8 size of the frame.  Requests are stored whole so they
+can be replayed; responses only keep their status and size unless
+``--bodies`` is given.  JSON-RPC frames are keyed ``jsonrpc_<id>`` as
+mcp_server.gd keys them.
+
+``replay`` re-sends a trace's requests, one socket per recorded connection,
+at the recorded pace divided by ``--speed`` (``max`` sends as fast as the
+in-flight window allows), against the editor or ``godot_ws.server``.  Pings
+are skipped.  ``summary`` and ``compare`` accept either a trace, whose
+latencies come from matching each send to its reply, or a replay report, so
+a recorded session can be compared with any later replay of it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+import websockets
+
+from .binary import decode_frame, is_binary_frame
+from .client import CommandTimeout, Connection, ConnectionLost
+from .protocol import DEFAULT_PORT, DEFAULT_URI, JSONRPC_VERSION, STATUS_SUCCESS, decode, select_subprotocol
+from .server import jsonrpc_command_id
+from .stats import LatencyHistogram, merged
+
+TRACE_FORMAT = 1
+DEFAULT_LISTEN_PORT = DEFAULT_PORT + 1
+SEND = "send"
+RECV = "recv"
+PING = "ping"
+
+
+def describe(message: Optional[dict]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """``(commandId, type, status)`` of a frame in either protocol."""
+    if message is None:
+        return None, None, None
+    if message.get("jsonrpc") == JSONRPC_VERSION:
+        request_id = message.get("id")
+        command_id = jsonrpc_command_id(request_id) if request_id is not None else None
+        if "method" in message:
+            return command_id, message.get("method"), None
+        return command_id, None, "error" if "error" in message else STATUS_SUCCESS
+    command_id = message.get("commandId")
+    command_id = None if command_id in (None, "") else str(command_id)
+    return command_id, message.get("type"), message.get("status")
+
+
+class TraceWriter:
+    """Append trace records to a JSONL file, one compact line per frame."""
+
+    def __init__(self, handle: TextIO, bodies: bool = False, upstream: str = ""):
+        self.handle = handle
+        self.bodies = bodies
+        self.origin = time.monotonic()
+        self.records = 0
+        self._write({
+            "format": TRACE_FORMAT,
+            "upstream": upstream,
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        })
+
+    def _write(self, record: dict) -> None:
+        self.handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.handle.flush()
+
+    def frame(self, conn: int, direction: str, frame) -> None:
+        size = len(frame.encode("utf-8")) if isinstance(frame, str) else len(frame)
+        message = decode_frame(frame) if is_binary_frame(frame) else decode(frame)
+        command_id, command_type, status = describe(message)
+        record = {"t": round(time.monotonic() - self.origin, 6), "conn": conn, "dir": direction}
+        if command_id is not None:
+            record["id"] = command_id
+        if command_type is not None:
+            record["type"] = command_type
+        if status is not None:
+            record["status"] = status
+        record["bytes"] = size
+        if message is not None and (direction == SEND or self.bodies):
+            record["msg"] = message
+        self.records += 1
+        self._write(record)
+
+
+async def record(
+    writer: TraceWriter,
+    upstream: str = DEFAULT_URI,
+    host: str = "localhost",
+    port: int = DEFAULT_LISTEN_PORT,
+    ready: Optional[asyncio.Future] = None,
+) -> None:
+    """Proxy ``host:port`` to ``upstream`` until cancelled, tracing every frame."""
+    counter = itertools.count()
+
+    async def pump(source, sink, conn: int, direction: str) -> None:
+        async for frame in source:
+            writer.frame(conn, direction, frame)
+            await sink.send(frame)
+
+    async def handler(client) -> None:
+        conn = next(counter)
+        offered = [client.subprotocol] if client.subprotocol else None
+        try:
+            editor = await websockets.connect(upstream, subprotocols=offered, max_size=None)
+        except (OSError, websockets.InvalidHandshake) as exc:
+            print(f"[conn {conn}] cannot reach {upstream}: {exc}", file=sys.stderr)
+            await client.close(1011, "upstream unavailable")
+            return
+        async with editor:
+            tasks = [
+                asyncio.create_task(pump(client, editor, conn, SEND)),
+                asyncio.create_task(pump(editor, client, conn, RECV)),
+            ]
+            try:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        await client.close()
+
+    async with websockets.serve(handler, host, port, select_subprotocol=select_subprotocol, max_size=None) as server:
+        if ready is not None:
+            ready.set_result(next(iter(server.sockets)).getsockname()[1])
+        await asyncio.Future()
+
+
+def read_trace(path: str) -> Iterator[dict]:
+    """Stream a trace's frame records, skipping the header."""
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                entry = json.loads(line)
+                if "dir" in entry:
+                    yield entry
+
+
+def trace_latencies(path: str) -> Iterator[Tuple[str, float, Optional[str]]]:
+    """Yield ``(type, latency_ms, status)`` by matching sends to their replies."""
+    pending: Dict[Tuple[int, str], Tuple[str, float]] = {}
+    for entry in read_trace(path):
+        key = entry.get("id")
+        if key is None:
+            continue
+        if entry["dir"] == SEND:
+            pending[(entry["conn"], key)] = (entry.get("type") or "?", entry["t"])
+        else:
+            sent = pending.pop((entry["conn"], key), None)
+            if sent is not None:
+                yield sent[0], (entry["t"] - sent[1]) * 1000.0, entry.get("status")
+
+
+def summarize(rows) -> dict:
+    """Per-command latency summaries from ``(type, latency_ms, status)`` rows."""
+    histograms: Dict[str, LatencyHistogram] = {}
+    errors: Dict[str, int] = {}
+    for command_type, latency, status in rows:
+        histograms.setdefault(command_type, LatencyHistogram()).record(latency)
+        if status not in (None, STATUS_SUCCESS):
+            errors[command_type] = errors.get(command_type, 0) + 1
+    commands = {}
+    for command_type in sorted(histograms):
+        commands[command_type] = histograms[command_type].summary()
+        commands[command_type]["errors"] = errors.get(command_type, 0)
+    return {"latency": merged(histograms.values()).summary(), "commands": commands}
+
+
+async def replay(
+    path: str,
+    uri: str = DEFAULT_URI,
+    speed: float = 1.0,
+    in_flight: int = 64,
+    timeout: float = 30.0,
+) -> dict:
+    """Re-send a trace's requests and return a report like :func:`summarize`.
+
+    ``speed`` divides the recorded gaps; ``0`` means as fast as possible.
+    """
+    connections: Dict[int, Connection] = {}
+    window = asyncio.Semaphore(in_flight)
+    rows: List[Tuple[str, float, Optional[str]]] = []
+    failures = {"timeouts": 0, "connection_lost": 0}
+    tasks = set()
+    loop = asyncio.get_running_loop()
+    lag = 0.0
+
+    async def send(connection: Connection, command_type: str, params: dict) -> None:
+        try:
+            started = time.perf_counter()
+            try:
+                response = await connection.request(command_type, params, timeout)
+            except CommandTimeout:
+                failures["timeouts"] += 1
+                return
+            except ConnectionLost:
+                failures["connection_lost"] += 1
+                return
+            rows.append((command_type, (time.perf_counter() - started) * 1000.0, response.get("status")))
+        finally:
+            window.release()
+
+    start = loop.time()
+    first_t: Optional[float] = None
+    try:
+        for entry in read_trace(path):
+            if entry["dir"] != SEND or not entry.get("type") or entry.get("type") == PING:
+                continue
+            message = entry.get("msg") or {}
+            params = message.get("params")
+            if first_t is None:
+                first_t = entry["t"]
+            if speed > 0:
+                due = start + (entry["t"] - first_t) / speed
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    lag = max(lag, -delay)
+            connection = connections.get(entry["conn"])
+            if connection is None:
+                connection = Connection(uri, max_in_flight=in_flight, id_prefix=f"replay_{entry['conn']}")
+                await connection.open()
+                connections[entry["conn"]] = connection
+            await window.acquire()
+            task = asyncio.create_task(send(connection, entry["type"], params if isinstance(params, dict) else {}))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+    finally:
+        elapsed = loop.time() - start
+        await asyncio.gather(*(connection.close() for connection in connections.values()), return_exceptions=True)
+
+    report = summarize(rows)
+    report.update({
+        "trace": path,
+        "uri": uri,
+        "speed": speed or "max",
+        "elapsed_s": round(elapsed, 3),
+        "replayed": len(rows),
+        "max_lag_ms": round(lag * 1000.0, 3),
+        **failures,
+    })
+    return report
+
+
+def load_summary(path: str) -> dict:
+    """A replay report as-is, or the summary of a recorded trace."""
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    return summarize(trace_latencies(path))
+
+
+DELTA_KEYS = ("mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms")
+
+
+def compare(baseline: dict, candidate: dict) -> Dict[str, dict]:
+    """Per-command latency deltas, ``candidate - baseline``."""
+    deltas = {}
+    for command_type in sorted(set(baseline["commands"]) | set(candidate["commands"])):
+        before = baseline["commands"].get(command_type)
+        after = candidate["commands"].get(command_type)
+        row = {"count": [before and before["count"], after and after["count"]]}
+        for key in DELTA_KEYS:
+            old = before and before.get(key)
+            new = after and after.get(key)
+            if old is None or new is None:
+                row[key] = None
+                continue
+            row[key] = {
+                "baseline": old,
+                "candidate": new,
+                "delta": round(new - old, 3),
+                "percent": round((new - old) * 100.0 / old, 1) if old else None,
+            }
+        deltas[command_type] = row
+    return deltas
+
+
+def format_summary(summary: dict) -> str:
+    lines = [f"{'command':<32}{'count':>8}{'err':>6}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}  (ms)"]
+    for command_type, row in list(summary["commands"].items()) + [("all", summary["latency"])]:
+        values = "".join(
+            f"{row[key]:>10.2f}" if row.get(key) is not None else f"{'-':>10}"
+            for key in ("p50_ms", "p90_ms", "p99_ms", "max_ms")
+        )
+        errors = row.get("errors", sum(item["errors"] for item in summary["commands"].values()))
+        lines.append(f"{command_type:<32}{row['count']:>8}{errors:>6}{values}")
+    return "\n".join(lines)
+
+
+def format_comparison(deltas: Dict[str, dict]) -> str:
+    lines = [f"{'command':<32}{'p50 delta':>18}{'p99 delta':>18}{'mean delta':>18}"]
+    for command_type, row in deltas.items():
+        cells = []
+        for key in ("p50_ms", "p99_ms", "mean_ms"):
+            cell = row[key]
+            if cell is None:
+                cells.append(f"{'-':>18}")
+            else:
+                percent = f" ({cell['percent']:+.1f}%)" if cell["percent"] is not None else ""
+                cells.append(f"{cell['delta']:+.2f}{percent}".rjust(18))
+        lines.append(f"{command_type:<32}" + "".join(cells))
+    return "\n".join(lines)
+
+
+def _speed(text: str) -> float:
+    if text == "max":
+        return 0.0
+    value = float(text.rstrip("x"))
+    if value <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return value
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="godot_ws.trace", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Proxy to the editor and write a trace")
+    record_parser.add_argument("--listen", type=int, default=DEFAULT_LISTEN_PORT, help="Port to accept clients on")
+    record_parser.add_argument("--host", default="localhost", help="Interface to bind")
+    record_parser.add_argument("--upstream", default=DEFAULT_URI, help=f"Editor to forward to (default: {DEFAULT_URI})")
+    record_parser.add_argument("--output", default="trace.jsonl", help="Trace file to append to")
+    record_parser.add_argument("--bodies", action="store_true", help="Also store response bodies")
+
+    replay_parser = commands.add_parser("replay", help="Play a trace back")
+    replay_parser.add_argument("trace")
+    replay_parser.add_argument("--uri", default=DEFAULT_URI, help="Server to replay against")
+    replay_parser.add_argument("--speed", type=_speed, default=1.0, help="1 (recorded pace), N, or max")
+    replay_parser.add_argument("--in-flight", type=int, default=64, help="Cap on outstanding requests")
+    replay_parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    replay_parser.add_argument("--output", help="Write the JSON report here")
+    replay_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    summary_parser = commands.add_parser("summary", help="Per-command latency of a trace or report")
+    summary_parser.add_argument("path")
+    summary_parser.add_argument("--json", action="store_true")
+
+    compare_parser = commands.add_parser("compare", help="Latency deltas between two runs")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--json", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        with open(args.output, "a", encoding="utf-8") as handle:
+            writer = TraceWriter(handle, args.bodies, args.upstream)
+            print(f"Recording ws://{args.host}:{args.listen} -> {args.upstream} into {args.output}", flush=True)
+            try:
+                asyncio.run(record(writer, args.upstream, args.host, args.listen))
+            except KeyboardInterrupt:
+                pass
+            except OSError as exc:
+                print(f"Could not listen on {args.host}:{args.listen}: {exc}", file=sys.stderr)
+                return 1
+        print(f"{writer.records} frames recorded")
+        return 0
+
+    if args.command == "replay":
+        try:
+            report = asyncio.run(replay(args.trace, args.uri, args.speed, args.in_flight, args.timeout))
+        except (OSError, websockets.InvalidHandshake) as exc:
+            print(f"Could not connect to {args.uri}: {exc}", file=sys.stderr)
+            return 1
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as handle:
+                json.dump(report, handle, indent=2)
+                handle.write("\n")
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print(
+                f"{report['replayed']} replies in {report['elapsed_s']}s at speed {report['speed']}, "
+                f"{report['timeouts']} timeouts, max lag {report['max_lag_ms']} ms"
+            )
+            print(format_summary(report))
+        return 0
+
+    if args.command == "summary":
+        summary = load_summary(args.path)
+        print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+        return 0
+
+    deltas = compare(load_summary(args.baseline), load_summary(args.candidate))
+    print(json.dumps(deltas, indent=2) if args.json else format_comparison(deltas))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -12,8 +12,8 @@ export const editorStateResource: Resource = {
     const godot = getGodotConnection();
     
     try {
-      // Call a command on the Godot side to get editor state
-      const result = await godot.sendCommand('get_editor_state');
+      // Served from the connection's mirror until an editor event says it changed
+      const result = await godot.getMirrored('get_editor_state');
       
       return {
         text: JSON.stringify(result)
@@ -36,8 +36,8 @@ export const selectedNodeResource: Resource = {
     const godot = getGodotConnection();
     
     try {
-      // Call a command on the Godot side to get selected node
-      const result = await godot.sendCommand('get_selected_node');
+      // Served from the connection's mirror until an editor event says it changed
+      const result = await godot.getMirrored('get_selected_node');
       
       return {
         text: JSON.stringify(result)
@@ -60,8 +60,8 @@ export const currentScriptResource: Resource = {
     const godot = getGodotConnection();
     
     try {
-      // Call a command on the Godot side to get current script
-      const result = await godot.sendCommand('get_current_script');
+      // Served from the connection's mirror until an editor event says it changed
+      const result = await godot.getMirrored('get_current_script');
       
       // If we got a script path, return script content and metadata
       if (result && result.script_found && result.content) {
@@ -86,6 +86,9 @@ interface AnalyzeWaveformParams {
   resource_path: string;
   silence_threshold?: number;
   envelope_bins?: number;
+  start_seconds?: number;
+  end_seconds?: number;
+  refresh_cache?: boolean;
 }
 
 interface AudioImportAssetConfig {
@@ -98,6 +101,8 @@ interface AudioImportAssetConfig {
 interface BatchImportAudioAssetsParams {
   assets?: AudioImportAssetConfig[];
   paths?: string[];
+  warm_waveform_cache?: boolean;
+  silence_threshold?: number;
 }
 
 const audioPlayerTypeSchema = z.enum([
@@ -346,10 +351,24 @@ const analyzeWaveformSchema = z.object({
   envelope_bins: z
     .number()
     .int()
-    .min(16)
-    .max(4096)
+    .min(1)
+    .max(65536)
+    .optional()
+    .describe('Number of min/max/RMS envelope bins to aggregate for waveform preview (default 256)'),
+  start_seconds: z
+    .number()
+    .min(0)
+    .optional()
+    .describe('Start of the envelope window in seconds (default 0)'),
+  end_seconds: z
+    .number()
+    .min(0)
     .optional()
-    .describe('Number of min/max envelope bins to aggregate for waveform preview (default 256)'),
+    .describe('End of the envelope window in seconds (default the end of the stream)'),
+  refresh_cache: z
+    .boolean()
+    .optional()
+    .describe('Rebuild the cached envelope pyramid instead of reusing it'),
 });
 
 const audioImportAssetSchema = z.object({
@@ -382,6 +401,16 @@ const batchImportAudioAssetsSchema = z
       .array(z.string().min(1))
       .optional()
       .describe('Shorthand list of audio asset paths to reimport with existing settings'),
+    warm_waveform_cache: z
+      .boolean()
+      .optional()
+      .describe('Build the analyze_waveform envelope cache for each reimported WAV asset'),
+    silence_threshold: z
+      .number()
+      .min(0.000001)
+      .max(0.1)
+      .optional()
+      .describe('Silence threshold to precompute when warming the waveform cache (default 0.0005)'),
   })
   .refine(
     (value) => (value.assets && value.assets.length > 0) || (value.paths && value.paths.length > 0),
@@ -576,6 +605,8 @@ const formatWaveformAnalysis = (result: CommandResult): string => {
   const sampleFrames = typeof result.sample_frames === 'number' ? (result.sample_frames as number) : undefined;
   const analysisDurationMs =
     typeof result.analysis_duration_ms === 'number' ? (result.analysis_duration_ms as number) : undefined;
+  const cache = typeof result.cache === 'string' ? (result.cache as string) : undefined;
+  const envelopeWindow = (result.envelope_window as Record<string, unknown>) ?? undefined;
   const overall = (result.overall as Record<string, unknown>) ?? {};
   const channelSummaries = Array.isArray(result.channel_summaries)
     ? (result.channel_summaries as Record<string, unknown>[])
@@ -610,7 +641,12 @@ const formatWaveformAnalysis = (result: CommandResult): string => {
     lines.push(`Silence threshold: ${silenceThreshold}`);
   }
   if (analysisDurationMs !== undefined) {
-    lines.push(`Analysis time: ${analysisDurationMs.toFixed(2)} ms`);
+    lines.push(`Analysis time: ${analysisDurationMs.toFixed(2)} ms${cache ? ` (envelope cache: ${cache})` : ''}`);
+  }
+  if (envelopeWindow && typeof envelopeWindow.start_seconds === 'number' && typeof envelopeWindow.end_seconds === 'number') {
+    lines.push(
+      `Envelope window: ${(envelopeWindow.start_seconds as number).toFixed(3)}s to ${(envelopeWindow.end_seconds as number).toFixed(3)}s`,
+    );
   }
 
   if (Object.keys(overall).length > 0) {
@@ -678,6 +714,7 @@ const formatBatchImportAudioResult = (result: CommandResult): string => {
       const preset = (asset.preset as string) ?? '';
       const optionsApplied =
         typeof asset.options_applied === 'number' ? (asset.options_applied as number) : undefined;
+      const waveformCache = typeof asset.waveform_cache === 'string' ? (asset.waveform_cache as string) : undefined;
 
       const details: string[] = [`status=${status}`];
       if (preset) {
@@ -686,6 +723,9 @@ const formatBatchImportAudioResult = (result: CommandResult): string => {
       if (optionsApplied !== undefined) {
         details.push(`options=${optionsApplied}`);
       }
+      if (waveformCache) {
+        details.push(`waveform cache=${waveformCache}`);
+      }
 
       lines.push(`- ${resourcePath}: ${details.join(', ')}`);
     });
@@ -935,6 +975,15 @@ export const audioTools: MCPTool[] = [
       if (args.envelope_bins !== undefined) {
         payload.envelope_bins = args.envelope_bins;
       }
+      if (args.start_seconds !== undefined) {
+        payload.start_seconds = args.start_seconds;
+      }
+      if (args.end_seconds !== undefined) {
+        payload.end_seconds = args.end_seconds;
+      }
+      if (args.refresh_cache !== undefined) {
+        payload.refresh_cache = args.refresh_cache;
+      }
 
       try {
         const result = await godot.sendCommand<CommandResult>('analyze_waveform', payload);
@@ -973,6 +1022,12 @@ export const audioTools: MCPTool[] = [
       if (args.paths && args.paths.length > 0) {
         payload.paths = args.paths;
       }
+      if (args.warm_waveform_cache !== undefined) {
+        payload.warm_waveform_cache = args.warm_waveform_cache;
+      }
+      if (args.silence_threshold !== undefined) {
+        payload.silence_threshold = args.silence_threshold;
+      }
 
       try {
         const result = await godot.sendCommand<CommandResult>('batch_import_audio_assets', payload);
@@ -1,5 +1,5 @@
 import { z } from 'zod';
-import { getGodotConnection } from '../utils/godot_connection.js';
+import { BatchCommand, BatchErrorPolicy, getGodotConnection } from '../utils/godot_connection.js';
 import { MCPTool, CommandResult } from '../utils/types.js';
 
 interface ExecuteEditorScriptParams {
@@ -201,7 +201,7 @@ export const editorTools: MCPTool[] = [
   },
   {
     name: 'snapshot_scene_state',
-    description: 'Capture a structured snapshot of the currently edited scene tree for review.',
+    description: 'Capture a structured snapshot of the currently edited scene tree for review, or only the changes since an earlier snapshot_id.',
     parameters: z.object({
       include_internal: z
         .boolean()
@@ -229,6 +229,16 @@ export const editorTools: MCPTool[] = [
         .positive()
         .optional()
         .describe('Maximum depth in the scene tree to traverse (default 3).'),
+      since: z
+        .number()
+        .int()
+        .positive()
+        .optional()
+        .describe('snapshot_id of an earlier snapshot; only added, removed, and changed nodes are returned.'),
+      verify: z
+        .boolean()
+        .optional()
+        .describe('With since, compare every node instead of only the nodes known to have changed.'),
     }),
     execute: async ({
       include_internal,
@@ -236,12 +246,16 @@ export const editorTools: MCPTool[] = [
       max_properties_per_node,
       node_limit,
       max_depth,
+      since,
+      verify,
     }: {
       include_internal?: boolean;
       include_resources?: boolean;
       max_properties_per_node?: number;
       node_limit?: number;
       max_depth?: number;
+      since?: number;
+      verify?: boolean;
     }): Promise<string> => {
       const godot = getGodotConnection();
 
@@ -251,6 +265,8 @@ export const editorTools: MCPTool[] = [
       if (max_properties_per_node !== undefined) payload.max_properties_per_node = max_properties_per_node;
       if (node_limit !== undefined) payload.node_limit = node_limit;
       if (max_depth !== undefined) payload.max_depth = max_depth;
+      if (since !== undefined) payload.since = since;
+      if (verify !== undefined) payload.verify = verify;
 
       const result = await godot.sendCommand<CommandResult>('snapshot_scene_state', payload);
       return JSON.stringify(result, null, 2);
@@ -259,4 +275,41 @@ export const editorTools: MCPTool[] = [
       requiredRole: 'edit',
     },
   },
+  {
+    name: 'execute_batch',
+    description:
+      'Run several editor commands in one round trip. The addon executes them in order within a single poll and returns every result in one reply.',
+    parameters: z.object({
+      commands: z
+        .array(
+          z.object({
+            type: z.string().describe('Command type, e.g. update_node_property'),
+            params: z.record(z.any()).optional().describe('Parameters for the command'),
+            commandId: z.string().optional().describe('Optional id echoed on this command\'s result'),
+          })
+        )
+        .min(1)
+        .max(1000)
+        .describe('Commands to run, in order'),
+      on_error: z
+        .enum(['stop', 'continue'])
+        .optional()
+        .describe('Skip the remaining commands after a failure (stop, default) or run them all (continue).'),
+    }),
+    execute: async ({
+      commands,
+      on_error,
+    }: {
+      commands: BatchCommand[];
+      on_error?: BatchErrorPolicy;
+    }): Promise<string> => {
+      const godot = getGodotConnection();
+      const result = await godot.sendBatch(commands, on_error ?? 'stop');
+      return JSON.stringify(result, null, 2);
+    },
+    metadata: {
+      requiredRole: 'admin',
+      escalationPrompt: 'Request approval to run a batch of arbitrary editor commands in one request.',
+    },
+  },
 ];
\ No newline at end of file
@@ -85,6 +85,70 @@ export const projectTools: MCPTool[] = [
       requiredRole: 'read',
     },
   },
+  {
+    name: 'list_project_files',
+    description: 'List project files from the editor file index, filtered by extension, directory, or resource type and paged.',
+    parameters: z.object({
+      extensions: z.array(z.string().min(1))
+        .optional()
+        .describe('Extensions to include, with or without the leading dot (default all files).'),
+      directory: z.string()
+        .optional()
+        .describe('Only list files under this directory (default res://).'),
+      type: z.string()
+        .optional()
+        .describe('Only list resources of this type or a subclass of it, e.g. PackedScene or Texture2D.'),
+      offset: z.number()
+        .int()
+        .nonnegative()
+        .optional()
+        .describe('Number of matching files to skip (default 0).'),
+      limit: z.number()
+        .int()
+        .positive()
+        .max(ENTRY_LIMIT)
+        .optional()
+        .describe('Maximum number of files to return (default 200, max 5000).'),
+    }),
+    execute: async ({
+      extensions,
+      directory,
+      type,
+      offset,
+      limit,
+    }: {
+      extensions?: string[];
+      directory?: string;
+      type?: string;
+      offset?: number;
+      limit?: number;
+    }): Promise<string> => {
+      const godot = getGodotConnection();
+      const payload: Record<string, unknown> = { limit: limit ?? 200 };
+      if (extensions && extensions.length > 0) {
+        payload.extensions = extensions;
+      }
+      if (directory !== undefined) {
+        payload.directory = directory;
+      }
+      if (type !== undefined) {
+        payload.type = type;
+      }
+      if (offset !== undefined) {
+        payload.offset = offset;
+      }
+
+      try {
+        const result = await godot.sendCommand<CommandResult>('list_project_files', payload);
+        return JSON.stringify(result, null, 2);
+      } catch (error) {
+        throw new Error(`Failed to list project files: ${(error as Error).message}`);
+      }
+    },
+    metadata: {
+      requiredRole: 'read',
+    },
+  },
   {
     name: 'list_input_actions',
     description: 'List all configured input actions from the Godot project settings.',
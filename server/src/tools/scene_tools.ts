@@ -13,6 +13,26 @@ interface OpenSceneParams {
   path: string;
 }
 
+type SceneStructureField =
+  | 'name'
+  | 'type'
+  | 'path'
+  | 'parent'
+  | 'depth'
+  | 'index'
+  | 'groups'
+  | 'instance'
+  | 'properties';
+
+interface GetSceneStructureParams {
+  path: string;
+  mode?: 'state' | 'instance';
+  max_depth?: number;
+  fields?: SceneStructureField[];
+  offset?: number;
+  limit?: number;
+}
+
 interface CreateSceneParams {
   path: string;
   root_node_type?: string;
@@ -87,9 +107,22 @@ interface GridMapPaintCell {
   orientation?: number;
 }
 
+type GridMapRegion =
+  | { shape: 'box' | 'line'; from: GridMapPosition; to: GridMapPosition; item?: number; orientation?: number }
+  | {
+    shape: 'fill';
+    origin: GridMapPosition;
+    bounds?: { from: GridMapPosition; to: GridMapPosition };
+    max_cells?: number;
+    item?: number;
+    orientation?: number;
+  };
+
 interface PaintGridMapCellsParams {
   node_path: string;
-  cells: GridMapPaintCell[];
+  cells?: GridMapPaintCell[];
+  packed_cells?: number[] | string;
+  regions?: GridMapRegion[];
   transaction_id?: string;
 }
 
@@ -102,7 +135,9 @@ interface GridMapClearCell {
 
 interface ClearGridMapCellsParams {
   node_path: string;
-  cells: GridMapClearCell[];
+  cells?: GridMapClearCell[];
+  packed_cells?: number[] | string;
+  regions?: GridMapRegion[];
   transaction_id?: string;
 }
 
@@ -196,6 +231,56 @@ const gridMapClearCellSchema = z
     }
   });
 
+const gridMapBoxRegionSchema = z.object({
+  shape: z.literal('box'),
+  from: gridMapPositionSchema,
+  to: gridMapPositionSchema,
+}).describe('Every cell between two corners, inclusive');
+
+const gridMapLineRegionSchema = z.object({
+  shape: z.literal('line'),
+  from: gridMapPositionSchema,
+  to: gridMapPositionSchema,
+}).describe('A straight line of cells between two positions, inclusive');
+
+const gridMapFillRegionSchema = z.object({
+  shape: z.literal('fill'),
+  origin: gridMapPositionSchema,
+  bounds: z.object({ from: gridMapPositionSchema, to: gridMapPositionSchema }).optional()
+    .describe('Optional X/Z box the fill may not leave'),
+  max_cells: z.number().int().positive().optional()
+    .describe('Fail instead of filling more than this many cells (default 65536)'),
+}).describe('Flood fill of the connected cells on the origin layer that hold the same item as the origin');
+
+const gridMapRegionItem = {
+  item: z.number().int().describe('MeshLibrary item ID to place in every cell of the region'),
+  orientation: z.number().int().optional().describe('Optional cell orientation index'),
+};
+
+const gridMapPaintRegionSchema = z.discriminatedUnion('shape', [
+  gridMapBoxRegionSchema.extend(gridMapRegionItem),
+  gridMapLineRegionSchema.extend(gridMapRegionItem),
+  gridMapFillRegionSchema.extend(gridMapRegionItem),
+]);
+
+const gridMapClearRegionSchema = z.discriminatedUnion('shape', [
+  gridMapBoxRegionSchema,
+  gridMapLineRegionSchema,
+  gridMapFillRegionSchema,
+]);
+
+const packedCellsSchema = (stride: number, layout: string) => z
+  .union([
+    z.array(z.number().int()).refine((values) => values.length % stride === 0, {
+      message: `packed_cells must hold ${stride} integers per cell`,
+    }),
+    z.string().describe('Base64 of little-endian int32 values'),
+  ])
+  .describe(`Flat cell list, ${stride} integers per cell (${layout}), as numbers or base64 int32`);
+
+const hasGridMapCells = (value: { cells?: unknown[]; packed_cells?: unknown; regions?: unknown[] }) =>
+  (value.cells?.length ?? 0) > 0 || value.packed_cells !== undefined || (value.regions?.length ?? 0) > 0;
+
 const materialValueSchema = z.union([
   z.string(),
   z.number(),
@@ -411,8 +496,9 @@ const formatGridMapResponse = (
   const status = (result.status as string) ?? 'pending';
   const transactionId = result.transaction_id ? ` (transaction ${result.transaction_id})` : '';
   const changes = Array.isArray(result.changes) ? (result.changes as any[]) : [];
+  const changeCount = typeof result.change_count === 'number' ? result.change_count : changes.length;
 
-  if (changes.length === 0) {
+  if (changeCount === 0) {
     const verb = action === 'paint' ? 'updated' : 'cleared';
     return `No GridMap cells ${verb} for ${nodeType} at ${nodePath}${transactionId} [${status}]`;
   }
@@ -434,8 +520,11 @@ const formatGridMapResponse = (
     })
     .join('\n');
 
+  const bounds = result.bounds as { from?: unknown; to?: unknown } | undefined;
+  const boundsLine = bounds ? `\nBounds: ${positionToString(bounds.from)} to ${positionToString(bounds.to)}` : '';
+  const omitted = changeCount > changes.length ? `\n- ... ${changeCount - changes.length} more` : '';
   const actionVerb = action === 'paint' ? 'Painted' : 'Cleared';
-  return `${actionVerb} ${changes.length} GridMap cell${changes.length === 1 ? '' : 's'} on ${nodeType} at ${nodePath} from ${requestedPath}${transactionId} [${status}]\n${changeLines}`;
+  return `${actionVerb} ${changeCount} GridMap cell${changeCount === 1 ? '' : 's'} on ${nodeType} at ${nodePath} from ${requestedPath}${transactionId} [${status}]${boundsLine}\n${changeLines}${omitted}`;
 };
 
 /**
@@ -530,6 +619,48 @@ export const sceneTools: MCPTool[] = [
     },
   },
 
+  {
+    name: 'get_scene_structure',
+    description: 'List the nodes of a scene file. The default "state" mode reads names, types, parents, groups and overridden properties from the packed scene without instantiating it',
+    parameters: z.object({
+      path: z.string()
+        .describe('Path to the scene file (e.g. "res://levels/level_1.tscn")'),
+      mode: z.enum(['state', 'instance']).default('state')
+        .describe('"state" reads the packed SceneState; "instance" builds the scene and returns the nested node tree'),
+      max_depth: z.number().int().min(0).optional()
+        .describe('State mode: skip nodes deeper than this (the root is depth 0)'),
+      fields: z.array(z.enum(['name', 'type', 'path', 'parent', 'depth', 'index', 'groups', 'instance', 'properties']))
+        .min(1)
+        .optional()
+        .describe('State mode: fields to return for each node (default: all)'),
+      offset: z.number().int().min(0).optional()
+        .describe('State mode: number of matching nodes to skip'),
+      limit: z.number().int().min(1).optional()
+        .describe('State mode: maximum number of nodes to return; the result has next_offset when more remain'),
+    }),
+    execute: async ({ path, mode, max_depth, fields, offset, limit }: GetSceneStructureParams): Promise<string> => {
+      const godot = getGodotConnection();
+
+      try {
+        const result = await godot.sendCommand<CommandResult>('get_scene_structure', {
+          path,
+          mode,
+          max_depth,
+          fields,
+          offset,
+          limit,
+        });
+
+        return JSON.stringify(result, null, 2);
+      } catch (error) {
+        throw new Error(`Failed to get scene structure: ${(error as Error).message}`);
+      }
+    },
+    metadata: {
+      requiredRole: 'read',
+    },
+  },
+
   {
     name: 'get_project_info',
     description: 'Get information about the current Godot project',
@@ -1043,23 +1174,29 @@ export const sceneTools: MCPTool[] = [
 
   {
     name: 'paint_gridmap_cells',
-    description: 'Fill GridMap cells with MeshLibrary items using undo/redo aware transactions',
+    description: 'Fill GridMap cells with MeshLibrary items as a single undo step. Large areas are cheapest as regions (box, line, fill) or packed_cells',
     parameters: z.object({
       node_path: z.string()
         .describe('Path to the GridMap node (e.g. "/root/Level/GridMap")'),
-      cells: z.array(gridMapPaintCellSchema)
-        .min(1, 'At least one cell must be provided')
+      cells: z.array(gridMapPaintCellSchema).optional()
         .describe('Array of cell definitions including coordinates, item id, and optional orientation'),
+      packed_cells: packedCellsSchema(5, 'x, y, z, item, orientation').optional(),
+      regions: z.array(gridMapPaintRegionSchema).optional()
+        .describe('Box, line and flood-fill regions expanded by the editor'),
       transaction_id: z.string().optional()
         .describe('Optional transaction identifier when batching cell edits'),
+    }).refine(hasGridMapCells, {
+      message: 'Provide cells, packed_cells or regions',
     }),
-    execute: async ({ node_path, cells, transaction_id }: PaintGridMapCellsParams): Promise<string> => {
+    execute: async ({ node_path, cells, packed_cells, regions, transaction_id }: PaintGridMapCellsParams): Promise<string> => {
       const godot = getGodotConnection();
 
       try {
         const result = await godot.sendCommand<CommandResult>('paint_gridmap_cells', {
           node_path,
           cells,
+          packed_cells,
+          regions,
           transaction_id,
         });
 
@@ -1075,23 +1212,29 @@ export const sceneTools: MCPTool[] = [
 
   {
     name: 'clear_gridmap_cells',
-    description: 'Clear GridMap cells back to empty space with undo/redo support',
+    description: 'Clear GridMap cells back to empty space as a single undo step',
     parameters: z.object({
       node_path: z.string()
         .describe('Path to the GridMap node (e.g. "/root/Level/GridMap")'),
-      cells: z.array(gridMapClearCellSchema)
-        .min(1, 'At least one cell position must be provided')
+      cells: z.array(gridMapClearCellSchema).optional()
         .describe('Array of cell positions to clear (either position objects or x/y/z components)'),
+      packed_cells: packedCellsSchema(3, 'x, y, z').optional(),
+      regions: z.array(gridMapClearRegionSchema).optional()
+        .describe('Box, line and flood-fill regions to clear'),
       transaction_id: z.string().optional()
         .describe('Optional transaction identifier when batching cell clears'),
+    }).refine(hasGridMapCells, {
+      message: 'Provide cells, packed_cells or regions',
     }),
-    execute: async ({ node_path, cells, transaction_id }: ClearGridMapCellsParams): Promise<string> => {
+    execute: async ({ node_path, cells, packed_cells, regions, transaction_id }: ClearGridMapCellsParams): Promise<string> => {
       const godot = getGodotConnection();
 
       try {
         const result = await godot.sendCommand<CommandResult>('clear_gridmap_cells', {
           node_path,
           cells,
+          packed_cells,
+          regions,
           transaction_id,
         });
 
@@ -0,0 +1,113 @@
+/**
+ * Decoder for the addon's binary reply frames (addons/godot_mcp/utils/binary_codec.gd).
+ *
+ *   0  "GMB1"
+ *   4  uint32 LE length H of the JSON header
+ *   8  H bytes of UTF-8 JSON header, zero-padded to a multiple of 8
+ *   D  little-endian typed arrays, each starting 8-byte aligned
+ *
+ * The header is the ordinary response with numeric arrays replaced by
+ * `{"$typed": dtype, "offset", "length"}` placeholders (offset in bytes from
+ * D) and arrays of same-keyed dictionaries replaced by
+ * `{"$table": n, "columns": {key: column}}`. godot_ws/binary.py documents
+ * the format and godot_ws/binary_bench.py measures it against JSON.
+ */
+
+export const BINARY_MAGIC = 'GMB1';
+
+const ALIGNMENT = 8;
+
+type TypedArray = Uint8Array | Int16Array | Int32Array | Float32Array | Float64Array;
+
+const ARRAY_TYPES: Record<string, { new (buffer: ArrayBuffer, offset: number, length: number): TypedArray; BYTES_PER_ELEMENT: number }> = {
+  u8: Uint8Array,
+  i16: Int16Array,
+  i32: Int32Array,
+  f32: Float32Array,
+  f64: Float64Array,
+};
+
+export interface BinaryDecodeOptions {
+  /**
+   * Rebuild plain arrays and one object per table row (the default), so the
+   * result looks exactly like a JSON reply. With `false`, typed arrays are
+   * returned as views and tables as `{ $table, columns }`, which skips the
+   * per-element work.
+   */
+  rows?: boolean;
+}
+
+const aligned = (size: number) => Math.ceil(size / ALIGNMENT) * ALIGNMENT;
+
+export function isBinaryFrame(data: Buffer): boolean {
+  return data.length >= 8 && data.toString('latin1', 0, 4) === BINARY_MAGIC;
+}
+
+export function decodeBinaryFrame(data: Buffer, options: BinaryDecodeOptions = {}): any {
+  if (!isBinaryFrame(data)) {
+    throw new Error('Not a binary reply frame');
+  }
+  const rows = options.rows ?? true;
+  const headerLength = data.readUInt32LE(4);
+  const header = JSON.parse(data.toString('utf8', 8, 8 + headerLength));
+  const start = aligned(8 + headerLength);
+
+  const typed = (placeholder: { $typed: string; offset: number; length: number }) => {
+    const ArrayType = ARRAY_TYPES[placeholder.$typed];
+    if (!ArrayType) {
+      throw new Error(`Unknown typed array '${placeholder.$typed}' in binary frame`);
+    }
+    const byteOffset = data.byteOffset + start + placeholder.offset;
+    const byteLength = placeholder.length * ArrayType.BYTES_PER_ELEMENT;
+    // ws hands over slices of a pooled buffer, which may not be aligned for a view.
+    const view = byteOffset % ArrayType.BYTES_PER_ELEMENT === 0
+      ? new ArrayType(data.buffer as ArrayBuffer, byteOffset, placeholder.length)
+      : new ArrayType(data.buffer.slice(byteOffset, byteOffset + byteLength) as ArrayBuffer, 0, placeholder.length);
+    return rows ? Array.from(view) : view;
+  };
+
+  const column = (value: any): any[] | TypedArray | Record<string, unknown> => {
+    if (value && typeof value === 'object' && !Array.isArray(value)) {
+      return '$typed' in value ? typed(value) : table(value);
+    }
+    return (value as any[]).map(unpack);
+  };
+
+  const table = (placeholder: { $table: number; columns: Record<string, unknown> }) => {
+    const columns = Object.entries(placeholder.columns).map(([key, value]) => [key, column(value)] as const);
+    if (!rows) {
+      return { $table: placeholder.$table, columns: Object.fromEntries(columns) };
+    }
+    const result = new Array(placeholder.$table);
+    for (let index = 0; index < placeholder.$table; index += 1) {
+      const row: Record<string, unknown> = {};
+      for (const [key, values] of columns) {
+        row[key] = (values as any[])[index];
+      }
+      result[index] = row;
+    }
+    return result;
+  };
+
+  const unpack = (value: any): any => {
+    if (Array.isArray(value)) {
+      return value.map(unpack);
+    }
+    if (value && typeof value === 'object') {
+      if ('$typed' in value) {
+        return typed(value);
+      }
+      if ('$table' in value) {
+        return table(value);
+      }
+      const result: Record<string, unknown> = {};
+      for (const [key, item] of Object.entries(value)) {
+        result[key] = unpack(item);
+      }
+      return result;
+    }
+    return value;
+  };
+
+  return unpack(header);
+}
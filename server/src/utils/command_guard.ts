@@ -1,5 +1,6 @@
 import { escalationManager } from './escalation_manager.js';
 import { CommandRole, MCPTool } from './types.js';
+import { LogLevel, logger } from './logger.js';
 
 interface CommandPolicyConfig {
   /**
@@ -20,6 +21,7 @@ const defaultPolicy: CommandPolicyConfig = {
 interface CommandLogContext {
   systemSection: string;
   error?: boolean;
+  level?: LogLevel;
   details?: Record<string, unknown>;
 }
 
@@ -34,8 +36,10 @@ export class CommandGuard {
     const requiredRole = tool.metadata?.requiredRole ?? this.policy.defaultRole;
 
     if (this.policy.autoApproveRoles.includes(requiredRole)) {
+      // Logged on every allowed call, so only at debug level.
       this.log('command_allowed', {
         systemSection: 'assert',
+        level: 'debug',
         details: {
           tool: tool.name,
           requiredRole,
@@ -76,23 +80,15 @@ export class CommandGuard {
     );
   }
 
-  private log(message: string, { systemSection, error = false, details }: CommandLogContext): void {
-    const logEntry = {
+  private log(message: string, { systemSection, error = false, level, details }: CommandLogContext): void {
+    logger.log(level ?? (error ? 'error' : 'info'), {
       filename: 'server/src/utils/command_guard.ts',
-      timestamp: new Date().toISOString(),
       classname: 'CommandGuard',
       function: systemSection,
-      system_section: systemSection,
-      line_num: 0,
-      error,
-      db_phase: 'none' as const,
-      method: 'NONE' as const,
+      systemSection,
       message,
-      ...(details ? { details } : {}),
-    };
-
-    console.error(JSON.stringify(logEntry));
-    console.error(`[Continuous skepticism (Sherlock Protocol)] ${message}`);
+      details,
+    });
   }
 }
 
@@ -1,6 +1,7 @@
 import { promises as fs } from 'node:fs';
 import path from 'node:path';
 import { randomUUID } from 'node:crypto';
+import { logger } from './logger.js';
 
 export type EscalationStatus = 'pending' | 'approved' | 'denied';
 
@@ -218,22 +219,14 @@ export class EscalationManager {
     error?: boolean;
     details?: Record<string, unknown>;
   }): void {
-    const logEntry = {
+    logger.log(error ? 'error' : 'info', {
       filename: 'server/src/utils/escalation_manager.ts',
-      timestamp: new Date().toISOString(),
       classname: 'EscalationManager',
       function: systemSection,
-      system_section: systemSection,
-      line_num: 0,
-      error,
-      db_phase: 'none' as const,
-      method: 'NONE' as const,
+      systemSection,
       message,
-      ...(details ? { details } : {}),
-    };
-
-    console.error(JSON.stringify(logEntry));
-    console.error(`[Continuous skepticism (Sherlock Protocol)] ${message}`);
+      details,
+    });
   }
 }
 
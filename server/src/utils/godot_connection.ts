@@ -1,13 +1,22 @@
 import WebSocket from 'ws';
+import { decodeBinaryFrame } from './binary_codec.js';
 
 /**
  * Response from Godot server
  */
 export interface GodotResponse {
-  status: 'success' | 'error';
+  status: 'success' | 'error' | 'chunk';
   result?: any;
   message?: string;
   commandId?: string;
+  /** Chunk frames: position in the stream, from 0 */
+  seq?: number;
+  /** Chunk frames: the next piece of the result's JSON text */
+  data?: string;
+  /** Set on the success frame that ends a chunked reply, which carries no result */
+  final?: boolean;
+  /** Final frame: how many chunks were sent */
+  chunks?: number;
 }
 
 /**
@@ -17,6 +26,108 @@ export interface GodotCommand {
   type: string;
   params: Record<string, any>;
   commandId: string;
+  /** Asks the addon to stream a successful reply in chunks of about this many characters */
+  chunkSize?: number;
+  /** Lets the addon send numeric arrays in a successful reply as a binary frame */
+  encoding?: 'binary';
+}
+
+/**
+ * Commands whose replies can run to megabytes; sendCommand streams them when
+ * the connection has a chunk size (GODOT_MCP_STREAM_CHUNK_SIZE).
+ */
+export const STREAMED_COMMANDS: ReadonlySet<string> = new Set([
+  'snapshot_scene_state',
+  'get_physics_world_snapshot',
+  'describe_animation_tracks',
+  'analyze_waveform',
+  'get_scene_structure',
+]);
+
+export const DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024;
+
+/**
+ * Frame the addon pushes, without a commandId, to a connection that called
+ * subscribe_events
+ */
+export interface GodotEvent {
+  type: 'event';
+  /** selection_changed, scene_changed, scene_saved, scene_edited, script_changed, filesystem_changed or play_state_changed */
+  event: string;
+  /** Grows by one with every event frame the addon sends */
+  seq: number;
+  /** What changed, e.g. the selected node paths or the saved scene path */
+  data: Record<string, any>;
+  /** How many further occurrences of the event this frame stands for */
+  coalesced: number;
+}
+
+/**
+ * Read-only commands whose results a connection that mirrors editor state
+ * keeps in memory, with the events that make each result stale
+ */
+export const MIRRORED_COMMANDS: Readonly<Record<string, readonly string[]>> = {
+  get_editor_state: [
+    'selection_changed',
+    'scene_changed',
+    'scene_saved',
+    'scene_edited',
+    'script_changed',
+    'play_state_changed',
+  ],
+  get_selected_node: ['selection_changed', 'scene_changed', 'scene_edited'],
+  get_current_script: ['script_changed', 'filesystem_changed'],
+};
+
+/** Commands that leave mirrored results valid: the mirrored reads and the subscriptions */
+const MIRROR_SAFE_COMMANDS: ReadonlySet<string> = new Set([
+  ...Object.keys(MIRRORED_COMMANDS),
+  'subscribe_events',
+  'unsubscribe_events',
+]);
+
+interface PendingCommand {
+  resolve: (value: any) => void;
+  reject: (reason: any) => void;
+  timeout: NodeJS.Timeout;
+  /** Set for chunked requests, which are resolved with the whole final response */
+  onChunk?: (seq: number, data: string) => void;
+}
+
+/**
+ * One command inside a batch envelope
+ */
+export interface BatchCommand {
+  type: string;
+  params?: Record<string, any>;
+  /** Echoed back on this command's entry in the batch result */
+  commandId?: string;
+}
+
+/**
+ * What the addon does after a command in a batch fails
+ */
+export type BatchErrorPolicy = 'stop' | 'continue';
+
+/**
+ * Outcome of one command in a batch; `skipped` follows a failure under the `stop` policy
+ */
+export interface BatchItemResult {
+  status: 'success' | 'error' | 'skipped';
+  result?: any;
+  message?: string;
+  commandId?: string;
+}
+
+/**
+ * Result of a batch, returned by the addon in a single frame
+ */
+export interface BatchResult {
+  results: BatchItemResult[];
+  completed: number;
+  failed: number;
+  skipped: number;
+  stopped: boolean;
 }
 
 /**
@@ -25,12 +136,15 @@ export interface GodotCommand {
 export class GodotConnection {
   private ws: WebSocket | null = null;
   private connected = false;
-  private commandQueue: Map<string, { 
-    resolve: (value: any) => void;
-    reject: (reason: any) => void;
-    timeout: NodeJS.Timeout;
-  }> = new Map();
+  private commandQueue: Map<string, PendingCommand> = new Map();
   private commandId = 0;
+  /** MIRRORED_COMMANDS results, kept while subscribed and dropped by their events */
+  private mirror: Map<string, unknown> = new Map();
+  /** Bumped whenever a mirrored result goes stale, so a read that raced the change is not kept */
+  private mirrorGenerations: Map<string, number> = new Map();
+  /** Resolves true once subscribed to editor events, false if the addon cannot push them */
+  private subscription: Promise<boolean> | null = null;
+  private eventListeners: Set<(event: GodotEvent) => void> = new Set();
   
   /**
    * Creates a new Godot connection
@@ -38,12 +152,18 @@ export class GodotConnection {
    * @param timeout Command timeout in ms
    * @param maxRetries Maximum number of connection retries
    * @param retryDelay Delay between retries in ms
+   * @param streamChunkSize Chunk size for STREAMED_COMMANDS; 0 asks for single-frame replies
+   * @param binaryReplies Accept binary frames for replies with numeric arrays
+   * @param mirrorEditorState Subscribe to editor events and serve MIRRORED_COMMANDS from memory
    */
   constructor(
     private url: string = 'ws://localhost:9080',
     private timeout: number = 20000,
     private maxRetries: number = 3,
-    private retryDelay: number = 2000
+    private retryDelay: number = 2000,
+    private streamChunkSize: number = 0,
+    private binaryReplies: boolean = false,
+    private mirrorEditorState: boolean = false
   ) {
     console.error('GodotConnection created with URL:', this.url);
   }
@@ -73,9 +193,14 @@ export class GodotConnection {
           resolve();
         });
         
-        this.ws.on('message', (data: Buffer) => {
+        this.ws.on('message', (data: Buffer, isBinary: boolean) => {
           try {
-            const response: GodotResponse = JSON.parse(data.toString());
+            const response: GodotResponse = isBinary ? decodeBinaryFrame(data) : JSON.parse(data.toString());
+            
+            if ((response as unknown as GodotEvent).type === 'event') {
+              this.handleEvent(response as unknown as GodotEvent);
+              return;
+            }
             
             // Handle command responses (logging removed to prevent stdio interference)
             if ('commandId' in response) {
@@ -83,11 +208,16 @@ export class GodotConnection {
               const pendingCommand = this.commandQueue.get(commandId);
               
               if (pendingCommand) {
+                if (response.status === 'chunk') {
+                  pendingCommand.onChunk?.(response.seq ?? -1, response.data ?? '');
+                  return;
+                }
+
                 clearTimeout(pendingCommand.timeout);
                 this.commandQueue.delete(commandId);
                 
                 if (response.status === 'success') {
-                  pendingCommand.resolve(response.result);
+                  pendingCommand.resolve(pendingCommand.onChunk ? response : response.result);
                 } else {
                   pendingCommand.reject(new Error(response.message || 'Unknown error'));
                 }
@@ -110,6 +240,7 @@ export class GodotConnection {
             console.error('Disconnected from Godot WebSocket server');
             this.connected = false;
           }
+          this.resetMirror();
         });
         
         // Set connection timeout
@@ -151,16 +282,20 @@ export class GodotConnection {
    * Sends a command to Godot and waits for a response
    * @param type Command type
    * @param params Command parameters
+   * @param timeout Command timeout in ms (defaults to the connection timeout)
    * @returns Promise that resolves with the command result
    */
-  async sendCommand<T = any>(type: string, params: Record<string, any> = {}): Promise<T> {
-    if (!this.ws || !this.connected) {
-      try {
-        await this.connect();
-      } catch (error) {
-        throw new Error(`Failed to connect: ${(error as Error).message}`);
-      }
+  async sendCommand<T = any>(
+    type: string,
+    params: Record<string, any> = {},
+    timeout: number = this.timeout
+  ): Promise<T> {
+    this.noteCommand(type);
+    if (this.streamChunkSize > 0 && STREAMED_COMMANDS.has(type)) {
+      return this.sendCommandChunked<T>(type, params, this.streamChunkSize, timeout);
     }
+
+    await this.ensureConnected();
     
     return new Promise<T>((resolve, reject) => {
       const commandId = `cmd_${this.commandId++}`;
@@ -170,6 +305,9 @@ export class GodotConnection {
         params,
         commandId
       };
+      if (this.binaryReplies) {
+        command.encoding = 'binary';
+      }
       
       // Set timeout for command
       const timeoutId = setTimeout(() => {
@@ -177,7 +315,7 @@ export class GodotConnection {
           this.commandQueue.delete(commandId);
           reject(new Error(`Command timed out: ${type}`));
         }
-      }, this.timeout);
+      }, timeout);
       
       // Store the promise resolvers
       this.commandQueue.set(commandId, {
@@ -197,6 +335,202 @@ export class GodotConnection {
     });
   }
   
+  /**
+   * Sends a command whose reply is streamed in chunks and reassembles the result
+   * @param type Command type
+   * @param params Command parameters
+   * @param chunkSize Approximate characters per chunk; the addon clamps it to 1 KiB..1 MiB
+   * @param timeout Longest wait in ms for the first or next chunk
+   * @returns Promise that resolves with the command result
+   */
+  async sendCommandChunked<T = any>(
+    type: string,
+    params: Record<string, any> = {},
+    chunkSize: number = DEFAULT_STREAM_CHUNK_SIZE,
+    timeout: number = this.timeout
+  ): Promise<T> {
+    const parts: string[] = [];
+    for await (const part of this.streamCommand(type, params, chunkSize, timeout)) {
+      parts.push(part);
+    }
+    return JSON.parse(parts.join('')) as T;
+  }
+
+  /**
+   * Sends a command and yields the JSON text of its result piece by piece as
+   * the chunks arrive, so a consumer that parses or forwards them
+   * incrementally never holds the whole payload. Breaking out of the loop
+   * stops listening for the rest of the reply.
+   * @param type Command type
+   * @param params Command parameters
+   * @param chunkSize Approximate characters per chunk; the addon clamps it to 1 KiB..1 MiB
+   * @param timeout Longest wait in ms for the first or next chunk
+   */
+  async *streamCommand(
+    type: string,
+    params: Record<string, any> = {},
+    chunkSize: number = DEFAULT_STREAM_CHUNK_SIZE,
+    timeout: number = this.timeout
+  ): AsyncGenerator<string, void, undefined> {
+    this.noteCommand(type);
+    await this.ensureConnected();
+
+    const commandId = `cmd_${this.commandId++}`;
+    const state: { received: string[]; nextSeq: number; finished: boolean; failure: Error | null } = {
+      received: [],
+      nextSeq: 0,
+      finished: false,
+      failure: null,
+    };
+    let wake: (() => void) | null = null;
+    const notify = () => {
+      const resume = wake;
+      wake = null;
+      resume?.();
+    };
+    const fail = (error: Error) => {
+      state.failure = error;
+      notify();
+    };
+    const expire = () => {
+      if (this.commandQueue.delete(commandId)) {
+        fail(new Error(`Command timed out: ${type}`));
+      }
+    };
+
+    const pending: PendingCommand = {
+      resolve: (response: GodotResponse) => {
+        if (!response.final) {
+          // The addon answered in one frame, as addons without streaming do.
+          state.received.push(JSON.stringify(response.result ?? null));
+        } else if (response.chunks !== state.nextSeq) {
+          fail(new Error(`Chunked reply to ${type} ended after ${state.nextSeq} of ${response.chunks} chunks`));
+          return;
+        }
+        state.finished = true;
+        notify();
+      },
+      reject: fail,
+      timeout: setTimeout(expire, timeout),
+      onChunk: (seq, data) => {
+        clearTimeout(pending.timeout);
+        if (seq !== state.nextSeq) {
+          this.commandQueue.delete(commandId);
+          fail(new Error(`Chunk ${seq} of ${type} arrived, expected ${state.nextSeq}`));
+          return;
+        }
+        state.nextSeq += 1;
+        state.received.push(data);
+        pending.timeout = setTimeout(expire, timeout);
+        notify();
+      },
+    };
+    this.commandQueue.set(commandId, pending);
+
+    try {
+      if (this.ws?.readyState !== WebSocket.OPEN) {
+        throw new Error('WebSocket not connected');
+      }
+      const command: GodotCommand = { type, params, commandId, chunkSize };
+      this.ws.send(JSON.stringify(command));
+
+      while (true) {
+        while (state.received.length > 0) {
+          yield state.received.shift()!;
+        }
+        if (state.failure) {
+          throw state.failure;
+        }
+        if (state.finished) {
+          return;
+        }
+        await new Promise<void>((resolve) => {
+          wake = resolve;
+        });
+      }
+    } finally {
+      if (this.commandQueue.get(commandId) === pending) {
+        clearTimeout(pending.timeout);
+        this.commandQueue.delete(commandId);
+      }
+    }
+  }
+
+  /**
+   * Sends several commands in one frame; the addon runs them in order within a
+   * single poll and answers with one frame holding every result.
+   * @param commands Commands to run, in order
+   * @param onError `stop` skips the remaining commands after a failure, `continue` runs them all
+   * @param timeout Timeout in ms for the whole batch (defaults to the connection timeout)
+   * @returns Per-command results plus completed/failed/skipped counts
+   */
+  async sendBatch(
+    commands: BatchCommand[],
+    onError: BatchErrorPolicy = 'stop',
+    timeout: number = this.timeout
+  ): Promise<BatchResult> {
+    const payload = commands.map(command => ({
+      type: command.type,
+      params: command.params ?? {},
+      ...(command.commandId ? { commandId: command.commandId } : {}),
+    }));
+    return this.sendCommand<BatchResult>('batch', { commands: payload, on_error: onError }, timeout);
+  }
+
+  /**
+   * Reads one of MIRRORED_COMMANDS. While subscribed to editor events the
+   * result is served from memory until an event says it changed, so polling
+   * an idle editor costs no round trips. Falls back to sending the command
+   * every time when mirroring is off or the addon cannot push events.
+   * @param type Command type, a key of MIRRORED_COMMANDS
+   */
+  async getMirrored<T = any>(type: string): Promise<T> {
+    if (!this.mirrorEditorState || !(type in MIRRORED_COMMANDS) || !(await this.subscribeEvents())) {
+      return this.sendCommand<T>(type);
+    }
+    if (this.mirror.has(type)) {
+      return this.mirror.get(type) as T;
+    }
+
+    const generation = this.mirrorGenerations.get(type) ?? 0;
+    const result = await this.sendCommand<T>(type);
+    if ((this.mirrorGenerations.get(type) ?? 0) === generation) {
+      this.mirror.set(type, result);
+    }
+    return result;
+  }
+
+  /**
+   * Subscribes this connection to every editor event, once per connection
+   * @returns false when the addon predates subscribe_events
+   */
+  subscribeEvents(): Promise<boolean> {
+    if (!this.subscription) {
+      const subscription = this.sendCommand('subscribe_events', {})
+        .then(() => true)
+        .catch((error: Error) => {
+          // Try again on the next read unless the addon lacks the command.
+          if (this.subscription === subscription && !error.message.startsWith('Unsupported command')) {
+            this.subscription = null;
+          }
+          return false;
+        });
+      this.subscription = subscription;
+    }
+    return this.subscription;
+  }
+
+  /**
+   * Calls listener with every event frame the addon pushes
+   * @returns Function that removes the listener
+   */
+  onEvent(listener: (event: GodotEvent) => void): () => void {
+    this.eventListeners.add(listener);
+    return () => {
+      this.eventListeners.delete(listener);
+    };
+  }
+
   /**
    * Disconnects from the Godot WebSocket server
    */
@@ -212,9 +546,63 @@ export class GodotConnection {
       this.ws.close();
       this.ws = null;
       this.connected = false;
+      this.resetMirror();
+    }
+  }
+
+  private handleEvent(event: GodotEvent): void {
+    for (const [type, events] of Object.entries(MIRRORED_COMMANDS)) {
+      if (events.includes(event.event)) {
+        this.invalidateMirror(type);
+      }
+    }
+    for (const listener of this.eventListeners) {
+      listener(event);
+    }
+  }
+
+  /**
+   * Any other command may change what the mirror holds, and its events only
+   * arrive with the addon's next flush, so a read that follows it must go to
+   * the editor to see its effect
+   */
+  private noteCommand(type: string): void {
+    if (this.mirrorEditorState && !MIRROR_SAFE_COMMANDS.has(type)) {
+      for (const mirrored of Object.keys(MIRRORED_COMMANDS)) {
+        this.invalidateMirror(mirrored);
+      }
+    }
+  }
+
+  private invalidateMirror(type: string): void {
+    this.mirror.delete(type);
+    this.mirrorGenerations.set(type, (this.mirrorGenerations.get(type) ?? 0) + 1);
+  }
+
+  /**
+   * Subscriptions end with the socket; events missed until the next one make
+   * everything mirrored suspect
+   */
+  private resetMirror(): void {
+    this.subscription = null;
+    for (const type of Object.keys(MIRRORED_COMMANDS)) {
+      this.invalidateMirror(type);
     }
   }
   
+  /**
+   * Connects first if there is no open connection
+   */
+  private async ensureConnected(): Promise<void> {
+    if (!this.ws || !this.connected) {
+      try {
+        await this.connect();
+      } catch (error) {
+        throw new Error(`Failed to connect: ${(error as Error).message}`);
+      }
+    }
+  }
+
   /**
    * Checks if connected to Godot
    */
@@ -231,7 +619,23 @@ let connectionInstance: GodotConnection | null = null;
  */
 export function getGodotConnection(): GodotConnection {
   if (!connectionInstance) {
-    connectionInstance = new GodotConnection();
+    // GODOT_WS_URL lets the connection go through a proxy such as
+    // `python -m godot_ws.trace record`.
+    // GODOT_MCP_STREAM_CHUNK_SIZE turns on chunked replies for STREAMED_COMMANDS
+    // and GODOT_MCP_BINARY_REPLIES=1 binary frames for numeric-heavy replies.
+    // GODOT_MCP_EDITOR_EVENTS=0 polls editor state instead of mirroring it.
+    const chunkSize = Number.parseInt(process.env.GODOT_MCP_STREAM_CHUNK_SIZE ?? '', 10);
+    const binaryReplies = ['1', 'true', 'yes'].includes((process.env.GODOT_MCP_BINARY_REPLIES ?? '').trim().toLowerCase());
+    const editorEvents = !['0', 'false', 'no'].includes((process.env.GODOT_MCP_EDITOR_EVENTS ?? '').trim().toLowerCase());
+    connectionInstance = new GodotConnection(
+      process.env.GODOT_WS_URL || undefined,
+      undefined,
+      undefined,
+      undefined,
+      Number.isFinite(chunkSize) && chunkSize > 0 ? chunkSize : 0,
+      binaryReplies,
+      editorEvents
+    );
   }
   return connectionInstance;
 }
\ No newline at end of file
@@ -0,0 +1,231 @@
+/**
+ * Leveled, sampled, buffered structured logging for the server utilities.
+ *
+ * Mirrors addons/godot_mcp/utils/mcp_logger.gd and reads the same
+ * environment variables:
+ *
+ *   GODOT_MCP_LOG_LEVEL      debug | info | warn | error | off   (warn)
+ *   GODOT_MCP_LOG_SAMPLE     section=N,...  keep 1 in N non-error entries
+ *   GODOT_MCP_LOG_MAX_CHARS  truncate longer values               (512)
+ *
+ * `log` checks the level and the section's sample rate before doing any
+ * work, so a dropped entry is never stringified. Kept entries wait in a
+ * fixed-size ring buffer and are written to stderr in one call once
+ * `flushBatch` are waiting, after `flushIntervalMs`, or at once for an error.
+ */
+
+export type LogLevel = 'debug' | 'info' | 'warn' | 'error' | 'off';
+
+const LEVEL_ORDER: Record<LogLevel, number> = {
+  debug: 0,
+  info: 1,
+  warn: 2,
+  error: 3,
+  off: 4,
+};
+
+const ECHO_PREFIX = '[Continuous skepticism (Sherlock Protocol)]';
+
+export interface LoggerOptions {
+  level: LogLevel;
+  /** Section -> keep one in N non-error entries. */
+  sampleEvery: Record<string, number>;
+  /** Longer values are cut to this many characters; 0 disables truncation. */
+  maxValueChars: number;
+  bufferCapacity: number;
+  flushBatch: number;
+  flushIntervalMs: number;
+  /** Also write the "[Continuous skepticism ...] message" echo line. */
+  echo: boolean;
+  write: (chunk: string) => void;
+}
+
+export interface LogRecord {
+  filename: string;
+  classname: string;
+  function: string;
+  systemSection: string;
+  message: string;
+  lineNum?: number;
+  details?: Record<string, unknown>;
+}
+
+interface BufferedEntry {
+  level: LogLevel;
+  time: number;
+  record: LogRecord;
+}
+
+const defaultOptions: LoggerOptions = {
+  level: 'warn',
+  sampleEvery: {},
+  maxValueChars: 512,
+  bufferCapacity: 512,
+  flushBatch: 64,
+  flushIntervalMs: 250,
+  echo: true,
+  write: (chunk) => {
+    process.stderr.write(chunk);
+  },
+};
+
+export function loggerOptionsFromEnv(env: NodeJS.ProcessEnv = process.env): Partial<LoggerOptions> {
+  const options: Partial<LoggerOptions> = {};
+
+  const level = env.GODOT_MCP_LOG_LEVEL?.trim().toLowerCase();
+  if (level && level in LEVEL_ORDER) {
+    options.level = level as LogLevel;
+  }
+
+  if (env.GODOT_MCP_LOG_SAMPLE) {
+    const sampleEvery: Record<string, number> = {};
+    for (const item of env.GODOT_MCP_LOG_SAMPLE.split(',')) {
+      const [section, every] = item.split('=').map((part) => part.trim());
+      const value = Number.parseInt(every ?? '', 10);
+      if (section && Number.isFinite(value)) {
+        sampleEvery[section] = Math.max(1, value);
+      }
+    }
+    options.sampleEvery = sampleEvery;
+  }
+
+  const maxChars = Number.parseInt(env.GODOT_MCP_LOG_MAX_CHARS ?? '', 10);
+  if (Number.isFinite(maxChars)) {
+    options.maxValueChars = maxChars;
+  }
+
+  return options;
+}
+
+export class Logger {
+  private readonly options: LoggerOptions;
+  private readonly buffer: Array<BufferedEntry | undefined>;
+  private head = 0;
+  private count = 0;
+  private dropped = 0;
+  private readonly sampleCounters = new Map<string, number>();
+  private timer: NodeJS.Timeout | null = null;
+
+  constructor(options: Partial<LoggerOptions> = {}) {
+    this.options = { ...defaultOptions, ...options };
+    this.buffer = new Array(this.options.bufferCapacity);
+  }
+
+  enabled(level: LogLevel): boolean {
+    return this.options.level !== 'off' && LEVEL_ORDER[level] >= LEVEL_ORDER[this.options.level];
+  }
+
+  log(level: LogLevel, record: LogRecord): void {
+    if (!this.enabled(level)) {
+      return;
+    }
+
+    const every = this.options.sampleEvery[record.systemSection];
+    if (every !== undefined && level !== 'error') {
+      const seen = this.sampleCounters.get(record.systemSection) ?? 0;
+      this.sampleCounters.set(record.systemSection, seen + 1);
+      if (seen % every !== 0) {
+        return;
+      }
+    }
+
+    const capacity = this.options.bufferCapacity;
+    if (this.count === capacity) {
+      this.head = (this.head + 1) % capacity;
+      this.count -= 1;
+      this.dropped += 1;
+    }
+    this.buffer[(this.head + this.count) % capacity] = { level, time: Date.now(), record };
+    this.count += 1;
+
+    if (this.count >= this.options.flushBatch || level === 'error') {
+      this.flush();
+    } else if (!this.timer) {
+      this.timer = setTimeout(() => this.flush(), this.options.flushIntervalMs);
+      this.timer.unref?.();
+    }
+  }
+
+  flush(): void {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    if (this.count === 0 && this.dropped === 0) {
+      return;
+    }
+
+    const lines: string[] = [];
+    if (this.dropped > 0) {
+      lines.push(JSON.stringify({
+        classname: 'Logger',
+        system_section: 'logging',
+        level: 'warn',
+        error: false,
+        message: 'Log buffer overflowed',
+        dropped: this.dropped,
+      }));
+      this.dropped = 0;
+    }
+
+    const capacity = this.options.bufferCapacity;
+    while (this.count > 0) {
+      const entry = this.buffer[this.head]!;
+      this.buffer[this.head] = undefined;
+      this.head = (this.head + 1) % capacity;
+      this.count -= 1;
+      lines.push(this.serialize(entry));
+      if (this.options.echo) {
+        lines.push(`${ECHO_PREFIX} ${entry.record.message}`);
+      }
+    }
+    this.options.write(`${lines.join('\n')}\n`);
+  }
+
+  truncate(text: string): string {
+    const limit = this.options.maxValueChars;
+    if (limit <= 0 || text.length <= limit) {
+      return text;
+    }
+    return `${text.slice(0, limit)}...(+${text.length - limit} chars)`;
+  }
+
+  private serialize({ level, time, record }: BufferedEntry): string {
+    const fixed = JSON.stringify({
+      filename: record.filename,
+      timestamp: new Date(time).toISOString(),
+      classname: record.classname,
+      function: record.function,
+      system_section: record.systemSection,
+      line_num: record.lineNum ?? 0,
+      error: level === 'error',
+      level,
+      db_phase: 'none',
+      method: 'NONE',
+    });
+    const payload: Array<[string, unknown]> = [['message', record.message]];
+    if (record.details) {
+      payload.push(['details', record.details]);
+    }
+
+    // Only the message and details are truncated.
+    const parts = payload.map(([key, value]) => {
+      let text: string;
+      if (typeof value === 'string') {
+        text = JSON.stringify(this.truncate(value));
+      } else {
+        // Containers are cut as text; the reader sees where the payload stopped.
+        text = JSON.stringify(value) ?? 'null';
+        if (this.options.maxValueChars > 0 && text.length > this.options.maxValueChars) {
+          text = JSON.stringify(this.truncate(text));
+        }
+      }
+      return `${JSON.stringify(key)}:${text}`;
+    });
+    return `${fixed.slice(0, -1)},${parts.join(',')}}`;
+  }
+}
+
+export const logger = new Logger(loggerOptionsFromEnv());
+
+process.once('exit', () => logger.flush());
@@ -3,6 +3,7 @@ import { randomUUID } from 'node:crypto';
 import * as path from 'node:path';
 import { parsePatch, applyPatch, ParsedDiff } from 'diff';
 import { permissionManager } from './permission_manager.js';
+import { logger } from './logger.js';
 
 interface PatchFilePlan {
   absolutePath: string;
@@ -341,22 +342,14 @@ export class PatchManager {
     error?: boolean;
     details?: Record<string, unknown>;
   }): void {
-    const logEntry = {
+    logger.log(error ? 'error' : 'info', {
       filename: 'server/src/utils/patch_manager.ts',
-      timestamp: new Date().toISOString(),
       classname: 'PatchManager',
       function: systemSection,
-      system_section: systemSection,
-      line_num: 0,
-      error,
-      db_phase: 'none' as const,
-      method: 'NONE' as const,
+      systemSection,
       message,
-      ...(details ? { details } : {}),
-    };
-
-    console.error(JSON.stringify(logEntry));
-    console.error(`[Continuous skepticism (Sherlock Protocol)] ${message}`);
+      details,
+    });
   }
 }
 
@@ -1,6 +1,7 @@
 import path from 'node:path';
 import { CapabilityConfig, PathRule, defaultCapabilityConfig } from './permission_config.js';
 import { escalationManager } from './escalation_manager.js';
+import { logger } from './logger.js';
 
 interface PermissionLogContext {
   systemSection: string;
@@ -98,22 +99,14 @@ export class PermissionManager {
   }
 
   private log(message: string, { systemSection, details, error = false }: PermissionLogContext): void {
-    const logEntry = {
+    logger.log(error ? 'error' : 'info', {
       filename: 'server/src/utils/permission_manager.ts',
-      timestamp: new Date().toISOString(),
       classname: 'PermissionManager',
       function: 'assertWriteAllowed',
-      system_section: systemSection,
-      line_num: 0,
-      error,
-      db_phase: 'none' as const,
-      method: 'NONE' as const,
+      systemSection,
       message,
-      ...(details ? { details } : {}),
-    };
-
-    console.error(JSON.stringify(logEntry));
-    console.error(`[Continuous skepticism (Sherlock Protocol)] ${message}`);
+      details,
+    });
   }
 }
 
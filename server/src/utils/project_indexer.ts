@@ -1,6 +1,7 @@
 import { promises as fs } from 'node:fs';
 import path from 'node:path';
 import { Dirent } from 'node:fs';
+import { logger } from './logger.js';
 
 export type ProjectIndexEntryType = 'file' | 'directory';
 
@@ -326,22 +327,14 @@ export class ProjectIndexer {
     details?: Record<string, unknown>;
     error?: boolean;
   }): void {
-    const logEntry = {
+    logger.log(error ? 'error' : 'info', {
       filename: 'server/src/utils/project_indexer.ts',
-      timestamp: new Date().toISOString(),
       classname: 'ProjectIndexer',
       function: systemSection,
-      system_section: systemSection,
-      line_num: 0,
-      error,
-      db_phase: 'none' as const,
-      method: 'NONE' as const,
+      systemSection,
       message,
-      ...(details ? { details } : {}),
-    };
-
-    console.error(JSON.stringify(logEntry));
-    console.error(`[Continuous skepticism (Sherlock Protocol)] ${message}`);
+      details,
+    });
   }
 }
 
@@ -0,0 +1,56 @@
+import { describe, expect, it } from 'vitest';
+import { binaryFrame } from './helpers/binary_frame.js';
+
+const { decodeBinaryFrame, isBinaryFrame } = await import('../dist/utils/binary_codec.js');
+
+const floats = (values: number[]) => Buffer.from(new Float32Array(values).buffer);
+const shorts = (values: number[]) => Buffer.from(new Int16Array(values).buffer);
+
+const header = {
+  status: 'success',
+  commandId: 'cmd_1',
+  result: {
+    resource_path: 'res://audio/theme.ogg',
+    envelope: {
+      $table: 3,
+      columns: {
+        min: { $typed: 'f32', offset: 0, length: 3 },
+        max: { $typed: 'f32', offset: 16, length: 3 },
+        label: ['a', 'b', 'c'],
+      },
+    },
+    samples: { $typed: 'i16', offset: 32, length: 4 },
+  },
+};
+const frame = binaryFrame(header, [floats([-0.5, -0.25, 0]), floats([0.5, 0.25, 1]), shorts([-3, 7, 300, -32768])]);
+
+describe('decodeBinaryFrame', () => {
+  it('rebuilds the JSON shape of the reply', () => {
+    expect(isBinaryFrame(frame)).toBe(true);
+    expect(isBinaryFrame(Buffer.from('{"status":"success"}'))).toBe(false);
+    expect(decodeBinaryFrame(frame)).toEqual({
+      status: 'success',
+      commandId: 'cmd_1',
+      result: {
+        resource_path: 'res://audio/theme.ogg',
+        envelope: [
+          { min: -0.5, max: 0.5, label: 'a' },
+          { min: -0.25, max: 0.25, label: 'b' },
+          { min: 0, max: 1, label: 'c' },
+        ],
+        samples: [-3, 7, 300, -32768],
+      },
+    });
+  });
+
+  it('returns typed columns on request and copes with unaligned buffers', () => {
+    const shifted = Buffer.alloc(frame.length + 1);
+    frame.copy(shifted, 1);
+    const decoded = decodeBinaryFrame(shifted.subarray(1), { rows: false });
+
+    expect(decoded.result.envelope.$table).toBe(3);
+    expect(decoded.result.envelope.columns.max).toBeInstanceOf(Float32Array);
+    expect(Array.from(decoded.result.envelope.columns.max)).toEqual([0.5, 0.25, 1]);
+    expect(decoded.result.samples).toBeInstanceOf(Int16Array);
+  });
+});
@@ -0,0 +1,188 @@
+import { afterEach, beforeEach, describe, expect, it } from 'vitest';
+import { WebSocketServer } from 'ws';
+import type { AddressInfo } from 'net';
+import { binaryFrame } from './helpers/binary_frame.js';
+
+const { GodotConnection } = await import('../dist/utils/godot_connection.js');
+
+type Reply = (command: Record<string, any>) => Array<Record<string, any> | Buffer>;
+
+// Answers every command with the frames `reply` returns for it.
+function startServer(reply: Reply) {
+  const server = new WebSocketServer({ port: 0 });
+  const received: Array<Record<string, any>> = [];
+  server.on('connection', (socket) => {
+    socket.on('message', (data) => {
+      const command = JSON.parse(data.toString());
+      received.push(command);
+      for (const frame of reply(command)) {
+        socket.send(Buffer.isBuffer(frame) ? frame : JSON.stringify(frame));
+      }
+    });
+  });
+  const url = () => `ws://127.0.0.1:${(server.address() as AddressInfo).port}`;
+  return { server, received, url };
+}
+
+function chunkFrames(commandId: string, result: unknown, size: number) {
+  const text = JSON.stringify(result);
+  const frames: Array<Record<string, any>> = [];
+  for (let start = 0; start < text.length; start += size) {
+    frames.push({ status: 'chunk', commandId, seq: frames.length, data: text.slice(start, start + size) });
+  }
+  frames.push({ status: 'success', commandId, final: true, chunks: frames.length });
+  return frames;
+}
+
+const snapshot = { nodes: Array.from({ length: 200 }, (_, index) => ({ name: `Node${index}`, depth: index % 4 })) };
+
+describe('GodotConnection chunked replies', () => {
+  let context: ReturnType<typeof startServer>;
+  let connection: InstanceType<typeof GodotConnection>;
+
+  beforeEach(() => {
+    context = startServer((command) => {
+      if (command.type === 'truncated') {
+        return chunkFrames(command.commandId, snapshot, 100).slice(1);
+      }
+      if (command.chunkSize && command.type !== 'legacy') {
+        return chunkFrames(command.commandId, snapshot, 100);
+      }
+      return [{ status: 'success', commandId: command.commandId, result: snapshot }];
+    });
+  });
+
+  afterEach(async () => {
+    connection?.disconnect();
+    await new Promise((resolve) => context.server.close(resolve));
+  });
+
+  it('reassembles chunks into the result', async () => {
+    connection = new GodotConnection(context.url(), 2000, 0, 0);
+    const result = await connection.sendCommandChunked('snapshot_scene_state', {}, 4096);
+
+    expect(result).toEqual(snapshot);
+    expect(context.received[0]).toMatchObject({ type: 'snapshot_scene_state', chunkSize: 4096 });
+  });
+
+  it('yields each chunk as it arrives', async () => {
+    connection = new GodotConnection(context.url(), 2000, 0, 0);
+    const parts: string[] = [];
+    for await (const part of connection.streamCommand('describe_animation_tracks', { include_keys: true })) {
+      parts.push(part);
+    }
+
+    expect(parts.length).toBeGreaterThan(1);
+    expect(parts.every((part) => part.length <= 100)).toBe(true);
+    expect(JSON.parse(parts.join(''))).toEqual(snapshot);
+  });
+
+  it('accepts a single-frame reply from an addon without streaming', async () => {
+    connection = new GodotConnection(context.url(), 2000, 0, 0);
+    await expect(connection.sendCommandChunked('legacy', {})).resolves.toEqual(snapshot);
+  });
+
+  it('streams only the listed commands when given a chunk size', async () => {
+    connection = new GodotConnection(context.url(), 2000, 0, 0, 8192);
+    await expect(connection.sendCommand('get_physics_world_snapshot', {})).resolves.toEqual(snapshot);
+    await expect(connection.sendCommand('get_editor_state', {})).resolves.toEqual(snapshot);
+
+    expect(context.received.map((command) => command.chunkSize)).toEqual([8192, undefined]);
+  });
+
+  it('decodes binary frames when binary replies are enabled', async () => {
+    const binary = startServer((command) => [
+      binaryFrame(
+        { status: 'success', commandId: command.commandId, result: { samples: { $typed: 'f32', offset: 0, length: 2 } } },
+        [Buffer.from(new Float32Array([0.5, -1]).buffer)]
+      ),
+    ]);
+
+    try {
+      connection = new GodotConnection(binary.url(), 2000, 0, 0, 0, true);
+      await expect(connection.sendCommand('analyze_waveform', {})).resolves.toEqual({ samples: [0.5, -1] });
+      expect(binary.received[0].encoding).toBe('binary');
+    } finally {
+      connection.disconnect();
+      await new Promise((resolve) => binary.server.close(resolve));
+    }
+  });
+
+  it('rejects a reply with missing chunks', async () => {
+    connection = new GodotConnection(context.url(), 2000, 0, 0);
+    await expect(connection.sendCommandChunked('truncated', {})).rejects.toThrow(/Chunk 1 of truncated arrived, expected 0/);
+  });
+});
+
+describe('GodotConnection editor state mirror', () => {
+  let context: ReturnType<typeof startServer>;
+  let connection: InstanceType<typeof GodotConnection>;
+  let reads = 0;
+
+  const push = (event: Record<string, any>) => {
+    for (const socket of context.server.clients) {
+      socket.send(JSON.stringify({ type: 'event', seq: 1, coalesced: 0, data: {}, ...event }));
+    }
+    return new Promise((resolve) => setTimeout(resolve, 50));
+  };
+
+  afterEach(async () => {
+    connection?.disconnect();
+    await new Promise((resolve) => context.server.close(resolve));
+  });
+
+  beforeEach(() => {
+    reads = 0;
+    context = startServer((command) => {
+      if (command.type === 'subscribe_events') {
+        return [{ status: 'success', commandId: command.commandId, result: { subscribed: ['selection_changed'] } }];
+      }
+      reads += 1;
+      return [{ status: 'success', commandId: command.commandId, result: { read: reads } }];
+    });
+  });
+
+  it('serves mirrored reads from memory until an event invalidates them', async () => {
+    connection = new GodotConnection(context.url(), 2000, 0, 0, 0, false, true);
+    const events: string[] = [];
+    connection.onEvent((event) => events.push(event.event));
+
+    await expect(connection.getMirrored('get_selected_node')).resolves.toEqual({ read: 1 });
+    await expect(connection.getMirrored('get_selected_node')).resolves.toEqual({ read: 1 });
+    await expect(connection.getMirrored('get_current_script')).resolves.toEqual({ read: 2 });
+
+    await push({ event: 'selection_changed', data: { selected_nodes: ['/root/Main/Player'] } });
+
+    await expect(connection.getMirrored('get_selected_node')).resolves.toEqual({ read: 3 });
+    await expect(connection.getMirrored('get_current_script')).resolves.toEqual({ read: 2 });
+    expect(events).toEqual(['selection_changed']);
+    expect(context.received.filter((command) => command.type === 'subscribe_events')).toHaveLength(1);
+  });
+
+  it('reads through the mirror after any other command', async () => {
+    connection = new GodotConnection(context.url(), 2000, 0, 0, 0, false, true);
+
+    await expect(connection.getMirrored('get_selected_node')).resolves.toEqual({ read: 1 });
+    await expect(connection.getMirrored('get_editor_state')).resolves.toEqual({ read: 2 });
+    // No event has arrived yet for the scene change.
+    await connection.sendCommand('open_scene', { path: 'res://main.tscn' });
+
+    await expect(connection.getMirrored('get_selected_node')).resolves.toEqual({ read: 4 });
+    await expect(connection.getMirrored('get_editor_state')).resolves.toEqual({ read: 5 });
+    await expect(connection.getMirrored('get_selected_node')).resolves.toEqual({ read: 4 });
+  });
+
+  it('polls when the addon cannot push events', async () => {
+    context.server.close();
+    context = startServer((command) =>
+      command.type === 'subscribe_events'
+        ? [{ status: 'error', commandId: command.commandId, message: 'Unsupported command: subscribe_events' }]
+        : [{ status: 'success', commandId: command.commandId, result: { read: ++reads } }]
+    );
+    connection = new GodotConnection(context.url(), 2000, 0, 0, 0, false, true);
+
+    await expect(connection.getMirrored('get_editor_state')).resolves.toEqual({ read: 1 });
+    await expect(connection.getMirrored('get_editor_state')).resolves.toEqual({ read: 2 });
+    expect(context.received.filter((command) => command.type === 'subscribe_events')).toHaveLength(1);
+  });
+});
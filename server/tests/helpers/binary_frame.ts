@@ -0,0 +1,9 @@
+// Lays out a reply frame the way addons/godot_mcp/utils/binary_codec.gd does.
+export function binaryFrame(header: unknown, buffers: Buffer[]): Buffer {
+  const headerBytes = Buffer.from(JSON.stringify(header), 'utf8');
+  const pad = (buffer: Buffer) => Buffer.concat([buffer, Buffer.alloc((8 - (buffer.length % 8)) % 8)]);
+  const prefix = Buffer.alloc(8);
+  prefix.write('GMB1', 0, 'latin1');
+  prefix.writeUInt32LE(headerBytes.length, 4);
+  return Buffer.concat([pad(Buffer.concat([prefix, headerBytes])), ...buffers.map(pad)]);
+}
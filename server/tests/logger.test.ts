@@ -0,0 +1,78 @@
+import { describe, expect, it } from 'vitest';
+
+const { Logger, loggerOptionsFromEnv } = await import('../dist/utils/logger.js');
+
+const record = (systemSection: string, message: string, details?: Record<string, unknown>) => ({
+  filename: 'server/tests/logger.test.ts',
+  classname: 'LoggerTest',
+  function: 'test',
+  systemSection,
+  message,
+  details,
+});
+
+function captureLogger(options: Record<string, unknown> = {}) {
+  const chunks: string[] = [];
+  const logger = new Logger({ echo: false, flushBatch: 1000, write: (chunk: string) => chunks.push(chunk), ...options });
+  const entries = () => chunks.join('').split('\n').filter(Boolean).map((line) => JSON.parse(line));
+  return { logger, chunks, entries };
+}
+
+describe('Logger', () => {
+  it('drops entries below the level and flushes the rest in one write', () => {
+    const { logger, chunks, entries } = captureLogger({ level: 'info' });
+
+    logger.log('debug', record('assert', 'hidden'));
+    logger.log('info', record('assert', 'first'));
+    logger.log('warn', record('assert', 'second'));
+    expect(chunks).toHaveLength(0);
+
+    logger.flush();
+    expect(chunks).toHaveLength(1);
+    expect(entries().map((entry) => entry.message)).toEqual(['first', 'second']);
+  });
+
+  it('samples sections but always keeps errors, which flush immediately', () => {
+    const { logger, chunks, entries } = captureLogger({ level: 'debug', sampleEvery: { assert: 3 } });
+
+    for (let index = 0; index < 6; index += 1) {
+      logger.log('info', record('assert', `allowed ${index}`));
+    }
+    logger.log('error', record('assert', 'escalation'));
+
+    expect(chunks).toHaveLength(1);
+    expect(entries().map((entry) => entry.message)).toEqual(['allowed 0', 'allowed 3', 'escalation']);
+    expect(entries()[2].error).toBe(true);
+  });
+
+  it('truncates large values and reports overflowed entries', () => {
+    const { logger, entries } = captureLogger({ level: 'info', maxValueChars: 16, bufferCapacity: 2 });
+
+    logger.log('info', record('patch', 'one', { payload: 'x'.repeat(100) }));
+    logger.log('info', record('patch', 'two'));
+    logger.log('info', record('patch', 'three'));
+    logger.flush();
+
+    const [overflow, second, third] = entries();
+    expect(overflow).toMatchObject({ message: 'Log buffer overflowed', dropped: 1 });
+    expect(second.message).toBe('two');
+    expect(third.message).toBe('three');
+
+    const { logger: truncating, entries: truncated } = captureLogger({ level: 'info', maxValueChars: 16 });
+    truncating.log('info', record('patch', 'big', { payload: 'x'.repeat(100) }));
+    truncating.flush();
+    expect(truncated()[0].details).toMatch(/^\{"payload":"xxxx.*\.\.\.\(\+\d+ chars\)$/);
+  });
+
+  it('reads the shared GODOT_MCP_LOG_* variables', () => {
+    expect(loggerOptionsFromEnv({
+      GODOT_MCP_LOG_LEVEL: 'DEBUG',
+      GODOT_MCP_LOG_SAMPLE: 'assert=10, patch=0',
+      GODOT_MCP_LOG_MAX_CHARS: '64',
+    })).toEqual({
+      level: 'debug',
+      sampleEvery: { assert: 10, patch: 1 },
+      maxValueChars: 64,
+    });
+  });
+});
@@ -18,6 +18,7 @@ const { mockSendCommand, mockGetIndex } = mockState;
 vi.mock('../dist/utils/godot_connection.js', () => ({
   getGodotConnection: () => ({
     sendCommand: mockSendCommand,
+    getMirrored: mockSendCommand,
     connect: vi.fn(),
     disconnect: vi.fn(),
   }),
@@ -24,6 +24,13 @@ const mockState = vi.hoisted(() => {
 
   return {
     mockSendCommand: vi.fn<(command: string, payload?: unknown) => Promise<any>>(async () => ({})),
+    mockSendBatch: vi.fn<(commands: unknown[], onError?: string) => Promise<any>>(async () => ({
+      results: [],
+      completed: 0,
+      failed: 0,
+      skipped: 0,
+      stopped: false,
+    })),
     mockRefresh: vi.fn(async () => snapshot),
     mockQuery: vi.fn(async () => []),
     mockGetIndex: vi.fn(async () => snapshot),
@@ -73,6 +80,7 @@ const mockState = vi.hoisted(() => {
 
 const {
   mockSendCommand,
+  mockSendBatch,
   mockRefresh,
   mockQuery,
   mockGetIndex,
@@ -87,6 +95,7 @@ const {
 vi.mock('../dist/utils/godot_connection.js', () => ({
   getGodotConnection: () => ({
     sendCommand: mockSendCommand,
+    sendBatch: mockSendBatch,
     connect: vi.fn(),
     disconnect: vi.fn(),
   }),
@@ -231,6 +240,7 @@ const godotCommandCases: Array<{
   { collection: sceneTools, name: 'save_scene', command: 'save_scene', args: { path: 'res://scenes/new_scene.tscn' } },
   { collection: sceneTools, name: 'open_scene', command: 'open_scene', args: { path: 'res://scenes/new_scene.tscn' } },
   { collection: sceneTools, name: 'get_current_scene', command: 'get_current_scene', args: {} },
+  { collection: sceneTools, name: 'get_scene_structure', command: 'get_scene_structure', args: { path: 'res://scenes/level.tscn', mode: 'state', max_depth: 2, fields: ['name', 'type'], limit: 100 } },
   {
     collection: sceneTools,
     name: 'get_project_info',
@@ -293,6 +303,36 @@ const godotCommandCases: Array<{
     command: 'clear_gridmap_cells',
     args: { node_path: '/root/Grid', cells: [{ position: { x: 0, y: 0, z: 0 } }], transaction_id: 'txn' },
   },
+  {
+    collection: sceneTools,
+    name: 'paint_gridmap_cells',
+    command: 'paint_gridmap_cells',
+    args: {
+      node_path: '/root/Grid',
+      packed_cells: [0, 0, 0, 1, 0, 1, 0, 0, 1, 0],
+      regions: [{ shape: 'box', from: { x: 0, y: 0, z: 0 }, to: { x: 255, y: 0, z: 255 }, item: 2 }],
+    },
+    response: {
+      node_path: '/root/Grid',
+      status: 'committed',
+      change_count: 65536,
+      changes: [{ position: { x: 0, y: 0, z: 0 }, previous_item: -1, previous_orientation: 0, item: 2, orientation: 0 }],
+      bounds: { from: { x: 0, y: 0, z: 0 }, to: { x: 255, y: 0, z: 255 } },
+    },
+  },
+  {
+    collection: sceneTools,
+    name: 'clear_gridmap_cells',
+    command: 'clear_gridmap_cells',
+    args: { node_path: '/root/Grid', regions: [{ shape: 'fill', origin: { x: 4, y: 0, z: 4 }, max_cells: 1024 }] },
+  },
+  {
+    collection: projectTools,
+    name: 'list_project_files',
+    command: 'list_project_files',
+    args: { extensions: ['.tscn'], directory: 'res://levels', offset: 200, limit: 100 },
+    response: { files: ['res://levels/forest.tscn'], total: 201, offset: 200 },
+  },
   { collection: projectTools, name: 'list_input_actions', command: 'list_input_actions', args: {} },
   { collection: projectTools, name: 'list_audio_buses', command: 'list_audio_buses', args: {} },
   {
@@ -413,7 +453,7 @@ const godotCommandCases: Array<{
     collection: audioTools,
     name: 'analyze_waveform',
     command: 'analyze_waveform',
-    args: { resource_path: 'res://audio/theme.ogg', envelope_bins: 128 },
+    args: { resource_path: 'res://audio/theme.ogg', envelope_bins: 128, start_seconds: 1.5, refresh_cache: true },
   },
   {
     collection: audioTools,
@@ -464,6 +504,20 @@ const godotCommandCases: Array<{
     args: { include_resources: false, node_limit: 10 },
     response: { node_count: 3 },
   },
+  {
+    collection: editorTools,
+    name: 'snapshot_scene_state',
+    command: 'snapshot_scene_state',
+    args: { since: 7 },
+    response: {
+      snapshot_id: 8,
+      since: 7,
+      compared: 'tracked',
+      added: [],
+      removed: [],
+      changed: [{ path: '/root/Main/Player', properties: { position: [120, 40] } }],
+    },
+  },
   { collection: animationTools, name: 'list_animation_players', command: 'list_animation_players', args: { include_tracks: true } },
   { collection: animationTools, name: 'describe_animation_tracks', command: 'describe_animation_tracks', args: { include_keys: true } },
   { collection: animationTools, name: 'describe_animation_state_machines', command: 'describe_animation_state_machines', args: { include_transitions: true } },
@@ -650,6 +704,7 @@ describe('Godot MCP tool command wiring', () => {
   beforeEach(() => {
     mockSendCommand.mockClear();
     mockSendCommand.mockImplementation(async () => ({}));
+    mockSendBatch.mockClear();
     mockRefresh.mockClear();
     mockQuery.mockClear();
     mockGetIndex.mockClear();
@@ -690,6 +745,20 @@ describe('Godot MCP tool command wiring', () => {
     expect(mockSendCommand).not.toHaveBeenCalled();
   });
 
+  it('sends execute_batch commands as one batch', async () => {
+    const tool = getTool(editorTools, 'execute_batch');
+    const commands = [
+      { type: 'create_node', params: { parent_path: '/root', node_type: 'Node2D', node_name: 'A' } },
+      { type: 'rename_node', params: { node_path: '/root/A', new_name: 'B' }, commandId: 'rename' },
+    ];
+    const output = await tool.execute({ commands, on_error: 'continue' } as never);
+
+    expect(output).toContain('"completed"');
+    expect(mockSendBatch).toHaveBeenCalledTimes(1);
+    expect(mockSendBatch).toHaveBeenCalledWith(commands, 'continue');
+    expect(mockSendCommand).not.toHaveBeenCalled();
+  });
+
   it('refreshes the project index via projectIndexer', async () => {
     const tool = getTool(projectTools, 'refresh_project_index');
     const output = await tool.execute({});
@@ -0,0 +1,71 @@
+@tool
+extends SceneTree
+
+# Checks MCPWaveformPyramid envelopes against envelopes decoded straight from
+# the PCM data, for windows whose edges fall inside pyramid bins.
+# Run with: godot --headless -s test_waveform_pyramid.gd
+
+const Pyramid = preload("res://addons/godot_mcp/utils/waveform_pyramid.gd")
+const FRAMES := 200000
+const EPSILON := 0.0001
+const RMS_TOLERANCE := 0.05
+
+func _init():
+	print("=== Testing waveform pyramid envelopes ===")
+
+	var stream := AudioStreamWAV.new()
+	stream.format = AudioStreamWAV.FORMAT_16_BITS
+	stream.stereo = false
+	var rng := RandomNumberGenerator.new()
+	rng.seed = 7
+	var data := PackedByteArray()
+	data.resize(FRAMES * 2)
+	for frame_index in FRAMES:
+		# A slow sweep under noise, so neighbouring windows differ.
+		var value := 0.6 * sin(frame_index * 0.0005 * (1.0 + frame_index / 50000.0)) + rng.randf_range(-0.2, 0.2)
+		data.encode_s16(frame_index * 2, int(clampf(value, -1.0, 1.0) * 32767.0))
+	stream.data = data
+
+	var pyramid: Dictionary = Pyramid.build(stream, 0.01)
+	var failures := 0
+	# [start_frame, end_frame, bins]; none of the edges line up with bins.
+	for window in [[1000, 1000 + 37 * 3001, 37], [777, 777 + 10 * 19993, 10], [12345, 190001, 3]]:
+		failures += _check_window(pyramid, stream, window[0], window[1], window[2])
+
+	if failures == 0:
+		print("✓ Pyramid envelopes match decoded envelopes")
+	else:
+		print("✗ %d envelope entries out of bounds" % failures)
+	quit(1 if failures > 0 else 0)
+
+
+func _check_window(pyramid: Dictionary, stream: AudioStreamWAV, start_frame: int, end_frame: int, bins: int) -> int:
+	var envelope: Dictionary = Pyramid.envelope(pyramid, stream, start_frame, end_frame, bins)
+	var level_frames: int = envelope["frames_per_bin"]
+	var decoded: Array = Pyramid._decode_envelope(stream, 1, start_frame, end_frame, bins)[0]
+	var span := end_frame - start_frame
+	var failures := 0
+	print("Window [%d, %d) in %d bins: level %d, %d frames per pyramid bin" % [start_frame, end_frame, bins, envelope["level"], level_frames])
+	for bin_index in bins:
+		var first := start_frame + span * bin_index / bins
+		var last := start_frame + span * (bin_index + 1) / bins
+		var entry: Dictionary = envelope["channels"][0][bin_index]
+		var exact: Dictionary = decoded[bin_index]
+		# What the entry may see: its own frames plus less than a pyramid bin
+		# on either side, which is at most an eighth of its width.
+		var widened: Dictionary = Pyramid._decode_envelope(stream, 1, maxi(first - level_frames + 1, 0), mini(last + level_frames - 1, FRAMES), 1)[0][0]
+		var problems := []
+		if level_frames * Pyramid.LEVEL_BINS_PER_ENTRY > last - first:
+			problems.append("pyramid bin wider than an eighth of the entry")
+		if entry["samples"] != exact["samples"]:
+			problems.append("samples %d != %d" % [entry["samples"], exact["samples"]])
+		if entry["min"] > exact["min"] + EPSILON or entry["min"] < widened["min"] - EPSILON:
+			problems.append("min %f outside [%f, %f]" % [entry["min"], widened["min"], exact["min"]])
+		if entry["max"] < exact["max"] - EPSILON or entry["max"] > widened["max"] + EPSILON:
+			problems.append("max %f outside [%f, %f]" % [entry["max"], exact["max"], widened["max"]])
+		if absf(entry["rms"] - exact["rms"]) > RMS_TOLERANCE:
+			problems.append("rms %f != %f" % [entry["rms"], exact["rms"]])
+		if not problems.is_empty():
+			print("  ✗ entry %d [%d, %d): %s" % [bin_index, first, last, ", ".join(PackedStringArray(problems))])
+			failures += 1
+	return failures
@@ -1,5 +1,11 @@
 #!/usr/bin/env python3
-"""Test WebSocket connection to Godot MCP server"""
+"""Test WebSocket connection to Godot MCP server
+
+Run with ``--bench [options]`` to load-test the server instead, or with
+``--trace record|replay|summary|compare [options]`` to record and replay
+command traffic; see ``python -m godot_ws.bench --help`` and
+``python -m godot_ws.trace --help``.
+"""
 
 import asyncio
 import websockets
@@ -11,7 +17,7 @@ async def test_connection():
     print(f"Attempting to connect to {uri}...")
     
     try:
-        async with websockets.connect(uri, timeout=5) as websocket:
+        async with websockets.connect(uri, open_timeout=5) as websocket:
             print("✅ Connected successfully!")
             
             # Wait for welcome message
@@ -54,6 +60,13 @@ async def test_connection():
         return False
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["--bench"]:
+        from godot_ws.bench import main
+        sys.exit(main(sys.argv[2:]))
+    if sys.argv[1:2] == ["--trace"]:
+        from godot_ws.trace import main
+        sys.exit(main(sys.argv[2:]))
+
     print("=== Testing Godot MCP WebSocket Server ===\n")
     result = asyncio.run(test_connection())
     sys.exit(0 if result else 1)
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from gdtools import balance
+from gdtools.balance import MISMATCHED, UNCLOSED, UNEXPECTED, UNTERMINATED, scan_brackets
+
+
+def _kinds(source):
+    return [(issue.kind, issue.line, issue.col, issue.char) for issue in scan_brackets(source)]
+
+
+def _exact(source):
+    """The regex-driven pass alone, as the reference for the bisecting scan."""
+    stack, raw_issues = [], []
+    balance._scan_exact(source, stack, raw_issues)
+    raw_issues += [(UNCLOSED, index, char, index) for char, index in stack]
+    position = balance._Positions(source)
+    issues = []
+    for kind, index, char, open_index in raw_issues:
+        open_line = open_col = None
+        if open_index is not None:
+            open_line, open_col = position(open_index)
+        issues.append(balance.BracketIssue(kind, *position(index), char, open_line, open_col))
+    return sorted(issues, key=lambda issue: (issue.line, issue.col, issue.kind))
+
+
+def test_clean_source_has_no_issues():
+    source = 'func f(a):\n\tvar d := {"k": [a, (1 + 2)]}  # ) in a comment\n\treturn d\n'
+    assert scan_brackets(source) == []
+
+
+def test_brackets_inside_strings_and_comments_are_ignored():
+    source = 'var a := "(["\nvar b := \'}\'\nvar c := """\n) spans lines\n"""\n# ]]]\nvar d := &"(" + ^"["\n'
+    assert scan_brackets(source) == []
+
+
+def test_reports_unclosed_unexpected_and_mismatched():
+    assert _kinds("foo(1, 2\n") == [(UNCLOSED, 1, 4, "(")]
+    assert _kinds("x)\n") == [(UNEXPECTED, 1, 2, ")")]
+    issues = scan_brackets("a = (1]\n")
+    assert [(issue.kind, issue.col, issue.open_col) for issue in issues] == [
+        (UNCLOSED, 5, 5),
+        (MISMATCHED, 7, 5),
+    ]
+
+
+def test_unterminated_string_resumes_on_next_line():
+    assert _kinds('var s = "open ( \nfoo()\n') == [(UNTERMINATED, 1, 9, '"')]
+
+
+def test_columns_count_characters_not_bytes():
+    assert _kinds('var s := "é" + ü(\n') == [(UNCLOSED, 1, 17, "(")]
+
+
+def test_deep_nesting_beyond_the_quick_depth():
+    depth = balance._QUICK_DEPTH * 3
+    assert scan_brackets("(" * depth + ")" * depth + "\n") == []
+    assert _kinds("(" * depth + ")" * (depth + 1) + "\n") == [(UNEXPECTED, 1, 2 * depth + 1, ")")]
+
+
+@pytest.mark.parametrize("leaf_bytes", [4, 64, 4096])
+def test_bisecting_scan_matches_the_exact_pass(monkeypatch, leaf_bytes):
+    monkeypatch.setattr(balance, "_LEAF_BYTES", leaf_bytes)
+    rng = random.Random(leaf_bytes)
+    alphabet = list("()[]{}()[]{}  ab\n\nfunc\n#é")
+    for _ in range(500):
+        source = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 300)))
+        assert scan_brackets(source) == _exact(source), repr(source)
+
+
+def test_line_table_agrees_with_direct_lookups():
+    source = "a\nbb\n\nccc(\n" * 20
+    direct = balance._Positions(source)
+    table = balance._Positions(source)
+    table.lookups = balance._DIRECT_LOOKUPS
+    for offset in range(len(source)):
+        assert direct(offset) == table(offset)
+        direct.lookups = 0
@@ -0,0 +1,43 @@
+import json
+
+from godot_ws.binary import TYPED_KEY, decode_frame, encode_frame
+from godot_ws.protocol import encode
+
+
+def _round_trip(values):
+    response = {"status": "success", "result": {"values": values}, "commandId": "cmd_1"}
+    frame = encode_frame(response)
+    assert frame is not None
+    assert decode_frame(frame) == json.loads(encode(response))
+    return decode_frame(frame, rows=False)["result"]["values"].typecode
+
+
+def test_float32_values_travel_as_f32():
+    assert _round_trip([0.5, 1.25, -3.0, 4.75, 0.0, 1.0, 2.0, 8.5]) == "f"
+
+
+def test_doubles_travel_as_f64():
+    assert _round_trip([0.1, 1.0 / 3.0, 2.5, 3.0, 4.0, 5.0, 6.0, 7.0]) == "d"
+
+
+def test_large_ints_mixed_with_floats_travel_as_f64():
+    assert _round_trip([2**24 + 1, 0.5, 1, 2, 3, 4, 5, 6]) == "d"
+
+
+def test_ints_beyond_float64_stay_json():
+    response = {"status": "success", "result": {"values": [2**53 + 1] * 8}, "commandId": "cmd_1"}
+    assert encode_frame(response) is None
+
+
+def test_narrow_ints_and_tables():
+    response = {
+        "status": "success",
+        "result": {"cells": [{"item": index, "name": f"cell_{index}"} for index in range(10)]},
+        "commandId": "cmd_1",
+    }
+    frame = encode_frame(response)
+    columns = decode_frame(frame, rows=False)["result"]["cells"]["columns"]
+    assert columns["item"].typecode == "B"
+    assert columns["name"] == [f"cell_{index}" for index in range(10)]
+    assert decode_frame(frame) == response
+    assert TYPED_KEY not in json.dumps(decode_frame(frame))
@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from gdtools import runner
+from gdtools.cache import LintCache
+from gdtools.rules import RULES
+
+SOURCE = "func f(x):\n\tvar y = x ? 1 : 2\n    return y\n"
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / "project.godot").write_text("")
+    script = tmp_path / "main.gd"
+    script.write_text(SOURCE)
+    calls = {"reads": 0, "lints": []}
+    read_source = runner.read_source
+    lint_source = runner.lint_source
+
+    def counting_read(path, *args, **kwargs):
+        calls["reads"] += 1
+        return read_source(path, *args, **kwargs)
+
+    def counting_lint(source, path, rules=None, *args, **kwargs):
+        calls["lints"].append(sorted(rule.name for rule in rules))
+        return lint_source(source, path, rules, *args, **kwargs)
+
+    monkeypatch.setattr(runner, "read_source", counting_read)
+    monkeypatch.setattr(runner, "lint_source", counting_lint)
+    return tmp_path, script, calls
+
+
+def _run(root, script):
+    reports = runner.run([script], jobs=1, cache=LintCache(root))
+    return sorted((finding.rule, finding.line) for report in reports for finding in report.findings)
+
+
+def _reset(calls):
+    calls["reads"] = 0
+    calls["lints"] = []
+
+
+def test_unchanged_file_is_served_without_being_opened(project):
+    root, script, calls = project
+    first = _run(root, script)
+    assert calls["reads"] == 1 and len(calls["lints"]) == 1
+    assert ("ternary-operator", 2) in first
+
+    _reset(calls)
+    assert _run(root, script) == first
+    assert calls == {"reads": 0, "lints": []}
+
+
+def test_touched_file_is_read_but_not_relinted(project):
+    root, script, calls = project
+    first = _run(root, script)
+    stat = script.stat()
+    os.utime(script, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    _reset(calls)
+    assert _run(root, script) == first
+    assert calls["reads"] == 1 and calls["lints"] == []
+
+
+def test_changed_content_is_relinted(project):
+    root, script, calls = project
+    _run(root, script)
+    script.write_text("func f(x):\n\treturn x\n")
+    stat = script.stat()
+    os.utime(script, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    _reset(calls)
+    assert _run(root, script) == []
+    assert calls["reads"] == 1 and len(calls["lints"]) == 1
+
+
+def test_rule_version_bump_reruns_only_that_rule(project, monkeypatch):
+    root, script, calls = project
+    first = _run(root, script)
+    monkeypatch.setattr(RULES["ternary-operator"], "version", RULES["ternary-operator"].version + 1)
+
+    _reset(calls)
+    assert _run(root, script) == first
+    assert calls["lints"] == [["ternary-operator"]]
+
+
+def test_fixing_a_file_invalidates_its_entry(project):
+    root, script, calls = project
+    _run(root, script)
+    runner.run([script], fix=True, jobs=1, cache=LintCache(root))
+    assert script.read_text() == "func f(x):\n\tvar y = 1 if x else 2\n\treturn y\n"
+
+    _reset(calls)
+    assert _run(root, script) == []
+    assert calls["reads"] == 1
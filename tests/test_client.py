@@ -0,0 +1,21 @@
+import asyncio
+
+from godot_ws.client import ClientPool
+from godot_ws.server import CommandProfile, StandInServer
+
+
+def test_run_batch_spreads_queued_commands_across_connections():
+    async def scenario():
+        server = StandInServer(CommandProfile(latency_ms=5))
+        async with server.running() as uri:
+            async with ClientPool(uri, size=2, max_in_flight=4) as pool:
+                results = await pool.run_batch(("get_editor_state", None) for _ in range(200))
+                sent = [next(connection.sequence) - 1 for connection in pool.slots]
+                loads = [connection.load for connection in pool.slots]
+        return results, sent, loads
+
+    results, sent, loads = asyncio.run(scenario())
+    assert results == [{}] * 200
+    assert sum(sent) == 200
+    assert min(sent) >= 90, sent
+    assert loads == [0, 0]
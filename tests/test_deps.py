@@ -0,0 +1,48 @@
+from gdtools.deps import DependencyGraph
+
+RES = "res://"
+
+
+def _project(tmp_path, scripts):
+    (tmp_path / "project.godot").write_text("")
+    for name, source in scripts.items():
+        (tmp_path / name).write_text(source)
+    return DependencyGraph.build([tmp_path], use_cache=False)
+
+
+def test_preload_cycle_is_one_component(tmp_path):
+    graph = _project(tmp_path, {
+        "a.gd": 'const B = preload("res://b.gd")\n',
+        "b.gd": 'const C = preload("c.gd")\n',
+        "c.gd": 'const A = preload("res://a.gd")\nconst D = preload("res://d.gd")\n',
+        "d.gd": "func f():\n\tpass\n",
+    })
+    assert graph.cycles() == [[RES + "a.gd", RES + "b.gd", RES + "c.gd"]]
+    # d.gd is outside the cycle and loads before it.
+    assert graph.components() == [[RES + "d.gd"], [RES + "a.gd", RES + "b.gd", RES + "c.gd"]]
+    assert graph.reachable(RES + "b.gd") == frozenset(RES + name for name in ("a.gd", "b.gd", "c.gd", "d.gd"))
+
+
+def test_load_calls_do_not_form_cycles(tmp_path):
+    graph = _project(tmp_path, {
+        "a.gd": 'const B = preload("res://b.gd")\n',
+        "b.gd": 'func f():\n\treturn load("res://a.gd")\n',
+    })
+    assert graph.cycles() == []
+
+
+def test_diamond_loads_dependencies_first(tmp_path):
+    graph = _project(tmp_path, {
+        "top.gd": 'const Left = preload("res://left.gd")\nconst Right = preload("res://right.gd")\n',
+        "left.gd": "extends Base\n",
+        "right.gd": "func f():\n\treturn Base.new()\n",
+        "base.gd": "class_name Base\nextends Node\n",
+    })
+    order = graph.load_order()
+    assert sorted(order) == [RES + name for name in ("base.gd", "left.gd", "right.gd", "top.gd")]
+    position = {node: index for index, node in enumerate(order)}
+    assert position[RES + "base.gd"] < position[RES + "left.gd"] < position[RES + "top.gd"]
+    assert position[RES + "base.gd"] < position[RES + "right.gd"] < position[RES + "top.gd"]
+    assert graph.cycles() == []
+    # The shared base is counted once in what top.gd drags in.
+    assert graph.cost(RES + "top.gd")["scripts"] == 4
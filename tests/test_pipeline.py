@@ -0,0 +1,65 @@
+from gdtools.cli import main
+from gdtools.pipeline import CONFLICT_RULE, repair_source, select_edits
+from gdtools.rules import Edit, Finding, get_rules
+
+
+def test_fixes_chain_to_a_fixed_point_in_one_run():
+    # The inner ternary only gets an edit once the outer one is rewritten.
+    result = repair_source("var y = a ? b : (c ? d : e)\n", rules=get_rules(["ternary-operator"]))
+    assert result.source == "var y = b if a else (d if c else e)\n"
+    assert result.converged
+    assert result.iterations == 2
+    assert not result.remaining
+
+
+def test_rules_combine_in_memory():
+    source = "func f(x):\n\tvar y = x > 0 ? 1 : 2\n        return y\n"
+    result = repair_source(source)
+    assert result.source == "func f(x):\n\tvar y = 1 if x > 0 else 2\n\treturn y\n"
+    # Eight spaces read as two levels, and the extra level is then dedented.
+    assert sorted({finding.rule for finding in result.fixed}) == [
+        "mixed-indentation",
+        "ternary-operator",
+        "unexpected-indent",
+    ]
+    assert result.diff().startswith("--- a/<string>\n+++ b/<string>\n")
+
+
+def test_clean_source_is_untouched():
+    result = repair_source("func f():\n\treturn 1\n")
+    assert not result.changed
+    assert result.iterations == 0
+    assert result.diff() == ""
+
+
+def test_max_iterations_stops_before_the_fixed_point():
+    result = repair_source("var y = a ? b : (c ? d : e)\n", rules=get_rules(["ternary-operator"]), max_iterations=1)
+    assert result.source == "var y = b if a else (c ? d : e)\n"
+    assert not result.converged
+
+
+def test_overlapping_edits_keep_the_first_and_report_a_conflict():
+    first = Finding("f.gd", 1, 1, "one", "m", Edit(0, 5, "x"), True)
+    second = Finding("f.gd", 1, 3, "two", "m", Edit(2, 8, "y"), True)
+    later = Finding("f.gd", 2, 1, "three", "m", Edit(10, 12, "z"), True)
+    chosen, conflicts = select_edits([second, later, first])
+    assert chosen == [first, later]
+    assert [conflict.rule for conflict in conflicts] == [CONFLICT_RULE]
+    assert "one" in conflicts[0].message and "two" in conflicts[0].message
+
+
+def test_conflicts_settled_by_a_later_pass_are_not_reported(tmp_path, capsys):
+    # The ternary edit overlaps the misplaced-var edit in the first pass and
+    # is applied in the second.
+    source = 'func f():\n\t"a" if var result := ok else (c ? "b" : "d")\n'
+    result = repair_source(source)
+    assert result.source == 'func f():\n\tvar result := "a" if ok else ("b" if c else "d")\n'
+    assert result.converged
+    assert result.conflicts == []
+    assert result.to_report().remaining == []
+
+    script = tmp_path / "conflict.gd"
+    script.write_text(source)
+    assert main([str(script), "--fix", "--no-cache"]) == 0
+    assert script.read_text() == result.source
+    capsys.readouterr()
@@ -0,0 +1,103 @@
+from gdtools.engine import lint_source
+from gdtools.pipeline import repair_source
+from gdtools.rules import get_rules
+
+
+def _fix(source, *rules):
+    return repair_source(source, rules=get_rules(rules or None)).source
+
+
+def _rules(source, *rules):
+    return [finding.rule for finding in lint_source(source, rules=get_rules(rules or None)).findings]
+
+
+def test_ternary_is_rewritten():
+    assert _fix("var y = x > 0 ? 1 : 2\n", "ternary-operator") == "var y = 1 if x > 0 else 2\n"
+
+
+def test_nested_ternary_from_script_commands():
+    # addons/godot_mcp/commands/script_commands.gd, get_script metadata.
+    source = (
+        "\t\tvar metadata = {\n"
+        '\t\t\t\t"path": path,\n'
+        '\t\t\t\t"language": path.ends_with(".gd") ? "gdscript" : (path.ends_with(".cs") ? "csharp" : "unknown")\n'
+        "\t\t}\n"
+    )
+    assert _fix(source, "ternary-operator") == (
+        "\t\tvar metadata = {\n"
+        '\t\t\t\t"path": path,\n'
+        '\t\t\t\t"language": "gdscript" if path.ends_with(".gd") else ("csharp" if path.ends_with(".cs") else "unknown")\n'
+        "\t\t}\n"
+    )
+
+
+def test_ternary_inside_call_arguments_keeps_other_arguments():
+    source = 'print(a ? "yes" : "no", b)\n'
+    assert _fix(source, "ternary-operator") == 'print("yes" if a else "no", b)\n'
+
+
+def test_question_marks_in_strings_and_comments_are_not_ternaries():
+    source = 'var s = "a ? b : c"  # x ? y : z\n'
+    assert _rules(source, "ternary-operator") == []
+
+
+def test_misplaced_var_is_moved_in_front():
+    source = '\t"a" if var result := ok else "b"\n'
+    assert _fix(source, "misplaced-var") == '\tvar result := "a" if ok else "b"\n'
+
+
+def test_mixed_indentation_follows_the_dominant_style():
+    source = "func f():\n\tvar a = 1\n\tvar b = 2\n    return a\n"
+    assert _rules(source, "mixed-indentation") == ["mixed-indentation"]
+    assert _fix(source, "mixed-indentation") == "func f():\n\tvar a = 1\n\tvar b = 2\n\treturn a\n"
+
+
+def test_space_levels_follow_the_step_between_lines_not_the_smallest_indent():
+    # node_commands.gd `_rename_node`: a block whose only space-indented lines
+    # sit 16 and 24 spaces deep under a tab-indented `if`.
+    source = (
+        "func f():\n"
+        "\tvar node = get_node()\n"
+        "\tnode.name = new_name\n"
+        "\tif transaction_id.is_empty():\n"
+        "                if not transaction.commit():\n"
+        "                        transaction.rollback()\n"
+        "                        return\n"
+        "\n"
+        "                var updated_path = node.get_path()\n"
+        "\t\tsend(updated_path)\n"
+    )
+    assert _fix(source, "mixed-indentation") == (
+        "func f():\n"
+        "\tvar node = get_node()\n"
+        "\tnode.name = new_name\n"
+        "\tif transaction_id.is_empty():\n"
+        "\t\tif not transaction.commit():\n"
+        "\t\t\ttransaction.rollback()\n"
+        "\t\t\treturn\n"
+        "\n"
+        "\t\tvar updated_path = node.get_path()\n"
+        "\t\tsend(updated_path)\n"
+    )
+
+
+def test_block_body_is_never_fixed_out_of_its_block():
+    source = "func f():\n\tif a:\n\t\tpass\n\tif b:\n  x()\n"
+    report = lint_source(source, rules=get_rules(["mixed-indentation"]))
+    assert [(finding.line, finding.fixable) for finding in report.findings] == [(5, False)]
+    assert _fix(source, "mixed-indentation") == source
+
+
+def test_alignment_inside_brackets_is_not_indentation():
+    source = "func f():\n\tcall(a,\n\t      b)\n"
+    assert _rules(source, "mixed-indentation") == []
+
+
+def test_unexpected_indent_aligns_with_the_previous_statement():
+    source = "func f():\n\tvar a = 1\n\t\t\tvar b = 2\n"
+    assert _fix(source, "unexpected-indent") == "func f():\n\tvar a = 1\n\tvar b = 2\n"
+
+
+def test_unexpected_indent_after_return_is_reported_without_a_fix():
+    report = lint_source("func f():\n\treturn 1\n\t\tvar b = 2\n", rules=get_rules(["unexpected-indent"]))
+    assert [(finding.line, finding.fixable) for finding in report.findings] == [(3, False)]
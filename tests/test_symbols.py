@@ -0,0 +1,83 @@
+import os
+
+from gdtools.symbols import FUNC, SymbolIndex
+
+SOURCE = """class_name Inventory
+extends Node
+
+func add_item(item):
+\tif item == null:
+\t\treturn false
+\titems.append(item)
+\treturn true
+
+func clear():
+\titems.clear()
+\temit_signal("changed", items.size())
+"""
+
+
+def _project(tmp_path, source=SOURCE):
+    (tmp_path / "project.godot").write_text("")
+    script = tmp_path / "inventory.gd"
+    script.write_text(source)
+    return script
+
+
+def _rewrite(script, source):
+    stamp = script.stat().st_mtime_ns + 5_000_000_000
+    script.write_text(source)
+    os.utime(script, ns=(stamp, stamp))
+
+
+def _functions(index):
+    return {symbol.name: symbol.body_hash for symbol in index.files["inventory.gd"] if symbol.kind == FUNC}
+
+
+def test_body_edit_changes_only_that_functions_hash(tmp_path):
+    script = _project(tmp_path)
+    index = SymbolIndex.build([tmp_path])
+    before = _functions(index)
+
+    _rewrite(script, SOURCE.replace("\treturn true", "\treturn items.size() > 0"))
+    index.update([script])
+    after = _functions(index)
+    assert index.stats["parsed"] == 2
+    assert after.keys() == before.keys()
+    assert after["add_item"] != before["add_item"]
+    assert after["clear"] == before["clear"]
+
+
+def test_formatting_and_comments_do_not_change_hashes(tmp_path):
+    script = _project(tmp_path)
+    index = SymbolIndex.build([tmp_path])
+    before = _functions(index)
+
+    _rewrite(script, SOURCE.replace("\titems.clear()", "    # Reset.\n    items.clear( )"))
+    index.update([script])
+    assert _functions(index) == before
+
+
+def test_rename_shows_up_as_remove_plus_add(tmp_path):
+    script = _project(tmp_path)
+    index = SymbolIndex.build([tmp_path])
+    before = _functions(index)
+
+    _rewrite(script, SOURCE.replace("func clear():", "func reset():"))
+    index.update([script])
+    after = _functions(index)
+    assert before.keys() - after.keys() == {"clear"}
+    assert after.keys() - before.keys() == {"reset"}
+    # Same body, new name: the hash follows the body.
+    assert after["reset"] == before["clear"]
+    assert after["add_item"] == before["add_item"]
+    assert index.who_defines("clear") == []
+    assert [symbol.line for symbol in index.who_defines("reset", FUNC)] == [10]
+
+
+def test_unchanged_files_are_served_from_the_cache(tmp_path):
+    _project(tmp_path)
+    SymbolIndex.build([tmp_path]).save()
+    index = SymbolIndex.build([tmp_path])
+    assert index.stats == {"reused": 1, "rehashed": 0, "parsed": 0}
+    assert "add_item" in _functions(index)
@@ -0,0 +1,64 @@
+from gdtools.tokenizer import COMMENT, NAME, OP, STRING, tokenize
+
+
+def _texts(line):
+    return [token.text for token in line.tokens]
+
+
+def test_brackets_join_physical_lines_into_one_logical_line():
+    stream = tokenize('func f(x):\n\tvar d = {\n\t\t"a": 1, # c\n\t}\n\treturn d\n')
+    assert [(line.start_line, line.end_line, line.indent) for line in stream.lines] == [
+        (1, 1, ""),
+        (2, 4, "\t"),
+        (5, 5, "\t"),
+    ]
+    assert _texts(stream.lines[1]) == ["var", "d", "=", "{", '"a"', ":", "1", ",", "}"]
+    assert [token.text for token in stream.comments] == ["# c"]
+
+
+def test_backslash_continuation_joins_lines():
+    stream = tokenize('var s = "a" \\\n\t+ "b"\nvar t = 1\n')
+    assert [(line.start_line, line.end_line) for line in stream.lines] == [(1, 2), (3, 3)]
+
+
+def test_strings_hide_comment_and_operator_characters():
+    stream = tokenize('var s = "#?:" + &"Name" + ^"Node/Path" + r"raw\\"\n')
+    kinds = [(token.kind, token.text) for token in stream.lines[0].tokens]
+    assert (STRING, '"#?:"') in kinds
+    assert (STRING, '&"Name"') in kinds
+    assert (STRING, '^"Node/Path"') in kinds
+    assert not stream.comments
+    assert all(kind != OP or text not in {"?", "#"} for kind, text in kinds)
+
+
+def test_triple_quoted_string_spans_lines():
+    stream = tokenize('var doc = """one\n(two\n"""\nvar x = 1\n')
+    assert [line.start_line for line in stream.lines] == [1, 4]
+    assert stream.lines[0].tokens[-1].kind == STRING
+
+
+def test_depth_tracks_bracket_nesting():
+    line = tokenize("f(a, [b, c])\n").lines[0]
+    assert dict(zip(_texts(line), line.depth))["b"] == 2
+    assert line.depth[0] == 0
+
+
+def test_indentation_style_counts():
+    tabs = tokenize("func f():\n\tpass\n\tpass\n")
+    spaces = tokenize("func f():\n  pass\n  pass\n")
+    assert tabs.prefers_tabs
+    assert not spaces.prefers_tabs
+    assert spaces.space_unit == 2
+
+
+def test_space_unit_is_the_step_between_neighbouring_lines():
+    assert tokenize("func f():\n\tif a:\n        b()\n            c()\n").space_unit == 4
+    assert tokenize("func f():\n\tif a:\n                b()\n").space_unit == 4
+    assert tokenize("if a:\n      b()\n      if c:\n            d()\n").space_unit == 6
+
+
+def test_comment_only_lines_are_not_logical_lines():
+    stream = tokenize("# header\n\nvar a = 1  # trailing\n")
+    assert len(stream.lines) == 1
+    assert stream.lines[0].first.kind == NAME
+    assert [token.kind for token in stream.comments] == [COMMENT, COMMENT]
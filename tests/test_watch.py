@@ -0,0 +1,123 @@
+import os
+
+from gdtools.engine import FileReport
+from gdtools.rules import Finding
+from gdtools.watch import ResultTable, Watcher, diff_snapshots
+
+TERNARY = "func f(x):\n\treturn x ? 1 : 2\n"
+CLEAN = "func f(x):\n\treturn x\n"
+
+
+def _write(path, text, mtime_ns):
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _watcher(tmp_path, debounce=0.3):
+    batches = []
+    watcher = Watcher([tmp_path], debounce=debounce, on_update=lambda reports, removed: batches.append(
+        (sorted(os.path.basename(report.path) for report in reports), [os.path.basename(path) for path in removed])
+    ))
+    return watcher, batches
+
+
+def test_diff_snapshots_separates_changes_from_removals():
+    old = {"a.gd": (10, 1), "b.gd": (10, 1), "c.gd": (10, 1)}
+    new = {"a.gd": (10, 1), "b.gd": (11, 2), "d.gd": (5, 3)}
+    assert diff_snapshots(old, new) == (["b.gd", "d.gd"], ["c.gd"])
+    assert diff_snapshots(new, new) == ([], [])
+
+
+def test_poll_waits_for_the_tree_to_settle(tmp_path):
+    script = tmp_path / "a.gd"
+    _write(script, TERNARY, 1_000_000_000)
+    watcher, batches = _watcher(tmp_path)
+
+    assert not watcher.poll(now=0.0)
+    assert not watcher.poll(now=0.1)
+    assert batches == []
+    assert watcher.poll(now=0.3)
+    assert batches == [(["a.gd"], [])]
+    assert [f["rule"] for f in watcher.table.query()["findings"]] == ["ternary-operator"]
+
+    # A burst of writes keeps pushing the lint back until it stops.
+    _write(script, CLEAN, 2_000_000_000)
+    assert not watcher.poll(now=1.0)
+    _write(tmp_path / "b.gd", CLEAN, 2_000_000_000)
+    assert not watcher.poll(now=1.2)
+    assert not watcher.poll(now=1.4)
+    assert watcher.poll(now=1.5)
+    assert batches[-1] == (["a.gd", "b.gd"], [])
+    assert watcher.table.query()["findings"] == []
+    assert not watcher.poll(now=5.0)
+
+
+def test_removed_files_leave_the_table(tmp_path):
+    script = tmp_path / "a.gd"
+    _write(script, TERNARY, 1_000_000_000)
+    watcher, batches = _watcher(tmp_path)
+    watcher.poll(now=0.0)
+    watcher.poll(now=1.0)
+
+    script.unlink()
+    assert not watcher.poll(now=2.0)
+    assert watcher.poll(now=2.5)
+    assert batches[-1] == ([], ["a.gd"])
+    assert watcher.table.status() == {"generation": 2, "files": 0, "findings": 0}
+
+
+def test_file_removed_and_re_added_within_one_window_is_relinted(tmp_path):
+    script = tmp_path / "a.gd"
+    _write(script, TERNARY, 1_000_000_000)
+    watcher, batches = _watcher(tmp_path)
+    watcher.poll(now=0.0)
+    watcher.poll(now=1.0)
+
+    script.unlink()
+    assert not watcher.poll(now=2.0)
+    _write(script, CLEAN, 3_000_000_000)
+    assert not watcher.poll(now=2.1)
+    assert watcher.poll(now=2.5)
+    assert batches[-1] == (["a.gd"], [])
+    assert watcher.table.query()["files"] == 1
+    assert watcher.table.query()["findings"] == []
+
+
+def test_file_added_and_removed_within_one_window_is_only_removed(tmp_path):
+    watcher, batches = _watcher(tmp_path)
+    watcher.poll(now=0.0)
+    script = tmp_path / "a.gd"
+    _write(script, TERNARY, 1_000_000_000)
+    watcher.poll(now=1.0)
+    script.unlink()
+    watcher.poll(now=1.1)
+    assert watcher.poll(now=1.5)
+    assert batches[-1] == ([], ["a.gd"])
+
+
+def _report(path, *rules):
+    return FileReport(path=path, findings=[Finding(path, 1, 1, rule, "m") for rule in rules])
+
+
+def test_query_matches_res_paths_by_suffix():
+    table = ResultTable()
+    table.update([
+        _report(os.path.join("project", "addons", "godot_mcp", "utils", "a.gd"), "ternary-operator"),
+        _report(os.path.join("project", "addons", "godot_mcp", "utils", "ba.gd"), "mixed-indentation"),
+    ])
+    assert table.query("res://addons/godot_mcp/utils/a.gd")["files"] == 1
+    assert table.query("utils/a.gd")["findings"][0]["rule"] == "ternary-operator"
+    # A suffix only matches whole path components.
+    assert table.query("a.gd")["files"] == 1
+    assert table.query("res://other/a.gd")["files"] == 0
+    assert table.query(rule="mixed-indentation")["files"] == 2
+    assert len(table.query(rule="mixed-indentation")["findings"]) == 1
+
+
+def test_query_since_returns_only_newer_generations():
+    table = ResultTable()
+    first = table.update([_report("a.gd", "ternary-operator")])
+    table.update([_report("b.gd", "ternary-operator")])
+    assert table.query(since=first)["files"] == 1
+    assert table.query(since=first)["generation"] == 2
+    assert table.query(since=2)["findings"] == []